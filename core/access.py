@@ -0,0 +1,256 @@
+"""Request-scoped access facts for the current user.
+
+A single page render used to resolve the same permission data several times:
+the sidebar context processor, ``sidebar_permission_required`` and the
+dashboard routing helpers each queried ``RoleAssignment``,
+``SidebarPermission`` and ``DashboardAssignment`` on their own.
+:class:`AccessContext` loads those facts lazily, once per request, and every
+call site reads from it via ``request.access`` (see
+``core.middleware.AccessContextMiddleware``) or :func:`get_access`.
+
+The user's role assignments and applicable ``SidebarPermission`` rows form a
+snapshot that is shared across workers through :mod:`core.permission_cache`,
+so a warm request costs one cache read.  Building a snapshot takes two
+queries; dashboard assignments are cached separately and only loaded by the
+views that route between dashboards.  Superuser status and the profile role
+are always read from the live user object.
+"""
+
+from functools import cached_property
+
+from django.db.models import Q
+
+from . import permission_cache
+from .models import DashboardAssignment, RoleAssignment, SidebarPermission
+
+DASHBOARD_KEY = "access:dash:{}"
+
+
+class AccessContext:
+    """Lazily resolved roles, sidebar items, dashboards and UI flags."""
+
+    def __init__(self, user, session=None):
+        self.user = user
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # Raw data (cached across workers, at most once per object)
+    # ------------------------------------------------------------------
+    def _cached(self, key, build):
+        version, value = permission_cache.read(key)
+        if value is None:
+            value = build()
+            permission_cache.write(key, version, value)
+        return value
+
+    @cached_property
+    def _snapshot(self):
+        if not self.user.is_authenticated:
+            return {"role_assignments": [], "sidebar_rows": []}
+        return self._cached(
+            permission_cache.USER_KEY.format(self.user.pk), self._build_snapshot
+        )
+
+    def _build_snapshot(self):
+        role_assignments = list(
+            RoleAssignment.objects.filter(user=self.user).select_related(
+                "role", "organization", "organization__org_type"
+            )
+        )
+        # The user override, every ``orgrole:<id>`` key and all legacy named
+        # roles (faculty, student, ...) so any session role resolves from it.
+        role_keys = [f"orgrole:{ra.role_id}" for ra in role_assignments]
+        query = Q(user=self.user, role="") | (
+            Q(user__isnull=True) & ~Q(role__startswith="orgrole:")
+        )
+        if role_keys:
+            query |= Q(user__isnull=True, role__in=role_keys)
+        sidebar_rows = list(SidebarPermission.objects.filter(query).order_by("pk"))
+        return {"role_assignments": role_assignments, "sidebar_rows": sidebar_rows}
+
+    @property
+    def role_assignments(self):
+        """``RoleAssignment`` rows with role, organization and org type."""
+        return self._snapshot["role_assignments"]
+
+    @cached_property
+    def role_names(self):
+        """Names of the user's assigned roles, in assignment order."""
+        return [ra.role.name for ra in self.role_assignments if ra.role_id]
+
+    @cached_property
+    def org_types(self):
+        """Lower-cased organization type names across the user's assignments."""
+        return {
+            ra.organization.org_type.name.lower()
+            for ra in self.role_assignments
+            if ra.organization_id and ra.organization.org_type_id
+        }
+
+    @property
+    def session_role(self):
+        if self.session is None:
+            return ""
+        return (self.session.get("role") or "").strip()
+
+    @cached_property
+    def dashboard_assignments(self):
+        """Dashboard keys from active ``DashboardAssignment`` rows."""
+        if not self.user.is_authenticated:
+            return []
+
+        def build():
+            role_names = [name.lower() for name in self.role_names]
+            return list(
+                DashboardAssignment.objects.filter(is_active=True)
+                .filter(Q(user=self.user) | Q(role__in=role_names))
+                .values_list("dashboard", flat=True)
+            )
+
+        return self._cached(DASHBOARD_KEY.format(self.user.pk), build)
+
+    # ------------------------------------------------------------------
+    # Sidebar permissions
+    # ------------------------------------------------------------------
+    @cached_property
+    def user_override(self):
+        """The per-user ``SidebarPermission`` (empty role), if any."""
+        for perm in self._snapshot["sidebar_rows"]:
+            if perm.user_id == self.user.pk and not perm.role:
+                return perm
+        return None
+
+    @cached_property
+    def role_items(self):
+        """Items granted through ``orgrole:<id>`` permissions."""
+        keys = {f"orgrole:{ra.role_id}" for ra in self.role_assignments}
+        items = set()
+        for perm in self._snapshot["sidebar_rows"]:
+            if perm.user_id is None and perm.role in keys:
+                items.update(perm.items)
+        return items
+
+    def role_permission(self, role):
+        """First role-level permission whose role matches ``role`` (any case)."""
+        role = (role or "").lower()
+        if not role:
+            return None
+        for perm in self._snapshot["sidebar_rows"]:
+            if perm.user_id is None and (perm.role or "").lower() == role:
+                return perm
+        return None
+
+    @cached_property
+    def allowed_items(self):
+        """Items for ``SidebarPermission.get_allowed_items``: a list or ``"ALL"``.
+
+        Superusers and profile-level admins are unrestricted; everyone else
+        gets their user override merged with all role-based items.
+        """
+        if self.user.is_superuser:
+            return "ALL"
+        profile_role = getattr(getattr(self.user, "profile", None), "role", None)
+        if profile_role and profile_role.lower() == "admin":
+            return "ALL"
+        allowed = set(self.role_items)
+        if self.user_override:
+            allowed.update(self.user_override.items)
+        return sorted(allowed)
+
+    @cached_property
+    def nav_items(self):
+        """``(items, unrestricted)`` for the sidebar context processor.
+
+        A per-user override replaces role items; otherwise ``orgrole`` items
+        are merged with the legacy session role, falling back to the faculty
+        baseline when nothing else applies.
+        """
+        if not self.user.is_authenticated:
+            return [], False
+        if self.user.is_superuser:
+            return [], True
+        if self.user_override:
+            return list(self.user_override.items), False
+        if self.session_role.lower() == "admin":
+            return [], True
+        items = set(self.role_items)
+        perm = self.role_permission(self.session_role)
+        if perm:
+            items.update(perm.items)
+        if not items:
+            perm = self.role_permission("faculty")
+            if perm:
+                items.update(perm.items)
+        return sorted(items), False
+
+    # ------------------------------------------------------------------
+    # Dashboards
+    # ------------------------------------------------------------------
+    @cached_property
+    def available_dashboards(self):
+        """Sorted dashboard keys the user may open.
+
+        Dashboard entries in a per-user override are authoritative; otherwise
+        sidebar ``dashboard:*`` items and ``DashboardAssignment`` rows are
+        combined.
+        """
+        choice_map = dict(DashboardAssignment.DASHBOARD_CHOICES)
+
+        def _dashboard_keys(items):
+            keys = set()
+            for item in items or []:
+                if isinstance(item, str) and item.startswith("dashboard:"):
+                    key = item.split(":", 1)[1]
+                    if key in choice_map:
+                        keys.add(key)
+            return keys
+
+        if self.user_override:
+            keys = _dashboard_keys(self.user_override.items)
+            if keys:
+                return sorted(keys)
+
+        items = self.allowed_items
+        keys = set(choice_map) if items == "ALL" else _dashboard_keys(items)
+        if self.user.is_superuser:
+            keys.update(choice_map)
+        else:
+            keys.update(k for k in self.dashboard_assignments if k in choice_map)
+        return sorted(keys)
+
+    # ------------------------------------------------------------------
+    # UI flags
+    # ------------------------------------------------------------------
+    @cached_property
+    def is_english_faculty(self):
+        for name in self.role_names:
+            name = (name or "").lower()
+            if "english" in name and (
+                "faculty" in name or "review" in name or "proof" in name
+            ):
+                return True
+        return False
+
+    @cached_property
+    def is_reviewer(self):
+        """Any role or profile role mentioning HOD, IQAC or admin."""
+        names = [(name or "").lower() for name in self.role_names]
+        profile_role = getattr(getattr(self.user, "profile", None), "role", "") or ""
+        if profile_role:
+            names.append(profile_role.lower())
+        blob = " ".join(names)
+        return "hod" in blob or "iqac" in blob or "admin" in blob
+
+
+def get_access(request):
+    """Return the request's :class:`AccessContext`, creating it if needed.
+
+    ``AccessContextMiddleware`` normally attaches one; requests built by hand
+    (e.g. ``RequestFactory`` in tests) get one on first use.  A context built
+    for a different user object (login/impersonation mid-request) is replaced.
+    """
+    access = getattr(request, "access", None)
+    if access is None or access.user is not request.user:
+        access = AccessContext(request.user, getattr(request, "session", None))
+        request.access = access
+    return access
@@ -0,0 +1,278 @@
+"""Buffered, batched writer for :class:`core.models.ActivityLog` entries.
+
+``ActivityLogMiddleware`` records every authenticated request.  Writing each
+entry with its own ``INSERT`` doubles write traffic and serialises requests on
+the SQLite write lock, so entries are queued in-process instead and a daemon
+thread persists them with ``bulk_create`` once ``BATCH_SIZE`` entries are
+waiting or ``FLUSH_INTERVAL`` seconds have passed.  Pending entries are flushed
+when the worker exits.
+
+Behaviour is controlled by the ``ACTIVITY_LOG`` setting::
+
+    ACTIVITY_LOG = {
+        "MODE": "buffered",          # or "sync" to write on the request thread
+        "BATCH_SIZE": 200,
+        "FLUSH_INTERVAL": 2.0,       # seconds
+        "MAX_QUEUE_SIZE": 10000,     # entries beyond this are dropped
+        "EXCLUDE_VIEWS": ["emt:autosave_proposal"],
+        "SAMPLE_RATES": {"dashboard": 0.25},
+        "HOT_DAYS": 90,              # read by compact_activity_logs
+        "ARCHIVE_RETENTION_DAYS": 730,
+    }
+
+View names in ``EXCLUDE_VIEWS``/``SAMPLE_RATES`` may be fully namespaced
+(``emt:autosave_proposal``) or bare (``autosave_proposal``).
+"""
+
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "MODE": "buffered",
+    "BATCH_SIZE": 200,
+    "FLUSH_INTERVAL": 2.0,
+    "MAX_QUEUE_SIZE": 10000,
+    "EXCLUDE_VIEWS": [],
+    "SAMPLE_RATES": {},
+    "HOT_DAYS": 90,
+    "ARCHIVE_RETENTION_DAYS": 730,
+}
+
+
+def get_config():
+    """Return the ``ACTIVITY_LOG`` setting merged over :data:`DEFAULTS`."""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "ACTIVITY_LOG", None) or {})
+    return config
+
+
+def _view_keys(view_name):
+    """Return the lookup keys for ``view_name`` (namespaced and bare)."""
+    if not view_name:
+        return ()
+    short = view_name.split(":")[-1]
+    return (view_name,) if short == view_name else (view_name, short)
+
+
+def should_log(view_name):
+    """Apply the exclusion and sampling rules for ``view_name``."""
+    config = get_config()
+    keys = _view_keys(view_name)
+    excluded = set(config["EXCLUDE_VIEWS"] or ())
+    if any(key in excluded for key in keys):
+        return False
+    rates = config["SAMPLE_RATES"] or {}
+    for key in keys:
+        if key in rates:
+            rate = float(rates[key])
+            return rate >= 1 or (rate > 0 and random.random() < rate)
+    return True
+
+
+class ActivityLogBuffer:
+    """Queue of unsaved ``ActivityLog`` instances drained by a flusher thread."""
+
+    def __init__(self, batch_size=200, flush_interval=2.0, max_queue_size=10000):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self._queue = queue.Queue(maxsize=max(0, int(max_queue_size)))
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._pid = os.getpid()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def enqueue(self, entry):
+        """Queue ``entry`` for the next flush; return ``False`` if dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def flush(self):
+        """Write every queued entry; return the number of rows written."""
+        from core.history import record_suggestions
+        from core.models import ActivityLog
+
+        total = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    break
+                started = time.perf_counter()
+                try:
+                    ActivityLog.objects.bulk_create(batch, batch_size=self.batch_size)
+                except Exception:
+                    self.failed += len(batch)
+                    logger.exception(
+                        "Failed to write %d buffered activity log entries", len(batch)
+                    )
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                record_suggestions(batch)
+                self.flushes += 1
+                self.written += len(batch)
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                self.total_flush_ms += elapsed_ms
+                total += len(batch)
+        return total
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # The flusher owns its own connection; release it between
+                # batches so an idle worker does not pin a DB connection.
+                connection.close()
+
+    def _ensure_started(self):
+        if os.getpid() != self._pid:
+            # Forked after the thread started (e.g. gunicorn --preload): the
+            # child inherits the queue but not the thread.
+            self._reset_after_fork()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-log-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _reset_after_fork(self):
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def shutdown(self, timeout=5.0):
+        """Stop the flusher thread and write anything still queued."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_size": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.flushes, 3)
+            if self.flushes
+            else 0.0,
+            "flusher_alive": bool(self._thread and self._thread.is_alive()),
+        }
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Return the process-wide :class:`ActivityLogBuffer`, creating it lazily."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                config = get_config()
+                _buffer = ActivityLogBuffer(
+                    batch_size=config["BATCH_SIZE"],
+                    flush_interval=config["FLUSH_INTERVAL"],
+                    max_queue_size=config["MAX_QUEUE_SIZE"],
+                )
+                atexit.register(_shutdown)
+    return _buffer
+
+
+def _shutdown():  # pragma: no cover - runs at interpreter exit
+    if _buffer is None:
+        return
+    try:
+        _buffer.shutdown()
+    except Exception:
+        logger.exception("Failed to flush activity log buffer on shutdown")
+
+
+def record(entry):
+    """Persist ``entry`` according to the configured ``MODE``.
+
+    ``entry`` is an unsaved :class:`core.models.ActivityLog`.  In ``sync`` mode
+    it is saved immediately; otherwise it is queued for the flusher thread.
+    ``bulk_create`` bypasses ``ActivityLog.save`` so the description is filled
+    in here when the caller did not provide one.
+    """
+    if not entry.description:
+        entry.description = entry.generate_description()
+    if get_config()["MODE"] == "sync":
+        entry.save()
+        return True
+    return get_buffer().enqueue(entry)
+
+
+def stats():
+    """Return buffer metrics plus the active mode."""
+    data = get_buffer().stats()
+    data["mode"] = get_config()["MODE"]
+    return data
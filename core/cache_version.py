@@ -0,0 +1,65 @@
+"""Shared version stamps for caches that are invalidated as a whole.
+
+A versioned cache, such as the access cache (:mod:`core.permission_cache`),
+tags every entry with a global version stamp and treats an entry written
+under another stamp as a miss.  Bumping the stamp invalidates every entry at
+once, in every worker sharing the cache.
+
+This module must not import models: ``core.navigation`` uses it (through
+``core.permission_cache``) while apps are still loading.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _fresh_version():
+    # Seeded from the clock so a cache that lost its stamp never reuses a
+    # version that older entries were written under.
+    return int(time.time() * 1000)
+
+
+class VersionStamp:
+    """The stamp stored at ``key`` in the cache named by ``settings.<alias_setting>``."""
+
+    def __init__(self, alias_setting, key, label):
+        self.alias_setting = alias_setting
+        self.key = key
+        self.label = label
+
+    def get_cache(self):
+        return caches[getattr(settings, self.alias_setting, "default")]
+
+    def current(self, cache=None):
+        """Return the stamp, or ``None`` when the cache keeps nothing."""
+        cache = cache or self.get_cache()
+        version = cache.get(self.key)
+        if version is None:
+            cache.add(self.key, _fresh_version(), None)
+            version = cache.get(self.key)
+        return version
+
+    def bump(self):
+        """Invalidate every entry written under the current stamp."""
+        cache = self.get_cache()
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, _fresh_version(), None)
+        except Exception:
+            logger.exception("Failed to bump the %s version", self.label)
+
+    def bump_on_commit(self):
+        """Bump now and again once the surrounding transaction commits.
+
+        The second bump discards entries another worker may have built from
+        data read before the commit became visible.
+        """
+        self.bump()
+        transaction.on_commit(self.bump)
@@ -1,60 +1,43 @@
 import logging
-from datetime import timedelta
 
-from django.db.models import Q
-from django.utils import timezone
+from django.conf import settings
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
 
-from emt.models import EventProposal
+from emt.approval_inbox import counts as approval_inbox_counts
 from transcript.models import get_active_academic_year
 
-from .models import RoleAssignment, SidebarPermission
+from .access import get_access
+from .notifications import get_feed
 
 logger = logging.getLogger(__name__)
 
 
 def notifications(request):
-    """Return proposal-related notifications for the logged-in user."""
+    """Return proposal-related notifications for the logged-in user.
+
+    Served from the cached per-user feed in :mod:`core.notifications`.
+    """
     if not request.user.is_authenticated:
         return {}
+    stream_url = ""
+    if getattr(settings, "NOTIFICATION_STREAM_ENABLED", False):
+        stream_url = reverse("api_notifications_stream")
+    return {
+        "notifications": get_feed(request.user)["items"],
+        "notification_stream_url": stream_url,
+    }
 
-    two_days_ago = timezone.now() - timedelta(days=2)
-    proposals = (
-        EventProposal.objects.filter(submitted_by=request.user)
-        .filter(
-            ~Q(status=EventProposal.Status.FINALIZED)
-            | Q(updated_at__gte=two_days_ago)
-        )
-        .order_by("-updated_at")[:10]
-    )
 
-    notif_list = []
-    for p in proposals:
-        """Build notification payloads compatible with the header dropdown."""
-        if p.status == EventProposal.Status.REJECTED:
-            n_type = "alert"
-            icon = "triangle-exclamation"
-        elif p.status in [
-            EventProposal.Status.SUBMITTED,
-            EventProposal.Status.UNDER_REVIEW,
-        ]:
-            n_type = "reminder"
-            icon = "clock"
-        else:
-            n_type = "info"
-            icon = "circle-info"
-
-        notif_list.append(
-            {
-                "title": p.event_title or "Event Proposal",
-                "message": p.get_status_display(),
-                "created_at": p.updated_at,
-                "icon": icon,
-                "type": n_type,
-                "is_read": False,
-            }
-        )
-
-    return {"notifications": notif_list}
+def approval_inbox(request):
+    """Counts for the Review and Event Approvals sidebar badges.
+
+    Read lazily from the cached inbox counts (see emt/approval_inbox.py),
+    so pages that never show the sidebar do not look them up.
+    """
+    if not request.user.is_authenticated:
+        return {}
+    return {"approval_inbox": SimpleLazyObject(lambda: approval_inbox_counts(request))}
 
 
 def active_academic_year(request):
@@ -72,6 +55,9 @@ def sidebar_permissions(request):
       ``SidebarPermission`` entries with ``role=orgrole:<id>``.
     - If no role-based records exist, fallback to the legacy session ``role``
       and finally to the faculty baseline.
+
+    The lookups come from the request's :class:`core.access.AccessContext`,
+    so they are shared with the permission decorators and dashboard views.
     """
 
     # Anonymous users: nothing and restricted
@@ -92,23 +78,17 @@ def sidebar_permissions(request):
             "is_reviewer": True,
         }
 
-    # Pre-compute English Faculty heuristic for conditional UI
-    def _is_english_faculty_user(u):
-        try:
-            raqs = RoleAssignment.objects.select_related("role").filter(
-                user=u, role__isnull=False
-            )
-            for ra in raqs:
-                name = (getattr(ra.role, "name", "") or "").lower()
-                if "english" in name and (
-                    "faculty" in name or "review" in name or "proof" in name
-                ):
-                    return True
-        except Exception:
-            return False
-        return False
-
-    _english_flag = _is_english_faculty_user(request.user)
+    access = get_access(request)
+    items, unrestricted = access.nav_items
+    logger.debug(
+        "sidebar_permissions CP: user=%s override=%s allowed=%s session_role=%s",
+        request.user.id,
+        access.user_override is not None,
+        items,
+        access.session_role,
+    )
+    if unrestricted:
+        return {"allowed_nav_items": [], "unrestricted_nav": True}
 
     def _expand_with_parents(ids):
         if not ids:
@@ -122,109 +102,15 @@ def sidebar_permissions(request):
         expanded.update({item.split(":", 1)[1] for item in ids if ":" in item})
         return sorted(expanded)
 
-    # Reviewer role heuristic: any role or profile containing HOD/IQAC/admin
-    def _is_reviewer(u):
-        try:
-            names = []
-            ras = RoleAssignment.objects.select_related("role").filter(
-                user=u, role__isnull=False
-            )
-            names.extend([(ra.role.name or "").lower() for ra in ras])
-            prof_role = getattr(getattr(u, "profile", None), "role", "") or ""
-            if prof_role:
-                names.append(prof_role.lower())
-            blob = " ".join(names)
-            return "hod" in blob or "iqac" in blob or "admin" in blob
-        except Exception:
-            return False
-
-    # 1) User-specific override
-    user_perm = SidebarPermission.objects.filter(
-        user=request.user, role__in=["", None]
-    ).first()
-    if user_perm:
-        try:
-            logger.debug(
-                "sidebar_permissions CP: user=%s override items=%s",
-                request.user.id,
-                user_perm.items,
-            )
-        except Exception:
-            pass
-        return {
-            "allowed_nav_items": _expand_with_parents(user_perm.items),
-            "unrestricted_nav": False,
-            "is_english_faculty": _english_flag,
-            "is_reviewer": _is_reviewer(request.user),
-        }
-
-    # 2) Merge permissions from all assigned organization roles
-    role_items = set()
-    role_ids = RoleAssignment.objects.filter(user=request.user).values_list(
-        "role_id", flat=True
-    )
-    if role_ids:
-        role_keys = [f"orgrole:{rid}" for rid in role_ids]
-        for perm in SidebarPermission.objects.filter(
-            user__isnull=True, role__in=role_keys
-        ):
-            role_items.update(perm.items)
     try:
-        logger.debug(
-            "sidebar_permissions CP: user=%s role_ids=%s merged_items=%s session_role=%s",
-            request.user.id,
-            list(role_ids),
-            sorted(role_items),
-            request.session.get("role"),
-        )
+        english_flag = access.is_english_faculty
+        reviewer_flag = access.is_reviewer
     except Exception:
-        pass
-
-    # 3) Legacy session role with faculty fallback
-    session_role = (request.session.get("role") or "").strip()
-    if session_role.lower() == "admin":
-        return {"allowed_nav_items": [], "unrestricted_nav": True}
+        english_flag = reviewer_flag = False
 
-    if session_role:
-        perm = SidebarPermission.objects.filter(
-            user__isnull=True, role__iexact=session_role
-        ).first()
-        if perm:
-            role_items.update(perm.items)
-
-    if not role_items:
-        perm = SidebarPermission.objects.filter(
-            user__isnull=True, role__iexact="faculty"
-        ).first()
-        if perm:
-            role_items.update(perm.items)
-
-    if role_items:
-        try:
-            logger.debug(
-                "sidebar_permissions CP: user=%s final allowed=%s",
-                request.user.id,
-                sorted(role_items),
-            )
-        except Exception:
-            pass
-        return {
-            "allowed_nav_items": _expand_with_parents(sorted(role_items)),
-            "unrestricted_nav": False,
-            "is_english_faculty": _english_flag,
-            "is_reviewer": _is_reviewer(request.user),
-        }
-
-    try:
-        logger.debug(
-            "sidebar_permissions CP: user=%s default none (no role/org or perms)",
-            request.user.id,
-        )
-    except Exception:
-        pass
     return {
-        "allowed_nav_items": [],
+        "allowed_nav_items": _expand_with_parents(items),
         "unrestricted_nav": False,
-        "is_english_faculty": _english_flag,
-        "is_reviewer": _is_reviewer(request.user),
+        "is_english_faculty": english_flag,
+        "is_reviewer": reviewer_flag,
     }
@@ -79,9 +79,9 @@ def sidebar_permission_required(item_id):
                 return view_func(request, *args, **kwargs)
 
             try:
-                from .models import SidebarPermission
+                from .access import get_access
 
-                allowed = SidebarPermission.get_allowed_items(request.user)
+                allowed = get_access(request).allowed_items
             except Exception:
                 logger.exception(
                     "Failed to resolve sidebar permissions for user %s",
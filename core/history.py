@@ -0,0 +1,191 @@
+"""Query helpers for the admin activity history screen.
+
+The history page and its JSON API page through ``ActivityLog`` with a keyset
+cursor on ``(timestamp, id)`` so every page is an indexed range scan of fixed
+size, however large the log grows.  Type-ahead values come from the
+:class:`core.models.ActivityLogSuggestion` index, which is filled in as
+entries are written instead of being recomputed with ``DISTINCT``.
+"""
+
+import base64
+import logging
+from datetime import datetime, timedelta
+from heapq import merge
+from operator import attrgetter
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ActivityLog, ActivityLogArchive, ActivityLogSuggestion
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+SUGGESTION_LIMIT = 200
+
+
+# ──────────────────────────────────────────────
+#  Filtering
+# ──────────────────────────────────────────────
+def parse_date(value):
+    """Parse a ``YYYY-MM-DD`` filter value, returning ``None`` when invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def filter_logs(logs, query="", start=None, end=None, user=None, action=None, view_name=None):
+    """Apply the history filters to ``logs``.
+
+    ``user``, ``action`` (prefix), ``view_name`` and the date range map onto
+    indexed columns.  Free-text ``query`` is an ``icontains`` match across
+    the text columns; the suggestion index only drives type-ahead.
+    """
+    if user:
+        logs = logs.filter(user__username=user)
+    if action:
+        logs = logs.filter(action__startswith=action)
+    if view_name:
+        logs = logs.filter(view_name=view_name)
+    if start:
+        logs = logs.filter(timestamp__gte=_day_start(start))
+    if end:
+        logs = logs.filter(timestamp__lt=_day_start(end + timedelta(days=1)))
+    if query:
+        logs = logs.filter(
+            Q(user__username__icontains=query)
+            | Q(user__first_name__icontains=query)
+            | Q(user__last_name__icontains=query)
+            | Q(action__icontains=query)
+            | Q(description__icontains=query)
+            | Q(ip_address__icontains=query)
+        )
+    return logs
+
+
+def history_sources(hot_days, **filters):
+    """Return the querysets to read for ``filters``.
+
+    The hot ``ActivityLog`` table is always included; archived monthly
+    partitions are only read when ``start`` predates the hot window.
+    """
+    sources = [filter_logs(ActivityLog.objects.select_related("user"), **filters)]
+    start, end = filters.get("start"), filters.get("end")
+    hot_start = timezone.localdate() - timedelta(days=hot_days)
+    if start and start < hot_start:
+        archived = ActivityLogArchive.objects.select_related("user").filter(
+            partition__gte=start.replace(day=1)
+        )
+        if end:
+            archived = archived.filter(partition__lte=end.replace(day=1))
+        sources.append(filter_logs(archived, **filters))
+    return sources
+
+
+# ──────────────────────────────────────────────
+#  Keyset pagination
+# ──────────────────────────────────────────────
+def encode_cursor(log):
+    raw = f"{log.timestamp.isoformat()}|{log.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return ``(timestamp, id)`` for ``cursor`` or ``None`` if malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, pk_raw = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        timestamp = parse_datetime(ts_raw)
+        if timestamp is None:
+            return None
+        return timestamp, int(pk_raw)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def history_page(sources, cursor=None, limit=PAGE_SIZE):
+    """Return ``(rows, next_cursor)`` for one page across ``sources``.
+
+    Each source contributes at most ``limit + 1`` rows after the cursor; the
+    results are merged on ``(timestamp, id)`` which is unique across the hot
+    and archive tables because archived rows keep their original ids.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    position = decode_cursor(cursor)
+    fetched = []
+    for source in sources:
+        qs = source
+        if position:
+            ts, pk = position
+            qs = qs.filter(Q(timestamp__lt=ts) | Q(timestamp=ts, pk__lt=pk))
+        fetched.append(list(qs.order_by("-timestamp", "-pk")[: limit + 1]))
+
+    key = attrgetter("timestamp", "pk")
+    rows = list(merge(*fetched, key=key, reverse=True))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1]) if has_more and rows else None
+    return rows, next_cursor
+
+
+# ──────────────────────────────────────────────
+#  Suggestion index
+# ──────────────────────────────────────────────
+# Values already written by this process.  Cleared when it grows past the
+# cap; the unique constraint makes re-inserting a value harmless.
+_known_suggestions = set()
+_KNOWN_SUGGESTIONS_CAP = 50000
+
+
+def record_suggestions(entries):
+    """Add any new actions/usernames from ``entries`` to the suggestion index.
+
+    A per-process memo skips values this worker has already written, so the
+    steady state costs no queries at all.
+    """
+    fresh = set()
+    for entry in entries:
+        if entry.action:
+            fresh.add((ActivityLogSuggestion.KIND_ACTION, entry.action[:255]))
+        username = getattr(entry.user, "username", None) if entry.user_id else None
+        if username:
+            fresh.add((ActivityLogSuggestion.KIND_USER, username[:255]))
+    fresh -= _known_suggestions
+    if not fresh:
+        return 0
+    try:
+        ActivityLogSuggestion.objects.bulk_create(
+            [ActivityLogSuggestion(kind=kind, value=value) for kind, value in fresh],
+            ignore_conflicts=True,
+        )
+    except Exception:
+        logger.exception("Failed to update activity history suggestions")
+        return 0
+    transaction.on_commit(lambda: _remember_suggestions(fresh))
+    return len(fresh)
+
+
+def _remember_suggestions(values):
+    if len(_known_suggestions) + len(values) > _KNOWN_SUGGESTIONS_CAP:
+        _known_suggestions.clear()
+    _known_suggestions.update(values)
+
+
+def suggestions(prefix="", limit=SUGGESTION_LIMIT):
+    """Return up to ``limit`` suggestion values, optionally prefix-filtered."""
+    qs = ActivityLogSuggestion.objects.all()
+    if prefix:
+        qs = qs.filter(value__startswith=prefix)
+    return list(qs.order_by("value").values_list("value", flat=True).distinct()[:limit])
@@ -0,0 +1,246 @@
+"""Benchmark the hot endpoints against the synthetic dataset.
+
+Each endpoint in ``ENDPOINTS`` is requested through the Django test client
+as one of the users created by ``manage.py seed_synthetic_data``.  Latency
+and query counts are recorded per request and summarised (median, p95, min)
+into a JSON baseline.  ``--compare`` loads an earlier baseline, prints the
+deltas and, with ``--fail-on-regression``, fails when an endpoint got slower
+than ``--threshold`` percent or issues more queries.
+"""
+
+import json
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core import synthetic
+
+
+def _report_id(faculty):
+    from emt.models import EventReport
+
+    report = (
+        EventReport.objects.filter(proposal__submitted_by=faculty)
+        .order_by("pk")
+        .first()
+    )
+    if report is None:
+        raise CommandError("The benchmark faculty user has no event reports.")
+    return report.pk
+
+
+def _roll_no():
+    from transcript.models import Student
+
+    student = (
+        Student.objects.filter(roll_no__startswith=synthetic.ROLL_PREFIX)
+        .order_by("pk")
+        .first()
+    )
+    if student is None:
+        raise CommandError("No synthetic transcript students found.")
+    return student.roll_no
+
+
+SEARCH_PAYLOAD = {"category": "events", "page": 1, "page_size": 100}
+
+# name -> (user, method, url builder, payload)
+ENDPOINTS = {
+    "dashboard": ("faculty", "get", lambda f: reverse("dashboard"), None),
+    "api_calendar_events": (
+        "faculty",
+        "get",
+        lambda f: reverse("api_calendar_events"),
+        {"category": "all"},
+    ),
+    "api_global_search": (
+        "admin",
+        "get",
+        lambda f: reverse("api_global_search"),
+        {"q": "Synth"},
+    ),
+    "api_search": ("admin", "post", lambda f: reverse("api_search"), SEARCH_PAYLOAD),
+    "api_export_csv": (
+        "admin",
+        "post",
+        lambda f: reverse("api_export_csv"),
+        {"category": "events"},
+    ),
+    "transcript_view": (
+        "faculty",
+        "get",
+        lambda f: reverse("transcript:transcript", args=[_roll_no()]),
+        None,
+    ),
+    "attendance_data": (
+        "faculty",
+        "get",
+        lambda f: reverse("emt:attendance_data", args=[_report_id(f)]),
+        None,
+    ),
+    "review_center": ("admin", "get", lambda f: reverse("emt:review_center"), None),
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[max(0, round(0.95 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Measure latency and query counts of hot endpoints on the synthetic dataset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Timed requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=1, help="Untimed requests per endpoint")
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            choices=sorted(ENDPOINTS),
+            help="Only run these endpoints (repeatable)",
+        )
+        parser.add_argument("--json", dest="json_path", help="Write the baseline to this file")
+        parser.add_argument("--compare", help="Baseline JSON file to compare against")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=25.0,
+            help="Median latency increase (percent) treated as a regression",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when --compare finds a regression",
+        )
+
+    def _clients(self):
+        users = {
+            "faculty": User.objects.filter(username=synthetic.BENCH_FACULTY).first(),
+            "admin": User.objects.filter(username=synthetic.BENCH_ADMIN).first(),
+        }
+        if not all(users.values()):
+            raise CommandError("Run `manage.py seed_synthetic_data` first.")
+        clients = {}
+        for key, user in users.items():
+            client = Client(HTTP_HOST="localhost", raise_request_exception=False)
+            client.force_login(user)
+            clients[key] = client
+        return users, clients
+
+    def _measure(self, client, method, url, payload, repeat, warmup):
+        if method == "post":
+            def call():
+                return client.post(
+                    url, json.dumps(payload or {}), content_type="application/json"
+                )
+        else:
+            def call():
+                return client.get(url, payload or {})
+
+        for _ in range(warmup):
+            call()
+        timings, queries, statuses = [], [], set()
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = call()
+                if getattr(response, "streaming", False):
+                    b"".join(response.streaming_content)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(ctx.captured_queries))
+            statuses.add(response.status_code)
+        return {
+            "url": url,
+            "status": sorted(statuses),
+            "median_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(_p95(timings), 2),
+            "min_ms": round(min(timings), 2),
+            "queries": int(statistics.median(queries)),
+            "max_queries": max(queries),
+        }
+
+    def handle(self, *args, **options):
+        users, clients = self._clients()
+        names = options["endpoint"] or list(ENDPOINTS)
+        repeat = max(1, options["repeat"])
+
+        results = {}
+        for name in names:
+            user_key, method, build_url, payload = ENDPOINTS[name]
+            url = build_url(users["faculty"])
+            results[name] = self._measure(
+                clients[user_key], method, url, payload, repeat, options["warmup"]
+            )
+            r = results[name]
+            self.stdout.write(
+                f"{name:<22} {r['median_ms']:9.1f} ms  p95 {r['p95_ms']:9.1f} ms  "
+                f"{r['queries']:5d} queries  status {','.join(map(str, r['status']))}"
+            )
+            if any(status >= 400 for status in r["status"]):
+                self.stderr.write(
+                    self.style.WARNING(f"  {name} returned an error; timings measure the error path")
+                )
+
+        baseline = {
+            "commit": _git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "repeat": repeat,
+            "endpoints": results,
+        }
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(baseline, fh, indent=2)
+            self.stdout.write(f"Baseline written to {options['json_path']}")
+
+        if options["compare"]:
+            regressions = self._compare(options["compare"], results, options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError("Regressions: " + "; ".join(regressions))
+
+    def _compare(self, path, results, threshold):
+        try:
+            with open(path) as fh:
+                previous = json.load(fh)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read baseline {path}: {exc}")
+
+        self.stdout.write(f"\nCompared with {path} ({previous.get('commit') or 'unknown commit'}):")
+        regressions = []
+        for name, current in results.items():
+            before = previous.get("endpoints", {}).get(name)
+            if not before:
+                self.stdout.write(f"  {name:<22} (not in baseline)")
+                continue
+            delta_ms = current["median_ms"] - before["median_ms"]
+            pct = (delta_ms / before["median_ms"] * 100) if before["median_ms"] else 0.0
+            delta_q = current["queries"] - before["queries"]
+            self.stdout.write(
+                f"  {name:<22} {delta_ms:+9.1f} ms ({pct:+6.1f}%)  {delta_q:+5d} queries"
+            )
+            if pct > threshold:
+                regressions.append(f"{name} {pct:+.0f}% latency")
+            if delta_q > 0:
+                regressions.append(f"{name} {delta_q:+d} queries")
+        return regressions
@@ -0,0 +1,145 @@
+"""Measure worker start-up import time with ``python -X importtime``.
+
+Each run boots Django in a fresh interpreter and loads the URLconf (which
+imports every view module), the same work a gunicorn worker does before it
+serves its first request.  The per-module timings are parsed from the
+``-X importtime`` report; the command fails when the total or any module
+with an explicit budget exceeds its limit, or when one of the heavy optional
+dependencies in ``DEFERRED_MODULES`` is imported eagerly again.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT_SCRIPT = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+DEFAULT_BUDGET_MS = 1000
+
+# Heavy optional dependencies that views import on first use; loading any of
+# them during start-up is a regression.
+DEFERRED_MODULES = ("weasyprint", "xhtml2pdf", "qrcode", "xlsxwriter", "bs4")
+
+
+def parse_importtime(text):
+    """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output.
+
+    A module imported more than once in the report keeps its first entry.
+    """
+    timings = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:  # header row
+            continue
+        timings.setdefault(parts[2].strip(), (self_us, cumulative_us))
+    return timings
+
+
+def _parse_module_budgets(values):
+    budgets = {}
+    for value in values or []:
+        module, sep, ms = value.partition("=")
+        try:
+            budgets[module.strip()] = float(ms)
+        except ValueError:
+            raise CommandError(f"Invalid --module-budget {value!r}; expected module=ms")
+        if not sep or not module.strip():
+            raise CommandError(f"Invalid --module-budget {value!r}; expected module=ms")
+    return budgets
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time for a cold worker start and enforce a budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs (median is reported)")
+        parser.add_argument("--top", type=int, default=15, help="Number of modules to list")
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=getattr(settings, "STARTUP_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS),
+            help="Fail when total import time exceeds this many milliseconds",
+        )
+        parser.add_argument(
+            "--module-budget",
+            action="append",
+            metavar="MODULE=MS",
+            help="Fail when MODULE's cumulative import time exceeds MS (repeatable)",
+        )
+        parser.add_argument("--json", dest="json_path", help="Write the report to this file")
+
+    def _run_once(self):
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+        # Measure a normal start with cached bytecode, not a recompile.
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Start-up run failed:\n{proc.stderr[-2000:]}")
+        return parse_importtime(proc.stderr)
+
+    def handle(self, *args, **options):
+        module_budgets = _parse_module_budgets(options["module_budget"])
+        self._run_once()  # warm the bytecode and filesystem caches
+
+        runs = [self._run_once() for _ in range(max(1, options["repeat"]))]
+        totals = [sum(self_us for self_us, _ in run.values()) for run in runs]
+        modules = set().union(*runs)
+        cumulative = {
+            name: statistics.median(run.get(name, (0, 0))[1] for run in runs)
+            for name in modules
+        }
+        total_ms = statistics.median(totals) / 1000
+
+        top = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)
+        top = top[: options["top"]]
+        self.stdout.write(f"Start-up import time: {total_ms:.1f} ms (budget {options['budget_ms']:.0f} ms)")
+        for name, us in top:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {name}")
+
+        failures = []
+        if total_ms > options["budget_ms"]:
+            failures.append(f"total {total_ms:.1f} ms > {options['budget_ms']:.0f} ms")
+        eager = sorted(name for name in DEFERRED_MODULES if name in modules)
+        if eager:
+            failures.append("imported at start-up: " + ", ".join(eager))
+        for name, budget in module_budgets.items():
+            ms = cumulative.get(name, 0) / 1000
+            if ms > budget:
+                failures.append(f"{name} {ms:.1f} ms > {budget:.0f} ms")
+
+        if options["json_path"]:
+            report = {
+                "total_ms": round(total_ms, 1),
+                "budget_ms": options["budget_ms"],
+                "modules_ms": {name: round(us / 1000, 2) for name, us in top},
+                "failures": failures,
+            }
+            with open(options["json_path"], "w") as fh:
+                json.dump(report, fh, indent=2)
+
+        if failures:
+            raise CommandError("Start-up import budget exceeded: " + "; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("Start-up import time within budget."))
@@ -0,0 +1,200 @@
+import re
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from core.activity_buffer import get_config
+from core.models import ActivityLog, ActivityLogArchive, ActivityLogDailyRollup
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def rollup_key(view_name, action):
+    """Return the rollup bucket for an entry.
+
+    Entries logged before ``view_name`` existed fall back to their action
+    with numeric path segments collapsed, so ``GET /proposal/12/`` and
+    ``GET /proposal/13/`` share one bucket.
+    """
+    if view_name:
+        return view_name
+    return _NUMERIC_SEGMENT.sub("/<id>", action or "")[:200]
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll up, archive and prune ActivityLog rows. Rows older than the hot "
+        "window move to ActivityLogArchive in small transactions; archived rows "
+        "past the retention window are deleted."
+    )
+
+    def add_arguments(self, parser):
+        config = get_config()
+        parser.add_argument(
+            "--hot-days",
+            type=int,
+            default=config["HOT_DAYS"],
+            help="Keep this many days in the hot ActivityLog table.",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=config["ARCHIVE_RETENTION_DAYS"],
+            help="Delete archived rows older than this many days (0 keeps all).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows moved or deleted per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would happen without writing anything.",
+        )
+        parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="Reclaim disk space after pruning (VACUUM).",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        chunk_size = max(1, options["chunk_size"])
+        dry_run = options["dry_run"]
+
+        days = self._rollup(timezone.localdate(now), dry_run)
+        archived = self._archive(
+            now - timedelta(days=options["hot_days"]), chunk_size, dry_run
+        )
+        pruned = 0
+        if options["retention_days"] > 0:
+            pruned = self._prune(
+                now - timedelta(days=options["retention_days"]), chunk_size, dry_run
+            )
+        if options["vacuum"] and not dry_run:
+            self._vacuum()
+
+        prefix = "[dry run] " if dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}Rolled up {days} day(s), archived {archived} and "
+                f"pruned {pruned} activity log rows."
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Rollups
+    # ------------------------------------------------------------------
+    def _rollup(self, today, dry_run):
+        """(Re)build daily rollups from the last rolled-up day to yesterday.
+
+        The latest existing day is recomputed because entries buffered around
+        midnight may have landed after the previous run.
+        """
+        last = ActivityLogDailyRollup.objects.aggregate(last=Max("day"))["last"]
+        if last is None:
+            earliest = [
+                qs.aggregate(first=Min("timestamp"))["first"]
+                for qs in (ActivityLog.objects.all(), ActivityLogArchive.objects.all())
+            ]
+            earliest = [ts for ts in earliest if ts is not None]
+            if not earliest:
+                return 0
+            last = timezone.localtime(min(earliest)).date()
+
+        days = 0
+        day = last
+        while day < today:
+            if not dry_run:
+                self._rollup_day(day)
+            days += 1
+            day += timedelta(days=1)
+        return days
+
+    def _rollup_day(self, day):
+        start, end = _day_bounds(day)
+        counts = defaultdict(int)
+        for model in (ActivityLog, ActivityLogArchive):
+            qs = model.objects.filter(timestamp__gte=start, timestamp__lt=end)
+            if model is ActivityLogArchive:
+                qs = qs.filter(partition=day.replace(day=1))
+            rows = (
+                qs.order_by()
+                .values("user_id", "view_name", "action")
+                .annotate(n=Count("id"))
+            )
+            for row in rows:
+                key = rollup_key(row["view_name"], row["action"])
+                counts[(row["user_id"], key)] += row["n"]
+
+        with transaction.atomic():
+            ActivityLogDailyRollup.objects.filter(day=day).delete()
+            ActivityLogDailyRollup.objects.bulk_create(
+                [
+                    ActivityLogDailyRollup(
+                        day=day, user_id=user_id, view_name=view_name, count=n
+                    )
+                    for (user_id, view_name), n in counts.items()
+                ]
+            )
+
+    # ------------------------------------------------------------------
+    # Archive / prune
+    # ------------------------------------------------------------------
+    def _archive(self, cutoff, chunk_size, dry_run):
+        stale = ActivityLog.objects.filter(timestamp__lt=cutoff)
+        if dry_run:
+            return stale.count()
+
+        moved = 0
+        while True:
+            ids = list(stale.order_by("id").values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                break
+            # One short transaction per chunk keeps the write lock brief.
+            with transaction.atomic():
+                rows = ActivityLog.objects.filter(id__in=ids)
+                ActivityLogArchive.objects.bulk_create(
+                    [ActivityLogArchive.from_log(log) for log in rows],
+                    ignore_conflicts=True,
+                )
+                ActivityLog.objects.filter(id__in=ids).delete()
+            moved += len(ids)
+        return moved
+
+    def _prune(self, cutoff, chunk_size, dry_run):
+        expired = ActivityLogArchive.objects.filter(
+            partition__lte=ActivityLogArchive.partition_for(cutoff),
+            timestamp__lt=cutoff,
+        )
+        if dry_run:
+            return expired.count()
+
+        deleted = 0
+        while True:
+            ids = list(expired.order_by("id").values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                ActivityLogArchive.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+        return deleted
+
+    def _vacuum(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("VACUUM")
+            elif connection.vendor == "postgresql":
+                for model in (ActivityLog, ActivityLogArchive):
+                    cursor.execute(f'VACUUM ANALYZE "{model._meta.db_table}"')
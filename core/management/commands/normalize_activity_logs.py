@@ -7,6 +7,8 @@ from core.models import ActivityLog
 
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
     help = "Normalize existing ActivityLog descriptions using generate_description()"
@@ -24,12 +26,20 @@ class Command(BaseCommand):
             query |= Q(description__icontains=pattern)
 
         count = 0
-        for log in ActivityLog.objects.filter(query):
+        pending = []
+        logs = ActivityLog.objects.filter(query).select_related("user")
+        for log in logs.iterator(chunk_size=BATCH_SIZE):
             new_desc = log.generate_description()
             if new_desc != log.description:
                 log.description = new_desc
-                log.save(update_fields=["description"])
-                count += 1
+                pending.append(log)
+            if len(pending) >= BATCH_SIZE:
+                ActivityLog.objects.bulk_update(pending, ["description"])
+                count += len(pending)
+                pending = []
+        if pending:
+            ActivityLog.objects.bulk_update(pending, ["description"])
+            count += len(pending)
         self.stdout.write(
             self.style.SUCCESS(f"Normalized {count} activity logs.")
         )
@@ -0,0 +1,67 @@
+"""Seed a synthetic university for benchmarking (see ``core/synthetic.py``)."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import synthetic
+
+
+class Command(BaseCommand):
+    help = "Seed a deterministic synthetic dataset for endpoint benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiply the default volumes (e.g. 0.1 for a quick run)",
+        )
+        for key, value in synthetic.DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f"--{key.replace('_', '-')}",
+                dest=key,
+                type=float if isinstance(value, float) else int,
+                help=f"Override {key.replace('_', ' ')} (default {value})",
+            )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete previously seeded synthetic rows first",
+        )
+        parser.add_argument(
+            "--flush-only",
+            action="store_true",
+            help="Delete previously seeded synthetic rows and exit",
+        )
+
+    def handle(self, *args, **options):
+        from django.contrib.auth.models import User
+
+        if options["flush"] or options["flush_only"]:
+            synthetic.flush()
+            self.stdout.write("Removed existing synthetic data.")
+            if options["flush_only"]:
+                return
+        elif User.objects.filter(username=synthetic.BENCH_ADMIN).exists():
+            raise CommandError(
+                "Synthetic data already exists; pass --flush to recreate it."
+            )
+
+        counts = synthetic.scaled_counts(
+            options["scale"],
+            **{key: options[key] for key in synthetic.DEFAULT_COUNTS},
+        )
+        started = time.perf_counter()
+        created = synthetic.seed(counts, seed_value=options["seed"], log=self.stdout.write)
+        elapsed = time.perf_counter() - started
+
+        for model, count in created.items():
+            self.stdout.write(f"  {model:<20} {count:>9}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {sum(created.values())} rows in {elapsed:.1f}s "
+                f"(benchmark users: {synthetic.BENCH_FACULTY}, {synthetic.BENCH_ADMIN})."
+            )
+        )
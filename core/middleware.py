@@ -1,13 +1,20 @@
 import logging
+import random
+import time
+from contextlib import ExitStack
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 from django.shortcuts import redirect
 from django.urls import reverse
 
 from core.models import ActivityLog, RoleAssignment
 from emt.models import Student
 
+from . import activity_buffer, query_stats
+from .access import AccessContext
 from .utils import get_or_create_current_site
 
 logger = logging.getLogger(__name__)
@@ -28,6 +35,44 @@ ADMIN_VIEW_ACTIONS = {
 }
 
 
+class QueryStatsMiddleware:
+    """Record query counts and timings for a sample of requests.
+
+    Disabled unless ``settings.QUERY_STATS["ENABLED"]`` is set, in which case
+    Django drops it from the chain at start-up.  Sampled requests run with an
+    ``execute_wrapper`` on every database connection; the totals are filed
+    under the resolved ``view_name`` in :mod:`core.query_stats`.  Sits near the
+    top of ``MIDDLEWARE`` so session, auth and access queries are included.
+    """
+
+    def __init__(self, get_response):
+        config = query_stats.get_config()
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config["SAMPLE_RATE"]
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = query_stats.RequestRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            response = self.get_response(request)
+        wall_time = time.perf_counter() - start
+
+        try:
+            resolver_match = getattr(request, "resolver_match", None)
+            view_name = getattr(resolver_match, "view_name", "") or "<unresolved>"
+            query_stats.get_store().record(view_name, recorder, wall_time)
+        except Exception:  # pragma: no cover - stats must never break a request
+            logger.exception("Failed to record query stats for %s", request.path)
+        return response
+
+
 class ImpersonationMiddleware:
     """Swap ``request.user`` when admin impersonates another user.
 
@@ -63,6 +108,22 @@ class ImpersonationMiddleware:
         return response
 
 
+class AccessContextMiddleware:
+    """Attach a lazy :class:`core.access.AccessContext` as ``request.access``.
+
+    Placed after ``ImpersonationMiddleware`` so the context describes the
+    effective user.  Nothing is queried until a view, decorator or context
+    processor reads from it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.access = AccessContext(request.user, request.session)
+        return self.get_response(request)
+
+
 class RegistrationRequiredMiddleware:
     """Redirect authenticated users to the registration form until they register."""
 
@@ -125,6 +186,10 @@ class ActivityLogMiddleware:
     recorded.  For a bank-level history table we want to retain a trail for
     every action a user performs, so this middleware now logs all requests
     except those for static/media assets.
+
+    Entries are handed to :mod:`core.activity_buffer`, which batches the
+    writes off the request thread and applies the per-view exclusion and
+    sampling rules from ``settings.ACTIVITY_LOG``.
     """
 
     def __init__(self, get_response):
@@ -155,6 +220,8 @@ class ActivityLogMiddleware:
                 # Skip noisy internal admin endpoints altogether
                 if view_name in ADMIN_NOISE_VIEWS:
                     return response
+                if not activity_buffer.should_log(view_name):
+                    return response
 
                 custom_action = ADMIN_VIEW_ACTIONS.get(view_name)
 
@@ -201,12 +268,15 @@ class ActivityLogMiddleware:
                     metadata = metadata or {}
                     metadata["object_title"] = obj_title
 
-                ActivityLog.objects.create(
-                    user=request.user,
-                    action=f"{request.method} {request.path}",
-                    description=description,
-                    ip_address=ip,
-                    metadata=metadata,
+                activity_buffer.record(
+                    ActivityLog(
+                        user=request.user,
+                        action=f"{request.method} {request.path}",
+                        view_name=view_name or "",
+                        description=description,
+                        ip_address=ip,
+                        metadata=metadata,
+                    )
                 )
         except (
             Exception
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_activitylog_timestamp_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='view_name',
+            field=models.CharField(blank=True, db_index=True, max_length=200),
+        ),
+        migrations.CreateModel(
+            name='ActivityLogArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('partition', models.DateField(db_index=True)),
+                ('action', models.CharField(max_length=255)),
+                ('view_name', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField()),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('metadata', models.JSONField(blank=True, null=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_activity_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['partition', 'timestamp'], name='core_alarch_part_ts_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityLogDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True)),
+                ('view_name', models.CharField(blank=True, max_length=200)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day', 'view_name'],
+                'indexes': [models.Index(fields=['view_name', 'day'], name='core_activi_view_na_dd5056_idx')],
+                'unique_together': {('day', 'user', 'view_name')},
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_suggestions(apps, schema_editor):
+    ActivityLog = apps.get_model("core", "ActivityLog")
+    ActivityLogArchive = apps.get_model("core", "ActivityLogArchive")
+    ActivityLogSuggestion = apps.get_model("core", "ActivityLogSuggestion")
+
+    for model in (ActivityLog, ActivityLogArchive):
+        for kind, field in (("action", "action"), ("user", "user__username")):
+            values = (
+                model.objects.exclude(**{f"{field}__isnull": True})
+                .exclude(**{field: ""})
+                .order_by()
+                .values_list(field, flat=True)
+                .distinct()
+            )
+            ActivityLogSuggestion.objects.bulk_create(
+                [ActivityLogSuggestion(kind=kind, value=v[:255]) for v in values],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_activitylog_archive_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityLogSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('action', 'Action'), ('user', 'Username')], max_length=10)),
+                ('value', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['value'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-timestamp', '-id'], name='core_actlog_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylogsuggestion',
+            index=models.Index(fields=['value'], name='core_alsugg_value_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='activitylogsuggestion',
+            unique_together={('kind', 'value')},
+        ),
+        migrations.RunPython(backfill_suggestions, migrations.RunPython.noop),
+    ]
@@ -634,13 +634,22 @@ class ActivityLog(models.Model):
         related_name="activity_logs",
     )
     action = models.CharField(max_length=255, db_index=True)
+    # Resolved URL name (e.g. ``emt:submit_proposal``); empty for entries not
+    # tied to a request such as login/logout.  Used for per-view rollups.
+    view_name = models.CharField(max_length=200, blank=True, db_index=True)
     description = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # ``default`` rather than ``auto_now_add`` so entries queued by
+    # ``core.activity_buffer`` keep the request time, not the flush time.
+    timestamp = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     metadata = models.JSONField(null=True, blank=True)
 
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            # Keyset pagination for the history screen walks (timestamp, id).
+            models.Index(fields=["-timestamp", "-id"], name="core_actlog_ts_id_idx")
+        ]
 
     def __str__(self):
         return f"{self.timestamp} - {self.user} - {self.action}"
@@ -682,6 +691,110 @@ class ActivityLog(models.Model):
         super().save(*args, **kwargs)
 
 
+class ActivityLogArchive(models.Model):
+    """Cold storage for ``ActivityLog`` rows older than the hot window.
+
+    Rows are moved here by the ``compact_activity_logs`` command and keep
+    their original primary key so history links stay valid.  ``partition``
+    holds the first day of the entry's month; every archive query filters on
+    it first so lookups only touch the months they need.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    partition = models.DateField(db_index=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_activity_logs",
+    )
+    action = models.CharField(max_length=255)
+    view_name = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+    timestamp = models.DateTimeField()
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    metadata = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-timestamp"]
+        indexes = [
+            models.Index(
+                fields=["partition", "timestamp"], name="core_alarch_part_ts_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.timestamp} - {self.user} - {self.action} (archived)"
+
+    @staticmethod
+    def partition_for(timestamp):
+        """Return the monthly partition key for ``timestamp``."""
+        return timezone.localtime(timestamp).date().replace(day=1)
+
+    @classmethod
+    def from_log(cls, log):
+        return cls(
+            id=log.id,
+            partition=cls.partition_for(log.timestamp),
+            user_id=log.user_id,
+            action=log.action,
+            view_name=log.view_name,
+            description=log.description,
+            timestamp=log.timestamp,
+            ip_address=log.ip_address,
+            metadata=log.metadata,
+        )
+
+
+class ActivityLogSuggestion(models.Model):
+    """Distinct actions and usernames offered as history type-ahead.
+
+    Maintained incrementally as log entries are written (see
+    ``core.history.record_suggestions``) so the history page never has to run
+    ``DISTINCT`` over the whole log.
+    """
+
+    KIND_ACTION = "action"
+    KIND_USER = "user"
+    KIND_CHOICES = [(KIND_ACTION, "Action"), (KIND_USER, "Username")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["value"]
+        unique_together = ("kind", "value")
+        indexes = [models.Index(fields=["value"], name="core_alsugg_value_idx")]
+
+    def __str__(self):
+        return f"{self.kind}: {self.value}"
+
+
+class ActivityLogDailyRollup(models.Model):
+    """Per user/view/day request counts kept after detail rows are pruned."""
+
+    day = models.DateField(db_index=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="activity_rollups",
+    )
+    view_name = models.CharField(max_length=200, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "view_name"]
+        unique_together = ("day", "user", "view_name")
+        indexes = [models.Index(fields=["view_name", "day"])]
+
+    def __str__(self):
+        return f"{self.day} - {self.user} - {self.view_name}: {self.count}"
+
+
 # ────────────────────────────────────────────────────────────────
 #  CDL SUPPORT MODELS
 # ────────────────────────────────────────────────────────────────
@@ -894,33 +1007,14 @@ class SidebarPermission(models.Model):
 
     @classmethod
     def get_allowed_items(cls, user):
-        # N+1 RISK: This method performs multiple queries. Use with care.
-        # Consider caching the results of this method per-request if called often.
-        from core.navigation import get_nav_items
-
-        if user.is_superuser:
-            return "ALL"
+        """Return the sidebar item ids ``user`` may see, or ``"ALL"``.
 
-        role = getattr(getattr(user, "profile", None), "role", None)
-        if role and role.lower() == "admin":
-            return "ALL"
+        Views with a request should use ``request.access.allowed_items`` so the
+        lookups are shared with the rest of the request.
+        """
+        from core.access import AccessContext
 
-        allowed: set[str] = set()
-
-        user_perm = cls.objects.filter(user=user, role__in=["", None]).first()
-        if user_perm:
-            allowed.update(user_perm.items)
-
-        role_ids = RoleAssignment.objects.filter(user=user).values_list(
-            "role_id", flat=True
-        )
-        if role_ids:
-            role_keys = [f"orgrole:{rid}" for rid in role_ids]
-            for perm in cls.objects.filter(user__isnull=True, role__in=role_keys):
-                allowed.update(perm.items)
-        # ... (rest of method) ...
-        nav_items = get_nav_items()
-        return sorted(list(allowed)) # Simplified return for brevity
+        return AccessContext(user).allowed_items
 
 
 class SidebarModule(models.Model):
@@ -974,26 +1068,21 @@ class DashboardAssignment(models.Model):
         return f"{target} -> {self.get_dashboard_display()}"
 
     @classmethod
-    def get_user_dashboards(cls, user):
+    def get_user_dashboards(cls, user, access=None):
         """Get all assigned dashboards for a user"""
-        # N+1 RISK: This method runs multiple queries. Use with care.
         if user.is_superuser:
             return cls.DASHBOARD_CHOICES
+        if access is None:
+            from core.access import AccessContext
+
+            access = AccessContext(user)
+        choices = dict(cls.DASHBOARD_CHOICES)
+        return [
+            (dash, choices[dash])
+            for dash in set(access.dashboard_assignments)
+            if dash in choices
+        ]
 
-        user_assignments = cls.objects.filter(user=user, is_active=True).values_list(
-            "dashboard", flat=True
-        )
-
-        user_roles = RoleAssignment.objects.filter(user=user).values_list(
-            "role__name", flat=True
-        )
-        role_assignments = cls.objects.filter(
-            role__in=[role.lower() for role in user_roles], is_active=True
-        ).values_list("dashboard", flat=True)
-
-        all_dashboards = set(user_assignments) | set(role_assignments)
-        return [(dash, dict(cls.DASHBOARD_CHOICES)[dash]) for dash in all_dashboards]
-    
     # ───────────────────────────────
 #  Logging Functions (for Impersonation)
 # ───────────────────────────────
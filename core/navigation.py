@@ -1,10 +1,11 @@
 """Navigation tree helpers (DB + fallback).
 
 Primary source becomes `SidebarModule` rows; if none exist yet we fall back
-to the original static structure (also used to seed first run).
+to the original static structure (also used to seed first run).  Nothing is
+loaded at import time; `NAV_ITEMS` and `SIDEBAR_ITEM_IDS` resolve on use.
 """
 
-from functools import lru_cache
+from core import permission_cache
 
 STATIC_NAV_ITEMS = [
     {"id": "dashboard", "label": "Dashboard", "children": [
@@ -47,13 +48,7 @@ def _flatten(items):
     return out
 
 
-@lru_cache(maxsize=1)
-def get_nav_items():
-    """Return navigation tree (DB or fallback).
-
-    Cache for request scope; cache invalidation can be manual via
-    `get_nav_items.cache_clear()` after admin edits (future admin UI).
-    """
+def _load_nav_items():
     try:
         from core.models import SidebarModule  # local import to avoid cycle
         if SidebarModule.objects.exists():
@@ -63,11 +58,67 @@ def get_nav_items():
     return STATIC_NAV_ITEMS
 
 
+def get_nav_items():
+    """Return navigation tree (DB or fallback).
+
+    The tree is shared by all workers through the versioned access cache
+    (:mod:`core.permission_cache`) and rebuilt after any sidebar change.
+    """
+    try:
+        version, tree = permission_cache.read(permission_cache.NAV_KEY)
+    except Exception:  # pragma: no cover - cache backend unavailable
+        return _load_nav_items()
+    if tree is None:
+        tree = _load_nav_items()
+        permission_cache.write(permission_cache.NAV_KEY, version, tree)
+    return tree
+
+
+# Kept for callers written against the old ``lru_cache`` API.
+get_nav_items.cache_clear = permission_cache.bump_version
+
+
 def get_sidebar_item_ids():
     return set(_flatten(get_nav_items()))
 
 
+class _LazyNav:
+    """Read-only proxy that calls ``factory()`` whenever it is used.
+
+    Importing this module must not touch the database (it is imported while
+    apps load), and the value should follow the shared, versioned tree rather
+    than freeze whatever existed at import time.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __iter__(self):
+        return iter(self._factory())
+
+    def __len__(self):
+        return len(self._factory())
+
+    def __contains__(self, item):
+        return item in self._factory()
+
+    def __getitem__(self, index):
+        return self._factory()[index]
+
+    def __bool__(self):
+        return bool(self._factory())
+
+    def __eq__(self, other):
+        return self._factory() == other
+
+    def __repr__(self):
+        return repr(self._factory())
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+
 # Backwards compatibility names used in existing code
-NAV_ITEMS = get_nav_items()
-SIDEBAR_ITEM_IDS = get_sidebar_item_ids()
+NAV_ITEMS = _LazyNav(get_nav_items)
+SIDEBAR_ITEM_IDS = _LazyNav(get_sidebar_item_ids)
 
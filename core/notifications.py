@@ -0,0 +1,159 @@
+"""Per-user notification feed kept in the shared cache.
+
+The header dropdown used to query the user's latest proposals on every
+template render.  The feed is now built once, stored under
+``notifications:user:<id>`` in the cache named by
+``settings.NOTIFICATION_CACHE_ALIAS`` and dropped by signals whenever one of
+the user's proposals, its approval steps or its report changes (see
+``core.signals``).  Renders read it with a single cache hit, the JSON API
+answers ``If-None-Match`` with 304, and :func:`notification_events` feeds
+the server-sent events stream served through ``iqac_project/asgi.py``.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+FEED_KEY = "notifications:user:{}"
+FEED_SIZE = 10
+FEED_TTL = 3600
+RECENT_FINALIZED = timedelta(days=2)
+
+STREAM_POLL_SECONDS = 5
+STREAM_MAX_SECONDS = 300
+STREAM_KEEPALIVE_SECONDS = 30
+
+
+def get_cache():
+    return caches[getattr(settings, "NOTIFICATION_CACHE_ALIAS", "default")]
+
+
+def _user_stamp(user):
+    # Stored with the feed so a recycled primary key never sees another
+    # user's entries.
+    joined = getattr(user, "date_joined", None)
+    return joined.isoformat() if joined else ""
+
+
+def _notification_for(proposal):
+    """Build a payload compatible with the header dropdown."""
+    from emt.models import EventProposal
+
+    if proposal.status == EventProposal.Status.REJECTED:
+        n_type, icon = "alert", "triangle-exclamation"
+    elif proposal.status in (
+        EventProposal.Status.SUBMITTED,
+        EventProposal.Status.UNDER_REVIEW,
+    ):
+        n_type, icon = "reminder", "clock"
+    else:
+        n_type, icon = "info", "circle-info"
+    return {
+        "id": proposal.pk,
+        "title": proposal.event_title or "Event Proposal",
+        "message": proposal.get_status_display(),
+        "created_at": proposal.updated_at,
+        "icon": icon,
+        "type": n_type,
+        "is_read": False,
+    }
+
+
+def build_feed(user):
+    """Query the user's recent proposals and return a fresh feed entry."""
+    from emt.models import EventProposal
+
+    proposals = (
+        EventProposal.objects.filter(submitted_by=user)
+        .filter(
+            ~Q(status=EventProposal.Status.FINALIZED)
+            | Q(updated_at__gte=timezone.now() - RECENT_FINALIZED)
+        )
+        .only("id", "event_title", "status", "updated_at")
+        .order_by("-updated_at")[:FEED_SIZE]
+    )
+    items = [_notification_for(p) for p in proposals]
+    digest = hashlib.md5(
+        json.dumps(
+            [(n["id"], n["message"], n["created_at"].isoformat()) for n in items]
+        ).encode()
+    ).hexdigest()
+    return {"user": _user_stamp(user), "etag": digest, "items": items}
+
+
+def get_feed(user):
+    """Return ``{"etag", "items"}`` for ``user``, building it on a miss."""
+    cache = get_cache()
+    key = FEED_KEY.format(user.pk)
+    feed = cache.get(key)
+    if feed is None or feed.get("user") != _user_stamp(user):
+        feed = build_feed(user)
+        try:
+            cache.set(key, feed, FEED_TTL)
+        except Exception:
+            logger.exception("Failed to store notifications for user %s", user.pk)
+    return feed
+
+
+def invalidate(user_id):
+    """Drop the cached feed so the next read rebuilds it."""
+    if not user_id:
+        return
+    try:
+        get_cache().delete(FEED_KEY.format(user_id))
+    except Exception:
+        logger.exception("Failed to invalidate notifications for user %s", user_id)
+
+
+def serialize(items):
+    """Return ``items`` with ISO-formatted timestamps for JSON output."""
+    out = []
+    for item in items:
+        item = dict(item)
+        if item.get("created_at"):
+            item["created_at"] = item["created_at"].isoformat()
+        out.append(item)
+    return out
+
+
+async def notification_events(
+    user,
+    last_event_id=None,
+    poll_seconds=STREAM_POLL_SECONDS,
+    max_seconds=STREAM_MAX_SECONDS,
+):
+    """Yield server-sent events whenever ``user``'s feed changes.
+
+    The feed's ETag is the event id, so a reconnecting ``EventSource`` that
+    sends ``Last-Event-ID`` only receives the feed again if it changed.  The
+    stream ends after ``max_seconds``; browsers reconnect automatically.
+    """
+    read_feed = sync_to_async(get_feed)
+    deadline = time.monotonic() + max_seconds
+    last_sent = time.monotonic()
+    yield f"retry: {poll_seconds * 1000}\n\n"
+    while True:
+        feed = await read_feed(user)
+        now = time.monotonic()
+        if feed["etag"] != last_event_id:
+            last_event_id = feed["etag"]
+            last_sent = now
+            payload = json.dumps({"notifications": serialize(feed["items"])})
+            yield f"id: {last_event_id}\nevent: notifications\ndata: {payload}\n\n"
+        elif now - last_sent >= STREAM_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keep-alive\n\n"
+        if now + poll_seconds > deadline:
+            return
+        await asyncio.sleep(poll_seconds)
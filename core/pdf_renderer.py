@@ -0,0 +1,370 @@
+"""Shared HTML → PDF renderer for transcripts and EMT reports.
+
+WeasyPrint is imported on first use (it adds ~200ms to a worker start).
+Each rendering thread keeps a warm :class:`WeasyRenderer` holding:
+
+* one long-lived ``FontConfiguration``, so fonts are resolved once per
+  thread instead of once per document;
+* the named stylesheets (static paths such as ``transcript/css/pdf.css``),
+  parsed once and re-parsed only when the file changes.
+
+Images and stylesheets referenced by documents under ``STATIC_URL`` or
+``MEDIA_URL`` (or as ``file:`` URLs inside the static directories or
+``MEDIA_ROOT``) are served by :func:`url_fetcher` from an in-memory LRU
+instead of HTTP.  Any other ``file:`` URL is refused.  At most
+``MAX_CONCURRENT`` documents render at once per process.  :func:`stats`
+reports renders, pages and render time per page.
+
+Without WeasyPrint the stylesheets are inlined and xhtml2pdf is used; with
+neither installed :class:`PDFGenerationError` is raised.
+
+Configured through ``settings.PDF_RENDERER``; see :data:`DEFAULTS`.
+"""
+
+import importlib.util
+import io
+import logging
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Documents rendered concurrently per process.
+    "MAX_CONCURRENT": 2,
+    # Memory for cached static/media assets, and the largest single file kept.
+    "ASSET_CACHE_BYTES": 32 * 1024 * 1024,
+    "ASSET_MAX_FILE_BYTES": 4 * 1024 * 1024,
+    # Base for relative URLs in rendered documents.
+    "BASE_URL": "http://localhost/",
+}
+
+
+class PDFGenerationError(Exception):
+    """Raised when PDF generation fails."""
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "PDF_RENDERER", {}) or {})
+    return config
+
+
+_pdf_backends = None
+
+
+def get_backends():
+    """Return ``(weasyprint module or None, xhtml2pdf.pisa or None)``."""
+    global _pdf_backends
+    if _pdf_backends is None:
+        try:  # pragma: no cover - optional dependency
+            import weasyprint
+            from weasyprint.text.fonts import FontConfiguration  # noqa: F401
+        except (ImportError, OSError) as exc:  # pragma: no cover - optional dependency
+            weasyprint = None
+            logger.warning(
+                "WeasyPrint import failed, falling back to xhtml2pdf for PDF generation. %s",
+                exc,
+            )
+        if importlib.util.find_spec("xhtml2pdf") is not None:
+            from xhtml2pdf import pisa  # type: ignore
+        else:  # pragma: no cover - optional dependency
+            pisa = None
+        _pdf_backends = (weasyprint, pisa)
+    return _pdf_backends
+
+
+# ─────────────────────────────────────────────────────────────
+# Local assets
+# ─────────────────────────────────────────────────────────────
+class AssetCache:
+    """Thread-safe LRU of file contents bounded by total bytes."""
+
+    def __init__(self, max_bytes, max_file_bytes):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """Return the bytes of ``path``, reading it on a miss or after a change."""
+        path = str(path)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        with open(path, "rb") as fh:
+            data = fh.read()
+        if len(data) <= self.max_file_bytes:
+            with self._lock:
+                previous = self._entries.pop(path, None)
+                if previous is not None:
+                    self._size -= len(previous[1])
+                self._entries[path] = (mtime, data)
+                self._size += len(data)
+                while self._size > self.max_bytes and self._entries:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_assets = None
+_assets_lock = threading.Lock()
+
+
+def get_assets():
+    global _assets
+    if _assets is None:
+        with _assets_lock:
+            if _assets is None:
+                config = get_config()
+                _assets = AssetCache(
+                    config["ASSET_CACHE_BYTES"], config["ASSET_MAX_FILE_BYTES"]
+                )
+    return _assets
+
+
+def _within(root, relative):
+    if not root:
+        return None
+    root = Path(root).resolve()
+    path = (root / relative).resolve()
+    if path != root and root not in path.parents:
+        return None
+    return path if path.is_file() else None
+
+
+def find_static(relative):
+    """Locate a static file via the staticfiles finders, then ``STATIC_ROOT``."""
+    from django.contrib.staticfiles import finders
+
+    try:
+        found = finders.find(relative)
+    except SuspiciousFileOperation:
+        return None
+    if found:
+        return Path(found)
+    return _within(settings.STATIC_ROOT, relative)
+
+
+def _file_roots():
+    """``STATIC_ROOT``, the staticfiles finders' directories and ``MEDIA_ROOT``."""
+    from django.contrib.staticfiles import finders
+
+    roots = [settings.STATIC_ROOT, settings.MEDIA_ROOT]
+    for finder in finders.get_finders():
+        for storage in getattr(finder, "storages", {}).values():
+            roots.append(getattr(storage, "location", None))
+    return [Path(root).resolve() for root in roots if root]
+
+
+def local_path(url):
+    """Map a static/media URL of this site to a file, or return ``None``.
+
+    ``None`` means the URL is not one of ours.  A ``file:`` URL outside the
+    static and media directories raises ``SuspiciousFileOperation``.
+    """
+    parts = urlsplit(url)
+    if parts.scheme == "file":
+        path = Path(unquote(parts.path)).resolve()
+        if not any(root in path.parents for root in _file_roots()):
+            raise SuspiciousFileOperation(f"{url} is outside the static and media roots")
+        return path if path.is_file() else None
+    if parts.scheme in ("http", "https"):
+        local_hosts = {"localhost", "127.0.0.1", urlsplit(get_config()["BASE_URL"]).hostname}
+        local_hosts.update(host for host in settings.ALLOWED_HOSTS if host != "*")
+        if parts.hostname not in local_hosts:
+            return None
+    elif parts.scheme:
+        return None
+    path = unquote(parts.path)
+    if settings.STATIC_URL and path.startswith(settings.STATIC_URL):
+        return find_static(path[len(settings.STATIC_URL):])
+    if settings.MEDIA_URL and path.startswith(settings.MEDIA_URL):
+        return _within(settings.MEDIA_ROOT, path[len(settings.MEDIA_URL):])
+    return None
+
+
+def url_fetcher(url, *args, **kwargs):
+    """WeasyPrint URL fetcher serving this site's static/media files from memory."""
+    try:
+        path = local_path(url)
+    except SuspiciousFileOperation:
+        raise ValueError(f"refused {url}") from None
+    if path is not None:
+        return {
+            "string": get_assets().get(path),
+            "mime_type": mimetypes.guess_type(str(path))[0],
+            "redirected_url": url,
+        }
+    from weasyprint import default_url_fetcher
+
+    return default_url_fetcher(url, *args, **kwargs)
+
+
+def stylesheet_text(name):
+    path = find_static(name)
+    if path is None:
+        raise PDFGenerationError(f"Stylesheet {name!r} not found.")
+    return get_assets().get(path).decode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────
+# Rendering
+# ─────────────────────────────────────────────────────────────
+class RenderStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.failures = 0
+        self.pages = 0
+        self.total_ms = 0.0
+        self.last_ms_per_page = 0.0
+        self.max_ms_per_page = 0.0
+
+    def record(self, elapsed_ms, pages):
+        per_page = elapsed_ms / max(pages, 1)
+        with self._lock:
+            self.renders += 1
+            self.pages += pages
+            self.total_ms += elapsed_ms
+            self.last_ms_per_page = per_page
+            self.max_ms_per_page = max(self.max_ms_per_page, per_page)
+
+    def failed(self):
+        with self._lock:
+            self.failures += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "renders": self.renders,
+                "failures": self.failures,
+                "pages": self.pages,
+                "total_ms": round(self.total_ms, 3),
+                "avg_ms_per_page": round(self.total_ms / self.pages, 3) if self.pages else 0.0,
+                "last_ms_per_page": round(self.last_ms_per_page, 3),
+                "max_ms_per_page": round(self.max_ms_per_page, 3),
+            }
+
+
+class WeasyRenderer:
+    """Warm WeasyPrint state for one thread."""
+
+    def __init__(self, weasyprint):
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.weasyprint = weasyprint
+        self.font_config = FontConfiguration()
+        self._stylesheets = {}
+
+    def stylesheet(self, name):
+        path = find_static(name)
+        if path is None:
+            raise PDFGenerationError(f"Stylesheet {name!r} not found.")
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._stylesheets.get(name)
+        if cached is None or cached[0] != mtime:
+            css = self.weasyprint.CSS(
+                string=get_assets().get(path).decode("utf-8"),
+                base_url=path.as_uri(),
+                url_fetcher=url_fetcher,
+                font_config=self.font_config,
+            )
+            cached = self._stylesheets[name] = (mtime, css)
+        return cached[1]
+
+    def render(self, html, stylesheets=()):
+        """Return ``(pdf_bytes, page_count)``."""
+        document = self.weasyprint.HTML(
+            string=html, base_url=get_config()["BASE_URL"], url_fetcher=url_fetcher
+        ).render(
+            stylesheets=[self.stylesheet(name) for name in stylesheets],
+            font_config=self.font_config,
+        )
+        return document.write_pdf(), len(document.pages)
+
+
+_local = threading.local()
+_slots = None
+_slots_lock = threading.Lock()
+_stats = RenderStats()
+
+
+def _get_slots():
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(max(1, get_config()["MAX_CONCURRENT"]))
+    return _slots
+
+
+def _render_pisa(pisa, html, stylesheets):
+    if stylesheets:
+        css = "".join(stylesheet_text(name) for name in stylesheets)
+        style = f"<style>{css}</style>"
+        html = html.replace("</head>", style + "</head>", 1) if "</head>" in html else style + html
+    pdf_buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(html, dest=pdf_buffer)
+    if pisa_status.err:
+        raise PDFGenerationError("Failed to generate PDF using xhtml2pdf.")
+    return pdf_buffer.getvalue()
+
+
+def render(html, stylesheets=()):
+    """Render an HTML string with the named static stylesheets into PDF bytes."""
+    weasyprint, pisa = get_backends()
+    if weasyprint is None and pisa is None:
+        raise PDFGenerationError(
+            "xhtml2pdf is not installed; install it or enable WeasyPrint for PDF output."
+        )
+    with _get_slots():
+        started = time.perf_counter()
+        try:
+            if weasyprint is not None:
+                renderer = getattr(_local, "renderer", None)
+                if renderer is None:
+                    renderer = _local.renderer = WeasyRenderer(weasyprint)
+                pdf, pages = renderer.render(html, stylesheets)
+            else:
+                pdf = _render_pisa(pisa, html, stylesheets)
+                pages = max(pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages"), 1)
+        except Exception:
+            _stats.failed()
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    _stats.record(elapsed_ms, pages)
+    logger.debug(
+        "Rendered %d page(s) in %.1fms (%.1fms/page)", pages, elapsed_ms, elapsed_ms / pages
+    )
+    return pdf
+
+
+def stats():
+    """Return this process's render counts, time per page and asset cache use."""
+    return {"render": _stats.as_dict(), "assets": get_assets().stats()}
@@ -0,0 +1,56 @@
+"""Versioned cross-process cache for navigation and permission data.
+
+Every gunicorn worker reads the navigation tree and per-user access snapshots
+(see :mod:`core.access`) from the Django cache named by
+``settings.ACCESS_CACHE_ALIAS`` (a file-based cache by default).  Entries
+carry the global version stamp (a :class:`core.cache_version.VersionStamp`)
+they were built under.  Any change to ``SidebarModule``,
+``SidebarPermission``, ``DashboardAssignment`` or ``RoleAssignment``, or to
+an organization or organization type embedded in the snapshots, bumps the
+stamp (see ``core.signals``), so every worker rebuilds on its next read
+instead of serving a stale copy.
+
+This module must not import models: ``core.navigation`` uses it while apps
+are still loading.
+"""
+
+import logging
+
+from .cache_version import VersionStamp
+
+logger = logging.getLogger(__name__)
+
+NAV_KEY = "access:nav"
+USER_KEY = "access:user:{}"
+
+stamp = VersionStamp("ACCESS_CACHE_ALIAS", "access:version", "access cache")
+VERSION_KEY = stamp.key
+get_cache = stamp.get_cache
+current_version = stamp.current
+# Invalidates every cached nav tree and access snapshot.
+bump_version = stamp.bump
+bump_version_on_commit = stamp.bump_on_commit
+
+
+def read(key):
+    """Return ``(version, value)``: the current stamp and the entry at ``key``.
+
+    Both come back from a single ``get_many`` round trip.  ``value`` is
+    ``None`` when the entry is missing or was built under another version.
+    """
+    cache = get_cache()
+    found = cache.get_many([VERSION_KEY, key])
+    version = found.get(VERSION_KEY)
+    if version is None:
+        return current_version(cache), None
+    entry = found.get(key)
+    if entry is None or entry[0] != version:
+        return version, None
+    return version, entry[1]
+
+
+def write(key, version, value):
+    try:
+        get_cache().set(key, (version, value))
+    except Exception:
+        logger.exception("Failed to store %s in the access cache", key)
@@ -0,0 +1,182 @@
+"""Sampled per-view SQL instrumentation.
+
+``core.middleware.QueryStatsMiddleware`` wraps a sample of requests with
+``connection.execute_wrapper`` and records, per resolved ``view_name``, the
+number of queries, time spent in the database and wall time of the view.
+Statements are fingerprinted by their SQL template (parameters are already
+separate, and ``IN (%s, %s, ...)`` lists are collapsed), so a template run
+``N_PLUS_ONE_THRESHOLD`` or more times in one request is flagged as a probable
+N+1.  Samples live in bounded per-view windows in process memory; the
+superuser report under ``/core-admin/query-stats/`` reads :func:`report`.
+
+Configured through ``settings.QUERY_STATS``; see :data:`DEFAULTS`.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+DEFAULTS = {
+    # Off unless explicitly enabled; the middleware removes itself otherwise.
+    "ENABLED": False,
+    # Fraction of requests to instrument.
+    "SAMPLE_RATE": 0.05,
+    # Samples kept per view for the rolling percentiles.
+    "WINDOW": 500,
+    # Identical statements per request at which a fingerprint is flagged.
+    "N_PLUS_ONE_THRESHOLD": 5,
+    # Distinct suspect fingerprints remembered per view.
+    "MAX_SUSPECTS": 20,
+}
+
+_IN_LIST_RE = re.compile(r"\((?:%s\s*,\s*)+%s\)")
+_WS_RE = re.compile(r"\s+")
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "QUERY_STATS", {}) or {})
+    return config
+
+
+def fingerprint(sql):
+    """Normalise ``sql`` so repeats of one statement template compare equal."""
+    sql = _WS_RE.sub(" ", sql).strip()
+    return _IN_LIST_RE.sub("(%s, ...)", sql)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (0 for an empty sequence)."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RequestRecorder:
+    """``execute_wrapper`` callable collecting one request's statements."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+
+class ViewStats:
+    def __init__(self, window):
+        self.requests = 0
+        self.queries = deque(maxlen=window)
+        self.db_ms = deque(maxlen=window)
+        self.wall_ms = deque(maxlen=window)
+        # fingerprint -> {"max_repeats", "requests"}
+        self.suspects = {}
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "samples": len(self.wall_ms),
+            "queries": {
+                "p50": percentile(self.queries, 50),
+                "p95": percentile(self.queries, 95),
+                "max": max(self.queries, default=0),
+            },
+            "db_ms": {
+                "p50": round(percentile(self.db_ms, 50), 2),
+                "p95": round(percentile(self.db_ms, 95), 2),
+                "p99": round(percentile(self.db_ms, 99), 2),
+            },
+            "wall_ms": {
+                "p50": round(percentile(self.wall_ms, 50), 2),
+                "p95": round(percentile(self.wall_ms, 95), 2),
+                "p99": round(percentile(self.wall_ms, 99), 2),
+            },
+            "n_plus_one": [
+                {"sql": sql, **info}
+                for sql, info in sorted(
+                    self.suspects.items(),
+                    key=lambda item: item[1]["max_repeats"],
+                    reverse=True,
+                )
+            ],
+        }
+
+
+class QueryStatsStore:
+    """Thread-safe per-view rolling windows."""
+
+    def __init__(self, window=None, threshold=None, max_suspects=None):
+        config = get_config()
+        self.window = window or config["WINDOW"]
+        self.threshold = threshold or config["N_PLUS_ONE_THRESHOLD"]
+        self.max_suspects = max_suspects or config["MAX_SUSPECTS"]
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, recorder, wall_time):
+        repeated = [
+            (sql, n) for sql, n in recorder.fingerprints.items() if n >= self.threshold
+        ]
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = ViewStats(self.window)
+            stats.requests += 1
+            stats.queries.append(recorder.count)
+            stats.db_ms.append(recorder.db_time * 1000)
+            stats.wall_ms.append(wall_time * 1000)
+            for sql, n in repeated:
+                info = stats.suspects.get(sql)
+                if info is None:
+                    if len(stats.suspects) >= self.max_suspects:
+                        continue
+                    info = stats.suspects[sql] = {"max_repeats": 0, "requests": 0}
+                info["max_repeats"] = max(info["max_repeats"], n)
+                info["requests"] += 1
+
+    def report(self, sort="wall_ms"):
+        with self._lock:
+            rows = [
+                {"view_name": name, **stats.summary()}
+                for name, stats in self._views.items()
+            ]
+        key = {
+            "queries": lambda row: row["queries"]["p95"],
+            "db_ms": lambda row: row["db_ms"]["p95"],
+            "n_plus_one": lambda row: len(row["n_plus_one"]),
+        }.get(sort, lambda row: row["wall_ms"]["p95"])
+        rows.sort(key=key, reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = QueryStatsStore()
+    return _store
+
+
+def report(sort="wall_ms"):
+    return get_store().report(sort)
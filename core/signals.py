@@ -4,13 +4,41 @@ from ipaddress import ip_address, AddressValueError
 
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db.models.signals import post_delete, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import ActivityLog, Profile, RoleAssignment, SidebarModule
-from functools import lru_cache
-from core import navigation
+from emt import approval_inbox, approvers, proposal_live
+from emt.models import (
+    ApprovalStep,
+    EventActivity,
+    EventExpectedOutcomes,
+    EventNeedAnalysis,
+    EventObjectives,
+    EventProposal,
+    EventReport,
+    ExpenseDetail,
+    IncomeDetail,
+    SpeakerProfile,
+    TentativeFlow,
+)
+
+from . import notifications as notification_feed
+from . import permission_cache
+from .models import (
+    ActivityLog,
+    ApprovalFlowConfig,
+    ApprovalFlowTemplate,
+    DashboardAssignment,
+    Organization,
+    OrganizationRole,
+    OrganizationType,
+    Profile,
+    RoleAssignment,
+    SidebarModule,
+    SidebarPermission,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -185,22 +213,191 @@ def log_user_logout(sender, request, user, **kwargs):
     )
 
 
+@receiver(post_save, sender=ActivityLog)
+def index_activity_log_suggestions(sender, instance, created, **kwargs):
+    """Keep the history type-ahead index current for directly saved entries.
+
+    Buffered entries are written with ``bulk_create`` (no signal) and are
+    indexed by ``core.activity_buffer`` after each flush instead.
+    """
+    if created:
+        from core.history import record_suggestions
+
+        record_suggestions([instance])
+
+
 # ───────────────────────────────
-# SidebarModule cache invalidation
+# Navigation / permission cache invalidation
 # ───────────────────────────────
 
-def _clear_nav_cache():  # pragma: no cover - simple utility
-    try:
-        navigation.get_nav_items.cache_clear()
-    except Exception:
-        pass
+@receiver(post_save, sender=SidebarModule)
+@receiver(post_delete, sender=SidebarModule)
+@receiver(post_save, sender=SidebarPermission)
+@receiver(post_delete, sender=SidebarPermission)
+@receiver(post_save, sender=DashboardAssignment)
+@receiver(post_delete, sender=DashboardAssignment)
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+@receiver(post_save, sender=OrganizationRole)
+@receiver(post_delete, sender=OrganizationRole)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_save, sender=OrganizationType)
+@receiver(post_delete, sender=OrganizationType)
+def invalidate_access_cache(sender, **kwargs):
+    """Bump the shared version so every worker drops cached nav/permissions."""
+    permission_cache.bump_version_on_commit()
 
 
-@receiver(post_save, sender=SidebarModule)
-def sidebar_module_saved(sender, instance, **kwargs):  # pragma: no cover - simple
-    _clear_nav_cache()
+@receiver(post_delete, sender=User)
+def invalidate_access_cache_for_deleted_user(sender, instance, **kwargs):
+    permission_cache.bump_version_on_commit()
 
 
-@receiver(post_delete, sender=SidebarModule)
-def sidebar_module_deleted(sender, instance, **kwargs):  # pragma: no cover - simple
-    _clear_nav_cache()
+# ───────────────────────────────
+# Approver directory invalidation
+# ───────────────────────────────
+
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+@receiver(post_save, sender=OrganizationRole)
+@receiver(post_delete, sender=OrganizationRole)
+@receiver(post_save, sender=ApprovalFlowTemplate)
+@receiver(post_delete, sender=ApprovalFlowTemplate)
+@receiver(post_save, sender=ApprovalFlowConfig)
+@receiver(post_delete, sender=ApprovalFlowConfig)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=User)
+def invalidate_approver_directory(sender, **kwargs):
+    # Deleting a user nulls template users without signals, hence User.
+    approvers.bump_version_on_commit()
+
+
+# ───────────────────────────────
+# Notification feed invalidation
+# ───────────────────────────────
+
+def _invalidate_notifications(user_id):
+    # Drop now and again after commit so a feed rebuilt from pre-commit data
+    # by another worker does not linger.
+    notification_feed.invalidate(user_id)
+    transaction.on_commit(lambda: notification_feed.invalidate(user_id))
+
+
+def _touches_status(update_fields):
+    return update_fields is None or "status" in update_fields
+
+
+def _proposal_submitter_id(instance):
+    if instance._meta.get_field("proposal").is_cached(instance):
+        return instance.proposal.submitted_by_id
+    return (
+        EventProposal.objects.filter(pk=instance.proposal_id)
+        .values_list("submitted_by_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=EventProposal)
+@receiver(post_delete, sender=EventProposal)
+def invalidate_proposal_notifications(sender, instance, **kwargs):
+    _invalidate_notifications(instance.submitted_by_id)
+
+
+@receiver(post_save, sender=ApprovalStep)
+@receiver(post_save, sender=EventReport)
+def invalidate_related_notifications(sender, instance, update_fields=None, **kwargs):
+    if _touches_status(update_fields):
+        _invalidate_notifications(_proposal_submitter_id(instance))
+
+
+# ───────────────────────────────
+# Proposal live-sync stamps
+# ───────────────────────────────
+
+PROPOSAL_CHILDREN = (
+    EventNeedAnalysis,
+    EventObjectives,
+    EventExpectedOutcomes,
+    TentativeFlow,
+    EventActivity,
+    SpeakerProfile,
+    ExpenseDetail,
+    IncomeDetail,
+)
+
+
+def touch_proposal_for_child(sender, instance, **kwargs):
+    proposal_live.touch(instance.proposal_id)
+
+
+for _child in PROPOSAL_CHILDREN:
+    post_save.connect(touch_proposal_for_child, sender=_child, dispatch_uid=f"live-{_child.__name__}")
+    post_delete.connect(touch_proposal_for_child, sender=_child, dispatch_uid=f"live-{_child.__name__}-del")
+
+
+@receiver(m2m_changed, sender=EventProposal.faculty_incharges.through)
+@receiver(m2m_changed, sender=EventProposal.sdg_goals.through)
+def touch_proposal_for_m2m(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        proposal_live.touch(instance.pk)
+    else:
+        for proposal_id in pk_set or ():
+            proposal_live.touch(proposal_id)
+
+
+# ───────────────────────────────
+# Approval inbox
+# ───────────────────────────────
+
+STEP_INBOX_FIELDS = {"status", "assigned_to", "is_optional", "optional_unlocked"}
+
+
+@receiver(post_save, sender=ApprovalStep)
+def sync_inbox_for_step(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or STEP_INBOX_FIELDS.intersection(update_fields):
+        approval_inbox.sync([instance.proposal_id], reports=False)
+
+
+@receiver(post_delete, sender=ApprovalStep)
+def invalidate_inbox_for_step(sender, instance, **kwargs):
+    # The inbox entry goes with the step; its assignee's count must follow.
+    approval_inbox.invalidate_users([instance.assigned_to_id])
+
+
+@receiver(post_save, sender=EventReport)
+def sync_inbox_for_report(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "review_stage" in update_fields:
+        approval_inbox.sync([instance.proposal_id], steps=False)
+
+
+_NOT_LOADED = object()
+
+
+@receiver(post_init, sender=EventProposal)
+def remember_proposal_organization(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred organization is not fetched here.
+    instance._loaded_organization_id = instance.__dict__.get("organization_id", _NOT_LOADED)
+
+
+@receiver(post_save, sender=EventProposal)
+def move_inbox_reports(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {"organization", "organization_id"} & set(update_fields):
+        return
+    loaded = getattr(instance, "_loaded_organization_id", _NOT_LOADED)
+    instance._loaded_organization_id = instance.organization_id
+    if not created and loaded != instance.organization_id:
+        approval_inbox.move_reports(instance)
+
+
+@receiver(post_delete, sender=EventReport)
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+@receiver(post_save, sender=OrganizationRole)
+@receiver(post_delete, sender=OrganizationRole)
+def invalidate_inbox_counts(sender, **kwargs):
+    # Which reports a reviewer may decide on depends on their roles.
+    approval_inbox.bump_version_on_commit()
@@ -0,0 +1,419 @@
+"""Synthetic university dataset used by the endpoint benchmarks.
+
+:func:`seed` fills the database with a deterministic, configurable volume of
+organisations, roles, users, event proposals (with approval steps, reports
+and attendance), transcript students/participations and activity logs.
+Everything is written with ``bulk_create`` and tagged with :data:`PREFIX` /
+:data:`ROLL_PREFIX` so :func:`flush` can remove it again without touching
+real data.  ``manage.py seed_synthetic_data`` and
+``manage.py benchmark_endpoints`` are the entry points.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+PREFIX = "synth"
+ROLL_PREFIX = "SY"
+BENCH_FACULTY = f"{PREFIX}_faculty"
+BENCH_ADMIN = f"{PREFIX}_admin"
+
+DEFAULT_COUNTS = {
+    "organizations": 2000,
+    "users": 5000,
+    "proposals": 20000,
+    "steps_per_proposal": 3,
+    # Share of approved/finalized proposals that have a report.
+    "report_ratio": 0.8,
+    "attendance_per_report": 20,
+    "students": 5000,
+    "events": 1000,
+    "participations_per_student": 10,
+    "activity_logs": 100000,
+}
+
+# Counts that are ratios or per-parent sizes rather than volumes.
+UNSCALED = {"steps_per_proposal", "report_ratio", "attendance_per_report", "participations_per_student"}
+
+ORG_TYPES = ("School", "Department", "Club", "Association", "Centre")
+ORG_ROLES = ("Faculty", "Hod", "Coordinator")
+VIEW_NAMES = ("dashboard", "proposal_status_detail", "review_center", "api_calendar_events", "transcript")
+
+BATCH_SIZE = 2000
+
+
+def scaled_counts(scale=1.0, **overrides):
+    """Return :data:`DEFAULT_COUNTS` scaled by ``scale`` with ``overrides``."""
+    counts = {}
+    for key, value in DEFAULT_COUNTS.items():
+        if key in UNSCALED:
+            counts[key] = value
+        else:
+            counts[key] = max(1, int(value * scale))
+    counts.update({k: v for k, v in overrides.items() if v is not None})
+    return counts
+
+
+def _bulk(model, objs):
+    model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+
+
+def _ids(qs):
+    return list(qs.order_by("pk").values_list("pk", flat=True))
+
+
+def flush():
+    """Delete everything previously created by :func:`seed`."""
+    from core.models import ActivityLog, Organization, OrganizationType
+    from transcript.models import (
+        CharacterStrength,
+        Course,
+        Event,
+        GraduateAttribute,
+        School,
+        Student,
+    )
+
+    from transcript import strengths
+
+    with transaction.atomic(), strengths.deferred():
+        ActivityLog.objects.filter(user__username__startswith=f"{PREFIX}_").delete()
+        User.objects.filter(username__startswith=f"{PREFIX}_").delete()
+        Organization.objects.filter(org_type__name__startswith="Synth ").delete()
+        OrganizationType.objects.filter(name__startswith="Synth ").delete()
+        Student.objects.filter(roll_no__startswith=ROLL_PREFIX).delete()
+        Event.objects.filter(name__startswith="Synth ").delete()
+        Course.objects.filter(school__name__startswith="Synth ").delete()
+        School.objects.filter(name__startswith="Synth ").delete()
+        GraduateAttribute.objects.filter(name__startswith="Synth ").delete()
+        CharacterStrength.objects.filter(name__startswith="Synth ").delete()
+
+
+def seed(counts=None, seed_value=0, log=None):
+    """Create the synthetic dataset and return the number of rows per model."""
+    counts = counts or scaled_counts()
+    rng = random.Random(seed_value)
+    log = log or (lambda msg: None)
+    created = {}
+    with transaction.atomic():
+        org_ids, role_by_org = _seed_organizations(rng, counts, created)
+        log(f"organizations: {len(org_ids)}")
+        user_ids, faculty, admin = _seed_users(rng, counts, org_ids, role_by_org, created)
+        log(f"users: {len(user_ids)}")
+        _seed_proposals(rng, counts, org_ids, user_ids, faculty, created)
+        log(f"proposals: {created['EventProposal']}")
+        _seed_transcript(rng, counts, created)
+        log(f"students: {created['Student']}")
+        _seed_activity(rng, counts, user_ids, created)
+        log(f"activity logs: {created['ActivityLog']}")
+
+    # bulk_create bypasses the signals that keep the shared caches and the
+    # materialized transcript scores fresh.
+    from core import permission_cache
+    from transcript import strengths
+
+    strengths.rebuild()
+    permission_cache.bump_version()
+    return created
+
+
+def _seed_organizations(rng, counts, created):
+    from core.models import Organization, OrganizationRole, OrganizationType
+
+    types = [OrganizationType(name=f"Synth {name}") for name in ORG_TYPES]
+    _bulk(OrganizationType, types)
+    type_ids = _ids(OrganizationType.objects.filter(name__startswith="Synth "))
+
+    _bulk(
+        Organization,
+        [
+            Organization(
+                name=f"Synth {ORG_TYPES[i % len(ORG_TYPES)]} {i:05d}",
+                org_type_id=type_ids[i % len(type_ids)],
+            )
+            for i in range(counts["organizations"])
+        ],
+    )
+    org_ids = _ids(Organization.objects.filter(org_type_id__in=type_ids))
+    _bulk(
+        OrganizationRole,
+        [
+            OrganizationRole(organization_id=org_id, name=name)
+            for org_id in org_ids
+            for name in ORG_ROLES
+        ],
+    )
+    role_by_org = {}
+    for role_id, org_id, name in OrganizationRole.objects.filter(
+        organization_id__in=org_ids
+    ).values_list("pk", "organization_id", "name"):
+        role_by_org.setdefault(org_id, {})[name] = role_id
+    created.update(
+        OrganizationType=len(type_ids),
+        Organization=len(org_ids),
+        OrganizationRole=len(org_ids) * len(ORG_ROLES),
+    )
+    return org_ids, role_by_org
+
+
+def _seed_users(rng, counts, org_ids, role_by_org, created):
+    from core.models import Profile, RoleAssignment
+
+    password = make_password(None)
+    users = [
+        User(
+            username=f"{PREFIX}_user{i:06d}",
+            email=f"{PREFIX}.user{i:06d}@example.edu",
+            first_name="Synth",
+            last_name=f"User {i}",
+            password=password,
+        )
+        for i in range(counts["users"])
+    ]
+    users.append(User(username=BENCH_FACULTY, email=f"{BENCH_FACULTY}@example.edu", first_name="Bench", last_name="Faculty", password=password))
+    users.append(User(username=BENCH_ADMIN, email=f"{BENCH_ADMIN}@example.edu", first_name="Bench", last_name="Admin", password=password, is_staff=True, is_superuser=True))
+    _bulk(User, users)
+    user_ids = _ids(User.objects.filter(username__startswith=f"{PREFIX}_user"))
+    faculty = User.objects.get(username=BENCH_FACULTY)
+    admin = User.objects.get(username=BENCH_ADMIN)
+
+    _bulk(
+        Profile,
+        [Profile(user_id=pk, role="faculty") for pk in user_ids + [faculty.pk]]
+        + [Profile(user_id=admin.pk, role="admin")],
+    )
+
+    assignments = [
+        RoleAssignment(
+            user_id=faculty.pk,
+            organization_id=org_ids[0],
+            role_id=role_by_org[org_ids[0]]["Faculty"],
+        )
+    ]
+    for pk in user_ids:
+        for org_id in rng.sample(org_ids, min(len(org_ids), rng.randint(1, 2))):
+            name = rng.choices(ORG_ROLES, weights=(8, 1, 2))[0]
+            assignments.append(
+                RoleAssignment(
+                    user_id=pk, organization_id=org_id, role_id=role_by_org[org_id][name]
+                )
+            )
+    _bulk(RoleAssignment, assignments)
+    created.update(User=len(users), Profile=len(users), RoleAssignment=len(assignments))
+    return user_ids, faculty, admin
+
+
+def _seed_proposals(rng, counts, org_ids, user_ids, faculty, created):
+    from emt import approval_inbox
+    from emt.models import ApprovalStep, AttendanceRow, EventProposal, EventReport
+
+    statuses = [choice for choice, _ in EventProposal.Status.choices]
+    weights = [1, 2, 2, 1, 3, 1, 1, 4]
+    today = timezone.localdate()
+    proposals = []
+    for i in range(counts["proposals"]):
+        start = today + timedelta(days=rng.randint(-365, 180))
+        status = rng.choices(statuses, weights=weights)[0]
+        if i % 40 == 0:
+            status = EventProposal.Status.FINALIZED
+        proposals.append(
+            EventProposal(
+                # Every 20th proposal belongs to the benchmark user (half of
+                # them finalized) so their dashboard and reports have volume.
+                submitted_by_id=faculty.pk if i % 20 == 0 else rng.choice(user_ids),
+                organization_id=rng.choice(org_ids),
+                event_title=f"Synth Event {i:06d} {rng.choice(('Seminar', 'Workshop', 'Conference', 'Fest', 'Lecture'))}",
+                event_start_date=start,
+                event_end_date=start + timedelta(days=rng.randint(0, 3)),
+                event_datetime=timezone.make_aware(
+                    datetime.combine(start, datetime.min.time())
+                ),
+                venue=f"Hall {rng.randint(1, 40)}",
+                academic_year=f"{start.year}-{start.year + 1}",
+                target_audience="Students",
+                status=status,
+            )
+        )
+    _bulk(EventProposal, proposals)
+    rows = list(
+        EventProposal.objects.filter(event_title__startswith="Synth Event ")
+        .order_by("pk")
+        .values_list("pk", "status", "submitted_by_id")
+    )
+
+    step_statuses = [choice for choice, _ in ApprovalStep.Status.choices]
+    step_roles = [choice for choice, _ in ApprovalStep.Role.choices]
+    steps = []
+    report_proposals = []
+    for pk, status, submitter in rows:
+        for order in range(1, counts["steps_per_proposal"] + 1):
+            steps.append(
+                ApprovalStep(
+                    proposal_id=pk,
+                    step_order=order,
+                    order_index=order,
+                    role_required=rng.choice(step_roles),
+                    assigned_to_id=rng.choice(user_ids),
+                    status=rng.choice(step_statuses),
+                )
+            )
+        if status in ("approved", "finalized") and (
+            submitter == faculty.pk or rng.random() < counts["report_ratio"]
+        ):
+            report_proposals.append(pk)
+    _bulk(ApprovalStep, steps)
+
+    stages = [choice for choice, _ in EventReport.ReviewStage.choices]
+    _bulk(
+        EventReport,
+        [
+            EventReport(
+                proposal_id=pk,
+                status=rng.choice(("draft", "submitted", "approved")),
+                review_stage=rng.choice(stages),
+                summary="Synthetic report summary. " * 10,
+                num_participants=counts["attendance_per_report"],
+            )
+            for pk in report_proposals
+        ],
+    )
+    report_ids = _ids(EventReport.objects.filter(proposal_id__in=report_proposals))
+    # Bulk inserts send no signals, so fill the approval inbox directly.
+    inbox_steps, inbox_reports = approval_inbox.sync([pk for pk, _, _ in rows])
+    categories = [choice for choice, _ in AttendanceRow.Category.choices]
+    attendance = [
+        AttendanceRow(
+            event_report_id=report_id,
+            registration_no=f"{ROLL_PREFIX}{rng.randint(0, 10 ** 7):07d}",
+            full_name=f"Synth Attendee {n}",
+            student_class=f"Class {rng.randint(1, 60)}",
+            absent=rng.random() < 0.1,
+            volunteer=rng.random() < 0.05,
+            category=rng.choices(categories, weights=(8, 1, 1))[0],
+        )
+        for report_id in report_ids
+        for n in range(counts["attendance_per_report"])
+    ]
+    _bulk(AttendanceRow, attendance)
+    created.update(
+        EventProposal=len(rows),
+        ApprovalStep=len(steps),
+        EventReport=len(report_ids),
+        AttendanceRow=len(attendance),
+        ApprovalInboxEntry=inbox_steps + inbox_reports,
+    )
+
+
+def _seed_transcript(rng, counts, created):
+    from transcript.models import (
+        AttributeStrengthMap,
+        CharacterStrength,
+        Course,
+        Event,
+        GraduateAttribute,
+        Participation,
+        Role,
+        School,
+        Student,
+        get_active_academic_year,
+    )
+
+    if not AttributeStrengthMap.objects.exists():
+        attributes = [GraduateAttribute(name=f"Synth Attribute {i}") for i in range(8)]
+        strengths = [CharacterStrength(name=f"Synth Strength {i}") for i in range(24)]
+        _bulk(GraduateAttribute, attributes)
+        _bulk(CharacterStrength, strengths)
+        attribute_ids = _ids(GraduateAttribute.objects.filter(name__startswith="Synth "))
+        strength_ids = _ids(CharacterStrength.objects.filter(name__startswith="Synth "))
+        _bulk(
+            AttributeStrengthMap,
+            [
+                AttributeStrengthMap(
+                    graduate_attribute_id=a, character_strength_id=s, weight=round(rng.random(), 2)
+                )
+                for a in attribute_ids
+                for s in rng.sample(strength_ids, 6)
+            ],
+        )
+    attribute_ids = _ids(GraduateAttribute.objects.all())
+
+    roles = {}
+    for name, factor in (("First Level", 3.0), ("High Level", 2.5), ("Medium Level", 2.0), ("Low Level", 1.5), ("Attendee", 1.0)):
+        roles[name] = Role.objects.get_or_create(name=name, defaults={"factor": factor})[0].pk
+    role_ids = list(roles.values())
+
+    schools = [School(name=f"Synth School {i}") for i in range(10)]
+    _bulk(School, schools)
+    school_ids = _ids(School.objects.filter(name__startswith="Synth "))
+    _bulk(Course, [Course(name=f"Course {j}", school_id=s) for s in school_ids for j in range(5)])
+    courses = list(Course.objects.filter(school_id__in=school_ids).values_list("pk", "school_id"))
+    year = get_active_academic_year()
+
+    students = []
+    for i in range(counts["students"]):
+        course_id, school_id = rng.choice(courses)
+        students.append(
+            Student(
+                roll_no=f"{ROLL_PREFIX}{i:07d}",
+                name=f"Synth Student {i}",
+                school_id=school_id,
+                course_id=course_id,
+                academic_year=year,
+            )
+        )
+    _bulk(Student, students)
+    student_ids = _ids(Student.objects.filter(roll_no__startswith=ROLL_PREFIX))
+
+    today = date.today()
+    _bulk(
+        Event,
+        [
+            Event(name=f"Synth Event {i:05d}", date=today - timedelta(days=rng.randint(0, 700)))
+            for i in range(counts["events"])
+        ],
+    )
+    event_ids = _ids(Event.objects.filter(name__startswith="Synth "))
+    through = Event.attributes.through
+    _bulk(
+        through,
+        [
+            through(event_id=e, graduateattribute_id=a)
+            for e in event_ids
+            for a in rng.sample(attribute_ids, min(len(attribute_ids), rng.randint(1, 3)))
+        ],
+    )
+    per_student = min(counts["participations_per_student"], len(event_ids))
+    participations = [
+        Participation(student_id=s, event_id=e, role_id=rng.choice(role_ids))
+        for s in student_ids
+        for e in rng.sample(event_ids, per_student)
+    ]
+    _bulk(Participation, participations)
+    created.update(
+        Student=len(student_ids), Event=len(event_ids), Participation=len(participations)
+    )
+
+
+def _seed_activity(rng, counts, user_ids, created):
+    from core.models import ActivityLog
+
+    now = timezone.now()
+    logs = []
+    for _ in range(counts["activity_logs"]):
+        view_name = rng.choice(VIEW_NAMES)
+        logs.append(
+            ActivityLog(
+                user_id=rng.choice(user_ids),
+                action=f"GET /{view_name.replace('_', '-')}/",
+                view_name=view_name,
+                description=f"Synth User viewed {view_name.replace('_', ' ')}",
+                timestamp=now - timedelta(minutes=rng.randint(0, 60 * 24 * 180)),
+                ip_address=f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            )
+        )
+    _bulk(ActivityLog, logs)
+    created["ActivityLog"] = len(logs)
@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import signals
+from core.access import AccessContext, get_access
+from core.context_processors import sidebar_permissions
+from core.models import (
+    DashboardAssignment,
+    Organization,
+    OrganizationRole,
+    OrganizationType,
+    RoleAssignment,
+    SidebarPermission,
+)
+
+
+class AccessContextTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        org_type = OrganizationType.objects.create(name="Department")
+        org = Organization.objects.create(name="English", org_type=org_type)
+        self.role = OrganizationRole.objects.create(
+            organization=org, name="English Faculty"
+        )
+        self.user = User.objects.create_user("fac", password="pass")
+        RoleAssignment.objects.create(user=self.user, role=self.role, organization=org)
+        SidebarPermission.objects.create(
+            role=f"orgrole:{self.role.id}", items=["reports", "dashboard:faculty"]
+        )
+        SidebarPermission.objects.create(role="faculty", items=["events"])
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def _request(self):
+        request = RequestFactory().get("/")
+        SessionMiddleware(lambda req: None).process_request(request)
+        request.user = self.user
+        return request
+
+    def test_matches_model_helpers(self):
+        DashboardAssignment.objects.create(user=self.user, dashboard="student")
+        access = AccessContext(self.user)
+        self.assertEqual(access.allowed_items, ["dashboard:faculty", "reports"])
+        self.assertEqual(access.available_dashboards, ["faculty", "student"])
+        self.assertTrue(access.is_english_faculty)
+        self.assertFalse(access.is_reviewer)
+        self.assertEqual(
+            SidebarPermission.get_allowed_items(self.user), access.allowed_items
+        )
+        self.assertEqual(
+            DashboardAssignment.get_user_dashboards(self.user),
+            [("student", "Student Dashboard")],
+        )
+
+    def test_shared_across_context_processor_and_helpers(self):
+        request = self._request()
+        with self.assertNumQueries(2):
+            result = sidebar_permissions(request)
+            get_access(request).allowed_items
+            get_access(request).is_reviewer
+        self.assertIn("reports", result["allowed_nav_items"])
+        self.assertTrue(result["is_english_faculty"])
+
+    def test_session_role_change_is_honoured(self):
+        SidebarPermission.objects.create(role="student", items=["transcript"])
+        request = self._request()
+        access = get_access(request)
+        access.allowed_items
+        request.session["role"] = "student"
+        self.assertIn("transcript", sidebar_permissions(request)["allowed_nav_items"])
+
+    def test_faculty_page_queries_permissions_once(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("admin_reports"))
+        self.assertEqual(resp.status_code, 200)
+        tables = [
+            table
+            for table in ("core_roleassignment", "core_sidebarpermission")
+            for query in ctx.captured_queries
+            if f'FROM "{table}"' in query["sql"]
+        ]
+        self.assertLessEqual(tables.count("core_roleassignment"), 1)
+        self.assertLessEqual(tables.count("core_sidebarpermission"), 1)
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import activity_buffer, signals
+from core.activity_buffer import ActivityLogBuffer
+from core.middleware import ActivityLogMiddleware
+from core.models import ActivityLog
+
+
+@mock.patch.object(ActivityLogBuffer, "_ensure_started", lambda self: None)
+class ActivityLogBufferTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        self.user = User.objects.create_user("bob", "bob@example.com", "pass")
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+
+    def _entry(self, path="/x/"):
+        return ActivityLog(user=self.user, action=f"GET {path}")
+
+    def test_flush_writes_batches_and_keeps_request_timestamp(self):
+        buf = ActivityLogBuffer(batch_size=2, flush_interval=60)
+        entries = [self._entry(f"/p{i}/") for i in range(5)]
+        for entry in entries:
+            self.assertTrue(buf.enqueue(entry))
+        self.assertFalse(ActivityLog.objects.exists())
+
+        written = buf.flush()
+
+        self.assertEqual(written, 5)
+        self.assertEqual(ActivityLog.objects.count(), 5)
+        stored = ActivityLog.objects.get(action="GET /p0/")
+        self.assertEqual(stored.timestamp, entries[0].timestamp)
+        stats = buf.stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["written"], 5)
+        self.assertEqual(stats["flushes"], 3)
+
+    def test_full_queue_drops_entries(self):
+        buf = ActivityLogBuffer(batch_size=10, flush_interval=60, max_queue_size=2)
+        results = [buf.enqueue(self._entry()) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(buf.stats()["dropped"], 1)
+        self.assertEqual(buf.stats()["queue_depth"], 2)
+
+    @override_settings(ACTIVITY_LOG={"MODE": "sync"})
+    def test_record_sync_mode_saves_with_generated_description(self):
+        activity_buffer.record(self._entry("/reports/"))
+        log = ActivityLog.objects.get()
+        self.assertEqual(log.description, "bob viewed reports")
+
+
+class ActivityLogRulesTests(TestCase):
+    @override_settings(ACTIVITY_LOG={"EXCLUDE_VIEWS": ["autosave_proposal"]})
+    def test_bare_exclusion_matches_any_namespace(self):
+        self.assertFalse(activity_buffer.should_log("emt:autosave_proposal"))
+        self.assertFalse(activity_buffer.should_log("emt_legacy:autosave_proposal"))
+        self.assertTrue(activity_buffer.should_log("emt:submit_proposal"))
+
+    @override_settings(
+        ACTIVITY_LOG={"SAMPLE_RATES": {"emt:review_center": 0, "dashboard": 1}}
+    )
+    def test_sample_rates(self):
+        self.assertFalse(activity_buffer.should_log("emt:review_center"))
+        self.assertTrue(activity_buffer.should_log("dashboard"))
+
+    @override_settings(
+        ACTIVITY_LOG={"MODE": "sync", "EXCLUDE_VIEWS": ["proposal_live_state"]}
+    )
+    def test_middleware_skips_excluded_view(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        self.addCleanup(
+            post_save.connect, signals.create_or_update_user_profile, sender=User
+        )
+        user = User.objects.create_user("carol", "carol@example.com", "pass")
+        request = RequestFactory().get("/suite/proposal/1/live-state/")
+        request.user = user
+        request.resolver_match = SimpleNamespace(view_name="emt:proposal_live_state")
+
+        ActivityLogMiddleware(lambda r: HttpResponse("ok"))(request)
+
+        self.assertFalse(ActivityLog.objects.exists())
+
+
+class ActivityLogStatsViewTests(TestCase):
+    def test_superuser_only(self):
+        admin = User.objects.create_superuser("root", "root@example.com", "pass")
+        user = User.objects.create_user("dave", "dave@example.com", "pass")
+        url = reverse("admin_activity_log_stats")
+
+        self.client.force_login(user)
+        self.assertNotEqual(self.client.get(url).status_code, 200)
+
+        self.client.force_login(admin)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        for key in ("queue_depth", "dropped", "last_flush_ms", "mode"):
+            self.assertIn(key, resp.json())
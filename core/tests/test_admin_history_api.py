@@ -0,0 +1,143 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core import signals
+from core.activity_buffer import ActivityLogBuffer
+from core.history import decode_cursor
+from core.models import ActivityLog, ActivityLogSuggestion
+
+
+class AdminHistoryApiTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pass")
+        self.alice = User.objects.create_user("alice")
+        self.client.force_login(self.admin)
+        base = timezone.now() - timedelta(hours=1)
+        # Two entries share a timestamp to exercise the id tie-breaker.
+        stamps = [base, base, base + timedelta(minutes=1), base + timedelta(minutes=2)]
+        self.logs = [
+            ActivityLog.objects.create(
+                user=self.alice if i % 2 else self.admin,
+                action=f"GET /page/{i}/",
+                view_name="page",
+                description=f"entry {i}",
+                timestamp=ts,
+            )
+            for i, ts in enumerate(stamps)
+        ]
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def _get(self, **params):
+        resp = self.client.get(reverse("admin_history_api"), params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()
+
+    def _expected_order(self):
+        return list(
+            ActivityLog.objects.order_by("-timestamp", "-id").values_list("id", flat=True)
+        )
+
+    def test_cursor_walks_every_row_once_in_order(self):
+        # Requests made while walking are logged too, but they are newer than
+        # the first cursor and therefore never appear in later pages.
+        expected = self._expected_order()
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            data = self._get(**params)
+            seen.extend(item["id"] for item in data["results"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_indexed_filters(self):
+        data = self._get(user="alice")
+        self.assertEqual({item["user"] for item in data["results"]}, {"alice"})
+        data = self._get(action="GET /page/3")
+        self.assertEqual([item["id"] for item in data["results"]], [self.logs[3].id])
+
+    def test_query_matching_a_suggestion_still_searches_text(self):
+        # "admin" is a known username, but the free-text search must still
+        # find it in another user's description.
+        note = ActivityLog.objects.create(
+            user=self.alice, action="edit", description="granted admin rights"
+        )
+        data = self._get(q="admin", limit=50)
+        self.assertIn(note.id, [item["id"] for item in data["results"]])
+
+    def test_rows_include_rendered_html(self):
+        data = self._get(limit=1)
+        self.assertIn("<tr>", data["results"][0]["html"])
+        self.assertIn(data["results"][0]["detail_url"], data["results"][0]["html"])
+
+    def test_malformed_cursor_starts_from_top(self):
+        self.assertIsNone(decode_cursor("not-a-cursor"))
+        newest = self._expected_order()[0]
+        data = self._get(cursor="not-a-cursor", limit=1)
+        self.assertEqual(data["results"][0]["id"], newest)
+
+
+class ActivityLogSuggestionIndexTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(self.admin)
+        self.user = User.objects.create_user("zed")
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def test_direct_create_updates_index(self):
+        ActivityLog.objects.create(user=self.user, action="export-report")
+        values = set(ActivityLogSuggestion.objects.values_list("kind", "value"))
+        self.assertIn(("action", "export-report"), values)
+        self.assertIn(("user", "zed"), values)
+
+    @mock.patch.object(ActivityLogBuffer, "_ensure_started", lambda self: None)
+    def test_buffered_flush_updates_index(self):
+        buf = ActivityLogBuffer(batch_size=10, flush_interval=60)
+        buf.enqueue(ActivityLog(user=self.user, action="bulk-action", description="x"))
+        buf.flush()
+        self.assertTrue(
+            ActivityLogSuggestion.objects.filter(kind="action", value="bulk-action").exists()
+        )
+
+    def test_suggestion_endpoint_filters_by_prefix(self):
+        ActivityLog.objects.create(user=self.user, action="zeta-action")
+        resp = self.client.get(reverse("admin_history_suggestions"), {"prefix": "ze"})
+        self.assertEqual(resp.json()["suggestions"], ["zed", "zeta-action"])
+
+    def test_page_query_count_does_not_grow_with_log(self):
+        url = reverse("admin_history")
+        ActivityLog.objects.create(user=self.user, action="warmup")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+        ActivityLog.objects.bulk_create(
+            [ActivityLog(user=self.user, action=f"GET /n/{i}/") for i in range(300)]
+        )
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(url)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(resp.context["logs"]), 50)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core import signals
+from core.management.commands.compact_activity_logs import rollup_key
+from core.models import ActivityLog, ActivityLogArchive, ActivityLogDailyRollup
+
+
+class CompactActivityLogsTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        self.user = User.objects.create_user("alice")
+        now = timezone.now()
+        self.old = ActivityLog.objects.create(
+            user=self.user,
+            action="GET /suite/proposal/7/",
+            view_name="emt:proposal_detail",
+            description="old view",
+            timestamp=now - timedelta(days=120),
+        )
+        self.ancient = ActivityLog.objects.create(
+            user=self.user,
+            action="login",
+            description="ancient login",
+            timestamp=now - timedelta(days=1000),
+        )
+        self.recent = ActivityLog.objects.create(
+            user=self.user,
+            action="GET /",
+            view_name="dashboard",
+            description="recent view",
+            timestamp=now - timedelta(days=1),
+        )
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command("compact_activity_logs", *args, stdout=out)
+        return out.getvalue()
+
+    def test_archives_prunes_and_rolls_up(self):
+        output = self._run("--hot-days", "90", "--retention-days", "730", "--chunk-size", "1")
+
+        self.assertIn("archived 2", output)
+        self.assertIn("pruned 1", output)
+        self.assertEqual(list(ActivityLog.objects.values_list("id", flat=True)), [self.recent.id])
+        archived = ActivityLogArchive.objects.get()
+        self.assertEqual(archived.id, self.old.id)
+        self.assertEqual(archived.partition, ActivityLogArchive.partition_for(self.old.timestamp))
+        self.assertEqual(archived.view_name, "emt:proposal_detail")
+
+        rollups = {
+            (r.day, r.view_name): r.count for r in ActivityLogDailyRollup.objects.all()
+        }
+        old_day = timezone.localtime(self.old.timestamp).date()
+        recent_day = timezone.localtime(self.recent.timestamp).date()
+        self.assertEqual(rollups[(old_day, "emt:proposal_detail")], 1)
+        self.assertEqual(rollups[(recent_day, "dashboard")], 1)
+
+    def test_rerun_is_idempotent(self):
+        self._run()
+        first = list(ActivityLogDailyRollup.objects.values_list("day", "view_name", "count"))
+        self._run()
+        second = list(ActivityLogDailyRollup.objects.values_list("day", "view_name", "count"))
+        self.assertEqual(sorted(first), sorted(second))
+
+    def test_dry_run_changes_nothing(self):
+        output = self._run("--dry-run")
+        self.assertIn("[dry run]", output)
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        self.assertFalse(ActivityLogArchive.objects.exists())
+        self.assertFalse(ActivityLogDailyRollup.objects.exists())
+
+    def test_rollup_key_collapses_ids_for_legacy_rows(self):
+        self.assertEqual(rollup_key("", "GET /suite/proposal/12/"), "GET /suite/proposal/<id>/")
+        self.assertEqual(rollup_key("dashboard", "GET /"), "dashboard")
+
+
+class AdminHistoryArchiveTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.login(username="admin", password="pass")
+        ts = timezone.now() - timedelta(days=200)
+        self.archived = ActivityLogArchive.objects.create(
+            id=999,
+            partition=ActivityLogArchive.partition_for(ts),
+            user=self.admin,
+            action="archived-action",
+            description="from the archive",
+            timestamp=ts,
+        )
+        ActivityLog.objects.create(user=self.admin, action="hot-action")
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def test_default_view_reads_hot_table_only(self):
+        resp = self.client.get(reverse("admin_history"))
+        self.assertContains(resp, "hot-action")
+        self.assertNotContains(resp, "archived-action")
+
+    def test_explicit_old_range_includes_archive(self):
+        start = (timezone.localdate() - timedelta(days=365)).strftime("%Y-%m-%d")
+        resp = self.client.get(reverse("admin_history"), {"start": start})
+        self.assertContains(resp, "hot-action")
+        self.assertContains(resp, "archived-action")
+
+    def test_detail_falls_back_to_archive(self):
+        resp = self.client.get(reverse("admin_history_detail", args=[999]))
+        self.assertContains(resp, "from the archive")
@@ -0,0 +1,106 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_save
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import notifications, signals
+from core.context_processors import notifications as notifications_cp
+from emt.models import ApprovalStep, EventProposal
+
+
+class NotificationFeedTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        self.user = User.objects.create_user("fac", password="pass")
+        self.client.force_login(self.user)
+        self.proposal = EventProposal.objects.create(
+            submitted_by=self.user,
+            event_title="Seminar",
+            status=EventProposal.Status.SUBMITTED,
+        )
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def _cp(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return notifications_cp(request)["notifications"]
+
+    def test_context_processor_is_a_cache_hit_once_warm(self):
+        self._cp()
+        with self.assertNumQueries(0):
+            items = self._cp()
+        self.assertEqual([n["title"] for n in items], ["Seminar"])
+        self.assertEqual(items[0]["type"], "reminder")
+
+    def test_status_change_refreshes_feed(self):
+        self._cp()
+        self.proposal.status = EventProposal.Status.REJECTED
+        self.proposal.save()
+        self.assertEqual(self._cp()[0]["type"], "alert")
+
+    def test_approval_step_status_change_invalidates(self):
+        step = ApprovalStep.objects.create(proposal=self.proposal, order_index=1)
+        self._cp()
+        step.comment = "noted"
+        step.save(update_fields=["comment"])
+        self.assertIsNotNone(
+            notifications.get_cache().get(notifications.FEED_KEY.format(self.user.pk))
+        )
+        step.status = ApprovalStep.Status.APPROVED
+        step.save(update_fields=["status"])
+        self.assertIsNone(
+            notifications.get_cache().get(notifications.FEED_KEY.format(self.user.pk))
+        )
+
+    def test_api_honours_if_none_match(self):
+        url = reverse("api_get_notifications")
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+        self.proposal.event_title = "Workshop"
+        self.proposal.save()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["notifications"][0]["title"], "Workshop")
+
+    def test_stream_disabled_by_default(self):
+        resp = self.client.get(reverse("api_notifications_stream"))
+        self.assertEqual(resp.status_code, 204)
+
+    async def test_event_stream_sends_only_changes(self):
+        feed = await notifications.sync_to_async(notifications.get_feed)(self.user)
+        chunks = [
+            chunk
+            async for chunk in notifications.notification_events(
+                self.user, poll_seconds=0, max_seconds=0
+            )
+        ]
+        self.assertTrue(chunks[0].startswith("retry:"))
+        self.assertIn(f"id: {feed['etag']}\nevent: notifications\n", chunks[1])
+        self.assertIn('"title": "Seminar"', chunks[1])
+
+        chunks = [
+            chunk
+            async for chunk in notifications.notification_events(
+                self.user, last_event_id=feed["etag"], poll_seconds=0, max_seconds=0
+            )
+        ]
+        self.assertEqual(len(chunks), 1)
+
+    @override_settings(NOTIFICATION_STREAM_ENABLED=True)
+    def test_stream_url_exposed_when_enabled(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        self.assertEqual(
+            notifications_cp(request)["notification_stream_url"],
+            reverse("api_notifications_stream"),
+        )
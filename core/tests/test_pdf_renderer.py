@@ -0,0 +1,199 @@
+import os
+import sys
+import tempfile
+import threading
+import types
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import SuspiciousFileOperation
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import pdf_renderer
+
+
+class FakePisaStatus:
+    err = 0
+
+
+class FakePisa:
+    def __init__(self):
+        self.html = []
+
+    def CreatePDF(self, html, dest):
+        self.html.append(html)
+        dest.write(b"%PDF-1.4 /Type /Pages /Type /Page")
+        return FakePisaStatus()
+
+
+class FakeWeasyPrint:
+    """Stand-in ``weasyprint`` module recording ``CSS`` and ``HTML`` calls."""
+
+    class FontConfiguration:
+        pass
+
+    def __init__(self):
+        self.css = []
+        self.html = []
+        weasy = self
+
+        class CSS:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+                weasy.css.append(self)
+
+        class Document:
+            pages = [object(), object()]
+
+            def write_pdf(self):
+                return b"%PDF-fake"
+
+        class HTML:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+                weasy.html.append(self)
+
+            def render(self, **kwargs):
+                self.render_kwargs = kwargs
+                return Document()
+
+        self.CSS = CSS
+        self.HTML = HTML
+
+    def modules(self):
+        fonts = types.ModuleType("weasyprint.text.fonts")
+        fonts.FontConfiguration = self.FontConfiguration
+        return {
+            "weasyprint": self,
+            "weasyprint.text": types.ModuleType("weasyprint.text"),
+            "weasyprint.text.fonts": fonts,
+        }
+
+
+class PdfRendererTests(SimpleTestCase):
+    def test_static_and_media_urls_map_to_local_files(self):
+        css = pdf_renderer.local_path("/static/transcript/css/pdf.css")
+        self.assertTrue(str(css).endswith(os.path.join("transcript", "css", "pdf.css")))
+        self.assertEqual(
+            pdf_renderer.local_path("http://localhost/static/transcript/css/pdf.css"), css
+        )
+        self.assertIsNone(pdf_renderer.local_path("https://example.com/static/x.css"))
+        self.assertIsNone(pdf_renderer.local_path("/static/../../etc/passwd"))
+
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            Path(media, "photo.png").write_bytes(b"png")
+            self.assertEqual(
+                pdf_renderer.local_path("/media/photo.png"), Path(media, "photo.png").resolve()
+            )
+            self.assertIsNone(pdf_renderer.local_path("/media/../secret.txt"))
+
+    def test_file_urls_outside_the_roots_are_refused(self):
+        css = pdf_renderer.find_static("transcript/css/pdf.css")
+        self.assertEqual(pdf_renderer.local_path(css.as_uri()), css.resolve())
+        with self.assertRaises(SuspiciousFileOperation):
+            pdf_renderer.local_path("file:///etc/passwd")
+        with self.assertRaisesMessage(ValueError, "refused file:///etc/passwd"):
+            pdf_renderer.url_fetcher("file:///etc/passwd")
+        with self.assertRaises(ValueError):
+            pdf_renderer.url_fetcher(css.as_uri() + "/../../../../../../../etc/passwd")
+
+    def test_url_fetcher_serves_assets_from_memory(self):
+        assets = pdf_renderer.AssetCache(max_bytes=10_000, max_file_bytes=10_000)
+        with mock.patch.object(pdf_renderer, "_assets", assets):
+            first = pdf_renderer.url_fetcher("/static/transcript/css/pdf.css")
+            second = pdf_renderer.url_fetcher("/static/transcript/css/pdf.css")
+        self.assertEqual(first["string"], second["string"])
+        self.assertEqual(first["mime_type"], "text/css")
+        self.assertEqual((assets.hits, assets.misses), (1, 1))
+
+    def test_asset_cache_is_bounded_and_reloads_changed_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            paths = [Path(root, f"{i}.bin") for i in range(3)]
+            for path in paths:
+                path.write_bytes(b"x" * 40)
+            assets = pdf_renderer.AssetCache(max_bytes=100, max_file_bytes=50)
+            for path in paths:
+                assets.get(path)
+            self.assertEqual(assets.stats()["entries"], 2)
+            self.assertEqual(assets.stats()["bytes"], 80)
+
+            paths[2].write_bytes(b"y" * 10)
+            os.utime(paths[2], ns=(0, 1))
+            self.assertEqual(assets.get(paths[2]), b"y" * 10)
+
+    def test_render_without_backend_raises(self):
+        with mock.patch.object(pdf_renderer, "get_backends", return_value=(None, None)):
+            with self.assertRaises(pdf_renderer.PDFGenerationError):
+                pdf_renderer.render("<p>x</p>")
+
+    def test_fallback_inlines_stylesheets_and_records_pages(self):
+        pisa = FakePisa()
+        before = pdf_renderer.stats()["render"]["pages"]
+        with mock.patch.object(pdf_renderer, "get_backends", return_value=(None, pisa)):
+            pdf = pdf_renderer.render(
+                "<html><head></head><body>x</body></html>", ["emt/css/report_pdf.css"]
+            )
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        self.assertIn("<style>", pisa.html[0])
+        self.assertIn(".section", pisa.html[0])
+        self.assertEqual(pdf_renderer.stats()["render"]["pages"], before + 1)
+
+    def test_warm_weasyprint_renderer_reuses_fonts_and_stylesheets(self):
+        weasy = FakeWeasyPrint()
+        with tempfile.TemporaryDirectory() as root, mock.patch.dict(
+            sys.modules, weasy.modules()
+        ), mock.patch.object(
+            pdf_renderer, "get_backends", return_value=(weasy, None)
+        ), mock.patch.object(
+            pdf_renderer, "find_static", side_effect=lambda name: Path(root, name)
+        ), mock.patch.object(
+            pdf_renderer, "_local", threading.local()
+        ), mock.patch.object(
+            pdf_renderer, "_assets", pdf_renderer.AssetCache(10_000, 10_000)
+        ):
+            Path(root, "a.css").write_text("p { color: red }")
+            for _ in range(2):
+                pdf = pdf_renderer.render("<p>x</p>", ["a.css"])
+            self.assertEqual(pdf, b"%PDF-fake")
+            self.assertEqual(len(weasy.css), 1)
+            self.assertEqual(weasy.css[0].kwargs["string"], "p { color: red }")
+
+            Path(root, "a.css").write_text("p { color: blue }")
+            os.utime(Path(root, "a.css"), ns=(0, 1))
+            pdf_renderer.render("<p>x</p>", ["a.css"])
+            self.assertEqual(len(weasy.css), 2)
+            self.assertEqual(weasy.css[1].kwargs["string"], "p { color: blue }")
+
+        font_config = weasy.css[0].kwargs["font_config"]
+        self.assertIsInstance(font_config, FakeWeasyPrint.FontConfiguration)
+        self.assertIs(weasy.css[1].kwargs["font_config"], font_config)
+        self.assertEqual(len(weasy.html), 3)
+        for html in weasy.html:
+            self.assertIs(html.kwargs["url_fetcher"], pdf_renderer.url_fetcher)
+            self.assertIs(html.render_kwargs["font_config"], font_config)
+        self.assertEqual(weasy.html[0].render_kwargs["stylesheets"], [weasy.css[0]])
+        self.assertEqual(weasy.html[2].render_kwargs["stylesheets"], [weasy.css[1]])
+
+    def test_unknown_stylesheet_raises(self):
+        with mock.patch.object(pdf_renderer, "get_backends", return_value=(None, FakePisa())):
+            with self.assertRaises(pdf_renderer.PDFGenerationError):
+                pdf_renderer.render("<p>x</p>", ["missing/nothing.css"])
+
+
+class PDFRendererStatsViewTests(TestCase):
+    def test_superuser_only(self):
+        admin = User.objects.create_superuser("root", "root@example.com", "pass")
+        user = User.objects.create_user("dave", "dave@example.com", "pass")
+        url = reverse("admin_pdf_renderer_stats")
+
+        self.client.force_login(user)
+        self.assertNotEqual(self.client.get(url).status_code, 200)
+
+        self.client.force_login(admin)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        for key in ("renders", "pages", "avg_ms_per_page", "max_ms_per_page"):
+            self.assertIn(key, resp.json()["render"])
+        self.assertIn("hits", resp.json()["assets"])
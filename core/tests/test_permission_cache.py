@@ -0,0 +1,84 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from core import permission_cache, signals
+from core.access import AccessContext
+from core.models import (
+    DashboardAssignment,
+    Organization,
+    OrganizationRole,
+    OrganizationType,
+    RoleAssignment,
+    SidebarPermission,
+)
+from core.navigation import get_nav_items
+
+
+class PermissionCacheTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        org_type = OrganizationType.objects.create(name="Department")
+        self.org = Organization.objects.create(name="Physics", org_type=org_type)
+        self.role = OrganizationRole.objects.create(organization=self.org, name="Faculty")
+        self.user = User.objects.create_user("fac", password="pass")
+        RoleAssignment.objects.create(user=self.user, role=self.role, organization=self.org)
+        self.perm = SidebarPermission.objects.create(
+            role=f"orgrole:{self.role.id}", items=["reports"]
+        )
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+
+    def test_warm_snapshot_needs_no_queries(self):
+        AccessContext(self.user).allowed_items
+        with self.assertNumQueries(0):
+            self.assertEqual(AccessContext(self.user).allowed_items, ["reports"])
+
+    def test_permission_edit_invalidates_every_reader(self):
+        AccessContext(self.user).allowed_items
+        self.perm.items = ["reports", "events"]
+        self.perm.save()
+        self.assertEqual(AccessContext(self.user).allowed_items, ["events", "reports"])
+
+    def test_role_and_dashboard_changes_invalidate(self):
+        access = AccessContext(self.user)
+        self.assertEqual(access.dashboard_assignments, [])
+        DashboardAssignment.objects.create(user=self.user, dashboard="faculty")
+        RoleAssignment.objects.filter(user=self.user).delete()
+        access = AccessContext(self.user)
+        self.assertEqual(access.dashboard_assignments, ["faculty"])
+        self.assertEqual(access.allowed_items, [])
+
+    def test_organization_changes_invalidate(self):
+        AccessContext(self.user).role_assignments
+        self.org.name = "Applied Physics"
+        self.org.save()
+        self.org.org_type.name = "School"
+        self.org.org_type.save()
+        assignment = AccessContext(self.user).role_assignments[0]
+        self.assertEqual(assignment.organization.name, "Applied Physics")
+        self.assertEqual(assignment.organization.org_type.name, "School")
+
+    def test_new_user_keeps_other_snapshots_warm(self):
+        AccessContext(self.user).allowed_items
+        User.objects.create_user("newcomer", password="pass")
+        with self.assertNumQueries(0):
+            self.assertEqual(AccessContext(self.user).allowed_items, ["reports"])
+
+    def test_lost_version_stamp_never_revives_old_entries(self):
+        AccessContext(self.user).allowed_items
+        permission_cache.get_cache().delete(permission_cache.VERSION_KEY)
+        SidebarPermission.objects.filter(pk=self.perm.pk).update(items=["events"])
+        self.assertEqual(AccessContext(self.user).allowed_items, ["events"])
+
+    def test_nav_tree_is_shared_and_versioned(self):
+        get_nav_items()
+        version = permission_cache.current_version()
+        with self.assertNumQueries(0):
+            get_nav_items()
+        get_nav_items.cache_clear()
+        self.assertNotEqual(permission_cache.current_version(), version)
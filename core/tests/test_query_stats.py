@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import query_stats, signals
+from core.middleware import QueryStatsMiddleware
+
+ENABLED = {"ENABLED": True, "SAMPLE_RATE": 1.0, "N_PLUS_ONE_THRESHOLD": 3}
+
+
+class QueryStatsStoreTests(SimpleTestCase):
+    def test_fingerprint_collapses_whitespace_and_in_lists(self):
+        self.assertEqual(
+            query_stats.fingerprint('SELECT  "a"\n FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT "a" FROM "t" WHERE "id" IN (%s, ...)',
+        )
+        self.assertEqual(
+            query_stats.fingerprint('WHERE "id" IN (%s,%s)'),
+            query_stats.fingerprint('WHERE "id" IN (%s, %s, %s, %s)'),
+        )
+
+    def test_percentiles_and_n_plus_one_flags(self):
+        store = query_stats.QueryStatsStore(window=10, threshold=3, max_suspects=5)
+        for n in range(1, 21):
+            recorder = query_stats.RequestRecorder()
+            recorder.count = n
+            recorder.fingerprints["SELECT 1"] = 4 if n == 20 else 1
+            store.record("dashboard", recorder, n / 1000)
+
+        (row,) = store.report()
+        self.assertEqual(row["view_name"], "dashboard")
+        self.assertEqual(row["requests"], 20)
+        self.assertEqual(row["samples"], 10)
+        self.assertEqual(row["queries"]["p50"], 15)
+        self.assertEqual(row["queries"]["max"], 20)
+        self.assertEqual(row["wall_ms"]["p99"], 20.0)
+        self.assertEqual(
+            row["n_plus_one"], [{"sql": "SELECT 1", "max_repeats": 4, "requests": 1}]
+        )
+
+    @override_settings(QUERY_STATS={"ENABLED": False})
+    def test_middleware_removed_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryStatsMiddleware(lambda request: None)
+
+
+@override_settings(QUERY_STATS=ENABLED)
+class QueryStatsMiddlewareTests(TestCase):
+    def setUp(self):
+        post_save.disconnect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.disconnect(signals.assign_role_on_login)
+        query_stats.get_store().reset()
+        self.admin = User.objects.create_superuser("root", "root@example.com", "pass")
+        self.client.force_login(self.admin)
+
+    def tearDown(self):
+        post_save.connect(signals.create_or_update_user_profile, sender=User)
+        user_logged_in.connect(signals.assign_role_on_login)
+        query_stats.get_store().reset()
+
+    def test_sampled_request_is_recorded_under_view_name(self):
+        self.client.get(reverse("api_get_notifications"))
+        rows = {row["view_name"]: row for row in query_stats.report()}
+        self.assertIn("api_get_notifications", rows)
+        self.assertGreater(rows["api_get_notifications"]["queries"]["max"], 0)
+
+    def test_report_json_and_html(self):
+        self.client.get(reverse("api_get_notifications"))
+        resp = self.client.get(reverse("admin_query_stats"), {"format": "json"})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertTrue(data["enabled"])
+        self.assertIn(
+            "api_get_notifications", [row["view_name"] for row in data["views"]]
+        )
+
+        resp = self.client.get(reverse("admin_query_stats"))
+        self.assertContains(resp, "api_get_notifications")
+
+        self.client.post(reverse("admin_query_stats"))
+        self.assertEqual(
+            [row["view_name"] for row in query_stats.report()], ["admin_query_stats"]
+        )
+
+    def test_report_requires_superuser(self):
+        user = User.objects.create_user("fac", password="pass")
+        self.client.force_login(user)
+        resp = self.client.get(reverse("admin_query_stats"))
+        self.assertEqual(resp.status_code, 302)
@@ -0,0 +1,45 @@
+import importlib
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import TestCase
+
+from core import navigation
+from core.management.commands.benchmark_startup import (
+    BOOT_SCRIPT,
+    DEFERRED_MODULES,
+    parse_importtime,
+)
+
+
+class StartupImportTests(TestCase):
+    def test_navigation_import_does_not_query(self):
+        with self.assertNumQueries(0):
+            importlib.reload(navigation)
+        self.assertIn("dashboard", navigation.SIDEBAR_ITEM_IDS)
+        self.assertEqual(list(navigation.NAV_ITEMS), navigation.get_nav_items())
+
+    def test_parse_importtime(self):
+        report = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   b\n"
+            "import time:        80 |        200 | a\n"
+        )
+        self.assertEqual(parse_importtime(report), {"b": (120, 120), "a": (80, 200)})
+
+    def test_heavy_dependencies_not_loaded_at_startup(self):
+        script = BOOT_SCRIPT + (
+            "import sys\n"
+            f"print('eager:' + ','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertEqual(proc.stdout.strip().splitlines()[-1], "eager:")
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core import synthetic
+from emt.models import ApprovalStep, EventProposal
+from transcript.models import Participation, Student
+
+TINY = ["--scale", "0.002", "--activity-logs", "50"]
+
+
+class SeedSyntheticDataTests(TestCase):
+    def test_seed_is_deterministic_and_flushable(self):
+        call_command("seed_synthetic_data", *TINY, stdout=StringIO())
+        titles = list(
+            EventProposal.objects.order_by("pk").values_list("event_title", flat=True)
+        )
+        self.assertEqual(len(titles), 40)
+        self.assertEqual(ApprovalStep.objects.count(), 120)
+        self.assertEqual(Participation.objects.count(), Student.objects.count() * 2)
+        self.assertTrue(User.objects.get(username=synthetic.BENCH_ADMIN).is_superuser)
+
+        with self.assertRaises(CommandError):
+            call_command("seed_synthetic_data", *TINY, stdout=StringIO())
+
+        call_command("seed_synthetic_data", *TINY, "--flush", stdout=StringIO())
+        self.assertEqual(
+            list(EventProposal.objects.order_by("pk").values_list("event_title", flat=True)),
+            titles,
+        )
+
+        call_command("seed_synthetic_data", "--flush-only", stdout=StringIO())
+        self.assertFalse(User.objects.filter(username__startswith="synth_").exists())
+        self.assertFalse(EventProposal.objects.exists())
+        self.assertFalse(Student.objects.exists())
+
+
+class BenchmarkEndpointsTests(TestCase):
+    def setUp(self):
+        call_command("seed_synthetic_data", *TINY, stdout=StringIO())
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_writes_and_compares_baseline(self):
+        args = [
+            "--repeat", "1", "--warmup", "0", "--json", self.path,
+            "--endpoint", "attendance_data", "--endpoint", "review_center",
+            "--endpoint", "transcript_view",
+        ]
+        call_command("benchmark_endpoints", *args, stdout=StringIO(), stderr=StringIO())
+        with open(self.path) as fh:
+            baseline = json.load(fh)
+        self.assertEqual(
+            sorted(baseline["endpoints"]),
+            ["attendance_data", "review_center", "transcript_view"],
+        )
+        for result in baseline["endpoints"].values():
+            self.assertEqual(result["status"], [200])
+            self.assertGreater(result["queries"], 0)
+
+        baseline["endpoints"]["review_center"]["queries"] = 0
+        with open(self.path, "w") as fh:
+            json.dump(baseline, fh)
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "review_center"):
+            call_command(
+                "benchmark_endpoints", "--repeat", "1", "--warmup", "0",
+                "--endpoint", "review_center", "--compare", self.path,
+                "--fail-on-regression", stdout=out, stderr=StringIO(),
+            )
+        self.assertIn("Compared with", out.getvalue())
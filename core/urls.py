@@ -96,6 +96,11 @@ urlpatterns = [
     path("core-admin/reports/<int:report_id>/reject/", views.admin_reports_reject, name="admin_reports_reject"),
     path("core-admin/history/", views.admin_history, name="admin_history"),
     path("core-admin/history/<int:pk>/", views.admin_history_detail, name="admin_history_detail"),
+    path("core-admin/history/buffer-stats/", views.admin_activity_log_stats, name="admin_activity_log_stats"),
+    path("core-admin/pdf-renderer-stats/", views.admin_pdf_renderer_stats, name="admin_pdf_renderer_stats"),
+    path("core-admin/query-stats/", views.admin_query_stats, name="admin_query_stats"),
+    path("core-admin/api/history/", views.admin_history_api, name="admin_history_api"),
+    path("core-admin/api/history/suggestions/", views.admin_history_suggestions, name="admin_history_suggestions"),
     # ────────────────────────────────────────────────
     # Admin - Approval & Outcome Management
     # ────────────────────────────────────────────────
@@ -143,6 +148,8 @@ urlpatterns = [
     # Admin - Data Export
     # ────────────────────────────────────────────────
     path("data-export-filter/", views.data_export_filter_view, name="data_export_filter"),
+    path("api/notifications/", views.api_get_notifications, name="api_get_notifications"),
+    path("api/notifications/stream/", views.api_notifications_stream, name="api_notifications_stream"),
     path("api/search/", views.api_search, name="api_search"),
     path("api/export/csv/", views.api_export_csv, name="api_export_csv"),
     path("api/export/excel/", views.api_export_excel, name="api_export_excel"),
@@ -1,4 +1,6 @@
+import importlib.util
 import logging
+import sys
 
 from django.conf import settings
 from django.contrib.sites.models import Site
@@ -20,3 +22,26 @@ def get_or_create_current_site(request):
         if created:
             logger.info("Created missing Site %s with id %s", host, site_id)
         return site
+
+
+def lazy_import(name):
+    """Return module ``name``, deferring its execution until first attribute use.
+
+    Used for heavy optional dependencies (``requests`` etc.) that only a few
+    views touch, so importing the view modules at worker start stays cheap.
+    The returned object is the real module once loaded, so ``mock.patch``
+    targets such as ``"emt.views.requests.get"`` keep working.  Returns
+    ``None`` when the module is not installed.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
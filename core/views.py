@@ -22,6 +22,7 @@ from django.utils import timezone
 import json
 import logging
 
+from .access import AccessContext, get_access
 logger = logging.getLogger(__name__)
 from .decorators import (
     popso_manager_required,
@@ -35,8 +36,6 @@ from .models import (
     Organization,
     OrganizationType,
     OrganizationMembership,
-    DashboardAssignment,
-    SidebarPermission,
     Report,
     Class,
     OrganizationRole,
@@ -44,6 +43,7 @@ from .models import (
     ProgramOutcome,
     ProgramSpecificOutcome,
     ActivityLog,
+    ActivityLogArchive,
     StudentAchievement,
 )
 from emt.models import EventProposal, Student
@@ -415,53 +415,25 @@ def _collect_join_requests(user):
 # ─────────────────────────────────────────────────────────────
 #  Dashboard helpers
 # ─────────────────────────────────────────────────────────────
-def _get_available_dashboards_for_user(user):
+def _get_available_dashboards_for_user(user, access=None):
     """Return a sorted list of dashboard keys the user can access.
 
     Combines explicit DashboardAssignment rows with SidebarPermission items
-    under the "dashboard:" branch (e.g. "dashboard:admin").
+    under the "dashboard:" branch (e.g. "dashboard:admin").  Pass the
+    request's ``access`` context to reuse lookups already made for it.
     """
     try:
-        choice_map = dict(DashboardAssignment.DASHBOARD_CHOICES)
-
-        # 0) If the user has an explicit per-user SidebarPermission, and it contains
-        #    dashboard entries, treat those as authoritative (override role defaults).
-        keys = set()
-        user_perm = SidebarPermission.objects.filter(user=user, role__in=["", None]).first()
-        if user_perm and user_perm.items:
-            for it in user_perm.items:
-                if isinstance(it, str) and it.startswith("dashboard:"):
-                    key = it.split(":", 1)[1]
-                    if key in choice_map:
-                        keys.add(key)
-        if keys:
-            return sorted(keys)
-
-        # 1) Otherwise, fallback to union of allowed nav items (user + roles)
-        #    and explicit DashboardAssignment rows.
-        items = SidebarPermission.get_allowed_items(user)
-        if items == "ALL":
-            keys.update(choice_map.keys())
-        else:
-            for it in items:
-                if isinstance(it, str) and it.startswith("dashboard:"):
-                    key = it.split(":", 1)[1]
-                    if key in choice_map:
-                        keys.add(key)
-
-        # From explicit DashboardAssignment rows (user + role-level)
-        for dash_key, _ in DashboardAssignment.get_user_dashboards(user):
-            keys.add(dash_key)
-
-        return sorted(keys)
+        if access is None or access.user is not user:
+            access = AccessContext(user)
+        return access.available_dashboards
     except Exception:
         return []
 
-def _user_has_dashboard(user, key: str) -> bool:
+def _user_has_dashboard(user, key: str, access=None) -> bool:
     if getattr(user, "is_superuser", False):
         return True
     try:
-        return key in _get_available_dashboards_for_user(user)
+        return key in _get_available_dashboards_for_user(user, access)
     except Exception:
         return False
 @login_required
@@ -1117,9 +1089,10 @@ def api_roles(request):
 @login_required
 def dashboard(request):
     user = request.user
+    access = get_access(request)
 
     # 1) Resolve available dashboards from permissions/assignments
-    avail_keys = _get_available_dashboards_for_user(user)
+    avail_keys = _get_available_dashboards_for_user(user, access)
     # If any available, pick highest priority to ensure permission-driven routing
     if avail_keys:
         priority = ["admin", "cdl_head", "cdl_work", "faculty", "student"]
@@ -1127,13 +1100,10 @@ def dashboard(request):
             if key in avail_keys:
                 return redirect("select_dashboard", dashboard_key=key)
 
-    # 2) Role / domain detection (fallback for users without assignments)
-    roles_qs = (
-        RoleAssignment.objects.filter(user=user)
-        .select_related("role", "organization", "organization__org_type")
-    )
+    # 2) Role / domain detection (fallback for users without assignments);
+    #    reuses the assignments already loaded for the sidebar.
     try:
-        roles = list(roles_qs)
+        roles = access.role_assignments
     except (InterfaceError, OperationalError):
         logger.warning(
             "dashboard(): detected closed DB connection while loading role assignments; retrying",
@@ -1141,10 +1111,7 @@ def dashboard(request):
         )
         close_old_connections()
         try:
-            roles = list(
-                RoleAssignment.objects.filter(user=user)
-                .select_related("role", "organization", "organization__org_type")
-            )
+            roles = access.role_assignments
         except (InterfaceError, OperationalError):
             logger.exception(
                 "dashboard(): unable to recover role assignments after resetting DB connections",
@@ -1560,7 +1527,7 @@ def select_dashboard(request, dashboard_key):
     from .models import DashboardAssignment
 
     # Verify user has access to this dashboard (combine assignments + sidebar)
-    avail_keys = _get_available_dashboards_for_user(request.user)
+    avail_keys = _get_available_dashboards_for_user(request.user, get_access(request))
     choice_map = dict(DashboardAssignment.DASHBOARD_CHOICES)
     available_dashboards = {k: choice_map.get(k, k) for k in avail_keys}
 
@@ -1888,7 +1855,7 @@ def admin_dashboard(request):
     """
     Render the admin dashboard with dynamic analytics and calendar events.
     """
-    if not _user_has_dashboard(request.user, "admin"):
+    if not _user_has_dashboard(request.user, "admin", get_access(request)):
         return HttpResponseForbidden()
     from django.contrib.auth.models import User
     from django.db.models import Q
@@ -3490,10 +3457,10 @@ def api_get_nav_tree(request):
     runtime and keep the Available/Assigned lists in sync with the
     navigation configuration in core.navigation.
     """
-    from core.navigation import NAV_ITEMS
+    from core.navigation import get_nav_items
     from django.http import JsonResponse
 
-    resp = JsonResponse({'nav_items': NAV_ITEMS})
+    resp = JsonResponse({'nav_items': get_nav_items()})
     resp['Cache-Control'] = 'no-store'
     return resp
 
@@ -3502,16 +3469,27 @@ def api_get_nav_tree(request):
 def api_get_notifications(request):
     """Return JSON notifications for the current user (newest-first).
 
-    Supports optional ?since=<iso8601> to fetch only newer items.
+    Supports optional ?since=<iso8601> to fetch only newer items.  Responses
+    carry an ETag derived from the cached feed, so polling clients that send
+    If-None-Match get a bodyless 304 until something changes.
     """
-    from django.http import JsonResponse
+    import hashlib
+    from django.http import HttpResponseNotModified, JsonResponse
     from django.utils.dateparse import parse_datetime
     from django.utils import timezone
-    # Reuse context processor logic to build notifications
-    data = notifications(request)
-    notifs = data.get('notifications', [])
+    from django.utils.http import quote_etag
+    from .notifications import get_feed, serialize
+
+    feed = get_feed(request.user)
+    since = request.GET.get('since') or ''
+    etag = quote_etag(f"{feed['etag']}-{hashlib.md5(since.encode()).hexdigest()[:8]}")
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        resp = HttpResponseNotModified()
+        resp['ETag'] = etag
+        resp['Cache-Control'] = 'no-cache'
+        return resp
 
-    since = request.GET.get('since')
+    notifs = feed['items']
     if since:
         try:
             dt = parse_datetime(since)
@@ -3523,20 +3501,44 @@ def api_get_notifications(request):
         except Exception:
             pass
 
-    # Serialize datetimes to ISO format
-    out = []
-    for n in notifs:
-        nn = n.copy()
-        ca = nn.get('created_at')
-        if ca:
-            try:
-                nn['created_at'] = ca.isoformat()
-            except Exception:
-                nn['created_at'] = str(ca)
-        out.append(nn)
+    resp = JsonResponse({'notifications': serialize(notifs)})
+    resp['ETag'] = etag
+    resp['Cache-Control'] = 'no-cache'
+    return resp
 
-    resp = JsonResponse({'notifications': out})
-    resp['Cache-Control'] = 'no-store'
+
+@login_required
+async def api_notifications_stream(request):
+    """Push notification updates as server-sent events.
+
+    Needs an ASGI server (``iqac_project.asgi:application``) and
+    ``NOTIFICATION_STREAM_ENABLED``; each stream
+    ends after a few minutes and the browser's EventSource reconnects with
+    ``Last-Event-ID`` so unchanged feeds are not resent.
+    """
+    from asgiref.sync import sync_to_async
+    from django.conf import settings
+    from django.http import HttpResponse, StreamingHttpResponse
+    from .notifications import notification_events
+
+    if not getattr(settings, 'NOTIFICATION_STREAM_ENABLED', False):
+        # 204 tells EventSource clients to stop reconnecting.
+        return HttpResponse(status=204)
+
+    def _effective_user():
+        # request.user may be lazy or swapped by ImpersonationMiddleware;
+        # resolve it outside the event loop.
+        user = request.user
+        user.pk
+        return user
+
+    user = await sync_to_async(_effective_user)()
+    resp = StreamingHttpResponse(
+        notification_events(user, request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream',
+    )
+    resp['Cache-Control'] = 'no-cache'
+    resp['X-Accel-Buffering'] = 'no'
     return resp
 
 
@@ -3547,11 +3549,10 @@ def api_my_sidebar(request):
     Used by the client to detect changes and refresh the page/sidebar.
     """
     from django.http import JsonResponse
-    from .models import SidebarPermission, RoleAssignment
     import logging
 
     logger = logging.getLogger(__name__)
-    items = SidebarPermission.get_allowed_items(request.user)
+    items = get_access(request).allowed_items
     unrestricted = False
     allowed = []
     if items == "ALL":
@@ -3561,10 +3562,7 @@ def api_my_sidebar(request):
 
     # Debug: user roles/org context
     try:
-        roles = (
-            RoleAssignment.objects.filter(user=request.user)
-            .select_related('role', 'organization', 'organization__org_type')
-        )
+        roles = get_access(request).role_assignments
         roles_dbg = [
             {
                 'role': (ra.role.name if ra.role else None),
@@ -3690,12 +3688,13 @@ def admin_academic_year_settings(request):
 def academic_year_archive(request, pk):
     """Archive the selected academic year."""
 
-    from transcript.models import AcademicYear
+    from transcript.models import AcademicYear, invalidate_active_academic_year
 
     year = get_object_or_404(AcademicYear, pk=pk)
     if request.method == "POST":
         year.is_active = False
         year.save(update_fields=["is_active"])
+        invalidate_active_academic_year()
         messages.success(request, "Academic year archived.")
     return redirect("admin_academic_year_settings")
 
@@ -3705,13 +3704,14 @@ def academic_year_archive(request, pk):
 def academic_year_restore(request, pk):
     """Restore an archived academic year."""
 
-    from transcript.models import AcademicYear
+    from transcript.models import AcademicYear, invalidate_active_academic_year
 
     year = get_object_or_404(AcademicYear, pk=pk)
     if request.method == "POST":
         AcademicYear.objects.exclude(pk=year.pk).update(is_active=False)
         year.is_active = True
         year.save(update_fields=["is_active"])
+        invalidate_active_academic_year()
         messages.success(request, "Academic year restored and set as active.")
     return redirect("admin_academic_year_settings")
 
@@ -4694,6 +4694,20 @@ def admin_reports_reject(request, report_id: int):
     return redirect("admin_reports")
 
 
+def _history_filters(request):
+    """Read the history filters shared by the page and its JSON API."""
+    from . import history
+
+    return {
+        "query": request.GET.get("q", "").strip(),
+        "start": history.parse_date(request.GET.get("start")),
+        "end": history.parse_date(request.GET.get("end")),
+        "user": request.GET.get("user", "").strip() or None,
+        "action": request.GET.get("action", "").strip() or None,
+        "view_name": request.GET.get("view", "").strip() or None,
+    }
+
+
 @sidebar_permission_required("settings:history")
 def admin_history(request):
     """List activity log entries for administrators.
@@ -4703,68 +4717,154 @@ def admin_history(request):
     requesting administrator. We therefore start with a queryset containing
     every :class:`ActivityLog` record and then apply any filtering based on
     the request parameters.
-    """
-
-    # Begin with activity from every user.
-    logs = ActivityLog.objects.select_related("user")
-
-    # Text search across user name, username, action and description
-    query = request.GET.get("q", "").strip()
-    if query:
-        logs = logs.filter(
-            Q(user__username__icontains=query)
-            | Q(user__first_name__icontains=query)
-            | Q(user__last_name__icontains=query)
-            | Q(action__icontains=query)
-            | Q(description__icontains=query)
-            | Q(ip_address__icontains=query)
-        )
-
-    # Date range filtering
-    start_date = request.GET.get("start")
-    end_date = request.GET.get("end")
-    if start_date:
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d").date()
-            logs = logs.filter(timestamp__date__gte=start)
-        except ValueError:
-            pass
-    if end_date:
-        try:
-            end = datetime.strptime(end_date, "%Y-%m-%d").date()
-            logs = logs.filter(timestamp__date__lte=end)
-        except ValueError:
-            pass
 
-    # Build type-ahead suggestions from the currently filtered log data
-    action_suggestions = logs.values_list("action", flat=True).distinct()
-    user_suggestions = logs.values_list("user__username", flat=True).distinct()
-    suggestions = sorted(
-        set(
-            filter(
-                None,
-                list(action_suggestions) + list(user_suggestions),
-            )
+    Only the first keyset page is rendered; further pages are fetched from
+    :func:`admin_history_api` with the returned cursor.  Archived partitions
+    are read only when the requested start date predates the hot window.
+    """
+    from . import history
+    from .activity_buffer import get_config
+
+    filters = _history_filters(request)
+    sources = history.history_sources(get_config()["HOT_DAYS"], **filters)
+    logs, next_cursor = history.history_page(sources)
+
+    # Unfiltered pages offer the precomputed index; filtered pages keep the
+    # suggestions scoped to what is on screen, as before.
+    if any(filters.values()):
+        suggestions = sorted(
+            {log.action for log in logs if log.action}
+            | {log.user.username for log in logs if log.user}
         )
-    )
+    else:
+        suggestions = history.suggestions()
 
-    logs = logs.order_by("-timestamp")
     context = {
         "logs": logs,
-        "q": query,
-        "start": start_date,
-        "end": end_date,
+        "next_cursor": next_cursor,
+        "q": filters["query"],
+        "start": request.GET.get("start"),
+        "end": request.GET.get("end"),
         "suggestions": suggestions,
     }
     return render(request, "core/admin_history.html", context)
 
 
+@sidebar_permission_required("settings:history")
+@require_GET
+def admin_history_api(request):
+    """Return one keyset page of activity history as JSON.
+
+    Accepts the page's ``q``/``start``/``end`` filters plus ``user``,
+    ``action`` (prefix) and ``view`` for indexed lookups, ``cursor`` from a
+    previous response and ``limit`` (max 200).
+    """
+    from django.template.loader import render_to_string
+
+    from . import history
+    from .activity_buffer import get_config
+
+    try:
+        limit = int(request.GET.get("limit", history.PAGE_SIZE))
+    except ValueError:
+        limit = history.PAGE_SIZE
+    sources = history.history_sources(
+        get_config()["HOT_DAYS"], **_history_filters(request)
+    )
+    logs, next_cursor = history.history_page(
+        sources, cursor=request.GET.get("cursor"), limit=limit
+    )
+    results = []
+    for log in logs:
+        results.append(
+            {
+                "id": log.pk,
+                "timestamp": log.timestamp.isoformat(),
+                "user": log.user.username if log.user else None,
+                "action": log.action,
+                "view_name": log.view_name,
+                "description": log.description,
+                "ip_address": log.ip_address,
+                "detail_url": reverse("admin_history_detail", args=[log.pk]),
+                "html": render_to_string(
+                    "core/partials/admin_history_row.html", {"log": log}
+                ),
+            }
+        )
+    return JsonResponse({"results": results, "next_cursor": next_cursor})
+
+
+@sidebar_permission_required("settings:history")
+@require_GET
+def admin_history_suggestions(request):
+    """Type-ahead values from the precomputed suggestion index."""
+    from . import history
+
+    prefix = request.GET.get("prefix", "").strip()
+    return JsonResponse({"suggestions": history.suggestions(prefix, limit=50)})
+
+
 @sidebar_permission_required("settings:history")
 def admin_history_detail(request, pk):
-    """Detailed view of a single activity log entry."""
-    log = get_object_or_404(ActivityLog, pk=pk)
+    """Detailed view of a single activity log entry (hot or archived)."""
+    log = ActivityLog.objects.filter(pk=pk).first()
+    if log is None:
+        log = get_object_or_404(ActivityLogArchive, pk=pk)
     return render(request, 'core/admin_history_detail.html', {'log': log})
 
+
+@login_required
+@user_passes_test(lambda u: u.is_superuser)
+@require_GET
+def admin_activity_log_stats(request):
+    """Expose the activity log buffer's queue depth, flush latency and drops."""
+    from . import activity_buffer
+
+    return JsonResponse(activity_buffer.stats())
+
+
+@login_required
+@user_passes_test(lambda u: u.is_superuser)
+@require_GET
+def admin_pdf_renderer_stats(request):
+    """Expose the PDF renderer's render time per page and asset cache usage."""
+    from . import pdf_renderer
+
+    return JsonResponse(pdf_renderer.stats())
+
+
+@login_required
+@user_passes_test(lambda u: u.is_superuser)
+def admin_query_stats(request):
+    """Per-view query counts, DB/wall time percentiles and N+1 suspects.
+
+    Figures come from this worker's sampled requests only (see
+    ``core.query_stats``).  ``POST`` clears them; ``?format=json`` returns
+    the raw report.
+    """
+    from . import query_stats
+
+    if request.method == "POST":
+        query_stats.get_store().reset()
+        return redirect("admin_query_stats")
+
+    sort = request.GET.get("sort", "wall_ms")
+    config = query_stats.get_config()
+    rows = query_stats.report(sort)
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "enabled": config["ENABLED"],
+                "sample_rate": config["SAMPLE_RATE"],
+                "views": rows,
+            }
+        )
+    return render(
+        request,
+        "core/admin_query_stats.html",
+        {"rows": rows, "config": config, "sort": sort},
+    )
+
 # ======================== API Endpoints & User Dashboard ========================
 
 from django.http import JsonResponse
@@ -5768,12 +5868,6 @@ from django.contrib.auth.models import User
 from django.db.models import Q
 from django.utils import timezone
 
-# Optional Excel writer
-try:
-    import xlsxwriter
-except Exception:
-    xlsxwriter = None
-
 # -------------------------
 # Import models (core + emt)
 # -------------------------
@@ -6456,7 +6550,10 @@ def api_export_excel(request):
     Export results as XLSX (requires xlsxwriter).
     Accepts same payload as api_search.
     """
-    if xlsxwriter is None:
+    # Optional Excel writer, imported on first export rather than at startup
+    try:
+        import xlsxwriter
+    except Exception:
         return JsonResponse({'error': 'XLSX export not available (xlsxwriter missing)'}, status=501)
     try:
         payload = json.loads(request.body.decode('utf-8') or "{}")
@@ -7211,7 +7308,7 @@ def api_log_popso_change(request):
 @login_required
 def cdl_head_dashboard(request):
     # Allow via dashboard permission first; fallback to group/role checks
-    is_allowed = _user_has_dashboard(request.user, "cdl_head")
+    is_allowed = _user_has_dashboard(request.user, "cdl_head", get_access(request))
     if not is_allowed:
         if request.user.groups.filter(name="CDL_HEAD").exists():
             is_allowed = True
@@ -7738,7 +7835,7 @@ def api_cdl_analysis(request):
 @login_required
 def cdl_work_dashboard(request):
     # Allow via dashboard permission first; fallback to CDL_MEMBER group and role checks
-    is_allowed = _user_has_dashboard(request.user, "cdl_work")
+    is_allowed = _user_has_dashboard(request.user, "cdl_work", get_access(request))
     if not is_allowed:
         if request.user.groups.filter(name="CDL_MEMBER").exists():
             is_allowed = True
@@ -7967,13 +8064,11 @@ def _comm_dict(m:CDLCommunicationMessage):
 # Proof-reading APIs
 # ────────────────────────────────────────────────
 
-def _is_english_faculty(user) -> bool:
+def _is_english_faculty(user, access=None) -> bool:
     try:
-        from .models import RoleAssignment
-        for ra in (
-            RoleAssignment.objects.filter(user=user)
-            .select_related("role", "organization", "organization__org_type")
-        ):
+        if access is None or access.user is not user:
+            access = AccessContext(user)
+        for ra in access.role_assignments:
             role_name = (ra.role.name if ra.role else "").lower()
             if "english" in role_name and ("faculty" in role_name or "review" in role_name):
                 return True
@@ -9038,7 +9133,7 @@ def faculty_review_page(request):
     Access: Only users with an English Faculty/reviewer role (by name heuristic).
     CDL Admin/Employees should not access this page.
     """
-    if not _is_english_faculty(request.user):
+    if not _is_english_faculty(request.user, get_access(request)):
         return HttpResponseForbidden()
     return render(request, "core/faculty_review.html")
 
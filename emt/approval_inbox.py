@@ -0,0 +1,323 @@
+"""Denormalized "waiting on me" inbox for approval steps and event reports.
+
+``my_approvals``, the Review Center and the sidebar badges used to work out
+what is waiting on a user by filtering every ``ApprovalStep`` on status,
+``is_optional`` and ``optional_unlocked``, and every ``EventReport`` on its
+review stage and the proposal's organization.  Those answers are now kept
+in :class:`~emt.models.ApprovalInboxEntry`:
+
+* a ``step`` entry for each pending step its assignee can act on (not
+  optional, or an optional step forwarded to them), keyed by assignee;
+* a ``report`` entry for each report not yet finalized, carrying the
+  proposal's organization and the report's review stage.
+
+:func:`sync` recomputes the entries of a few proposals inside the caller's
+transaction.  ``emt.utils`` calls it after its bulk step updates (which send
+no signals) and ``core.signals`` after ``ApprovalStep``/``EventReport``
+saves, which covers ``review_action`` and ``review_approval_step``.
+:func:`rebuild` (``manage.py rebuild_approval_inbox``) reconciles the whole
+table with the source rows.
+
+Badge counts (:func:`counts`) are cached per user in the cache named by
+``settings.APPROVAL_INBOX_CACHE_ALIAS``.  A step change drops its assignee's
+entry; a report entry or role change bumps a version stamp shared by all
+users, since who may review a report depends on roles.
+"""
+
+import logging
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from core.access import get_access
+from core.cache_version import VersionStamp
+
+from .models import ApprovalInboxEntry, ApprovalStep, EventProposal, EventReport
+
+logger = logging.getLogger(__name__)
+
+COUNTS_KEY = "emt:inbox:user:{}"
+# Legacy ``Profile.role`` changes send no invalidation, so counts expire.
+COUNTS_TIMEOUT = 300
+BATCH_SIZE = 500
+
+Stage = EventReport.ReviewStage
+Kind = ApprovalInboxEntry.Kind
+
+# Report stages each reviewer stage may approve or reject (see review_action).
+DECIDES = {
+    Stage.DIQAC: (Stage.USER, Stage.DIQAC),
+    Stage.HOD: (Stage.DIQAC, Stage.HOD),
+    Stage.UIQAC: (Stage.HOD, Stage.UIQAC),
+}
+# Reviewer stages that only see reports of their own organizations.
+ORGANIZATION_SCOPED = (Stage.DIQAC, Stage.HOD)
+
+ACTIONABLE_STEP = Q(status=ApprovalStep.Status.PENDING, assigned_to__isnull=False) & (
+    Q(is_optional=False) | Q(optional_unlocked=True)
+)
+
+ReviewerScope = namedtuple("ReviewerScope", "stage organization_ids admin")
+
+# Shared by every user's counts; bumped when report entries or roles change.
+stamp = VersionStamp("APPROVAL_INBOX_CACHE_ALIAS", "emt:inbox:version", "approval inbox")
+VERSION_KEY = stamp.key
+get_cache = stamp.get_cache
+current_version = stamp.current
+bump_version = stamp.bump
+bump_version_on_commit = stamp.bump_on_commit
+
+
+# ----------------------------------------------------------------------
+# Reviewer roles
+# ----------------------------------------------------------------------
+def _role_blob(user, role_names):
+    names = [(name or "").lower() for name in role_names]
+    profile_role = getattr(getattr(user, "profile", None), "role", "") or ""
+    if profile_role:
+        names.append(profile_role.lower())
+    return " ".join(names)
+
+
+def _stage_for(blob):
+    stage = Stage.USER
+    if "hod" in blob or "head" in blob:
+        stage = Stage.HOD
+    if "iqac" in blob and ("university" in blob or "coord" in blob or "admin" in blob):
+        stage = Stage.UIQAC
+    elif "iqac" in blob:
+        stage = Stage.DIQAC
+    return stage
+
+
+def is_admin_override(user, role_names=None):
+    """Staff, superusers and anyone whose role mentions "admin"."""
+    if getattr(user, "is_superuser", False) or getattr(user, "is_staff", False):
+        return True
+    if role_names is None:
+        role_names = []
+        try:
+            if hasattr(user, "role_assignments"):
+                role_names = list(
+                    user.role_assignments.filter(role__isnull=False).values_list(
+                        "role__name", flat=True
+                    )
+                )
+        except Exception:
+            pass
+    return "admin" in _role_blob(user, role_names)
+
+
+def reviewer_scope(request):
+    """Return the user's review stage, organizations and admin flag.
+
+    Roles come from the request's :class:`core.access.AccessContext`, so
+    this shares its lookups with the sidebar and permission checks.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return ReviewerScope(Stage.USER, [], False)
+    access = get_access(request)
+    role_names = access.role_names
+    organization_ids = sorted(
+        {ra.organization_id for ra in access.role_assignments if ra.organization_id}
+    )
+    return ReviewerScope(
+        _stage_for(_role_blob(user, role_names)),
+        organization_ids,
+        is_admin_override(user, role_names),
+    )
+
+
+# ----------------------------------------------------------------------
+# Reads
+# ----------------------------------------------------------------------
+def _report_filter(scope, deciding=False, prefix=""):
+    """``Q`` over entries (or, with ``prefix``, a relation to them)."""
+    q = Q(**{f"{prefix}kind": Kind.REPORT})
+    if scope.admin:
+        return q
+    if scope.stage not in DECIDES:
+        return None
+    if deciding:
+        q &= Q(**{f"{prefix}stage__in": DECIDES[scope.stage]})
+    if scope.stage in ORGANIZATION_SCOPED:
+        q &= Q(**{f"{prefix}organization_id__in": scope.organization_ids})
+    return q
+
+
+def pending_steps(user):
+    """Steps waiting on ``user``, driven by their inbox entries."""
+    return ApprovalStep.objects.filter(
+        inbox_entry__user=user, inbox_entry__kind=Kind.STEP
+    )
+
+
+def open_reports(scope, queryset=None):
+    """Unfinalized reports a reviewer with ``scope`` may see."""
+    if queryset is None:
+        queryset = EventReport.objects.all()
+    q = _report_filter(scope, prefix="inbox_entry__")
+    if q is None:
+        return queryset.none()
+    return queryset.filter(q)
+
+
+def build_counts(user, scope):
+    approvals = ApprovalInboxEntry.objects.filter(user=user, kind=Kind.STEP).count()
+    q = _report_filter(scope, deciding=True)
+    reports = ApprovalInboxEntry.objects.filter(q).count() if q is not None else 0
+    return {"approvals": approvals, "reports": reports}
+
+
+def counts(request):
+    """Return ``{"approvals": n, "reports": n}`` for the badges."""
+    user = request.user
+    if not user.is_authenticated:
+        return {"approvals": 0, "reports": 0}
+    cache = get_cache()
+    key = COUNTS_KEY.format(user.pk)
+    try:
+        found = cache.get_many([VERSION_KEY, key])
+    except Exception:
+        logger.exception("Failed to read approval inbox counts")
+        found = {}
+    version = found.get(VERSION_KEY)
+    entry = found.get(key)
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1]
+    if version is None:
+        version = current_version()
+    value = build_counts(user, reviewer_scope(request))
+    if version is not None:
+        try:
+            cache.set(key, (version, value), COUNTS_TIMEOUT)
+        except Exception:
+            logger.exception("Failed to store approval inbox counts")
+    return value
+
+
+def invalidate_users(user_ids):
+    """Drop the cached counts of ``user_ids``, now and after commit."""
+    keys = [COUNTS_KEY.format(user_id) for user_id in set(user_ids) if user_id]
+    if not keys:
+        return
+
+    def drop():
+        try:
+            get_cache().delete_many(keys)
+        except Exception:
+            logger.exception("Failed to drop approval inbox counts")
+
+    drop()
+    transaction.on_commit(drop)
+
+
+# ----------------------------------------------------------------------
+# Writes
+# ----------------------------------------------------------------------
+def _wanted_steps(proposal_ids):
+    return {
+        step_id: (proposal_id, user_id, None, "")
+        for step_id, proposal_id, user_id in ApprovalStep.objects.filter(
+            ACTIONABLE_STEP, proposal_id__in=proposal_ids
+        ).values_list("id", "proposal_id", "assigned_to_id")
+    }
+
+
+def _wanted_reports(proposal_ids):
+    return {
+        report_id: (proposal_id, None, organization_id, stage)
+        for report_id, proposal_id, organization_id, stage in EventReport.objects.filter(
+            proposal_id__in=proposal_ids
+        )
+        .exclude(review_stage=Stage.FINALIZED)
+        .values_list("id", "proposal_id", "proposal__organization_id", "review_stage")
+    }
+
+
+def _reconcile(kind, wanted, entries):
+    """Make ``entries`` match ``wanted``; return the changed value tuples."""
+    target = "step_id" if kind == Kind.STEP else "report_id"
+    existing = {
+        row[0]: (row[1], row[2:])
+        for row in entries.filter(kind=kind).values_list(
+            target, "id", "proposal_id", "user_id", "organization_id", "stage"
+        )
+    }
+    stale = [
+        (entry_id, values)
+        for target_id, (entry_id, values) in existing.items()
+        if wanted.get(target_id) != values
+    ]
+    fresh = [
+        (target_id, values)
+        for target_id, values in wanted.items()
+        if target_id not in existing or existing[target_id][1] != values
+    ]
+    if stale:
+        ApprovalInboxEntry.objects.filter(id__in=[entry_id for entry_id, _ in stale]).delete()
+    if fresh:
+        ApprovalInboxEntry.objects.bulk_create(
+            [
+                ApprovalInboxEntry(
+                    kind=kind,
+                    proposal_id=proposal_id,
+                    user_id=user_id,
+                    organization_id=organization_id,
+                    stage=stage,
+                    **{target: target_id},
+                )
+                for target_id, (proposal_id, user_id, organization_id, stage) in fresh
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return [values for _, values in stale] + [values for _, values in fresh]
+
+
+def _apply(proposal_ids, steps, reports):
+    entries = ApprovalInboxEntry.objects.filter(proposal_id__in=proposal_ids)
+    changed_steps, changed_reports = [], []
+    with transaction.atomic(savepoint=False):
+        if steps:
+            changed_steps = _reconcile(Kind.STEP, _wanted_steps(proposal_ids), entries)
+        if reports:
+            changed_reports = _reconcile(Kind.REPORT, _wanted_reports(proposal_ids), entries)
+    invalidate_users(user_id for _, user_id, _, _ in changed_steps)
+    if changed_reports:
+        bump_version_on_commit()
+    return len(changed_steps), len(changed_reports)
+
+
+def sync(proposal_ids, steps=True, reports=True):
+    """Recompute the inbox entries of ``proposal_ids``.
+
+    Large sets are handled ``BATCH_SIZE`` proposals at a time.  Returns the
+    number of step and report entries added or removed.
+    """
+    proposal_ids = sorted({proposal_id for proposal_id in proposal_ids if proposal_id})
+    changed_steps = changed_reports = 0
+    for start in range(0, len(proposal_ids), BATCH_SIZE):
+        batch = proposal_ids[start : start + BATCH_SIZE]
+        step_count, report_count = _apply(batch, steps, reports)
+        changed_steps += step_count
+        changed_reports += report_count
+    return changed_steps, changed_reports
+
+
+def move_reports(proposal):
+    """Follow a change of ``proposal``'s organization in its report entry."""
+    moved = (
+        ApprovalInboxEntry.objects.filter(kind=Kind.REPORT, proposal_id=proposal.pk)
+        .exclude(organization_id=proposal.organization_id)
+        .update(organization_id=proposal.organization_id)
+    )
+    if moved:
+        bump_version_on_commit()
+    return moved
+
+
+def rebuild():
+    """Reconcile the whole inbox with the steps and reports it mirrors."""
+    return sync(EventProposal.objects.values_list("pk", flat=True))
@@ -0,0 +1,145 @@
+"""Cached per-organization approver directory for building approval chains.
+
+Building a chain needs an organization's ``ApprovalFlowConfig``, its
+``ApprovalFlowTemplate`` steps and, for template steps without a fixed
+user, the user holding the step's role.  :func:`get_directories` resolves
+all of that for any number of organizations at once -- one query each for
+configs, templates and role assignments (of the organizations and their
+parents) -- and caches one entry per organization in the cache named by
+``settings.APPROVER_DIRECTORY_CACHE_ALIAS``.
+
+Entries carry a version stamp that ``core.signals`` bumps whenever a
+``RoleAssignment``, ``OrganizationRole``, ``ApprovalFlowTemplate``,
+``ApprovalFlowConfig`` or ``Organization`` changes, or a user is deleted.
+
+Role names are matched case-insensitively (``OrganizationRole.save``
+capitalizes them, templates store ``ApprovalStep.Role`` values).  A role
+nobody holds in the organization is looked up in its parent, then the
+grandparent, and so on.
+"""
+
+import logging
+
+from core.cache_version import VersionStamp
+from core.models import (
+    ApprovalFlowConfig,
+    ApprovalFlowTemplate,
+    Organization,
+    RoleAssignment,
+)
+
+logger = logging.getLogger(__name__)
+
+ENTRY_KEY = "emt:approvers:org:{}"
+CACHE_TIMEOUT = 3600
+MAX_DEPTH = 10
+
+
+stamp = VersionStamp(
+    "APPROVER_DIRECTORY_CACHE_ALIAS", "emt:approvers:version", "approver directory"
+)
+get_cache = stamp.get_cache
+current_version = stamp.current
+bump_version = stamp.bump
+bump_version_on_commit = stamp.bump_on_commit
+
+
+def _ancestry(org_ids):
+    """Return ``{org_id: [org_id, parent_id, ...]}`` for ``org_ids``."""
+    parents = {}
+    frontier = set(org_ids)
+    for _ in range(MAX_DEPTH):
+        frontier -= set(parents)
+        if not frontier:
+            break
+        rows = Organization.objects.filter(id__in=frontier).values_list("id", "parent_id")
+        found = dict(rows)
+        parents.update(found)
+        parents.update({org_id: None for org_id in frontier - set(found)})
+        frontier = {parent for parent in found.values() if parent}
+    chains = {}
+    for org_id in org_ids:
+        chain, current = [], org_id
+        while current and current not in chain and len(chain) < MAX_DEPTH:
+            chain.append(current)
+            current = parents.get(current)
+        chains[org_id] = chain
+    return chains
+
+
+def build(org_ids):
+    """Query the directories of ``org_ids``: ``{org_id: entry}``."""
+    org_ids = list(org_ids)
+    chains = _ancestry(org_ids)
+    fic_first = set(
+        ApprovalFlowConfig.objects.filter(
+            organization_id__in=org_ids, require_faculty_incharge_first=True
+        ).values_list("organization_id", flat=True)
+    )
+    templates = {org_id: [] for org_id in org_ids}
+    for org_id, role, user_id, optional in (
+        ApprovalFlowTemplate.objects.filter(organization_id__in=org_ids)
+        .order_by("organization_id", "step_order")
+        .values_list("organization_id", "role_required", "user_id", "optional")
+    ):
+        templates[org_id].append((role, user_id, optional))
+
+    holders = {}
+    every_org = {org for chain in chains.values() for org in chain}
+    for org_id, role, user_id in (
+        RoleAssignment.objects.filter(organization_id__in=every_org, role__isnull=False)
+        .order_by("user_id")
+        .values_list("organization_id", "role__name", "user_id")
+    ):
+        holders.setdefault(org_id, {}).setdefault(role.lower(), user_id)
+
+    directories = {}
+    for org_id in org_ids:
+        approvers = {}
+        for org in reversed(chains[org_id]):
+            approvers.update(holders.get(org, {}))
+        directories[org_id] = {
+            "require_faculty_incharge_first": org_id in fic_first,
+            "templates": templates[org_id],
+            "approvers": approvers,
+        }
+    return directories
+
+
+def get_directories(org_ids):
+    """Return ``{org_id: entry}``, building only the entries not cached.
+
+    An entry holds ``require_faculty_incharge_first``, ``templates`` as
+    ``(role_required, user_id, optional)`` in step order and ``approvers``
+    mapping lower-cased role names to a user id.
+    """
+    org_ids = {org_id for org_id in org_ids if org_id}
+    if not org_ids:
+        return {}
+    version = current_version()
+    if version is None:
+        return build(org_ids)
+    cache = get_cache()
+    keys = {org_id: ENTRY_KEY.format(org_id) for org_id in org_ids}
+    found = cache.get_many(list(keys.values()))
+    directories = {}
+    for org_id, key in keys.items():
+        entry = found.get(key)
+        if entry is not None and entry[0] == version:
+            directories[org_id] = entry[1]
+    missing = org_ids - set(directories)
+    if missing:
+        built = build(missing)
+        directories.update(built)
+        try:
+            cache.set_many(
+                {keys[org_id]: (version, entry) for org_id, entry in built.items()},
+                CACHE_TIMEOUT,
+            )
+        except Exception:
+            logger.exception("Failed to store approver directories")
+    return directories
+
+
+def get_directory(org_id):
+    return get_directories([org_id]).get(org_id)
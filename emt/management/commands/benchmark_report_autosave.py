@@ -0,0 +1,111 @@
+"""Measure the bytes an event report autosave writes to the database.
+
+Replays an editing session through ``emt.views.autosave_event_report``: a
+report whose text sections hold ``--field-size`` characters each, with one
+section edited per autosave.  Every INSERT/UPDATE/DELETE is captured and the
+length of its SQL (parameters included) summed per autosave.  The size of
+the full JSON payload is printed alongside, which is what storing a
+snapshot per autosave used to rewrite at the very least.  Everything runs
+in a transaction that is rolled back.
+"""
+
+import json
+import statistics
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from emt.models import EventProposal
+from emt.views import autosave_event_report
+
+TEXT_FIELDS = [
+    "event_summary",
+    "event_outcomes",
+    "analysis",
+    "key_achievements",
+    "notable_moments",
+    "learning_outcomes",
+    "participant_feedback",
+    "measurable_outcomes",
+    "impact_assessment",
+    "lessons_learned",
+]
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+class Command(BaseCommand):
+    help = "Report the bytes written to the database per event report autosave."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--autosaves", type=int, default=50)
+        parser.add_argument("--field-size", type=int, default=2000)
+        parser.add_argument("--json", action="store_true", help="Print the result as JSON.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            result = self._run(options["autosaves"], options["field_size"])
+            transaction.set_rollback(True)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(
+            f"{result['autosaves']} autosaves, payload {result['payload_bytes']} bytes"
+        )
+        self.stdout.write(
+            "bytes written per autosave: "
+            f"median {result['median_bytes']}, mean {result['mean_bytes']}, "
+            f"max {result['max_bytes']} (first save {result['first_bytes']})"
+        )
+
+    def _run(self, autosaves, field_size):
+        user = User.objects.create_user(username="__autosave_benchmark__")
+        proposal = EventProposal.objects.create(
+            submitted_by=user, event_title="Autosave benchmark"
+        )
+        payload = {
+            "proposal_id": proposal.id,
+            "location": "Main Hall",
+            "num_activities": "2",
+            "activity_name_1": "Opening",
+            "activity_date_1": "2024-01-01",
+            "activity_name_2": "Workshop",
+            "activity_date_2": "2024-01-02",
+        }
+        for name in TEXT_FIELDS:
+            payload[name] = (f"{name} " * field_size)[:field_size]
+
+        factory = RequestFactory()
+        url = reverse("emt:autosave_event_report")
+        written = []
+        for index in range(autosaves + 1):
+            if index:
+                name = TEXT_FIELDS[index % len(TEXT_FIELDS)]
+                payload[name] = payload[name][:-12] + f" edit {index:05d}"
+            request = factory.post(
+                url, data=json.dumps(payload), content_type="application/json"
+            )
+            request.user = user
+            with CaptureQueriesContext(connection) as queries:
+                response = autosave_event_report(request)
+            if response.status_code != 200:
+                raise RuntimeError(response.content.decode())
+            payload["report_id"] = json.loads(response.content)["report_id"]
+            written.append(
+                sum(len(q["sql"]) for q in queries if q["sql"].startswith(WRITES))
+            )
+
+        per_save = written[1:]
+        return {
+            "autosaves": autosaves,
+            "payload_bytes": len(json.dumps(payload)),
+            "first_bytes": written[0],
+            "median_bytes": int(statistics.median(per_save)) if per_save else 0,
+            "mean_bytes": int(statistics.mean(per_save)) if per_save else 0,
+            "max_bytes": max(per_save, default=0),
+        }
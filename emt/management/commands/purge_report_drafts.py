@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from emt import report_drafts
+
+
+class Command(BaseCommand):
+    help = "Delete server-side event report drafts that have not been touched for the TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ttl-days",
+            type=int,
+            default=report_drafts.get_config()["TTL_DAYS"],
+            help="Delete drafts untouched for this many days.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = report_drafts.purge_expired(options["ttl_days"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired report draft(s)."))
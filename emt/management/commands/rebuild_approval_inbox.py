@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from emt import approval_inbox
+
+
+class Command(BaseCommand):
+    help = "Reconcile the approval inbox with the approval steps and event reports."
+
+    def handle(self, *args, **options):
+        steps, reports = approval_inbox.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled approval inbox: {steps} step and {reports} report entry change(s)."
+            )
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emt', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventproposal',
+            name='autosave_field_versions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='eventproposal',
+            name='autosave_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
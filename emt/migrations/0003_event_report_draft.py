@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 14:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emt', '0002_proposal_autosave_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReportDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form', models.CharField(default='event_report', max_length=32)),
+                ('payload', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('proposal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_drafts', to='emt.eventproposal')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_report_drafts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='emt_eventre_updated_5391dc_idx')],
+                'unique_together': {('user', 'proposal', 'form')},
+            },
+        ),
+    ]
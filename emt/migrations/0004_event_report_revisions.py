@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-17 14:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emt', '0003_event_report_draft'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventreport',
+            name='checkpoint_revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventreport',
+            name='revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='eventreport',
+            name='generated_payload',
+            field=models.JSONField(blank=True, default=dict, help_text='Stores the autosave payload as of the latest checkpoint revision; later changes are diffs in EventReportRevision.'),
+        ),
+        migrations.CreateModel(
+            name='EventReportRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('checkpoint', models.BooleanField(default=False)),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='emt.eventreport')),
+            ],
+            options={
+                'ordering': ['report', 'number'],
+                'unique_together': {('report', 'number')},
+            },
+        ),
+    ]
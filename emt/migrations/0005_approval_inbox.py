@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-17 15:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def backfill_inbox(apps, schema_editor):
+    ApprovalStep = apps.get_model("emt", "ApprovalStep")
+    EventReport = apps.get_model("emt", "EventReport")
+    ApprovalInboxEntry = apps.get_model("emt", "ApprovalInboxEntry")
+
+    steps = (
+        ApprovalStep.objects.filter(status="pending", assigned_to__isnull=False)
+        .filter(Q(is_optional=False) | Q(optional_unlocked=True))
+        .values_list("id", "proposal_id", "assigned_to_id")
+    )
+    ApprovalInboxEntry.objects.bulk_create(
+        [
+            ApprovalInboxEntry(kind="step", step_id=step_id, proposal_id=proposal_id, user_id=user_id)
+            for step_id, proposal_id, user_id in steps.iterator()
+        ],
+        batch_size=1000,
+    )
+    reports = EventReport.objects.exclude(review_stage="finalized").values_list(
+        "id", "proposal_id", "proposal__organization_id", "review_stage"
+    )
+    ApprovalInboxEntry.objects.bulk_create(
+        [
+            ApprovalInboxEntry(
+                kind="report",
+                report_id=report_id,
+                proposal_id=proposal_id,
+                organization_id=organization_id,
+                stage=stage,
+            )
+            for report_id, proposal_id, organization_id, stage in reports.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_activitylog_keyset_suggestions'),
+        ('emt', '0004_event_report_revisions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApprovalInboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('step', 'Approval step'), ('report', 'Event report')], max_length=10)),
+                ('stage', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.organization')),
+                ('proposal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='emt.eventproposal')),
+                ('report', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entry', to='emt.eventreport')),
+                ('step', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entry', to='emt.approvalstep')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='approval_inbox', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Approval Inbox Entry',
+                'verbose_name_plural': 'Approval Inbox Entries',
+                'indexes': [models.Index(fields=['user', 'kind'], name='emt_approva_user_id_3cfb8b_idx'), models.Index(fields=['kind', 'organization', 'stage'], name='emt_approva_kind_c9f802_idx'), models.Index(fields=['kind', 'stage'], name='emt_approva_kind_236efd_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_inbox, migrations.RunPython.noop),
+    ]
@@ -118,6 +118,11 @@ class EventProposal(models.Model):
         default=False,
         help_text="Hide draft from submitter while retaining it for admin review.",
     )
+    # Optimistic concurrency for editor autosaves (see emt/proposal_autosave.py):
+    # the draft version and, per field or row group, the version that last
+    # changed it.
+    autosave_version = models.PositiveIntegerField(default=0)
+    autosave_field_versions = models.JSONField(default=dict, blank=True)
 
     class Meta:
         verbose_name = "Event Proposal"
@@ -669,10 +674,13 @@ class EventReport(models.Model):
         default=dict,
         blank=True,
         help_text=(
-            "Stores the most recent autosave payload so partially completed "
-            "reports can be recovered without breaking database constraints."
+            "Stores the autosave payload as of the latest checkpoint revision; "
+            "later changes are diffs in EventReportRevision."
         ),
     )
+    # Autosave revision log position (see emt/report_revisions.py)
+    revision = models.PositiveIntegerField(default=0)
+    checkpoint_revision = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -684,6 +692,30 @@ class EventReport(models.Model):
         return f"Report for {self.proposal.event_title}"
 
 
+class EventReportRevision(models.Model):
+    """One autosave of an event report: a diff, or a full checkpoint."""
+
+    report = models.ForeignKey(
+        EventReport, on_delete=models.CASCADE, related_name="revisions"
+    )
+    number = models.PositiveIntegerField()
+    checkpoint = models.BooleanField(default=False)
+    # Full payload for checkpoints, otherwise {"set": {...}, "unset": [...]}
+    data = models.JSONField(default=dict)
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("report", "number")
+        ordering = ["report", "number"]
+
+    def __str__(self):
+        kind = "checkpoint" if self.checkpoint else "diff"
+        return f"Report {self.report_id} r{self.number} ({kind})"
+
+
 class EventReportMessage(models.Model):
     """Threaded communication for an EventReport across roles."""
 
@@ -740,6 +772,103 @@ class AttendanceRow(models.Model):
         return f"{self.full_name} ({self.registration_no})"
 
 
+class EventReportDraft(models.Model):
+    """Unsubmitted report form values for one user, proposal and form.
+
+    Kept out of the session so its size does not grow with every report a
+    user is drafting; see emt/report_drafts.py.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="event_report_drafts",
+    )
+    proposal = models.ForeignKey(
+        EventProposal,
+        on_delete=models.CASCADE,
+        related_name="report_drafts",
+    )
+    form = models.CharField(max_length=32, default="event_report")
+    # zlib-compressed JSON object of field name → value
+    payload = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "proposal", "form")
+        indexes = [models.Index(fields=["updated_at"])]
+
+    def __str__(self):
+        return f"Draft {self.form} for {self.proposal_id} by {self.user_id}"
+
+
+# ────────────────────────────────────────────────────────────────
+#  Approval Inbox
+# ────────────────────────────────────────────────────────────────
+class ApprovalInboxEntry(models.Model):
+    """Something waiting on a reviewer; rebuilt from the source rows.
+
+    A ``step`` entry exists for every pending approval step its assignee can
+    act on, a ``report`` entry for every event report not yet finalized
+    (with the proposal's organization and the report's review stage copied
+    over).  Kept in sync by emt/approval_inbox.py.
+    """
+
+    class Kind(models.TextChoices):
+        STEP = "step", "Approval step"
+        REPORT = "report", "Event report"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    proposal = models.ForeignKey(
+        EventProposal, on_delete=models.CASCADE, related_name="inbox_entries"
+    )
+    step = models.OneToOneField(
+        ApprovalStep,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="inbox_entry",
+    )
+    report = models.OneToOneField(
+        EventReport,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="inbox_entry",
+    )
+    # Step entries: the assignee
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="approval_inbox",
+    )
+    # Report entries: the proposal's organization and the review stage
+    organization = models.ForeignKey(
+        Organization,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    stage = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "kind"]),
+            models.Index(fields=["kind", "organization", "stage"]),
+            models.Index(fields=["kind", "stage"]),
+        ]
+        verbose_name = "Approval Inbox Entry"
+        verbose_name_plural = "Approval Inbox Entries"
+
+    def __str__(self):
+        target = self.step_id if self.kind == self.Kind.STEP else self.report_id
+        return f"{self.get_kind_display()} {target}"
+
+
 # ────────────────────────────────────────────────────────────────
 #  STUDENT PROFILE
 # ────────────────────────────────────────────────────────────────
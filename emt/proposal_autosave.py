@@ -0,0 +1,205 @@
+"""Versioned, field-level autosave for event proposal drafts.
+
+Once a draft exists the proposal editor sends only what changed since its
+last acknowledged save, together with the version it was based on::
+
+    {"proposal_id": 12, "version": 7, "changes": {"venue": "Hall B"}}
+
+``changes`` uses the editor's field names.  Dynamic rows (activities,
+speakers, expenses, income) travel as whole groups: when any
+``activity_*`` key is sent, every current ``activity_*`` key is sent and
+the activities are rewritten; untouched groups are never written.
+
+``emt.views.autosave_proposal`` applies a delta under a row lock and bumps
+``EventProposal.autosave_version``.  ``autosave_field_versions`` records
+the version that last changed each field or group, so a save based on an
+older version is refused with ``409`` and the server values of everything
+changed since (see :func:`serialize`).  Full-form autosaves bump the
+version too, so both kinds of client see each other's edits.
+"""
+
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from .models import EventProposal
+
+SCALAR_FIELDS = (
+    "event_title",
+    "event_start_date",
+    "event_end_date",
+    "venue",
+    "committees_collaborations",
+    "num_activities",
+    "student_coordinators",
+    "pos_pso",
+    "target_audience",
+    "event_focus_type",
+    "fest_fee_participants",
+    "fest_fee_rate",
+    "fest_fee_amount",
+    "fest_sponsorship_amount",
+    "conf_fee_participants",
+    "conf_fee_rate",
+    "conf_fee_amount",
+    "conf_sponsorship_amount",
+)
+M2M_FIELDS = ("faculty_incharges", "sdg_goals")
+
+# Editor field → related name of the one-to-one text section.
+TEXT_SECTIONS = {
+    "need_analysis": "need_analysis",
+    "objectives": "objectives",
+    "outcomes": "expected_outcomes",
+    "flow": "tentative_flow",
+}
+
+# Row groups: key pattern, related name, first row index and the editor
+# field → model attribute of each row.
+GROUPS = {
+    "activities": (
+        re.compile(r"^activity_(?:name|date)_(\d+)$"),
+        "activities",
+        1,
+        {"activity_name": "name", "activity_date": "date"},
+    ),
+    "speakers": (
+        re.compile(
+            r"^speaker_(?:full_name|designation|affiliation|contact_email|"
+            r"contact_number|linkedin_url|photo|detailed_profile)_(\d+)$"
+        ),
+        "speakers",
+        0,
+        {
+            "speaker_full_name": "full_name",
+            "speaker_designation": "designation",
+            "speaker_affiliation": "affiliation",
+            "speaker_contact_email": "contact_email",
+            "speaker_contact_number": "contact_number",
+            "speaker_linkedin_url": "linkedin_url",
+            "speaker_detailed_profile": "detailed_profile",
+        },
+    ),
+    "expenses": (
+        re.compile(r"^expense_(?:sl_no|particulars|amount)_(\d+)$"),
+        "expense_details",
+        0,
+        {
+            "expense_sl_no": "sl_no",
+            "expense_particulars": "particulars",
+            "expense_amount": "amount",
+        },
+    ),
+    "income": (
+        re.compile(r"^income_(?:sl_no|particulars|participants|rate|amount)_(\d+)$"),
+        "income_details",
+        0,
+        {
+            "income_sl_no": "sl_no",
+            "income_particulars": "particulars",
+            "income_participants": "participants",
+            "income_rate": "rate",
+            "income_amount": "amount",
+        },
+    ),
+}
+
+VERSION_FIELDS = ["autosave_version", "autosave_field_versions", "updated_at"]
+
+_form_fields = {}
+
+
+def form_field(name):
+    """Return the (cached) form field validating the model field ``name``."""
+    field = _form_fields.get(name)
+    if field is None:
+        field = _form_fields[name] = EventProposal._meta.get_field(name).formfield()
+    return field
+
+
+def group_of(key):
+    """Return the row group a changed key belongs to, or ``None``."""
+    for name, (pattern, *_rest) in GROUPS.items():
+        if pattern.match(key):
+            return name
+    return None
+
+
+def tracked_name(key):
+    """Map an editor key to the name its version is recorded under."""
+    if key == "organization_type":
+        return "organization"
+    return group_of(key) or key
+
+
+def split_groups(changes):
+    """Return ``{group: {key: value}}`` for the row groups present in ``changes``."""
+    groups = {}
+    for key, value in changes.items():
+        group = group_of(key)
+        if group:
+            groups.setdefault(group, {})[key] = value
+    return groups
+
+
+def bump(proposal, names):
+    """Advance the draft version, recording it for ``names``.
+
+    Only sets attributes; returns the fields the caller must save.
+    """
+    proposal.autosave_version = (proposal.autosave_version or 0) + 1
+    versions = dict(proposal.autosave_field_versions or {})
+    for name in names:
+        versions[name] = proposal.autosave_version
+    proposal.autosave_field_versions = versions
+    return list(VERSION_FIELDS)
+
+
+def changed_since(proposal, version):
+    """Names changed by saves after ``version``."""
+    versions = proposal.autosave_field_versions or {}
+    return sorted(name for name, changed in versions.items() if changed > version)
+
+
+def _json(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _section_content(proposal, related_name):
+    try:
+        return getattr(proposal, related_name).content or ""
+    except ObjectDoesNotExist:
+        return ""
+
+
+def serialize(proposal, names):
+    """Return the current server values of ``names`` as editor keys."""
+    values = {}
+    for name in names:
+        if name == "organization":
+            organization = proposal.organization
+            values["organization"] = str(organization.pk) if organization else ""
+            values["organization_type"] = str(organization.org_type_id) if organization else ""
+        elif name in SCALAR_FIELDS:
+            values[name] = _json(getattr(proposal, name))
+        elif name in M2M_FIELDS:
+            values[name] = [
+                str(pk) for pk in getattr(proposal, name).order_by("pk").values_list("pk", flat=True)
+            ]
+        elif name in TEXT_SECTIONS:
+            values[name] = _section_content(proposal, TEXT_SECTIONS[name])
+        elif name in GROUPS:
+            _, related_name, start, columns = GROUPS[name]
+            rows = getattr(proposal, related_name).order_by("pk")
+            for index, row in enumerate(rows, start=start):
+                for prefix, attribute in columns.items():
+                    values[f"{prefix}_{index}"] = _json(getattr(row, attribute))
+    return values
@@ -0,0 +1,118 @@
+"""Change stamps and push stream for the proposal editor's live sync.
+
+``emt.views.proposal_live_state`` serializes a proposal with seven related
+tables.  Before doing any of that it reads the proposal's stamp -- its
+``updated_at`` and ``autosave_version`` -- with one indexed query and
+answers ``If-None-Match``/``If-Modified-Since`` with 304 when the editor
+already has that state.
+
+Writes to the proposal's text sections, rows and many-to-many fields do not
+save the proposal itself, so ``core.signals`` calls :func:`touch` for them;
+it moves ``updated_at`` forward once per transaction, after commit.
+
+:func:`live_events` backs the server-sent events variant: it re-reads only
+the stamp every few seconds and emits an event when it changes, and the
+editor then fetches the state with its ETag.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EventProposal
+
+STREAM_POLL_SECONDS = 2
+STREAM_MAX_SECONDS = 300
+STREAM_KEEPALIVE_SECONDS = 30
+
+
+def stamp(proposal_id, user):
+    """Return ``(updated_at, autosave_version)`` of ``user``'s proposal, or ``None``."""
+    return (
+        EventProposal.objects.filter(pk=proposal_id, submitted_by=user)
+        .values_list("updated_at", "autosave_version")
+        .first()
+    )
+
+
+def etag(proposal_id, current):
+    updated_at, version = current
+    moment = updated_at.timestamp() if updated_at else 0
+    return f'"{proposal_id}-{version}-{moment:.6f}"'
+
+
+# Per thread (and so per connection): proposal id -> its pending _Touch.
+# Django holds the only strong reference to a callback until it runs, so a
+# rolled-back transaction or savepoint drops its entries here as well.
+_pending = threading.local()
+
+
+def _pending_touches():
+    touches = getattr(_pending, "touches", None)
+    if touches is None:
+        touches = _pending.touches = weakref.WeakValueDictionary()
+    return touches
+
+
+class _Touch:
+    """On-commit callback moving ``updated_at`` of one proposal forward."""
+
+    def __init__(self, proposal_id):
+        self.proposal_id = proposal_id
+
+    def __call__(self):
+        touches = _pending_touches()
+        if touches.get(self.proposal_id) is self:
+            del touches[self.proposal_id]
+        EventProposal.objects.filter(pk=self.proposal_id).update(updated_at=timezone.now())
+
+
+def touch(proposal_id):
+    """Mark ``proposal_id`` changed once the surrounding transaction commits."""
+    if not proposal_id:
+        return
+    touches = _pending_touches()
+    if touches.get(proposal_id) is not None:
+        return
+    callback = touches[proposal_id] = _Touch(proposal_id)
+    transaction.on_commit(callback)
+
+
+async def live_events(
+    proposal_id,
+    user,
+    last_event_id=None,
+    poll_seconds=STREAM_POLL_SECONDS,
+    max_seconds=STREAM_MAX_SECONDS,
+):
+    """Yield a server-sent event whenever the proposal's stamp changes.
+
+    The event id is the ETag, so a reconnecting ``EventSource`` sending
+    ``Last-Event-ID`` hears nothing until the proposal changes again.  The
+    stream ends after ``max_seconds`` or when the proposal disappears.
+    """
+    read_stamp = sync_to_async(stamp)
+    deadline = time.monotonic() + max_seconds
+    last_sent = time.monotonic()
+    yield f"retry: {poll_seconds * 1000}\n\n"
+    while True:
+        current = await read_stamp(proposal_id, user)
+        if current is None:
+            return
+        now = time.monotonic()
+        tag = etag(proposal_id, current)
+        if tag != last_event_id:
+            last_event_id, last_sent = tag, now
+            updated_at = current[0].isoformat() if current[0] else ""
+            yield f"id: {tag}\nevent: proposal\ndata: {updated_at}\n\n"
+        elif now - last_sent >= STREAM_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keep-alive\n\n"
+        if now + poll_seconds > deadline:
+            return
+        await asyncio.sleep(poll_seconds)
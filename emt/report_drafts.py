@@ -0,0 +1,131 @@
+"""Server-side drafts of the event report form.
+
+Unsubmitted report values used to live under
+``request.session["event_report_draft"][proposal_id]``, so every request
+from a user re-read and re-wrote all of their drafts with the session.
+They are now :class:`~emt.models.EventReportDraft` rows keyed by
+``(user, proposal, form)`` holding zlib-compressed JSON:
+
+* :func:`load` reads one draft (``{}`` when missing or expired);
+* :func:`save` stores the full set of posted values and :func:`update`
+  merges a few fields into it, both under a row lock and skipping the
+  write when nothing changed;
+* :func:`discard` drops a draft once the report is submitted;
+* :func:`purge_expired` (``manage.py purge_report_drafts``) deletes drafts
+  untouched for ``TTL_DAYS``.
+
+Configured through ``settings.REPORT_DRAFTS``; see :data:`DEFAULTS`.
+"""
+
+import json
+import logging
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import EventReportDraft
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Drafts untouched for this many days are ignored and purged.
+    "TTL_DAYS": 30,
+    "COMPRESSION_LEVEL": 6,
+}
+
+EVENT_REPORT = "event_report"
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "REPORT_DRAFTS", {}) or {})
+    return config
+
+
+def encode(data):
+    raw = json.dumps(data, separators=(",", ":"), sort_keys=True, default=str)
+    return zlib.compress(raw.encode("utf-8"), get_config()["COMPRESSION_LEVEL"])
+
+
+def decode(payload):
+    try:
+        return json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+    except (zlib.error, ValueError):
+        logger.warning("Discarding unreadable report draft payload")
+        return {}
+
+
+def _expiry():
+    return timezone.now() - timedelta(days=get_config()["TTL_DAYS"])
+
+
+def load(user, proposal_id, form=EVENT_REPORT):
+    """Return the stored values of ``user``'s draft, or ``{}``."""
+    payload = (
+        EventReportDraft.objects.filter(
+            user=user, proposal_id=proposal_id, form=form, updated_at__gt=_expiry()
+        )
+        .values_list("payload", flat=True)
+        .first()
+    )
+    return decode(payload) if payload is not None else {}
+
+
+def _write(user, proposal_id, form, merge):
+    try:
+        return _write_locked(user, proposal_id, form, merge)
+    except IntegrityError:
+        # A concurrent first save created the row; lock and merge into it.
+        return _write_locked(user, proposal_id, form, merge)
+
+
+def _write_locked(user, proposal_id, form, merge):
+    with transaction.atomic():
+        draft = (
+            EventReportDraft.objects.select_for_update()
+            .filter(user=user, proposal_id=proposal_id, form=form)
+            .first()
+        )
+        if draft is None:
+            data = merge({})
+            EventReportDraft.objects.create(
+                user=user, proposal_id=proposal_id, form=form, payload=encode(data)
+            )
+            return data
+        current = decode(draft.payload) if draft.updated_at > _expiry() else {}
+        data = merge(dict(current))
+        if data != current:
+            draft.payload = encode(data)
+            draft.save(update_fields=["payload", "updated_at"])
+        return data
+
+
+def save(user, proposal_id, data, form=EVENT_REPORT):
+    """Replace the draft with ``data`` (all of the form's posted values)."""
+    return _write(user, proposal_id, form, lambda current: dict(data))
+
+
+def update(user, proposal_id, changes, form=EVENT_REPORT):
+    """Merge ``changes`` into the draft, creating it if needed."""
+
+    def merge(current):
+        current.update(changes)
+        return current
+
+    return _write(user, proposal_id, form, merge)
+
+
+def discard(user, proposal_id, form=EVENT_REPORT):
+    EventReportDraft.objects.filter(user=user, proposal_id=proposal_id, form=form).delete()
+
+
+def purge_expired(ttl_days=None):
+    """Delete drafts untouched for ``ttl_days``; return how many were removed."""
+    if ttl_days is None:
+        ttl_days = get_config()["TTL_DAYS"]
+    cutoff = timezone.now() - timedelta(days=ttl_days)
+    deleted, _ = EventReportDraft.objects.filter(updated_at__lte=cutoff).delete()
+    return deleted
@@ -0,0 +1,131 @@
+"""Append-only revision log for event report autosaves.
+
+Every autosave that changes the payload appends an
+:class:`~emt.models.EventReportRevision`.  Most revisions store only a
+diff against the previous payload::
+
+    {"set": {"location": "Hall B"}, "unset": ["blog_link"]}
+
+Every ``CHECKPOINT_EVERY`` revisions (and the first one) stores the full
+payload instead, and only then is ``EventReport.generated_payload``
+rewritten, so a keystroke burst writes a few hundred bytes rather than the
+whole report.  ``EventReport.revision`` is the latest revision and
+``checkpoint_revision`` the one ``generated_payload`` holds;
+:func:`current_payload` applies the diffs in between, and
+:func:`reconstruct` rebuilds any earlier revision from the nearest
+checkpoint.
+
+Configured through ``settings.REPORT_REVISIONS``; see :data:`DEFAULTS`.
+"""
+
+from django.conf import settings
+
+from .models import EventReportRevision
+
+_MISSING = object()
+
+DEFAULTS = {
+    # Store a full payload every this many revisions.
+    "CHECKPOINT_EVERY": 25,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "REPORT_REVISIONS", {}) or {})
+    return config
+
+
+def diff(old, new):
+    """Return the change from payload ``old`` to ``new`` (``{}`` when equal)."""
+    changes = {}
+    changed = {key: value for key, value in new.items() if old.get(key, _MISSING) != value}
+    removed = sorted(key for key in old if key not in new)
+    if changed:
+        changes["set"] = changed
+    if removed:
+        changes["unset"] = removed
+    return changes
+
+
+def apply(payload, changes):
+    payload = dict(payload)
+    for key in changes.get("unset", ()):
+        payload.pop(key, None)
+    payload.update(changes.get("set", {}))
+    return payload
+
+
+def touches(changes, prefix):
+    """Whether ``changes`` sets or unsets any key starting with ``prefix``."""
+    keys = list(changes.get("set", {})) + list(changes.get("unset", ()))
+    return any(key.startswith(prefix) for key in keys)
+
+
+def current_payload(report):
+    """Return the latest autosaved payload of ``report``."""
+    payload = report.generated_payload if isinstance(report.generated_payload, dict) else {}
+    if report.revision > report.checkpoint_revision:
+        diffs = (
+            report.revisions.filter(
+                number__gt=report.checkpoint_revision, number__lte=report.revision
+            )
+            .order_by("number")
+            .values_list("data", flat=True)
+        )
+        for changes in diffs:
+            payload = apply(payload, changes)
+    return payload
+
+
+def reconstruct(report, number):
+    """Return the payload as of revision ``number``."""
+    if number < 1 or number > report.revision:
+        raise EventReportRevision.DoesNotExist(
+            f"Report {report.pk} has no revision {number}."
+        )
+    checkpoint = (
+        report.revisions.filter(number__lte=number, checkpoint=True)
+        .order_by("-number")
+        .values_list("number", "data")
+        .first()
+    )
+    start, payload = checkpoint if checkpoint else (0, {})
+    diffs = (
+        report.revisions.filter(number__gt=start, number__lte=number)
+        .order_by("number")
+        .values_list("data", flat=True)
+    )
+    for changes in diffs:
+        payload = apply(payload, changes)
+    return payload
+
+
+def record(report, payload, author=None):
+    """Append a revision for ``payload`` if it differs from the current one.
+
+    ``report`` should be locked by the caller.  Sets the revision fields on
+    ``report`` without saving it and returns ``(changes, update_fields)``.
+    """
+    changes = diff(current_payload(report), payload)
+    if not changes:
+        return changes, []
+    number = report.revision + 1
+    checkpoint = (
+        report.checkpoint_revision == 0
+        or number - report.checkpoint_revision >= get_config()["CHECKPOINT_EVERY"]
+    )
+    EventReportRevision.objects.create(
+        report=report,
+        number=number,
+        checkpoint=checkpoint,
+        data=payload if checkpoint else changes,
+        author=author,
+    )
+    report.revision = number
+    update_fields = ["revision"]
+    if checkpoint:
+        report.generated_payload = payload
+        report.checkpoint_revision = number
+        update_fields += ["generated_payload", "checkpoint_revision"]
+    return changes, update_fields
@@ -1,5 +1,12 @@
 // AutosaveManager handles autosaving draft proposals including dynamic fields
 // and exposing hooks for reinitializing field listeners and manual saves.
+//
+// The first save of a page sends the whole form and learns the draft's
+// autosave version. Later saves send only the fields that differ from the
+// last acknowledged save (dynamic rows as whole groups) with that version;
+// only one request is in flight and edits made meanwhile are coalesced into
+// the next one. A 409 means the draft changed elsewhere: its diff becomes the
+// new baseline and only our own edits are resent.
 
 window.AutosaveManager = (function() {
     let proposalId = window.PROPOSAL_ID || '';
@@ -11,6 +18,12 @@ window.AutosaveManager = (function() {
     let isRestoringDynamic = false;
     let lastSentSignature = null;
     let pendingSignature = null;
+    // Delta autosave state
+    let serverVersion = null;
+    let lastSynced = null;
+    let inFlight = null;
+    let queued = null;
+    const ROW_GROUPS = [/^activity_/, /^speaker_/, /^expense_/, /^income_/];
 
     // Always read the freshest CSRF value to avoid mismatches when the token
     // rotates after a login or in another tab. Prefer cookie, then <meta>,
@@ -123,6 +136,79 @@ window.AutosaveManager = (function() {
         }
     }
 
+    function sameValue(a, b) {
+        return computeSignature({ v: a }) === computeSignature({ v: b });
+    }
+
+    function groupOf(key) {
+        const group = ROW_GROUPS.find(re => re.test(key));
+        return group ? group.source : null;
+    }
+
+    // Fields that differ from the last acknowledged save. A changed row
+    // resends its whole group so the server can replace the rows.
+    function computeDelta(current, base) {
+        const changes = {};
+        const dirtyGroups = new Set();
+        const keys = new Set([...Object.keys(current), ...Object.keys(base)]);
+        keys.forEach(key => {
+            if (key === 'proposal_id' || sameValue(current[key], base[key])) return;
+            const group = groupOf(key);
+            if (group) {
+                dirtyGroups.add(group);
+            } else if (current[key] === undefined) {
+                changes[key] = Array.isArray(base[key]) ? [] : '';
+            } else {
+                changes[key] = current[key];
+            }
+        });
+        Object.keys(current).forEach(key => {
+            if (dirtyGroups.has(groupOf(key))) changes[key] = current[key];
+        });
+        return changes;
+    }
+
+    // Put a server value into the inputs named ``key``; false when there is
+    // no plain input to update (rows, files, custom widgets).
+    function applyServerValue(key, value) {
+        const inputs = Array.from(document.querySelectorAll(`[name="${CSS.escape(key)}"]`))
+            .filter(f => !f.closest('.speaker-item'));
+        if (!inputs.length || inputs.some(f => f.type === 'file') || groupOf(key)) return false;
+        inputs.forEach(f => {
+            if (f.type === 'checkbox') {
+                f.checked = Array.isArray(value) ? value.includes(f.value) : !!value;
+            } else if (f.type === 'radio') {
+                f.checked = value === f.value;
+            } else if (f.multiple) {
+                const values = Array.isArray(value) ? value : [value];
+                Array.from(f.options).forEach(o => { o.selected = values.includes(o.value); });
+            } else {
+                f.value = value;
+            }
+            f.dispatchEvent(new Event('change', { bubbles: true }));
+        });
+        return true;
+    }
+
+    // Take the server's newer values as the baseline. Fields we edited keep
+    // our value (and are resent); the rest show the server value.
+    function rebase(conflict, formData) {
+        Object.entries(conflict.diff || {}).forEach(([key, value]) => {
+            if (!sameValue(formData[key], lastSynced[key])) {
+                lastSynced[key] = value;
+                return;
+            }
+            if (applyServerValue(key, value)) {
+                formData[key] = value;
+                lastSynced[key] = value;
+            } else {
+                lastSynced[key] = formData[key];
+            }
+        });
+        serverVersion = conflict.version;
+        document.dispatchEvent(new CustomEvent('autosave:conflict', { detail: conflict }));
+    }
+
     function collectFieldData() {
         const saved = getSavedData();
         const grouped = {};
@@ -230,6 +316,74 @@ window.AutosaveManager = (function() {
     }
 
     function autosaveDraft() {
+        if (inFlight) {
+            // Coalesce bursts: one follow-up save sends everything changed meanwhile.
+            if (!queued) {
+                queued = inFlight.catch(() => {}).then(() => {
+                    queued = null;
+                    return autosaveDraft();
+                });
+            }
+            return queued;
+        }
+        inFlight = runSave().finally(() => { inFlight = null; });
+        return inFlight;
+    }
+
+    function sendDelta(changes, formData, seq, retried) {
+        document.dispatchEvent(new Event('autosave:start'));
+        return fetch(window.AUTOSAVE_URL, {
+            method: 'POST',
+            headers: { 'X-CSRFToken': getCSRFToken(), 'Content-Type': 'application/json' },
+            credentials: 'same-origin',
+            body: JSON.stringify({ proposal_id: proposalId, version: serverVersion, changes }),
+        })
+        .then(async res => {
+            let data = null;
+            try {
+                data = await res.json();
+            } catch (e) {
+                // ignore JSON parse errors
+            }
+            if (res.status === 409 && data && data.diff && !retried) {
+                rebase(data, formData);
+                const again = computeDelta(formData, lastSynced);
+                if (!Object.keys(again).length) {
+                    return { success: true, proposal_id: data.proposal_id, version: data.version };
+                }
+                return sendDelta(again, formData, seq, true);
+            }
+            if (!res.ok) {
+                return Promise.reject(data || res.status);
+            }
+            return data;
+        })
+        .then(data => {
+            if (!data || !data.proposal_id) {
+                return Promise.reject(data);
+            }
+            serverVersion = data.version;
+            lastSynced = formData;
+            lastSentSignature = computeSignature(formData);
+            if (seq >= lastHandledSeq) {
+                lastHandledSeq = seq;
+                saveLocal();
+                document.dispatchEvent(new CustomEvent('autosave:success', {
+                    detail: { proposalId: data.proposal_id, errors: data.errors, success: data.success }
+                }));
+            }
+            return data;
+        })
+        .catch(err => {
+            if (seq >= lastHandledSeq) {
+                lastHandledSeq = seq;
+                document.dispatchEvent(new CustomEvent('autosave:error', {detail: err}));
+            }
+            return Promise.reject(err);
+        });
+    }
+
+    function runSave() {
         const seq = ++saveSeq;
         // Don't autosave for submitted proposals
         if (window.PROPOSAL_STATUS && window.PROPOSAL_STATUS !== 'draft') {
@@ -244,6 +398,14 @@ window.AutosaveManager = (function() {
 
         const formEl = document.querySelector('form');
         const hasFile = formEl && Array.from(formEl.querySelectorAll('input[type="file"]')).some(f => f.files.length > 0);
+        if (!hasFile && proposalId && serverVersion !== null && lastSynced) {
+            const changes = computeDelta(formData, lastSynced);
+            if (!Object.keys(changes).length) {
+                return Promise.resolve({ skipped: true });
+            }
+            return sendDelta(changes, formData, seq, false);
+        }
+
         const signature = hasFile ? null : computeSignature(formData);
 
         if (!hasFile && signature && (signature === lastSentSignature || signature === pendingSignature)) {
@@ -309,6 +471,10 @@ window.AutosaveManager = (function() {
                 }
             }
             if (data && data.proposal_id) {
+                if (data.version !== undefined) {
+                    serverVersion = data.version;
+                    lastSynced = formData;
+                }
                 // Only update UI/events if this response is not stale
                 if (seq >= lastHandledSeq) {
                     lastHandledSeq = seq;
@@ -5,10 +5,19 @@
         return;
     }
 
+    // Changes are pushed over server-sent events when the server supports
+    // them (the stream answers 204 otherwise) and polled for every
+    // POLL_INTERVAL ms as a fallback. Fetches send the last ETag, so an
+    // unchanged proposal costs a bodyless 304.
+    const streamUrl = window.PROPOSAL_LIVE_STREAM_URL;
     const POLL_INTERVAL = 4000;
     let lastTimestamp = window.PROPOSAL_LAST_UPDATED || null;
+    let lastEtag = null;
     let isPolling = false;
+    let pollAgain = false;
     let timerId = null;
+    let source = null;
+    let streamUnavailable = !streamUrl || !window.EventSource;
 
     const ACTIVE_TAGS = new Set(["INPUT", "TEXTAREA"]);
 
@@ -311,7 +320,11 @@
     }
 
     async function poll() {
-        if (isPolling || document.hidden) {
+        if (document.hidden) {
+            return;
+        }
+        if (isPolling) {
+            pollAgain = true;
             return;
         }
         isPolling = true;
@@ -323,14 +336,22 @@
             const url = params.toString()
                 ? `${liveStateUrl}?${params.toString()}`
                 : liveStateUrl;
+            const headers = { Accept: 'application/json' };
+            if (lastEtag) {
+                headers['If-None-Match'] = lastEtag;
+            }
             const response = await fetch(url, {
                 credentials: 'same-origin',
-                headers: { Accept: 'application/json' },
+                headers,
             });
+            if (response.status === 304) {
+                return;
+            }
             if (!response.ok) {
                 throw new Error(`Live sync request failed (${response.status})`);
             }
             const data = await response.json();
+            lastEtag = response.headers.get('ETag') || lastEtag;
             if (data && typeof data === 'object') {
                 if (data.updated_at) {
                     lastTimestamp = data.updated_at;
@@ -343,10 +364,29 @@
             console.warn('Proposal live sync failed:', err);
         } finally {
             isPolling = false;
+            if (pollAgain) {
+                pollAgain = false;
+                poll();
+            }
         }
     }
 
     function startPolling() {
+        if (!streamUnavailable) {
+            if (!source) {
+                source = new EventSource(streamUrl);
+                source.addEventListener('proposal', poll);
+                source.addEventListener('error', () => {
+                    if (source && source.readyState === EventSource.CLOSED) {
+                        // 204 or a hard failure: fall back to polling.
+                        source = null;
+                        streamUnavailable = true;
+                        startPolling();
+                    }
+                });
+            }
+            return;
+        }
         if (timerId) {
             clearInterval(timerId);
         }
@@ -355,6 +395,10 @@
     }
 
     function stopPolling() {
+        if (source) {
+            source.close();
+            source = null;
+        }
         if (!timerId) return;
         clearInterval(timerId);
         timerId = null;
@@ -369,7 +413,7 @@
     });
 
     document.addEventListener('autosave:success', () => {
-        if (!timerId) {
+        if (!timerId && !source) {
             startPolling();
         }
     });
@@ -0,0 +1,107 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import (
+    ApprovalFlowConfig,
+    ApprovalFlowTemplate,
+    Organization,
+    OrganizationRole,
+    OrganizationType,
+    RoleAssignment,
+)
+from emt import approvers
+from emt.models import ApprovalInboxEntry, ApprovalStep, EventProposal
+from emt.utils import build_approval_chain, build_approval_chains
+
+
+class ApprovalChainTests(TestCase):
+    def setUp(self):
+        org_type = OrganizationType.objects.create(name="Dept")
+        self.school = Organization.objects.create(name="School", org_type=org_type)
+        self.dept = Organization.objects.create(
+            name="Physics", org_type=org_type, parent=self.school
+        )
+        self.hod = User.objects.create_user("hod")
+        self.dean = User.objects.create_user("dean")
+        self.fic = User.objects.create_user("fic")
+        self.submitter = User.objects.create_user("submitter")
+        RoleAssignment.objects.create(
+            user=self.hod,
+            role=OrganizationRole.objects.create(organization=self.dept, name="hod"),
+            organization=self.dept,
+        )
+        RoleAssignment.objects.create(
+            user=self.dean,
+            role=OrganizationRole.objects.create(organization=self.school, name="dean"),
+            organization=self.school,
+        )
+        for order, role in enumerate(
+            [ApprovalStep.Role.FACULTY_INCHARGE, ApprovalStep.Role.HOD, ApprovalStep.Role.DEAN],
+            start=1,
+        ):
+            ApprovalFlowTemplate.objects.create(
+                organization=self.dept,
+                step_order=order,
+                role_required=role.value,
+                optional=role == ApprovalStep.Role.DEAN,
+            )
+        ApprovalFlowConfig.objects.create(
+            organization=self.dept, require_faculty_incharge_first=True
+        )
+
+    def _proposal(self, organization=None):
+        proposal = EventProposal.objects.create(
+            submitted_by=self.submitter,
+            organization=organization or self.dept,
+            status=EventProposal.Status.SUBMITTED,
+        )
+        proposal.faculty_incharges.add(self.fic)
+        return proposal
+
+    def _chain(self, proposal):
+        return list(
+            proposal.approval_steps.order_by("step_order").values_list(
+                "role_required", "assigned_to_id", "status", "is_optional"
+            )
+        )
+
+    def test_chain_resolves_roles_from_org_and_parents(self):
+        proposal = self._proposal()
+        build_approval_chain(proposal)
+        self.assertEqual(
+            self._chain(proposal),
+            [
+                ("faculty_incharge", self.fic.id, "pending", False),
+                ("hod", self.hod.id, "waiting", False),
+                ("dean", self.dean.id, "waiting", True),
+            ],
+        )
+
+    def test_bulk_build_inserts_all_steps_at_once(self):
+        proposals = [self._proposal() for _ in range(5)]
+        proposals.append(self._proposal(self.school))
+        with CaptureQueriesContext(connection) as queries:
+            build_approval_chains(proposals)
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "emt_approvalstep"')]
+        self.assertEqual(len(inserts), 1)
+        # Three of these fill the approval inbox (emt/approval_inbox.py).
+        self.assertLessEqual(len(queries), 9)
+        self.assertEqual(
+            ApprovalInboxEntry.objects.filter(proposal__in=proposals).count(), 5
+        )
+        self.assertEqual(ApprovalStep.objects.filter(proposal__in=proposals).count(), 15)
+        self.assertEqual(self._chain(proposals[0]), self._chain(proposals[4]))
+
+    def test_directory_is_cached_until_assignments_change(self):
+        approvers.bump_version()
+        approvers.get_directory(self.dept.id)
+        with self.assertNumQueries(0):
+            directory = approvers.get_directory(self.dept.id)
+        self.assertEqual(directory["approvers"]["hod"], self.hod.id)
+
+        other = User.objects.create_user("other_hod")
+        RoleAssignment.objects.filter(user=self.hod).update(user=other)
+        RoleAssignment.objects.get(user=other).save()
+        self.assertEqual(approvers.get_directory(self.dept.id)["approvers"]["hod"], other.id)
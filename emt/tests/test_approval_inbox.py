@@ -0,0 +1,154 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Organization, OrganizationRole, OrganizationType, RoleAssignment
+from emt import approval_inbox
+from emt.models import ApprovalInboxEntry, ApprovalStep, EventProposal, EventReport
+from emt.utils import skip_all_downstream_optionals, unlock_optionals_after
+
+
+class ApprovalInboxTests(TestCase):
+    def setUp(self):
+        org_type = OrganizationType.objects.create(name="Dept")
+        self.org = Organization.objects.create(name="Physics", org_type=org_type)
+        self.other_org = Organization.objects.create(name="Chemistry", org_type=org_type)
+        self.submitter = User.objects.create_user("submitter")
+        self.first = User.objects.create_user("first", password="p")
+        self.second = User.objects.create_user("second", password="p")
+        self.optional = User.objects.create_user("optional")
+        self.diqac = User.objects.create_user("diqac", password="p")
+        RoleAssignment.objects.create(
+            user=self.diqac,
+            role=OrganizationRole.objects.create(organization=self.org, name="IQAC"),
+            organization=self.org,
+        )
+        self.proposal = EventProposal.objects.create(
+            submitted_by=self.submitter,
+            organization=self.org,
+            event_title="Seminar",
+            status=EventProposal.Status.SUBMITTED,
+        )
+        self.step1 = self._step(1, self.first, status=ApprovalStep.Status.PENDING)
+        self.step2 = self._step(2, self.optional, is_optional=True)
+        self.step3 = self._step(3, self.second)
+
+    def _step(self, order, user, **fields):
+        fields.setdefault("status", ApprovalStep.Status.WAITING)
+        return ApprovalStep.objects.create(
+            proposal=self.proposal,
+            step_order=order,
+            order_index=order,
+            assigned_to=user,
+            role_required=ApprovalStep.Role.HOD,
+            **fields,
+        )
+
+    def _request(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def _inbox(self, user):
+        return list(approval_inbox.pending_steps(user).values_list("id", flat=True))
+
+    def test_step_entries_follow_the_approval_flow(self):
+        self.assertEqual(self._inbox(self.first), [self.step1.id])
+        self.assertEqual(self._inbox(self.second), [])
+
+        self.client.force_login(self.first)
+        resp = self.client.post(
+            reverse("emt:review_approval_step", args=[self.step1.id]),
+            {"action": "approve", "comment": "ok"},
+        )
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(self._inbox(self.first), [])
+        self.assertEqual(self._inbox(self.optional), [])
+        self.assertEqual(self._inbox(self.second), [self.step3.id])
+
+        self.client.force_login(self.second)
+        resp = self.client.get(reverse("emt:my_approvals"))
+        self.assertEqual([s.id for s in resp.context["pending_steps"]], [self.step3.id])
+
+    def test_bulk_step_updates_keep_the_inbox_in_sync(self):
+        unlock_optionals_after(self.step1, [self.step2.id])
+        self.assertEqual(self._inbox(self.optional), [self.step2.id])
+        self.step2.refresh_from_db()
+        skip_all_downstream_optionals(self.step1)
+        self.assertEqual(self._inbox(self.optional), [])
+
+    def test_report_entries_follow_review_stage(self):
+        report = EventReport.objects.create(proposal=self.proposal)
+        other = EventReport.objects.create(
+            proposal=EventProposal.objects.create(
+                submitted_by=self.submitter, organization=self.other_org
+            )
+        )
+        request = self._request(self.diqac)
+        scope = approval_inbox.reviewer_scope(request)
+        self.assertEqual(scope.stage, EventReport.ReviewStage.DIQAC)
+        self.assertEqual(list(approval_inbox.open_reports(scope)), [report])
+        self.assertEqual(approval_inbox.counts(request), {"approvals": 0, "reports": 1})
+
+        self.client.force_login(self.diqac)
+        resp = self.client.post(
+            reverse("emt:review_action"),
+            {"report_id": report.id, "action": "approve", "feedback": "Good"},
+        )
+        self.assertEqual(resp.status_code, 200, resp.content)
+        entry = ApprovalInboxEntry.objects.get(report=report)
+        self.assertEqual(entry.stage, EventReport.ReviewStage.HOD)
+        # Still listed for the department, but no longer D-IQAC's decision.
+        self.assertEqual(list(approval_inbox.open_reports(scope)), [report])
+        self.assertEqual(approval_inbox.counts(request)["reports"], 0)
+
+        report.review_stage = EventReport.ReviewStage.FINALIZED
+        report.save()
+        self.assertFalse(ApprovalInboxEntry.objects.filter(report=report).exists())
+
+        other.proposal.organization = self.org
+        other.proposal.save()
+        self.assertEqual(ApprovalInboxEntry.objects.get(report=other).organization, self.org)
+        self.assertEqual(list(approval_inbox.open_reports(scope)), [other])
+
+    def test_saving_a_proposal_in_place_leaves_the_inbox_alone(self):
+        EventReport.objects.create(proposal=self.proposal)
+        proposal = EventProposal.objects.get(pk=self.proposal.pk)
+        proposal.event_title = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            proposal.save()
+        self.assertFalse([q for q in queries if "emt_approvalinboxentry" in q["sql"]])
+
+        proposal.organization = self.other_org
+        proposal.save()
+        entry = ApprovalInboxEntry.objects.get(proposal=proposal, kind="report")
+        self.assertEqual(entry.organization, self.other_org)
+
+    def test_counts_are_cached_until_a_step_changes(self):
+        approval_inbox.bump_version()
+        request = self._request(self.first)
+        approval_inbox.counts(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(approval_inbox.counts(self._request(self.first))["approvals"], 1)
+
+        self.step1.status = ApprovalStep.Status.APPROVED
+        self.step1.save()
+        self.assertEqual(approval_inbox.counts(self._request(self.first))["approvals"], 0)
+
+    def test_rebuild_reconciles_drift(self):
+        report = EventReport.objects.create(proposal=self.proposal)
+        ApprovalInboxEntry.objects.filter(step=self.step1).delete()
+        ApprovalStep.objects.filter(pk=self.step3.pk).update(status=ApprovalStep.Status.PENDING)
+        EventReport.objects.filter(pk=report.pk).update(review_stage=EventReport.ReviewStage.HOD)
+
+        call_command("rebuild_approval_inbox", stdout=StringIO())
+
+        self.assertEqual(self._inbox(self.first), [self.step1.id])
+        self.assertEqual(self._inbox(self.second), [self.step3.id])
+        self.assertEqual(ApprovalInboxEntry.objects.get(report=report).stage, "hod")
+        self.assertEqual(approval_inbox.rebuild(), (0, 0))
@@ -8,6 +8,7 @@ from django.urls import reverse
 
 from core.models import Organization, OrganizationMembership, OrganizationType
 from core.signals import assign_role_on_login, create_or_update_user_profile
+from emt import report_drafts
 from emt.models import EventProposal, EventReport, Student
 
 
@@ -109,11 +110,8 @@ class SaveAttendanceRowsTests(TestCase):
         self.assertEqual(saved["F1"]["category"], "faculty")
         self.assertEqual(len(saved), 3)  # empty registration_no excluded from keys
 
-    def test_save_attendance_updates_session_draft(self):
+    def test_save_attendance_updates_report_draft(self):
         url = reverse("emt:attendance_save", args=[self.report.id])
-        session = self.client.session
-        session["event_report_draft"] = {str(self.proposal.id): {}}
-        session.save()
 
         rows = [
             {
@@ -154,8 +152,7 @@ class SaveAttendanceRowsTests(TestCase):
             data=json.dumps({"rows": rows}),
             content_type="application/json",
         )
-        session = self.client.session
-        draft = session["event_report_draft"][str(self.proposal.id)]
+        draft = report_drafts.load(self.user, self.proposal.id)
         self.assertEqual(draft["num_participants"], 3)
         self.assertEqual(draft["num_student_volunteers"], 1)
         self.assertEqual(draft["num_student_participants"], 1)
@@ -3,11 +3,14 @@ import json
 from django.contrib.auth.models import Permission, User
 from django.contrib.auth.signals import user_logged_in
 from django.db.models.signals import post_save
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from core.signals import assign_role_on_login, create_or_update_user_profile
-from emt.models import EventActivity, EventProposal, EventReport
+from emt import report_revisions
+from emt.models import EventActivity, EventProposal, EventReport, EventReportRevision
 
 
 class AutosaveEventReportTests(TestCase):
@@ -170,3 +173,71 @@ class AutosaveEventReportTests(TestCase):
 
         report = EventReport.objects.get(id=data["report_id"])
         self.assertIsNotNone(report.report_signed_date)
+
+    def _autosave(self, **fields):
+        payload = {"proposal_id": self.proposal.id}
+        payload.update(fields)
+        return self.client.post(
+            reverse("emt:autosave_event_report"),
+            data=json.dumps(payload),
+            content_type="application/json",
+        ).json()
+
+    @override_settings(REPORT_REVISIONS={"CHECKPOINT_EVERY": 3})
+    def test_revisions_store_diffs_between_checkpoints(self):
+        states = [
+            {"location": "Hall", "event_summary": "Long summary " * 50},
+            {"location": "Hall B", "event_summary": "Long summary " * 50},
+            {"location": "Hall B", "event_summary": "Long summary " * 50, "blog_link": "https://example.com/post"},
+            {"location": "Hall C", "event_summary": "Long summary " * 50},
+            {"location": "Hall C", "event_summary": "Short"},
+        ]
+        for state in states:
+            data = self._autosave(**state)
+        self.assertEqual(data["revision"], 5)
+
+        report = EventReport.objects.get(proposal=self.proposal)
+        revisions = list(report.revisions.order_by("number"))
+        self.assertEqual([r.checkpoint for r in revisions], [True, False, False, True, False])
+        self.assertEqual(revisions[1].data, {"set": {"location": "Hall B"}})
+        self.assertEqual(revisions[3].data["location"], "Hall C")
+        self.assertEqual(report.checkpoint_revision, 4)
+
+        for number, state in enumerate(states, start=1):
+            expected = {"proposal_id": self.proposal.id, **state}
+            self.assertEqual(report_revisions.reconstruct(report, number), expected)
+        self.assertEqual(
+            report_revisions.current_payload(report),
+            {"proposal_id": self.proposal.id, **states[-1]},
+        )
+        with self.assertRaises(EventReportRevision.DoesNotExist):
+            report_revisions.reconstruct(report, 6)
+
+    def test_unchanged_autosave_writes_nothing(self):
+        self._autosave(location="Hall", activity_name_1="Intro", activity_date_1="2024-01-01")
+        with CaptureQueriesContext(connection) as queries:
+            data = self._autosave(
+                location="Hall", activity_name_1="Intro", activity_date_1="2024-01-01"
+            )
+        self.assertEqual(data["revision"], 1)
+        writes = [
+            q["sql"] for q in queries
+            if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+            and "django_session" not in q["sql"]
+        ]
+        self.assertEqual(writes, [])
+
+    def test_autosave_updates_only_changed_columns(self):
+        self._autosave(location="Hall", activity_name_1="Intro", activity_date_1="2024-01-01")
+        activity_id = EventActivity.objects.get(proposal=self.proposal).id
+        with CaptureQueriesContext(connection) as queries:
+            self._autosave(
+                location="Hall 2", activity_name_1="Intro", activity_date_1="2024-01-01"
+            )
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "emt_eventreport"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"location"', updates[0])
+        self.assertNotIn('"summary"', updates[0])
+        self.assertNotIn('"generated_payload"', updates[0])
+        # Activities were unchanged, so the row was not rewritten.
+        self.assertTrue(EventActivity.objects.filter(id=activity_id).exists())
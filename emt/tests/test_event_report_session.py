@@ -1,11 +1,21 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in
 from django.db.models.signals import post_save
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from core.signals import assign_role_on_login, create_or_update_user_profile
-from emt.models import EventProposal
+from emt import report_drafts
+from emt.models import EventProposal, EventReportDraft
 
 
 class EventReportSessionTests(TestCase):
@@ -42,9 +52,9 @@ class EventReportSessionTests(TestCase):
         post_data.update(self._management_data())
         self.client.post(url, post_data)
 
-        session = self.client.session.get("event_report_draft", {})
-        self.assertIn(str(self.proposal.id), session)
-        self.assertEqual(session[str(self.proposal.id)]["location"], "Hall")
+        self.assertNotIn("event_report_draft", self.client.session)
+        draft = report_drafts.load(self.user, self.proposal.id)
+        self.assertEqual(draft["location"], "Hall")
 
         resp = self.client.get(url)
         self.assertContains(resp, 'name="location" value="Hall"', html=False)
@@ -57,5 +67,50 @@ class EventReportSessionTests(TestCase):
 
         resp = self.client.post(url, post_data)
         self.assertEqual(resp.status_code, 302)
-        session = self.client.session.get("event_report_draft", {})
-        self.assertNotIn(str(self.proposal.id), session)
+        self.assertFalse(EventReportDraft.objects.filter(proposal=self.proposal).exists())
+
+    def test_draft_stored_compressed_and_updated_incrementally(self):
+        report_drafts.save(self.user, self.proposal.id, {"location": "Hall", "venue": "A"})
+        report_drafts.update(self.user, self.proposal.id, {"venue": "B"})
+
+        row = EventReportDraft.objects.get(user=self.user, proposal=self.proposal)
+        self.assertNotIn(b"Hall", bytes(row.payload))
+        self.assertEqual(
+            report_drafts.load(self.user, self.proposal.id), {"location": "Hall", "venue": "B"}
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            report_drafts.update(self.user, self.proposal.id, {"venue": "B"})
+        self.assertFalse([q for q in queries if q["sql"].startswith("UPDATE")])
+
+    def test_concurrent_first_save_merges_into_the_winner(self):
+        report_drafts.save(self.user, self.proposal.id, {"location": "Hall"})
+        real = QuerySet.select_for_update
+        calls = []
+
+        def lose_the_race(qs, *args, **kwargs):
+            # The first lookup misses the row another request just created.
+            calls.append(1)
+            if len(calls) == 1:
+                return qs.none()
+            return real(qs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, "select_for_update", lose_the_race):
+            report_drafts.update(self.user, self.proposal.id, {"venue": "B"})
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            report_drafts.load(self.user, self.proposal.id), {"location": "Hall", "venue": "B"}
+        )
+
+    def test_drafts_are_per_user(self):
+        other = User.objects.create_user(username="carol", password="pass")
+        report_drafts.save(self.user, self.proposal.id, {"location": "Hall"})
+        self.assertEqual(report_drafts.load(other, self.proposal.id), {})
+
+    def test_expired_drafts_are_ignored_and_purged(self):
+        report_drafts.save(self.user, self.proposal.id, {"location": "Hall"})
+        EventReportDraft.objects.update(updated_at=timezone.now() - timedelta(days=31))
+        self.assertEqual(report_drafts.load(self.user, self.proposal.id), {})
+
+        call_command("purge_report_drafts", stdout=StringIO())
+        self.assertFalse(EventReportDraft.objects.exists())
@@ -13,6 +13,7 @@ from django.http import QueryDict
 
 from core.models import Organization, OrganizationType, SDGGoal
 from core.signals import assign_role_on_login, create_or_update_user_profile
+from emt import report_drafts
 from emt.forms import EventReportForm
 from emt.models import (AttendanceRow, CDLSupport, EventActivity, EventProposal,
                         EventReport, SpeakerProfile)
@@ -155,11 +156,7 @@ class SubmitEventReportViewTests(TestCase):
             generated_payload={"venue": ""},
         )
 
-        session = self.client.session
-        session.setdefault("event_report_draft", {})[str(self.proposal.id)] = {
-            "venue": "",
-        }
-        session.save()
+        report_drafts.save(self.user, self.proposal.id, {"venue": ""})
 
         response = self.client.get(
             reverse("emt:submit_event_report", args=[self.proposal.id])
@@ -0,0 +1,116 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import (Organization, OrganizationRole, OrganizationType,
+                         RoleAssignment)
+from emt.models import EventActivity, EventNeedAnalysis, EventProposal
+
+
+class ProposalDeltaAutosaveTests(TestCase):
+    def setUp(self):
+        self.ot = OrganizationType.objects.create(name="Dept")
+        self.org = Organization.objects.create(name="Science", org_type=self.ot)
+        role = OrganizationRole.objects.create(organization=self.org, name="Faculty")
+        self.user = User.objects.create(username="u1", email="u1@example.com")
+        RoleAssignment.objects.create(user=self.user, role=role, organization=self.org)
+        self.client.force_login(self.user)
+        self.url = reverse("emt:autosave_proposal")
+
+        data = self.post(
+            {
+                "organization_type": str(self.ot.id),
+                "organization": str(self.org.id),
+                "academic_year": "2024-2025",
+                "event_title": "Talk",
+                "need_analysis": "Why",
+                "activity_name_1": "Intro",
+                "activity_date_1": "2024-07-01",
+            }
+        ).json()
+        self.pid = data["proposal_id"]
+        self.version = data["version"]
+
+    def post(self, payload):
+        return self.client.post(
+            self.url, data=json.dumps(payload), content_type="application/json"
+        )
+
+    def delta(self, changes, version=None):
+        return self.post(
+            {
+                "proposal_id": self.pid,
+                "version": self.version if version is None else version,
+                "changes": changes,
+            }
+        )
+
+    def test_full_autosave_reports_version(self):
+        self.assertEqual(self.version, 1)
+        self.assertEqual(EventProposal.objects.get().autosave_version, 1)
+
+    def test_delta_writes_only_changed_fields(self):
+        activity_id = EventActivity.objects.get().id
+        resp = self.delta({"venue": "Hall B", "event_start_date": "2024-07-01"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"success": True, "proposal_id": self.pid, "version": 2})
+        proposal = EventProposal.objects.get()
+        self.assertEqual((proposal.venue, str(proposal.event_start_date)), ("Hall B", "2024-07-01"))
+        self.assertEqual(proposal.event_title, "Talk")
+        # Untouched rows and sections are not rewritten.
+        self.assertEqual(EventActivity.objects.get().id, activity_id)
+        self.assertEqual(EventNeedAnalysis.objects.get().content, "Why")
+
+    def test_unchanged_values_keep_the_version(self):
+        resp = self.delta({"event_title": "Talk", "need_analysis": "Why"})
+        self.assertEqual(resp.json()["version"], 1)
+
+    def test_invalid_values_are_reported_and_not_saved(self):
+        resp = self.delta({"event_title": "", "event_end_date": "soon", "venue": "Hall"})
+        data = resp.json()
+        self.assertFalse(data["success"])
+        self.assertEqual(set(data["errors"]), {"event_title", "event_end_date"})
+        proposal = EventProposal.objects.get()
+        self.assertEqual((proposal.event_title, proposal.venue), ("Talk", "Hall"))
+
+    def test_row_groups_are_replaced_as_a_whole(self):
+        self.delta(
+            {
+                "activity_name_1": "Intro",
+                "activity_date_1": "2024-07-01",
+                "activity_name_2": "Panel",
+                "activity_date_2": "2024-07-02",
+            }
+        )
+        self.assertEqual(
+            list(EventActivity.objects.order_by("date").values_list("name", flat=True)),
+            ["Intro", "Panel"],
+        )
+
+    def test_stale_version_gets_conflict_with_server_diff(self):
+        self.delta({"venue": "Hall B", "activity_name_1": "Keynote", "activity_date_1": "2024-07-03"})
+        resp = self.delta({"venue": "Hall C"}, version=1)
+        self.assertEqual(resp.status_code, 409)
+        data = resp.json()
+        self.assertEqual(data["version"], 2)
+        self.assertEqual(
+            data["diff"],
+            {"venue": "Hall B", "activity_name_1": "Keynote", "activity_date_1": "2024-07-03"},
+        )
+        self.assertEqual(EventProposal.objects.get().venue, "Hall B")
+
+        resp = self.delta({"venue": "Hall C"}, version=data["version"])
+        self.assertEqual(resp.json()["version"], 3)
+
+    def test_full_autosave_is_seen_by_delta_clients(self):
+        self.post({"proposal_id": self.pid, "objectives": "Learn"})
+        resp = self.delta({"venue": "Hall"}, version=1)
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()["diff"], {"objectives": "Learn"})
+
+    def test_other_users_draft_is_not_found(self):
+        other = User.objects.create(username="u2")
+        self.client.force_login(other)
+        self.assertEqual(self.delta({"venue": "Hall"}).status_code, 404)
@@ -1,11 +1,14 @@
 from datetime import timedelta
 
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from core.models import Organization, OrganizationType, SDGGoal
+from emt import proposal_live
 from emt.models import (
     EventActivity,
     EventExpectedOutcomes,
@@ -28,58 +31,59 @@ class ProposalLiveStateTests(TestCase):
             name="Computer Science",
             org_type=self.org_type,
         )
-        self.proposal = EventProposal.objects.create(
-            submitted_by=self.user,
-            organization=self.organization,
-            event_title="Live Sync Showcase",
-            event_start_date=timezone.now().date(),
-            event_end_date=timezone.now().date(),
-            venue="Innovation Hall",
-            academic_year="2024-2025",
-            target_audience="Students",
-            event_focus_type="Seminar",
-            num_activities=1,
-            pos_pso="PO1",
-            student_coordinators="Coordinator A",
-            committees_collaborations="Robotics Club",
-        )
-        EventNeedAnalysis.objects.create(proposal=self.proposal, content="Need content")
-        EventObjectives.objects.create(proposal=self.proposal, content="Objectives content")
-        EventExpectedOutcomes.objects.create(
-            proposal=self.proposal,
-            content="Outcomes content",
-        )
-        TentativeFlow.objects.create(proposal=self.proposal, content="2024-05-01T10:00:00||Kickoff")
-        EventActivity.objects.create(
-            proposal=self.proposal,
-            name="Introduction",
-            date=timezone.now().date(),
-        )
-        SpeakerProfile.objects.create(
-            proposal=self.proposal,
-            full_name="Dr. Jane Speaker",
-            designation="Professor",
-            affiliation="Computer Science",
-            contact_email="speaker@example.com",
-            contact_number="1234567890",
-            detailed_profile="Keynote speaker",
-        )
-        ExpenseDetail.objects.create(
-            proposal=self.proposal,
-            sl_no=1,
-            particulars="Logistics",
-            amount=2500,
-        )
-        IncomeDetail.objects.create(
-            proposal=self.proposal,
-            sl_no=1,
-            particulars="Registration",
-            participants=50,
-            rate=100,
-            amount=5000,
-        )
-        sdg = SDGGoal.objects.create(name="Quality Education")
-        self.proposal.sdg_goals.add(sdg)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.proposal = EventProposal.objects.create(
+                submitted_by=self.user,
+                organization=self.organization,
+                event_title="Live Sync Showcase",
+                event_start_date=timezone.now().date(),
+                event_end_date=timezone.now().date(),
+                venue="Innovation Hall",
+                academic_year="2024-2025",
+                target_audience="Students",
+                event_focus_type="Seminar",
+                num_activities=1,
+                pos_pso="PO1",
+                student_coordinators="Coordinator A",
+                committees_collaborations="Robotics Club",
+            )
+            EventNeedAnalysis.objects.create(proposal=self.proposal, content="Need content")
+            EventObjectives.objects.create(proposal=self.proposal, content="Objectives content")
+            EventExpectedOutcomes.objects.create(
+                proposal=self.proposal,
+                content="Outcomes content",
+            )
+            TentativeFlow.objects.create(proposal=self.proposal, content="2024-05-01T10:00:00||Kickoff")
+            EventActivity.objects.create(
+                proposal=self.proposal,
+                name="Introduction",
+                date=timezone.now().date(),
+            )
+            SpeakerProfile.objects.create(
+                proposal=self.proposal,
+                full_name="Dr. Jane Speaker",
+                designation="Professor",
+                affiliation="Computer Science",
+                contact_email="speaker@example.com",
+                contact_number="1234567890",
+                detailed_profile="Keynote speaker",
+            )
+            ExpenseDetail.objects.create(
+                proposal=self.proposal,
+                sl_no=1,
+                particulars="Logistics",
+                amount=2500,
+            )
+            IncomeDetail.objects.create(
+                proposal=self.proposal,
+                sl_no=1,
+                particulars="Registration",
+                participants=50,
+                rate=100,
+                amount=5000,
+            )
+            sdg, _ = SDGGoal.objects.get_or_create(name="Quality Education")
+            self.proposal.sdg_goals.add(sdg)
 
         self.url = reverse("emt:proposal_live_state", args=[self.proposal.id])
 
@@ -125,3 +129,96 @@ class ProposalLiveStateTests(TestCase):
         self.client.login(username="other", password="pass1234")
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 404)
+
+    def test_unchanged_proposal_answers_304_with_one_query(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        proposal_queries = [q for q in queries if "emt_eventproposal" in q["sql"]]
+        self.assertEqual(len(proposal_queries), 1)
+        self.assertFalse([q for q in queries if "emt_eventactivity" in q["sql"]])
+
+    def test_proposal_save_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.proposal.venue = "Main Hall"
+        self.proposal.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["payload"]["fields"]["venue"], "Main Hall")
+
+    def test_child_rows_touch_proposal_once_per_transaction(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            today = timezone.now().date()
+            EventActivity.objects.create(proposal=self.proposal, name="Panel", date=today)
+            EventActivity.objects.create(proposal=self.proposal, name="Q&A", date=today)
+            self.proposal.need_analysis.content = "Updated need"
+            self.proposal.need_analysis.save()
+        self.assertEqual(len(callbacks), 1)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()["payload"]
+        self.assertEqual(len(payload["activities"]), 3)
+        self.assertEqual(payload["text_sections"]["need_analysis"], "Updated need")
+
+    def test_rolled_back_touch_does_not_hide_the_next_one(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    proposal_live.touch(self.proposal.id)
+                    raise DatabaseError("rolled back")
+            except DatabaseError:
+                pass
+            proposal_live.touch(self.proposal.id)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_m2m_changes_touch_proposal(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.proposal.sdg_goals.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["payload"]["sdg_goals"], [])
+
+    def test_stream_disabled_by_default(self):
+        response = self.client.get(
+            reverse("emt:proposal_live_stream", args=[self.proposal.id])
+        )
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(PROPOSAL_STREAM_ENABLED=True)
+    def test_stream_enforces_owner(self):
+        User.objects.create_user(username="other", password="pass1234")
+        self.client.login(username="other", password="pass1234")
+        response = self.client.get(
+            reverse("emt:proposal_live_stream", args=[self.proposal.id])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_event_stream_sends_only_changes(self):
+        current = await proposal_live.sync_to_async(proposal_live.stamp)(
+            self.proposal.id, self.user
+        )
+        etag = proposal_live.etag(self.proposal.id, current)
+        chunks = [
+            chunk
+            async for chunk in proposal_live.live_events(
+                self.proposal.id, self.user, poll_seconds=0, max_seconds=0
+            )
+        ]
+        self.assertTrue(chunks[0].startswith("retry:"))
+        self.assertIn(f"id: {etag}\nevent: proposal\n", chunks[1])
+
+        chunks = [
+            chunk
+            async for chunk in proposal_live.live_events(
+                self.proposal.id, self.user, last_event_id=etag, poll_seconds=0, max_seconds=0
+            )
+        ]
+        self.assertEqual(len(chunks), 1)
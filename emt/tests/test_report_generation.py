@@ -61,8 +61,8 @@ class ReportGenerationViewsTests(TestCase):
         response = self.client.get(reverse("emt:generate_report_pdf"))
         self.assertEqual(response.status_code, 405)
 
-    @patch("emt.views.pdfkit.from_string", return_value=b"%PDF-1.4 test")
-    def test_generate_report_pdf_returns_pdf(self, mock_from_string):
+    @patch("core.pdf_renderer.render", return_value=b"%PDF-1.4 test")
+    def test_generate_report_pdf_returns_pdf(self, mock_render):
         payload = {
             "event_title": "AI Workshop",
             "event_date": "2024-09-01",
@@ -71,7 +71,7 @@ class ReportGenerationViewsTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/pdf")
         self.assertIn("Event_Report.pdf", response["Content-Disposition"])
-        mock_from_string.assert_called_once()
+        mock_render.assert_called_once()
 
 
 class EventReportWorkflowTests(TestCase):
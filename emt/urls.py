@@ -67,6 +67,11 @@ urlpatterns = [
         views.proposal_live_state,
         name="proposal_live_state",
     ),
+    path(
+        "proposal-live-stream/<int:proposal_id>/",
+        views.proposal_live_stream,
+        name="proposal_live_stream",
+    ),
     path(
         "reset-proposal-draft/", views.reset_proposal_draft, name="reset_proposal_draft"
     ),
@@ -2,13 +2,11 @@ import csv
 import os
 from io import TextIOBase, TextIOWrapper
 
-import requests
-from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 
-from core.models import ApprovalFlowConfig, ApprovalFlowTemplate
-
-from .models import ApprovalStep
+from . import approval_inbox, approvers
+from .models import ApprovalStep, EventProposal
 
 STUDENT_ATTENDANCE_HEADERS = [
     "Registration No",
@@ -103,61 +101,82 @@ def parse_attendance_csv(file_obj):
 
 def build_approval_chain(proposal):
     """Create approval steps for a proposal based on org config and templates."""
-    config = ApprovalFlowConfig.objects.filter(
-        organization=proposal.organization
-    ).first()
+    build_approval_chains([proposal])
+
 
-    flow = ApprovalFlowTemplate.objects.filter(
-        organization=proposal.organization
-    ).order_by("step_order")
+def build_approval_chains(proposals):
+    """Create the approval steps of many proposals in one ``bulk_create``.
+
+    Org configs, templates and approvers come from the cached approver
+    directory (see emt/approvers.py); faculty in-charges of all proposals
+    are read in one query when an org puts them first.
+    """
+    proposals = list(proposals)
+    directories = approvers.get_directories(p.organization_id for p in proposals)
+
+    fic_ids = [
+        p.pk
+        for p in proposals
+        if directories.get(p.organization_id, {}).get("require_faculty_incharge_first")
+    ]
+    incharges = {}
+    if fic_ids:
+        through = EventProposal.faculty_incharges.through
+        for proposal_id, user_id in (
+            through.objects.filter(eventproposal_id__in=fic_ids)
+            .order_by("id")
+            .values_list("eventproposal_id", "user_id")
+        ):
+            incharges.setdefault(proposal_id, []).append(user_id)
 
     steps = []
-    idx = 1
+    for proposal in proposals:
+        directory = directories.get(proposal.organization_id)
+        if directory is None:
+            continue
+        idx = 1
+
+        # Track if we've already added faculty in-charge approvals
+        fic_first = directory["require_faculty_incharge_first"]
+
+        if fic_first:
+            for user_id in incharges.get(proposal.pk, []):
+                steps.append(
+                    ApprovalStep(
+                        proposal=proposal,
+                        step_order=idx,
+                        order_index=idx,
+                        role_required=ApprovalStep.Role.FACULTY_INCHARGE,
+                        assigned_to_id=user_id,
+                        status="pending" if idx == 1 else "waiting",
+                    )
+                )
+                idx += 1
 
-    # Track if we've already added faculty in-charge approvals
-    fic_first = config and config.require_faculty_incharge_first
+        for role_required, user_id, optional in directory["templates"]:
+            # Skip duplicate faculty in-charge steps if they're already added above
+            if fic_first and role_required == ApprovalStep.Role.FACULTY_INCHARGE:
+                continue
 
-    if fic_first:
-        for fic in proposal.faculty_incharges.all():
             steps.append(
                 ApprovalStep(
                     proposal=proposal,
                     step_order=idx,
                     order_index=idx,
-                    role_required=ApprovalStep.Role.FACULTY_INCHARGE,
-                    assigned_to=fic,
+                    role_required=role_required,
+                    assigned_to_id=user_id
+                    or directory["approvers"].get(role_required.lower()),
+                    is_optional=optional,
                     status="pending" if idx == 1 else "waiting",
                 )
             )
             idx += 1
 
-    for tmpl in flow:
-        # Skip duplicate faculty in-charge steps if they're already added above
-        if fic_first and tmpl.role_required == ApprovalStep.Role.FACULTY_INCHARGE:
-            continue
-
-        assigned_to = (
-            tmpl.user
-            or User.objects.filter(
-                role_assignments__role__name=tmpl.role_required,
-                role_assignments__organization=proposal.organization,
-            ).first()
-        )
-
-        steps.append(
-            ApprovalStep(
-                proposal=proposal,
-                step_order=idx,
-                order_index=idx,
-                role_required=tmpl.role_required,
-                assigned_to=assigned_to,
-                is_optional=getattr(tmpl, "optional", False),
-                status="pending" if idx == 1 else "waiting",
-            )
-        )
-        idx += 1
-
-    ApprovalStep.objects.bulk_create(steps)
+    if not steps:
+        return
+    with transaction.atomic(savepoint=False):
+        ApprovalStep.objects.bulk_create(steps)
+        approval_inbox.sync({proposal.id for proposal in proposals}, reports=False)
 
 
 def auto_approve_non_optional_duplicates(proposal, approver, actor):
@@ -169,42 +188,48 @@ def auto_approve_non_optional_duplicates(proposal, approver, actor):
         status__in=[ApprovalStep.Status.PENDING, "waiting"],
     )
     now = timezone.now()
-    qs.update(
-        status=ApprovalStep.Status.APPROVED,
-        approved_by=actor,
-        approved_at=now,
-        decided_by=actor,
-        decided_at=now,
-        note="Auto-approved (duplicate non-optional step for same approver).",
-    )
+    with transaction.atomic(savepoint=False):
+        qs.update(
+            status=ApprovalStep.Status.APPROVED,
+            approved_by=actor,
+            approved_at=now,
+            decided_by=actor,
+            decided_at=now,
+            note="Auto-approved (duplicate non-optional step for same approver).",
+        )
+        approval_inbox.sync([proposal.id], reports=False)
 
 
 def unlock_optionals_after(step, selected_ids):
     """Unlock selected optional steps downstream of the given step."""
-    ApprovalStep.objects.filter(
-        proposal=step.proposal,
-        is_optional=True,
-        status__in=[ApprovalStep.Status.PENDING, "waiting"],
-        optional_unlocked=False,
-        order_index__gt=step.order_index,
-        id__in=selected_ids,
-    ).update(
-        optional_unlocked=True,
-        status=ApprovalStep.Status.PENDING,
-        note="Unlocked by previous approver.",
-    )
+    with transaction.atomic(savepoint=False):
+        ApprovalStep.objects.filter(
+            proposal=step.proposal,
+            is_optional=True,
+            status__in=[ApprovalStep.Status.PENDING, "waiting"],
+            optional_unlocked=False,
+            order_index__gt=step.order_index,
+            id__in=selected_ids,
+        ).update(
+            optional_unlocked=True,
+            status=ApprovalStep.Status.PENDING,
+            note="Unlocked by previous approver.",
+        )
+        approval_inbox.sync([step.proposal_id], reports=False)
 
 
 def skip_all_downstream_optionals(
     step, skip_note="Automatically skipped (not forwarded to optional approver)."
 ):
     """Skip all optional steps downstream of the given step."""
-    ApprovalStep.objects.filter(
-        proposal=step.proposal,
-        is_optional=True,
-        status__in=[ApprovalStep.Status.PENDING, "waiting"],
-        order_index__gt=step.order_index,
-    ).update(status=ApprovalStep.Status.SKIPPED, note=skip_note)
+    with transaction.atomic(savepoint=False):
+        ApprovalStep.objects.filter(
+            proposal=step.proposal,
+            is_optional=True,
+            status__in=[ApprovalStep.Status.PENDING, "waiting"],
+            order_index__gt=step.order_index,
+        ).update(status=ApprovalStep.Status.SKIPPED, note=skip_note)
+        approval_inbox.sync([step.proposal_id], reports=False)
 
 
 def get_downstream_optional_candidates(step):
@@ -234,6 +259,8 @@ def generate_report_with_ai(event_report):
     if not api_key:
         return "Error: GEMINI_API_KEY or GOOGLE_API_KEY is not set in the .env file."
 
+    import requests
+
     api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
 
     proposal = event_report.proposal
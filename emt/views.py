@@ -1,4 +1,3 @@
-import copy
 import csv
 import json
 import logging
@@ -7,10 +6,7 @@ from datetime import datetime, timedelta
 from operator import attrgetter
 from types import SimpleNamespace
 from urllib.parse import urlparse
-from django.utils.http import url_has_allowed_host_and_scheme
-import pdfkit
-import requests
-from bs4 import BeautifulSoup
+from django.utils.http import http_date, url_has_allowed_host_and_scheme
 from django import forms
 from django.conf import settings
 from django.contrib import messages
@@ -18,17 +14,22 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import EmailValidator, URLValidator
+from django.db import transaction
 from django.db.models import Q, Sum
 from django.forms import modelformset_factory
+from asgiref.sync import sync_to_async
 from django.http import (
+    Http404,
     HttpResponse,
     HttpResponseNotAllowed,
     JsonResponse,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.formats import date_format
 from django.utils.timezone import now
 from django.urls import reverse
@@ -49,6 +50,8 @@ from core.models import (
     SDGGoal,
     ActivityLog,
 )
+from core import pdf_renderer
+from core.utils import lazy_import
 from core.utils_email import send_notification, resolve_role_emails
 from emt.utils import (ATTENDANCE_HEADERS,
                        auto_approve_non_optional_duplicates,
@@ -58,6 +61,8 @@ from emt.utils import (ATTENDANCE_HEADERS,
                        unlock_optionals_after)
 from transcript.models import get_active_academic_year
 
+from . import (approval_inbox, proposal_autosave, proposal_live, report_drafts,
+               report_revisions)
 from .forms import (NAME_PATTERN, CDLSupportForm, EventProposalForm,
                     EventReportAttachmentForm, EventReportForm,
                     ExpectedOutcomesForm, ExpenseDetailForm, NeedAnalysisForm,
@@ -74,6 +79,8 @@ ACADEMIC_COORDINATOR_ROLE = "academic_coordinator"
 
 
 logger = logging.getLogger(__name__)
+# Only the LinkedIn fetch needs HTTP; load the client on first use.
+requests = lazy_import("requests")
 NAME_RE = re.compile(NAME_PATTERN)
 MAX_ACTIVE_DRAFTS = 5
 
@@ -184,22 +191,7 @@ def _user_role_stage(request):
     """Derive the review stage for the current user.
     Returns one of EventReport.ReviewStage values.
     """
-    # Default to USER
-    stage = EventReport.ReviewStage.USER
-    roles_lower = [
-        (ra.role.name.lower() if ra.role else "") for ra in getattr(request.user, "role_assignments", []).all()
-    ] if hasattr(request.user, "role_assignments") else []
-    prof_role = getattr(getattr(request.user, "profile", None), "role", "")
-    if prof_role:
-        roles_lower.append(prof_role.lower())
-    role_blob = " ".join(roles_lower)
-    if "hod" in role_blob or "head" in role_blob:
-        stage = EventReport.ReviewStage.HOD
-    if "iqac" in role_blob and ("university" in role_blob or "coord" in role_blob or "admin" in role_blob):
-        stage = EventReport.ReviewStage.UIQAC
-    elif "iqac" in role_blob:
-        stage = EventReport.ReviewStage.DIQAC
-    return stage
+    return approval_inbox.reviewer_scope(request).stage
 
 
 def _is_admin_override(user) -> bool:
@@ -208,52 +200,32 @@ def _is_admin_override(user) -> bool:
     - is_superuser or is_staff
     - OR any assigned role/profile role contains the word 'admin' (case-insensitive)
     """
-    if getattr(user, "is_superuser", False) or getattr(user, "is_staff", False):
-        return True
-    roles_lower = []
-    try:
-        if hasattr(user, "role_assignments"):
-            roles_lower.extend([
-                (ra.role.name.lower() if ra.role else "")
-                for ra in user.role_assignments.all()
-            ])
-        prof_role = getattr(getattr(user, "profile", None), "role", "")
-        if prof_role:
-            roles_lower.append(prof_role.lower())
-    except Exception:
-        pass
-    blob = " ".join(roles_lower)
-    return "admin" in blob
+    return approval_inbox.is_admin_override(user)
 
 
 def _reports_for_user(request):
-    stage = _user_role_stage(request)
-    user = request.user
+    scope = approval_inbox.reviewer_scope(request)
     qs = EventReport.objects.select_related("proposal", "proposal__organization", "proposal__submitted_by")
-    if stage == EventReport.ReviewStage.USER:
-        return qs.filter(proposal__submitted_by=user)
-    if stage == EventReport.ReviewStage.DIQAC:
-        # Department IQAC: restrict to user's organizations
-        org_ids = list(user.role_assignments.exclude(organization__isnull=True).values_list("organization_id", flat=True)) if hasattr(user, "role_assignments") else []
-        return qs.filter(proposal__organization_id__in=org_ids).exclude(review_stage=EventReport.ReviewStage.FINALIZED)
-    if stage == EventReport.ReviewStage.HOD:
-        org_ids = list(user.role_assignments.exclude(organization__isnull=True).values_list("organization_id", flat=True)) if hasattr(user, "role_assignments") else []
-        return qs.filter(proposal__organization_id__in=org_ids).exclude(review_stage=EventReport.ReviewStage.FINALIZED)
-    if stage == EventReport.ReviewStage.UIQAC:
-        # University IQAC: see all non-finalized
-        return qs.exclude(review_stage=EventReport.ReviewStage.FINALIZED)
-    return qs.none()
+    if scope.stage == EventReport.ReviewStage.USER:
+        return qs.filter(proposal__submitted_by=request.user)
+    # Reviewers: unfinalized reports from the approval inbox (D-IQAC and HOD
+    # limited to their organizations, University IQAC sees all)
+    return approval_inbox.open_reports(scope._replace(admin=False), qs)
 
 
 @login_required
 def review_center(request):
-    stage = _user_role_stage(request)
-    admin_override = _is_admin_override(request.user)
+    scope = approval_inbox.reviewer_scope(request)
+    stage = scope.stage
+    admin_override = scope.admin
     # Gate access: submitters (USER stage) should not access Review Center unless admin override
     if not admin_override and stage == EventReport.ReviewStage.USER:
         return HttpResponse(status=403)
     if admin_override:
-        reports = EventReport.objects.select_related("proposal", "proposal__organization", "proposal__submitted_by").exclude(review_stage=EventReport.ReviewStage.FINALIZED).order_by("-updated_at")
+        reports = approval_inbox.open_reports(
+            scope,
+            EventReport.objects.select_related("proposal", "proposal__organization", "proposal__submitted_by"),
+        ).order_by("-updated_at")
         stage_label = "Admin"
     else:
         reports = _reports_for_user(request).order_by("-updated_at")
@@ -263,7 +235,7 @@ def review_center(request):
     if report_id and request.headers.get("X-Requested-With"):
         r = get_object_or_404(reports, id=report_id)
         # Determine if the user can decide on this report, mirroring review_action
-        if _is_admin_override(request.user):
+        if admin_override:
             can_decide = r.review_stage != EventReport.ReviewStage.FINALIZED
         else:
             if stage == EventReport.ReviewStage.DIQAC:
@@ -571,13 +543,24 @@ def report_form(request):
     return render(request, "emt/report_generation.html", context)
 
 
+# Stylesheets applied to emt/pdf_template.html (static paths).
+REPORT_PDF_STYLESHEETS = ("emt/css/report_pdf.css",)
+
+
 @csrf_exempt
 def generate_report_pdf(request):
     if request.method != "POST":
         return HttpResponseNotAllowed(["POST"])
 
     html = render_to_string("emt/pdf_template.html", {"data": request.POST})
-    pdf = pdfkit.from_string(html, False)
+    try:
+        pdf = pdf_renderer.render(html, REPORT_PDF_STYLESHEETS)
+    except pdf_renderer.PDFGenerationError:
+        logger.exception("Failed to generate event report PDF")
+        return HttpResponse(
+            "An error occurred while generating the PDF. Please try again later.",
+            status=500,
+        )
     response = HttpResponse(pdf, content_type="application/pdf")
     response["Content-Disposition"] = 'attachment; filename="Event_Report.pdf"'
     return response
@@ -1222,11 +1205,132 @@ def review_proposal(request, proposal_id):
 # ──────────────────────────────────────────────────────────────
 #  Autosave draft (XHR from JS)
 # ──────────────────────────────────────────────────────────────
+def _validate_dynamic_rows(data):
+    """Return row errors for activities, speakers, expenses and income in ``data``.
+
+    Activity dates are normalised to ISO format in place.
+    """
+    errors = {}
+    # Validate activities
+    act_errors = {}
+    idx = 1
+    while any(key in data for key in [f"activity_name_{idx}", f"activity_date_{idx}"]):
+        name = data.get(f"activity_name_{idx}")
+        date = data.get(f"activity_date_{idx}")
+        missing = {}
+        if name or date:
+            if not name:
+                missing["name"] = "This field is required."
+            if not date:
+                missing["date"] = "This field is required."
+            else:
+                parsed = parse_date(str(date))
+                if not parsed:
+                    missing["date"] = "Enter a valid date."
+                else:
+                    data[f"activity_date_{idx}"] = parsed.isoformat()
+        if missing:
+            act_errors[idx] = missing
+        idx += 1
+    if act_errors:
+        errors["activities"] = act_errors
+
+    # Validate speakers
+    sp_errors = {}
+    sp_idx = 0
+    sp_fields = [
+        "full_name",
+        "designation",
+        "affiliation",
+        "contact_email",
+        "detailed_profile",
+    ]
+    email_validator = EmailValidator()
+    url_validator = URLValidator()
+    while any(
+        f"speaker_{field}_{sp_idx}" in data
+        for field in sp_fields + ["contact_number", "linkedin_url", "photo"]
+    ):
+        missing = {}
+        has_any = False
+        for field in sp_fields:
+            value = data.get(f"speaker_{field}_{sp_idx}")
+            if value:
+                has_any = True
+                if field == "full_name" and not NAME_RE.fullmatch(value):
+                    missing[field] = "Enter a valid name (letters, spaces, .'- only)."
+                elif field == "contact_email":
+                    try:
+                        email_validator(value)
+                    except ValidationError:
+                        missing[field] = "Enter a valid email address."
+            else:
+                missing[field] = "This field is required."
+
+        linkedin = data.get(f"speaker_linkedin_url_{sp_idx}")
+        if linkedin:
+            try:
+                url_validator(linkedin)
+            except ValidationError:
+                missing["linkedin_url"] = "Enter a valid URL."
+
+        if has_any and missing:
+            sp_errors[sp_idx] = missing
+        sp_idx += 1
+    if sp_errors:
+        errors["speakers"] = sp_errors
+
+    # Validate expenses
+    ex_errors = {}
+    ex_idx = 0
+    while any(
+        f"expense_{field}_{ex_idx}" in data
+        for field in ["sl_no", "particulars", "amount"]
+    ):
+        particulars = data.get(f"expense_particulars_{ex_idx}")
+        amount = data.get(f"expense_amount_{ex_idx}")
+        missing = {}
+        if particulars or amount:
+            if not particulars:
+                missing["particulars"] = "This field is required."
+            if not amount:
+                missing["amount"] = "This field is required."
+        if missing:
+            ex_errors[ex_idx] = missing
+        ex_idx += 1
+    if ex_errors:
+        errors["expenses"] = ex_errors
+
+    # Validate income
+    in_errors = {}
+    in_idx = 0
+    while any(
+        f"income_{field}_{in_idx}" in data
+        for field in ["particulars", "participants", "rate", "amount"]
+    ):
+        particulars = data.get(f"income_particulars_{in_idx}")
+        participants = data.get(f"income_participants_{in_idx}")
+        rate = data.get(f"income_rate_{in_idx}")
+        amount = data.get(f"income_amount_{in_idx}")
+        missing = {}
+        # Only require particulars and amount; participants and rate are optional
+        if any([particulars, participants, rate, amount]):
+            if not particulars:
+                missing["particulars"] = "This field is required."
+            if not amount:
+                missing["amount"] = "This field is required."
+        if missing:
+            in_errors[in_idx] = missing
+        in_idx += 1
+    if in_errors:
+        errors["income"] = in_errors
+    return errors
+
+
 @login_required
 def autosave_proposal(request):
     if request.method != "POST":
         return JsonResponse({"error": "Invalid request"}, status=400)
-    errors = {}
     if request.content_type and request.content_type.startswith("multipart/form-data"):
         data = {}
         multi_fields = {"faculty_incharges", "sdg_goals"}
@@ -1246,6 +1350,18 @@ def autosave_proposal(request):
 
     logger.debug("autosave_proposal payload: %s", data)
 
+    if isinstance(data, dict) and "changes" in data:
+        return _autosave_proposal_delta(request, data)
+
+    # The draft row stays locked until the save commits, so a concurrent
+    # delta save cannot interleave with the version bump below.
+    with transaction.atomic():
+        return _autosave_proposal_form(request, data)
+
+
+def _autosave_proposal_form(request, data):
+    """Full-form (or text-only) autosave; runs inside the caller's transaction."""
+    errors = {}
     # Replace department logic with generic organization
     org_type_val = data.get("organization_type")
     org_name_val = data.get("organization")
@@ -1270,11 +1386,15 @@ def autosave_proposal(request):
     existing_proposal = None
     proposal = None
     if pid := data.get("proposal_id"):
-        existing_proposal = EventProposal.objects.filter(
-            id=pid,
-            submitted_by=request.user,
-            is_user_deleted=False,
-        ).first()
+        existing_proposal = (
+            EventProposal.objects.select_for_update()
+            .filter(
+                id=pid,
+                submitted_by=request.user,
+                is_user_deleted=False,
+            )
+            .first()
+        )
 
         # Don't autosave if proposal is already submitted
         if existing_proposal and existing_proposal.status != EventProposal.Status.DRAFT:
@@ -1286,16 +1406,28 @@ def autosave_proposal(request):
     text_keys = {"need_analysis", "objectives", "outcomes", "flow"}
     if existing_proposal and set(data.keys()).issubset(text_keys | {"proposal_id"}):
         text_errors = _save_text_sections(existing_proposal, data)
+        existing_proposal.save(
+            update_fields=proposal_autosave.bump(
+                existing_proposal, set(data) & set(proposal_autosave.TEXT_SECTIONS)
+            )
+        )
         if text_errors:
             logger.debug("autosave_proposal text errors: %s", text_errors)
             return JsonResponse(
                 {
                     "success": False,
                     "proposal_id": existing_proposal.id,
+                    "version": existing_proposal.autosave_version,
                     "errors": text_errors,
                 }
             )
-        return JsonResponse({"success": True, "proposal_id": existing_proposal.id})
+        return JsonResponse(
+            {
+                "success": True,
+                "proposal_id": existing_proposal.id,
+                "version": existing_proposal.autosave_version,
+            }
+        )
 
     if existing_proposal and existing_proposal.academic_year:
         data["academic_year"] = existing_proposal.academic_year
@@ -1352,6 +1484,9 @@ def autosave_proposal(request):
         setattr(proposal, field, value)
     proposal.submitted_by = request.user
     proposal.status = EventProposal.Status.DRAFT
+    proposal_autosave.bump(
+        proposal, {proposal_autosave.tracked_name(key) for key in data if key != "proposal_id"}
+    )
     proposal.save()
 
     for field, value in form.cleaned_data.items():
@@ -1365,119 +1500,7 @@ def autosave_proposal(request):
     if text_errors:
         errors.update(text_errors)
 
-    # Validate activities
-    act_errors = {}
-    idx = 1
-    while any(key in data for key in [f"activity_name_{idx}", f"activity_date_{idx}"]):
-        name = data.get(f"activity_name_{idx}")
-        date = data.get(f"activity_date_{idx}")
-        missing = {}
-        if name or date:
-            if not name:
-                missing["name"] = "This field is required."
-            if not date:
-                missing["date"] = "This field is required."
-            else:
-                parsed = parse_date(str(date))
-                if not parsed:
-                    missing["date"] = "Enter a valid date."
-                else:
-                    data[f"activity_date_{idx}"] = parsed.isoformat()
-        if missing:
-            act_errors[idx] = missing
-        idx += 1
-    if act_errors:
-        errors["activities"] = act_errors
-
-    # Validate speakers
-    sp_errors = {}
-    sp_idx = 0
-    sp_fields = [
-        "full_name",
-        "designation",
-        "affiliation",
-        "contact_email",
-        "detailed_profile",
-    ]
-    email_validator = EmailValidator()
-    url_validator = URLValidator()
-    while any(
-        f"speaker_{field}_{sp_idx}" in data
-        for field in sp_fields + ["contact_number", "linkedin_url", "photo"]
-    ):
-        missing = {}
-        has_any = False
-        for field in sp_fields:
-            value = data.get(f"speaker_{field}_{sp_idx}")
-            if value:
-                has_any = True
-                if field == "full_name" and not NAME_RE.fullmatch(value):
-                    missing[field] = "Enter a valid name (letters, spaces, .'- only)."
-                elif field == "contact_email":
-                    try:
-                        email_validator(value)
-                    except ValidationError:
-                        missing[field] = "Enter a valid email address."
-            else:
-                missing[field] = "This field is required."
-
-        linkedin = data.get(f"speaker_linkedin_url_{sp_idx}")
-        if linkedin:
-            try:
-                url_validator(linkedin)
-            except ValidationError:
-                missing["linkedin_url"] = "Enter a valid URL."
-
-        if has_any and missing:
-            sp_errors[sp_idx] = missing
-        sp_idx += 1
-    if sp_errors:
-        errors["speakers"] = sp_errors
-
-    # Validate expenses
-    ex_errors = {}
-    ex_idx = 0
-    while any(
-        f"expense_{field}_{ex_idx}" in data
-        for field in ["sl_no", "particulars", "amount"]
-    ):
-        particulars = data.get(f"expense_particulars_{ex_idx}")
-        amount = data.get(f"expense_amount_{ex_idx}")
-        missing = {}
-        if particulars or amount:
-            if not particulars:
-                missing["particulars"] = "This field is required."
-            if not amount:
-                missing["amount"] = "This field is required."
-        if missing:
-            ex_errors[ex_idx] = missing
-        ex_idx += 1
-    if ex_errors:
-        errors["expenses"] = ex_errors
-
-    # Validate income
-    in_errors = {}
-    in_idx = 0
-    while any(
-        f"income_{field}_{in_idx}" in data
-        for field in ["particulars", "participants", "rate", "amount"]
-    ):
-        particulars = data.get(f"income_particulars_{in_idx}")
-        participants = data.get(f"income_participants_{in_idx}")
-        rate = data.get(f"income_rate_{in_idx}")
-        amount = data.get(f"income_amount_{in_idx}")
-        missing = {}
-        # Only require particulars and amount; participants and rate are optional
-        if any([particulars, participants, rate, amount]):
-            if not particulars:
-                missing["particulars"] = "This field is required."
-            if not amount:
-                missing["amount"] = "This field is required."
-        if missing:
-            in_errors[in_idx] = missing
-        in_idx += 1
-    if in_errors:
-        errors["income"] = in_errors
+    errors.update(_validate_dynamic_rows(data))
 
     _save_activities(proposal, data)
     _save_speakers(proposal, data, request.FILES)
@@ -1497,7 +1520,153 @@ def autosave_proposal(request):
     # encountered. Drafts are still persisted even when ``success`` is False so
     # the frontend can surface issues without clearing the user's progress.
     success = not errors
-    response = {"success": success, "proposal_id": proposal.id}
+    response = {
+        "success": success,
+        "proposal_id": proposal.id,
+        "version": proposal.autosave_version,
+    }
+    if errors:
+        response["errors"] = errors
+    return JsonResponse(response)
+
+
+def _apply_proposal_changes(proposal, changes):
+    """Apply an autosave delta to ``proposal`` (locked by the caller).
+
+    Returns ``(errors, tracked, update_fields)``: validation errors, the
+    names whose value changed and the proposal columns to save.  Invalid
+    values are reported and left unsaved, like the full-form autosave.
+    """
+    errors, tracked, update_fields = {}, set(), []
+
+    if "organization" in changes or "organization_type" in changes:
+        org_value = str(changes.get("organization") or "").strip()
+        org_type_value = str(changes.get("organization_type") or "").strip()
+        organizations = Organization.objects.filter(is_active=True)
+        if org_type_value:
+            organizations = organizations.filter(
+                **{"org_type_id" if org_type_value.isdigit() else "org_type__name": org_type_value}
+            )
+        organization = None
+        if org_value.isdigit():
+            organization = organizations.filter(pk=org_value).first()
+        elif org_value:
+            organization = organizations.filter(name__iexact=org_value).first()
+        if org_value and organization is None:
+            errors["organization"] = ["Organization not found"]
+        elif organization and organization.pk != proposal.organization_id:
+            proposal.organization = organization
+            update_fields.append("organization")
+            tracked.add("organization")
+
+    for name in proposal_autosave.SCALAR_FIELDS:
+        if name not in changes:
+            continue
+        try:
+            value = proposal_autosave.form_field(name).clean(changes[name])
+        except ValidationError as exc:
+            errors[name] = exc.messages
+            continue
+        if value is None and not EventProposal._meta.get_field(name).null:
+            value = ""
+        if getattr(proposal, name) != value:
+            setattr(proposal, name, value)
+            update_fields.append(name)
+            tracked.add(name)
+
+    if "faculty_incharges" in changes:
+        ids = [int(v) for v in changes["faculty_incharges"] or [] if str(v).isdigit()]
+        wanted = set(User.objects.filter(id__in=ids).values_list("id", flat=True))
+        if wanted != set(proposal.faculty_incharges.values_list("id", flat=True)):
+            proposal.faculty_incharges.set(wanted)
+            tracked.add("faculty_incharges")
+    if "sdg_goals" in changes:
+        try:
+            goals = EventProposalForm.base_fields["sdg_goals"].clean(changes["sdg_goals"] or [])
+        except ValidationError as exc:
+            errors["sdg_goals"] = exc.messages
+        else:
+            wanted = {goal.pk for goal in goals}
+            if wanted != set(proposal.sdg_goals.values_list("id", flat=True)):
+                proposal.sdg_goals.set(wanted)
+                tracked.add("sdg_goals")
+
+    sections = {
+        name: changes[name]
+        for name in proposal_autosave.TEXT_SECTIONS
+        if name in changes
+        and (changes[name] or "")
+        != proposal_autosave.serialize(proposal, [name])[name]
+    }
+    if sections:
+        errors.update(_save_text_sections(proposal, sections))
+        tracked.update(name for name in sections if name not in errors)
+
+    groups = proposal_autosave.split_groups(changes)
+    if groups:
+        rows = {key: value for group in groups.values() for key, value in group.items()}
+        errors.update(_validate_dynamic_rows(rows))
+        if "activities" in groups:
+            _save_activities(proposal, rows)
+        if "speakers" in groups:
+            _save_speakers(proposal, rows, {})
+        if "expenses" in groups:
+            _save_expenses(proposal, rows)
+        if "income" in groups:
+            _save_income(proposal, rows)
+        tracked.update(groups)
+
+    return errors, tracked, update_fields
+
+
+def _autosave_proposal_delta(request, data):
+    """Apply only the changed fields of a draft (see emt/proposal_autosave.py)."""
+    changes = data.get("changes")
+    try:
+        base_version = int(data.get("version"))
+    except (TypeError, ValueError):
+        base_version = None
+    if not isinstance(changes, dict) or base_version is None or not data.get("proposal_id"):
+        return JsonResponse(
+            {"success": False, "error": "proposal_id, version and changes are required"},
+            status=400,
+        )
+
+    with transaction.atomic():
+        proposal = (
+            EventProposal.objects.select_for_update()
+            .filter(id=data["proposal_id"], submitted_by=request.user, is_user_deleted=False)
+            .first()
+        )
+        if proposal is None:
+            return JsonResponse({"success": False, "error": "Draft not found"}, status=404)
+        if proposal.status != EventProposal.Status.DRAFT:
+            return JsonResponse(
+                {"success": False, "error": "Cannot modify submitted proposal"}
+            )
+        if proposal.autosave_version != base_version:
+            stale = proposal_autosave.changed_since(proposal, base_version)
+            return JsonResponse(
+                {
+                    "success": False,
+                    "error": "stale",
+                    "proposal_id": proposal.id,
+                    "version": proposal.autosave_version,
+                    "diff": proposal_autosave.serialize(proposal, stale),
+                },
+                status=409,
+            )
+        errors, tracked, update_fields = _apply_proposal_changes(proposal, changes)
+        if tracked:
+            proposal.save(
+                update_fields=update_fields + proposal_autosave.bump(proposal, tracked)
+            )
+
+    response = {
+        "success": not errors,
+        "proposal_id": proposal.id,
+        "version": proposal.autosave_version,
+    }
     if errors:
         response["errors"] = errors
     return JsonResponse(response)
@@ -1505,9 +1674,59 @@ def autosave_proposal(request):
 
 @login_required
 def proposal_live_state(request, proposal_id):
+    """Serialize a proposal for the editor's live sync.
+
+    Answers ``If-None-Match``/``If-Modified-Since`` with 304 from the
+    proposal's stamp alone (see emt/proposal_live.py).
+    """
     if request.method != "GET":
         return HttpResponseNotAllowed(["GET"])
 
+    current = proposal_live.stamp(proposal_id, request.user)
+    if current is None:
+        raise Http404("No EventProposal matches the given query.")
+    etag = proposal_live.etag(proposal_id, current)
+    last_modified = current[0].timestamp() if current[0] else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _proposal_live_payload(request, proposal_id)
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+async def proposal_live_stream(request, proposal_id):
+    """Push proposal changes to the editor as server-sent events.
+
+    Needs an ASGI server and ``PROPOSAL_STREAM_ENABLED``; without them the
+    204 tells the editor to keep polling ``proposal_live_state``.
+    """
+    if not getattr(settings, "PROPOSAL_STREAM_ENABLED", False):
+        return HttpResponse(status=204)
+
+    def _effective_user():
+        user = request.user
+        user.pk
+        return user
+
+    user = await sync_to_async(_effective_user)()
+    if await sync_to_async(proposal_live.stamp)(proposal_id, user) is None:
+        raise Http404("No EventProposal matches the given query.")
+    response = StreamingHttpResponse(
+        proposal_live.live_events(
+            proposal_id, user, request.headers.get("Last-Event-ID")
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _proposal_live_payload(request, proposal_id):
     proposal = get_object_or_404(
         EventProposal.objects.select_related(
             "need_analysis",
@@ -2622,7 +2841,7 @@ def autosave_event_report(request):
 
     # Preserve the original payload so we can persist it without being mutated
     # by the transformations that follow (e.g., flattening list fields).
-    payload_snapshot = copy.deepcopy(data)
+    payload_snapshot = dict(data)
 
     proposal_id = data.get("proposal_id")
     report_id = data.get("report_id")
@@ -2641,9 +2860,11 @@ def autosave_event_report(request):
         report, _ = EventReport.objects.get_or_create(proposal=proposal)
 
     # Map section fields to model fields
-    summary_content = data.pop("event_summary", None)
-    outcomes_content = data.pop("event_outcomes", None)
-    analysis_content = data.pop("analysis", None)
+    sections = {
+        "summary": data.pop("event_summary", None),
+        "outcomes": data.pop("event_outcomes", None),
+        "analysis": data.pop("analysis", None),
+    }
 
     # Flatten any list values (e.g., multi-select fields) into comma-separated strings
     for key, value in list(data.items()):
@@ -2651,17 +2872,25 @@ def autosave_event_report(request):
             data[key] = ", ".join(value)
 
     form = EventReportForm(data, instance=report)
-    # For autosave, allow partial payloads and do NOT overwrite unspecified fields
-    for f in form.fields.values():
-        f.required = False
-    form.fields.get("report_signed_date").required = False
+    # For autosave, validate only the submitted fields and do NOT overwrite
+    # unspecified ones
+    for name in list(form.fields):
+        if name not in data:
+            del form.fields[name]
+        else:
+            form.fields[name].required = False
     if not form.is_valid():
         logger.debug("autosave_event_report form errors: %s", form.errors)
         return JsonResponse({"success": False, "errors": form.errors})
 
-    # Apply only the submitted fields to the existing instance
-    for name in form.fields.keys():
-        if name in data:
+    with transaction.atomic():
+        report = EventReport.objects.select_for_update().get(pk=report.pk)
+        changes, update_fields = report_revisions.record(
+            report, payload_snapshot, request.user
+        )
+
+        # Apply only the submitted fields that changed
+        for name in form.fields.keys():
             cleaned_value = form.cleaned_data.get(name)
             if name == "report_signed_date" and cleaned_value in (None, ""):
                 # Leave the existing value intact when autosave payload omits a date.
@@ -2671,23 +2900,22 @@ def autosave_event_report(request):
                 # preserves either the default or any previously saved date while still
                 # allowing the client to update it once a real value is provided.
                 continue
-            try:
+            if getattr(report, name) != cleaned_value:
                 setattr(report, name, cleaned_value)
-            except Exception:
-                pass
-    if summary_content is not None:
-        report.summary = summary_content
-    if outcomes_content is not None:
-        report.outcomes = outcomes_content
-    if analysis_content is not None and hasattr(report, "analysis"):
-        report.analysis = analysis_content
-    if payload_snapshot:
-        report.generated_payload = payload_snapshot
-    report.save()
+                update_fields.append(name)
+        for name, content in sections.items():
+            if content is not None and getattr(report, name) != content:
+                setattr(report, name, content)
+                update_fields.append(name)
+        if update_fields:
+            report.save(update_fields=update_fields + ["updated_at"])
 
-    _save_activities(proposal, data)
+        if report_revisions.touches(changes, "activity_"):
+            _save_activities(proposal, data)
 
-    return JsonResponse({"success": True, "report_id": report.id})
+    return JsonResponse(
+        {"success": True, "report_id": report.id, "revision": report.revision}
+    )
 
 
 @login_required
@@ -2906,6 +3134,8 @@ def _parse_public_li(html: str):  # pragma: no cover
     dictionary suitable for JSON serialization. The parsing intentionally
     avoids any advanced scraping that would require authentication.
     """
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html or "", "html.parser")
 
     def _meta(prop):
@@ -2968,12 +3198,8 @@ def api_outcomes(request, org_id):
 @login_required
 def my_approvals(request):
     pending_steps = (
-        ApprovalStep.objects.filter(
-            assigned_to=request.user,
-            status=ApprovalStep.Status.PENDING,
-        )
-        .filter(Q(is_optional=False) | Q(optional_unlocked=True))
-        .select_related("proposal")
+        approval_inbox.pending_steps(request.user)
+        .select_related("proposal", "proposal__submitted_by")
         .order_by("order_index")
     )
     return render(request, "emt/my_approvals.html", {"pending_steps": pending_steps})
@@ -3153,8 +3379,10 @@ def submit_event_report(request, proposal_id):
         EventReportAttachment, form=EventReportAttachmentForm, extra=2, can_delete=True
     )
 
-    drafts = request.session.setdefault("event_report_draft", {})
-    draft = drafts.get(str(proposal_id), {})
+    # Drafts used to live in the session; drop any left over there.
+    if "event_report_draft" in request.session:
+        del request.session["event_report_draft"]
+    draft = report_drafts.load(request.user, proposal.id)
 
     if request.method == "POST":
         trigger_ai = str(request.POST.get("generate_ai", "")).lower() in {
@@ -3163,16 +3391,19 @@ def submit_event_report(request, proposal_id):
             "on",
             "yes",
         }
-        drafts[str(proposal_id)] = {
-            key: (
-                request.POST.getlist(key)
-                if len(request.POST.getlist(key)) > 1
-                else request.POST.get(key)
-            )
-            for key in request.POST.keys()
-            if key != "generate_ai"
-        }
-        request.session.modified = True
+        report_drafts.save(
+            request.user,
+            proposal.id,
+            {
+                key: (
+                    request.POST.getlist(key)
+                    if len(request.POST.getlist(key)) > 1
+                    else request.POST.get(key)
+                )
+                for key in request.POST.keys()
+                if key != "generate_ai" and key != "csrfmiddlewaretoken"
+            },
+        )
 
         post_data = request.POST.copy()
         # Map front-end field names to model fields
@@ -3206,8 +3437,7 @@ def submit_event_report(request, proposal_id):
             for obj in formset.deleted_objects:
                 obj.delete()
 
-            drafts.pop(str(proposal_id), None)
-            request.session.modified = True
+            report_drafts.discard(request.user, proposal.id)
 
             if trigger_ai:
                 messages.success(
@@ -3346,11 +3576,7 @@ def submit_event_report(request, proposal_id):
         "external": external_count,
     }
 
-    generated_payload = (
-        report.generated_payload
-        if report and isinstance(report.generated_payload, dict)
-        else {}
-    )
+    generated_payload = report_revisions.current_payload(report) if report else {}
 
     def _coalesce_prefill(key, *fallbacks):
         """Return the first meaningful value for a report field.
@@ -5101,21 +5327,18 @@ def save_attendance_rows(request, report_id):
         ]
     )
 
-    # Persist counts in session draft so the report form shows updated values
-    drafts = request.session.setdefault("event_report_draft", {})
-    key = str(report.proposal_id)
-    draft = drafts.get(key, {})
-    draft.update(
+    # Persist counts in the report draft so the report form shows updated values
+    report_drafts.update(
+        request.user,
+        report.proposal_id,
         {
             "num_participants": present,
             "num_student_volunteers": volunteers,
             "num_student_participants": student_count,
             "num_faculty_participants": faculty_count,
             "num_external_participants": external_count,
-        }
+        },
     )
-    drafts[key] = draft
-    request.session.modified = True
 
     return JsonResponse(
         {
@@ -2,6 +2,11 @@
 ASGI config for iqac_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``gunicorn -k uvicorn.workers.UvicornWorker``) with
+``NOTIFICATION_STREAM_ENABLED=1`` to push header notifications over
+server-sent events (``core.views.api_notifications_stream``), and with
+``PROPOSAL_STREAM_ENABLED=1`` to push proposal editor changes
+(``emt.views.proposal_live_stream``).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -1,5 +1,6 @@
 import importlib.util
 import os
+import sys
 from pathlib import Path
 
 
@@ -73,11 +74,13 @@ ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.QueryStatsMiddleware",  # no-op unless QUERY_STATS enabled
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "core.middleware.ImpersonationMiddleware",
+    "core.middleware.AccessContextMiddleware",
     "allauth.account.middleware.AccountMiddleware",  # ← allauth middleware
     "core.middleware.ActivityLogMiddleware",
     "core.middleware.EnsureSiteMiddleware",
@@ -108,6 +111,7 @@ TEMPLATES = [
                 "django.template.context_processors.csrf",
                 "django.contrib.messages.context_processors.messages",
                 "core.context_processors.notifications",
+                "core.context_processors.approval_inbox",
                 "core.context_processors.active_academic_year",
                 "core.context_processors.sidebar_permissions",
             ],
@@ -132,6 +136,9 @@ DATABASES = {
     }
 }
 
+# Clears the caches and the transcript render cache between tests.
+TEST_RUNNER = "iqac_project.test_runner.TestRunner"
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # AUTHENTICATION
@@ -266,6 +273,161 @@ LOGGING = {
         },
     },
 }
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CACHES
+# ──────────────────────────────────────────────────────────────────────────────
+# The "access" cache holds the navigation tree, per-user permission snapshots
+# (see core/permission_cache.py), notification feeds (core/notifications.py),
+# the active academic year (transcript.models.get_active_academic_year), the
+# transcript home page directory (transcript/directory.py), the approver
+# directory used to build approval chains (emt/approvers.py) and the approval
+# inbox badge counts (emt/approval_inbox.py).
+# It must be shared by every worker, so it defaults to a file-based cache;
+# point it at the database cache or Redis through the environment.  Tests use
+# an in-memory cache, cleared after every test (see iqac_project/test_runner.py).
+ACCESS_CACHE_ALIAS = "access"
+NOTIFICATION_CACHE_ALIAS = ACCESS_CACHE_ALIAS
+ACADEMIC_YEAR_CACHE_ALIAS = ACCESS_CACHE_ALIAS
+TRANSCRIPT_DIRECTORY_CACHE_ALIAS = ACCESS_CACHE_ALIAS
+APPROVER_DIRECTORY_CACHE_ALIAS = ACCESS_CACHE_ALIAS
+APPROVAL_INBOX_CACHE_ALIAS = ACCESS_CACHE_ALIAS
+# Server-sent notification pushes hold a connection open, so only enable them
+# when serving iqac_project.asgi:application; WSGI workers keep polling.
+NOTIFICATION_STREAM_ENABLED = os.getenv("NOTIFICATION_STREAM_ENABLED", "0") == "1"
+# Same for the proposal editor's live sync (emt.views.proposal_live_stream).
+PROPOSAL_STREAM_ENABLED = os.getenv("PROPOSAL_STREAM_ENABLED", "0") == "1"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    ACCESS_CACHE_ALIAS: {
+        "BACKEND": os.getenv(
+            "ACCESS_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache"
+            if "test" in sys.argv[1:2]
+            else "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "ACCESS_CACHE_LOCATION", str(BASE_DIR / ".cache" / "access")
+        ),
+        "TIMEOUT": int(os.getenv("ACCESS_CACHE_TIMEOUT", "86400")),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("ACCESS_CACHE_MAX_ENTRIES", "20000"))},
+    },
+}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ACTIVITY LOG (see core/activity_buffer.py)
+# ──────────────────────────────────────────────────────────────────────────────
+# Requests are logged through an in-process buffer flushed with bulk_create.
+# The test runner writes synchronously so assertions see rows immediately.
+ACTIVITY_LOG = {
+    "MODE": os.getenv(
+        "ACTIVITY_LOG_MODE", "sync" if "test" in sys.argv[1:2] else "buffered"
+    ),
+    "BATCH_SIZE": int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "200")),
+    "FLUSH_INTERVAL": float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "2.0")),
+    "MAX_QUEUE_SIZE": int(os.getenv("ACTIVITY_LOG_MAX_QUEUE_SIZE", "10000")),
+    # Background XHRs (autosave, live sync, header polling) add no audit value.
+    # Bare names match every namespace the view is mounted under.
+    "EXCLUDE_VIEWS": [
+        "autosave_proposal",
+        "autosave_event_report",
+        "proposal_live_state",
+        "proposal_live_stream",
+        "api_get_notifications",
+        "api_notifications_stream",
+    ],
+    # Optional per-view sampling, e.g. {"dashboard": 0.25}
+    "SAMPLE_RATES": {},
+    # Retention used by ``manage.py compact_activity_logs``: rows older than
+    # HOT_DAYS move to ActivityLogArchive, archived rows older than
+    # ARCHIVE_RETENTION_DAYS are deleted (0 keeps them forever).
+    "HOT_DAYS": int(os.getenv("ACTIVITY_LOG_HOT_DAYS", "90")),
+    "ARCHIVE_RETENTION_DAYS": int(os.getenv("ACTIVITY_LOG_RETENTION_DAYS", "730")),
+}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# QUERY STATS (see core/query_stats.py)
+# ──────────────────────────────────────────────────────────────────────────────
+# Sampled per-view query counts, DB time and N+1 fingerprints, reported at
+# /core-admin/query-stats/.  Samples are kept in each worker's memory.
+QUERY_STATS = {
+    "ENABLED": os.getenv("QUERY_STATS_ENABLED", "0") == "1",
+    "SAMPLE_RATE": float(os.getenv("QUERY_STATS_SAMPLE_RATE", "0.05")),
+    "WINDOW": int(os.getenv("QUERY_STATS_WINDOW", "500")),
+    "N_PLUS_ONE_THRESHOLD": int(os.getenv("QUERY_STATS_N_PLUS_ONE_THRESHOLD", "5")),
+}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# PDF RENDERER (see core/pdf_renderer.py)
+# ──────────────────────────────────────────────────────────────────────────────
+# Shared by transcript and EMT PDFs: warm per-thread WeasyPrint state, static
+# and media assets served from an in-memory LRU, bounded concurrency.
+PDF_RENDERER = {
+    "MAX_CONCURRENT": int(os.getenv("PDF_RENDERER_MAX_CONCURRENT", "2")),
+    "ASSET_CACHE_BYTES": int(os.getenv("PDF_RENDERER_ASSET_CACHE_MB", "32")) * 1024 * 1024,
+    "ASSET_MAX_FILE_BYTES": 4 * 1024 * 1024,
+    "BASE_URL": "http://localhost/",
+}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# BULK TRANSCRIPTS (see transcript/bulk.py)
+# ──────────────────────────────────────────────────────────────────────────────
+# Course-wide downloads render PDFs in a process pool.  WORKERS=0 renders in
+# the request process; MAX_IN_FLIGHT (0 = 2 × WORKERS) bounds how many
+# transcripts are queued at once and therefore peak memory.
+TRANSCRIPT_BULK = {
+    "WORKERS": int(os.getenv("TRANSCRIPT_BULK_WORKERS", "2")),
+    "MAX_IN_FLIGHT": int(os.getenv("TRANSCRIPT_BULK_MAX_IN_FLIGHT", "0")),
+    # "forkserver" keeps pool workers from inheriting the locks of request
+    # threads (activity buffer, logging); "spawn" works everywhere.
+    "START_METHOD": os.getenv("TRANSCRIPT_BULK_START_METHOD", "forkserver"),
+}
+
+# Background course jobs (see transcript/jobs.py).  Each web process starts a
+# worker thread on demand; set TRANSCRIPT_JOBS_AUTOSTART=0 and run
+# ``manage.py run_transcript_jobs`` to process them in a separate process.
+TRANSCRIPT_JOBS = {
+    "AUTOSTART": os.getenv("TRANSCRIPT_JOBS_AUTOSTART", "1") == "1",
+    "STALE_AFTER": int(os.getenv("TRANSCRIPT_JOBS_STALE_AFTER", "120")),
+    "HEARTBEAT_INTERVAL": int(os.getenv("TRANSCRIPT_JOBS_HEARTBEAT_INTERVAL", "30")),
+    "IDLE_TIMEOUT": int(os.getenv("TRANSCRIPT_JOBS_IDLE_TIMEOUT", "60")),
+    "RETENTION_HOURS": int(os.getenv("TRANSCRIPT_JOBS_RETENTION_HOURS", "24")),
+}
+
+# Rendered QR codes, transcript HTML and PDFs cached under MEDIA_ROOT (see
+# transcript/render_cache.py).
+_MB = 1024 * 1024
+TRANSCRIPT_RENDER_CACHE = {
+    "ENABLED": os.getenv("TRANSCRIPT_RENDER_CACHE_ENABLED", "1") == "1",
+    "DIR": "cache/transcripts",
+    "MAX_BYTES": {
+        "qr": int(os.getenv("TRANSCRIPT_RENDER_CACHE_QR_MB", "16")) * _MB,
+        "html": int(os.getenv("TRANSCRIPT_RENDER_CACHE_HTML_MB", "64")) * _MB,
+        "pdf": int(os.getenv("TRANSCRIPT_RENDER_CACHE_PDF_MB", "512")) * _MB,
+    },
+    "TEMPLATE_VERSION": os.getenv("TRANSCRIPT_TEMPLATE_VERSION", "1"),
+}
+
+# ──────────────────────────────────────────────────────────────────────────────
+# EVENT REPORT DRAFTS AND REVISIONS (see emt/report_drafts.py, report_revisions.py)
+# ──────────────────────────────────────────────────────────────────────────────
+# Unsubmitted report forms are stored per user/proposal/form as compressed
+# JSON instead of in the session.  ``manage.py purge_report_drafts`` deletes
+# drafts untouched for TTL_DAYS.
+REPORT_DRAFTS = {
+    "TTL_DAYS": int(os.getenv("REPORT_DRAFTS_TTL_DAYS", "30")),
+    "COMPRESSION_LEVEL": 6,
+}
+
+# Report autosaves append diffs to EventReportRevision and store the full
+# payload every CHECKPOINT_EVERY revisions (see emt/report_revisions.py).
+REPORT_REVISIONS = {
+    "CHECKPOINT_EVERY": int(os.getenv("REPORT_REVISIONS_CHECKPOINT_EVERY", "25")),
+}
+
 ALLOWED_HOSTS = ["iqac-suite.onrender.com", "localhost", "127.0.0.1"]
 
 RENDER_EXTERNAL_HOSTNAME = os.getenv("RENDER_EXTERNAL_HOSTNAME")
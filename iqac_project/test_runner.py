@@ -0,0 +1,44 @@
+"""Test runner that keeps the production caches on without leaking state.
+
+Test cases roll their rows back without sending signals, so nothing bumps
+the version stamps or drops the entries a test left in the shared caches.
+Every test therefore starts from empty caches, and the whole run writes
+``MEDIA_ROOT`` (including the transcript render cache) to a temporary
+directory.
+"""
+
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+from django.test.utils import iter_test_cases
+
+
+def clear_caches():
+    from transcript import render_cache
+
+    for cache in caches.all():
+        cache.clear()
+    render_cache.clear()
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        # Assigned directly, as Django does for ALLOWED_HOSTS, so that
+        # settings.SETTINGS_MODULE stays visible to the tests.
+        self._saved_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = tempfile.mkdtemp(prefix="iqac-test-media-")
+
+    def teardown_test_environment(self, **kwargs):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        settings.MEDIA_ROOT = self._saved_media_root
+        super().teardown_test_environment(**kwargs)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        for test in iter_test_cases(suite):
+            test.addCleanup(clear_caches)
+        return suite
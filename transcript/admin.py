@@ -12,6 +12,8 @@ from .models import (
     Role,
     School,
     Student,
+    TranscriptBatchItem,
+    TranscriptBatchJob,
 )
 
 
@@ -40,6 +42,29 @@ class StudentAdmin(admin.ModelAdmin):
     photo_tag.short_description = "Photo"
 
 
+class TranscriptBatchItemInline(admin.TabularInline):
+    model = TranscriptBatchItem
+    extra = 0
+    raw_id_fields = ("student",)
+    readonly_fields = ("status", "error", "finished_at")
+
+
+@admin.register(TranscriptBatchJob)
+class TranscriptBatchJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "course",
+        "academic_year",
+        "output",
+        "status",
+        "completed",
+        "failed",
+        "total",
+        "created_at",
+    )
+    list_filter = ("status", "output")
+    inlines = [TranscriptBatchItemInline]
+
+
 # Register other models normally.
 admin.site.register(Event)
 admin.site.register(Participation)
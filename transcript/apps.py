@@ -5,3 +5,9 @@ from django.apps import AppConfig
 class TranscriptConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "transcript"
+
+    def ready(self):
+        """
+        Import signals when the app is ready.
+        """
+        from . import signals  # noqa: F401
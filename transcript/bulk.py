@@ -0,0 +1,389 @@
+"""Parallel, streaming rendering of course-wide transcript downloads.
+
+Transcript HTML is built in the request process (it needs the database);
+the expensive HTML → PDF step runs in a ``ProcessPoolExecutor``.  At most
+``MAX_IN_FLIGHT`` transcripts are queued or rendering at any time and each
+PDF is handed on as soon as it finishes, so peak memory depends on the pool
+size rather than on the number of students:
+
+* :func:`stream_zip` turns finished PDFs into ZIP bytes chunk by chunk, for a
+  ``StreamingHttpResponse`` or :func:`write_zip` to a file;
+* :func:`merge_pdfs` spools per-student PDFs to a temporary directory and
+  concatenates them with pypdf instead of laying out one huge HTML document,
+  copying one source file at a time into the output.
+
+The pool is started on first use and kept for the life of the process, so
+only the first download pays for starting workers and ``django.setup()``.
+
+Configured through ``settings.TRANSCRIPT_BULK``; see :data:`DEFAULTS`.
+"""
+
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from core.pdf_renderer import PDFGenerationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Pool processes; 0 renders in the calling process.
+    "WORKERS": 2,
+    # Transcripts submitted but not yet consumed; 0 means 2 × WORKERS.
+    "MAX_IN_FLIGHT": 0,
+    # multiprocessing start method for the pool (None = platform default).
+    "START_METHOD": "forkserver",
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "TRANSCRIPT_BULK", {}) or {})
+    return config
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def render_pdf(html):
+    """Render one transcript; runs inside the pool workers."""
+    from .views import render_pdf_from_html
+
+    return render_pdf_from_html(html)
+
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def _executor(workers, start_method):
+    """Return the shared pool, starting it on first use or a config change."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None and _pool_key != (workers, start_method):
+            # Work already queued by other requests still completes.
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            context = None
+            method = start_method
+            if method:
+                if method not in multiprocessing.get_all_start_methods():
+                    method = "spawn"
+                context = multiprocessing.get_context(method)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_worker
+            )
+            _pool_key = (workers, start_method)
+        return _pool
+
+
+def _discard(pool):
+    """Forget ``pool`` after a worker died so the next call starts afresh."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown():
+    """Stop the shared pool; it is started again when next needed."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def render_all(items, workers=None, max_in_flight=None):
+    """Render ``(key, html)`` pairs, yielding ``(key, pdf_bytes, error)``.
+
+    Results arrive in completion order.  ``items`` is consumed lazily, only
+    as fast as the pool frees up, and a failed render yields its exception
+    instead of aborting the remaining students.
+    """
+    config = get_config()
+    workers = config["WORKERS"] if workers is None else workers
+    max_in_flight = max_in_flight or config["MAX_IN_FLIGHT"] or 2 * max(workers, 1)
+
+    if workers <= 0:
+        for key, html in items:
+            try:
+                yield key, render_pdf(html), None
+            except Exception as exc:
+                yield key, None, exc
+        return
+
+    items = iter(items)
+    pending = {}
+    start_method = config["START_METHOD"]
+    pool = _executor(workers, start_method)
+
+    def submit(html):
+        nonlocal pool
+        try:
+            return pool.submit(render_pdf, html)
+        except BrokenProcessPool:
+            _discard(pool)
+            pool = _executor(workers, start_method)
+            return pool.submit(render_pdf, html)
+
+    def fill():
+        while len(pending) < max_in_flight:
+            try:
+                key, html = next(items)
+            except StopIteration:
+                return
+            pending[submit(html)] = key
+
+    try:
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                try:
+                    yield key, future.result(), None
+                except BrokenProcessPool as exc:
+                    _discard(pool)
+                    yield key, None, exc
+                except Exception as exc:
+                    yield key, None, exc
+            fill()
+    finally:
+        # Also reached when the client disconnects mid-download; the pool
+        # stays up for the next request, only our queued work is dropped.
+        for future in pending:
+            future.cancel()
+
+
+class _ZipSink:
+    """Write-only, unseekable file object drained after every ZIP entry.
+
+    ``zipfile`` writes data descriptors instead of seeking back to patch
+    headers, so nothing but the current entry is held in memory.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """Yield the bytes of a ZIP archive of ``(name, data)`` entries."""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w") as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    yield sink.drain()
+
+
+def write_zip(fileobj, entries):
+    """Write a ZIP archive of ``(name, data)`` entries to ``fileobj``."""
+    for chunk in stream_zip(entries):
+        fileobj.write(chunk)
+
+
+def as_generation_error(key, error):
+    """Return a render failure of ``key`` as a :class:`PDFGenerationError`.
+
+    Worker crashes (``BrokenProcessPool``) and template errors arrive as
+    other exception types; wrapping them lets callers handle one type.
+    """
+    if isinstance(error, PDFGenerationError):
+        return error
+    wrapped = PDFGenerationError(f"Failed to render transcript {key}: {error!r}")
+    wrapped.__cause__ = error
+    return wrapped
+
+
+def zip_entries(results, failures):
+    """Turn :func:`render_all` results keyed by file name into ZIP entries.
+
+    Failed students are appended to ``failures`` and listed in an
+    ``errors.txt`` entry at the end of the archive.
+    """
+    for name, pdf, error in results:
+        if error is not None:
+            logger.error("Failed to render %s: %s", name, error)
+            failures.append((name, error))
+            continue
+        yield name, pdf
+    if failures:
+        yield "errors.txt", "".join(
+            f"{name}: {error}\n" for name, error in failures
+        ).encode("utf-8")
+
+
+def merge_pdf_files(paths, output):
+    """Concatenate the PDF files at ``paths`` into the file object ``output``.
+
+    Each file's pages and the objects they reference are renumbered and
+    written straight to ``output`` before the next file is opened, so memory
+    is bounded by the largest single file rather than the combined PDF.
+    Only pages are carried over; outlines and form fields are dropped.
+    """
+    try:
+        from pypdf import PdfReader
+        from pypdf.generic import (
+            ArrayObject,
+            DictionaryObject,
+            IndirectObject,
+            NameObject,
+            NullObject,
+            NumberObject,
+        )
+        from pypdf.errors import PyPdfError
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise PDFGenerationError("pypdf is required to combine transcripts.") from exc
+
+    offsets = []
+    position = 0
+
+    def emit(data):
+        nonlocal position
+        output.write(data)
+        position += len(data)
+
+    def write_object(idnum, obj):
+        buffer = io.BytesIO()
+        obj.write_to_stream(buffer)
+        offsets[idnum - 1] = position
+        emit(b"%d 0 obj\n" % idnum + buffer.getvalue() + b"\nendobj\n")
+
+    def new_id():
+        offsets.append(None)
+        return len(offsets)
+
+    # Objects 1 and 2 are the page tree and catalog, written last.
+    pages_ref = IndirectObject(new_id(), 0, None)
+    root_ref = IndirectObject(new_id(), 0, None)
+    kids = ArrayObject()
+    emit(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def copy(path):
+        """Write the pages of ``path`` and everything they reference."""
+        reader = PdfReader(path)
+        renumbered = {}
+        queue = []
+
+        def ref(indirect):
+            key = (indirect.idnum, indirect.generation)
+            if key not in renumbered:
+                renumbered[key] = new_id()
+                queue.append(indirect)
+            return IndirectObject(renumbered[key], 0, None)
+
+        def remap(obj):
+            # References already renumbered have no reader attached.
+            if isinstance(obj, IndirectObject):
+                return ref(obj) if obj.pdf is reader else obj
+            if isinstance(obj, DictionaryObject):
+                if obj.get("/Type") == "/Page":
+                    # Inherited attributes were copied onto the page by pypdf.
+                    obj[NameObject("/Parent")] = pages_ref
+                for key, value in list(dict.items(obj)):
+                    obj[key] = remap(value)
+            elif isinstance(obj, ArrayObject):
+                for index, value in enumerate(list.__iter__(obj)):
+                    obj[index] = remap(value)
+            return obj
+
+        for page in reader.pages:
+            kids.append(ref(page.indirect_reference))
+        while queue:
+            indirect = queue.pop()
+            idnum = renumbered[(indirect.idnum, indirect.generation)]
+            obj = reader.get_object(indirect)
+            write_object(idnum, NullObject() if obj is None else remap(obj))
+
+    for path in paths:
+        try:
+            copy(path)
+        except PyPdfError as exc:
+            raise PDFGenerationError(f"Could not read {path}: {exc}") from exc
+
+    write_object(
+        pages_ref.idnum,
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Pages"),
+                NameObject("/Kids"): kids,
+                NameObject("/Count"): NumberObject(len(kids)),
+            }
+        ),
+    )
+    write_object(
+        root_ref.idnum,
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Catalog"),
+                NameObject("/Pages"): pages_ref,
+            }
+        ),
+    )
+    xref = position
+    emit(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+    emit(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    trailer = io.BytesIO()
+    DictionaryObject(
+        {
+            NameObject("/Size"): NumberObject(len(offsets) + 1),
+            NameObject("/Root"): root_ref,
+        }
+    ).write_to_stream(trailer)
+    emit(b"trailer\n" + trailer.getvalue() + b"\nstartxref\n%d\n%%%%EOF\n" % xref)
+
+
+def merge_pdfs(results, output):
+    """Concatenate rendered PDFs into ``output`` in key order.
+
+    ``results`` are :func:`render_all` triples keyed by sort position; the
+    first failure is raised as a :class:`PDFGenerationError`.  Each PDF is
+    spooled to disk as it finishes and only the merge itself reads them back.
+    """
+    with tempfile.TemporaryDirectory(prefix="transcripts-") as workdir:
+        paths = {}
+        for key, pdf, error in results:
+            if error is not None:
+                raise as_generation_error(key, error)
+            paths[key] = os.path.join(workdir, f"{len(paths):06d}.pdf")
+            with open(paths[key], "wb") as fh:
+                fh.write(pdf)
+        merge_pdf_files([paths[key] for key in sorted(paths)], output)
@@ -0,0 +1,135 @@
+"""Cached, level-by-level student directory for the transcript home page.
+
+The home page only ships the academic years; schools, courses and pages of
+students are fetched as the user drills down.  Every response is built from
+the cache named by ``settings.TRANSCRIPT_DIRECTORY_CACHE_ALIAS`` and tagged
+with the directory version stamp, which ``transcript.signals`` bumps whenever
+a ``Student``, ``Course``, ``School`` or ``AcademicYear`` changes.  The ETag
+of a response is derived from the stamp and the query alone, so an unchanged
+directory answers ``If-None-Match`` without touching the database.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+from core.cache_version import VersionStamp
+
+from .models import AcademicYear, Student
+
+logger = logging.getLogger(__name__)
+
+ENTRY_KEY = "transcript:directory:{}"
+CACHE_TIMEOUT = 3600
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+stamp = VersionStamp(
+    "TRANSCRIPT_DIRECTORY_CACHE_ALIAS", "transcript:directory:version", "transcript directory"
+)
+get_cache = stamp.get_cache
+current_version = stamp.current
+bump_version = stamp.bump
+bump_version_on_commit = stamp.bump_on_commit
+
+
+def _digest(level, params):
+    encoded = json.dumps([level, params], sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def etag(version, level, params):
+    if version is None:
+        return None
+    return f'"{version}-{_digest(level, params)}"'
+
+
+def lookup(version, level, params):
+    """Return the payload for ``level``, built on a miss and cached under ``version``."""
+    builder = BUILDERS[level]
+    if version is None:
+        return builder(**params)
+    cache = get_cache()
+    key = ENTRY_KEY.format(_digest(level, params))
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    payload = builder(**params)
+    try:
+        cache.set(key, (version, payload), CACHE_TIMEOUT)
+    except Exception:
+        logger.exception("Failed to store %s in the transcript directory cache", key)
+    return payload
+
+
+# ─────────────────────────────────────────────────────────────
+# Levels
+# ─────────────────────────────────────────────────────────────
+def _listed(year="", school="", course=""):
+    """Students that appear in the directory, narrowed to a year/school/course."""
+    students = Student.objects.filter(
+        academic_year__isnull=False, course__isnull=False
+    )
+    if year:
+        students = students.filter(academic_year__year=year)
+    if school:
+        students = students.filter(course__school__name=school)
+    if course:
+        students = students.filter(course__name=course)
+    return students
+
+
+def years():
+    return {"results": list(AcademicYear.objects.order_by("year").values_list("year", flat=True))}
+
+
+def schools(year):
+    names = (
+        _listed(year)
+        .order_by("course__school__name")
+        .values_list("course__school__name", flat=True)
+        .distinct()
+    )
+    return {"year": year, "results": list(names)}
+
+
+def courses(year, school):
+    names = (
+        _listed(year, school)
+        .order_by("course__name")
+        .values_list("course__name", flat=True)
+        .distinct()
+    )
+    return {"year": year, "school": school, "results": list(names)}
+
+
+def students(year, school, course, q="", page=1, page_size=PAGE_SIZE):
+    listed = _listed(year, school, course)
+    if q:
+        listed = listed.filter(Q(name__icontains=q) | Q(roll_no__icontains=q))
+    rows = listed.order_by("roll_no", "pk").values("name", "roll_no")
+    current = Paginator(rows, page_size).get_page(page)
+    return {
+        "year": year,
+        "school": school,
+        "course": course,
+        "q": q,
+        "results": list(current.object_list),
+        "count": current.paginator.count,
+        "page": current.number,
+        "pages": current.paginator.num_pages,
+        "page_size": page_size,
+    }
+
+
+BUILDERS = {
+    "years": years,
+    "schools": schools,
+    "courses": courses,
+    "students": students,
+}
@@ -0,0 +1,575 @@
+"""Bulk, diff-based import of transcript data from CSV or XLSX files.
+
+Each kind of data has an importer that turns input rows into records keyed
+by a natural key, then applies them a chunk at a time:
+
+* ``mappings`` – the attribute × strength matrix of ``transcript/mapping.csv``
+  (first column the graduate attribute, one column per character strength);
+* ``events`` – ``name``, ``date``;
+* ``event_attributes`` – ``event``, ``date``, ``attribute``;
+* ``students`` – ``roll_no``, ``name``, ``school``, ``course``, ``academic_year``;
+* ``participations`` – ``roll_no``, ``event``, ``date``, ``role``.
+
+Input is streamed (XLSX through openpyxl's read-only mode) and foreign keys
+are resolved through dictionaries loaded once per run.  For every chunk the
+existing rows are fetched in one query, compared with the input and only the
+difference is written, with ``bulk_create``/``bulk_update`` inside one
+transaction per chunk.  Rows missing from the input are left alone.
+
+Bulk writes send no model signals, so the importer refreshes the strength
+tables and the home page directory itself once the run is over.  A dry run
+computes the same report without writing anything.
+"""
+
+import csv
+import io
+import logging
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from django.db import transaction
+
+from . import directory, strengths
+from .models import (
+    AcademicYear,
+    AttributeStrengthMap,
+    CharacterStrength,
+    Course,
+    Event,
+    GraduateAttribute,
+    Participation,
+    Role,
+    School,
+    Student,
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y")
+
+
+class ImportFailed(Exception):
+    """Raised when an input file cannot be read."""
+
+
+class RowError(ValueError):
+    """A single input row that cannot be imported."""
+
+
+# ─────────────────────────────────────────────────────────────
+# Reading
+# ─────────────────────────────────────────────────────────────
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, (date, datetime)):
+        return value
+    return str(value).strip()
+
+
+def _csv_rows(fileobj):
+    reader = csv.reader(fileobj)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [_text(name) for name in header]
+    for values in reader:
+        if any(value.strip() for value in values):
+            yield dict(zip(header, (_text(value) for value in values)))
+
+
+def _xlsx_rows(path, sheet=None):
+    try:
+        import openpyxl
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportFailed("openpyxl is required to import XLSX files.") from exc
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        values = worksheet.iter_rows(values_only=True)
+        header = next(values, None)
+        if header is None:
+            return
+        header = [_text(name) for name in header]
+        for row in values:
+            if any(value not in (None, "") for value in row):
+                yield dict(zip(header, (_text(value) for value in row)))
+    finally:
+        workbook.close()
+
+
+def read_rows(source, fmt=None, sheet=None):
+    """Yield one ``{column: value}`` dict per non-blank row of ``source``.
+
+    ``source`` is a path or a text file object (CSV only).  The format is
+    taken from the file extension unless ``fmt`` (``csv`` or ``xlsx``) is given.
+    """
+    if not isinstance(source, (str, Path)):
+        yield from _csv_rows(source)
+        return
+    fmt = fmt or Path(source).suffix.lstrip(".").lower()
+    if fmt in ("xlsx", "xlsm"):
+        yield from _xlsx_rows(source, sheet)
+    elif fmt == "csv":
+        try:
+            with open(source, newline="", encoding="utf-8-sig") as fh:
+                yield from _csv_rows(fh)
+        except FileNotFoundError as exc:
+            raise ImportFailed(f"File not found: {source}") from exc
+    else:
+        raise ImportFailed(f"Unsupported file format {fmt!r}; use csv or xlsx.")
+
+
+def _normalize(row):
+    return {name.lower().replace(" ", "_"): value for name, value in row.items() if name}
+
+
+def _required(row, name):
+    value = row.get(name, "")
+    if value in ("", None):
+        raise RowError(f"missing {name}")
+    return value
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise RowError(f"invalid date {value!r}")
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ─────────────────────────────────────────────────────────────
+# Reports
+# ─────────────────────────────────────────────────────────────
+class ImportReport:
+    MAX_ERRORS = 50
+
+    def __init__(self, kind, dry_run=False):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.error_count = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        verb = "would be " if self.dry_run else ""
+        text = (
+            f"{self.kind}: {self.rows} rows read, {self.created} {verb}created, "
+            f"{self.updated} {verb}updated, {self.unchanged} unchanged, "
+            f"{self.error_count} errors in {self.elapsed:.2f}s "
+            f"({self.rows_per_second:.0f} rows/s)"
+        )
+        return text + (" [dry run]" if self.dry_run else "")
+
+
+# ─────────────────────────────────────────────────────────────
+# Importers
+# ─────────────────────────────────────────────────────────────
+class Importer:
+    """Base class: subclasses turn rows into keyed records and compare them.
+
+    ``records(row)`` yields ``(key, values)`` pairs where ``values`` maps model
+    fields to the wanted values; ``existing(keys)`` returns the stored objects
+    for those keys; ``build(key, values)`` makes a new unsaved object.
+    """
+
+    kind = None
+    model = None
+
+    def __init__(self, dry_run=False, chunk_size=CHUNK_SIZE):
+        self.dry_run = dry_run
+        self.chunk_size = chunk_size
+        self.report = ImportReport(self.kind, dry_run)
+        # Objects a dry run would have created, so later chunks see them.
+        self._planned = {}
+
+    def load_references(self):
+        """Load the lookup dictionaries used to resolve foreign keys."""
+
+    def records(self, row):
+        raise NotImplementedError
+
+    def existing(self, keys):
+        raise NotImplementedError
+
+    def build(self, key, values):
+        return self.model(**values)
+
+    def applied(self, created, updated):
+        """Called after each chunk is written (``updated`` holds ``(obj, previous)``)."""
+
+    def finish(self):
+        """Called once after the last chunk of a real run."""
+
+    def run(self, rows):
+        started = time.perf_counter()
+        self.load_references()
+        numbered = enumerate(rows, start=2)  # line 1 is the header
+        with strengths.deferred():
+            for chunk in _chunked(numbered, self.chunk_size):
+                self._apply(chunk)
+            if not self.dry_run:
+                self.finish()
+        self.report.elapsed = time.perf_counter() - started
+        return self.report
+
+    def _apply(self, chunk):
+        report = self.report
+        wanted = {}
+        for line, row in chunk:
+            report.rows += 1
+            try:
+                # A key repeated in the input takes its last values.
+                wanted.update(self.records(row))
+            except RowError as exc:
+                report.error(line, str(exc))
+
+        stored = self.existing(list(wanted))
+        created, updated, fields = [], [], set()
+        for key, values in wanted.items():
+            obj = stored.get(key) or self._planned.get(key)
+            if obj is None:
+                obj = self.build(key, values)
+                created.append(obj)
+                if self.dry_run:
+                    self._planned[key] = obj
+                continue
+            changed = {
+                name: getattr(obj, name)
+                for name, value in values.items()
+                if getattr(obj, name) != value
+            }
+            if not changed:
+                report.unchanged += 1
+                continue
+            for name in changed:
+                setattr(obj, name, values[name])
+            fields.update(changed)
+            updated.append((obj, changed))
+
+        report.created += len(created)
+        report.updated += len(updated)
+        if self.dry_run or not (created or updated):
+            return
+        with transaction.atomic():
+            if created:
+                self.model.objects.bulk_create(created, batch_size=self.chunk_size)
+            if updated:
+                self.model.objects.bulk_update(
+                    [obj for obj, _ in updated], sorted(fields), batch_size=self.chunk_size
+                )
+            self.applied(created, updated)
+
+
+class MappingImporter(Importer):
+    """Attribute × strength weight matrix; blank, invalid and zero weights are skipped."""
+
+    kind = "mappings"
+    model = AttributeStrengthMap
+
+    def load_references(self):
+        self.attributes = _first_ids(GraduateAttribute.objects.values_list("name", "pk"))
+        self.strengths = _first_ids(CharacterStrength.objects.values_list("name", "pk"))
+        self.maps = {
+            (attribute, strength): obj
+            for obj in AttributeStrengthMap.objects.select_related(
+                "graduate_attribute", "character_strength"
+            ).order_by("-pk")
+            for attribute, strength in [
+                (obj.graduate_attribute.name, obj.character_strength.name)
+            ]
+        }
+        self.changed = False
+
+    def records(self, row):
+        cells = iter(row.items())
+        _, attribute = next(cells, (None, ""))
+        if not attribute:
+            return []
+        records = []
+        for strength, value in cells:
+            try:
+                weight = float(value)
+            except (TypeError, ValueError):
+                continue
+            if weight > 0 and strength:
+                records.append(((attribute, strength), {"weight": weight}))
+        return records
+
+    def existing(self, keys):
+        return {key: self.maps[key] for key in keys if key in self.maps}
+
+    def build(self, key, values):
+        attribute, strength = key
+        obj = self.maps[key] = AttributeStrengthMap(
+            graduate_attribute_id=self._resolve(self.attributes, GraduateAttribute, attribute),
+            character_strength_id=self._resolve(self.strengths, CharacterStrength, strength),
+            **values,
+        )
+        return obj
+
+    def _resolve(self, ids, model, name):
+        if name not in ids:
+            ids[name] = None if self.dry_run else model.objects.create(name=name).pk
+        return ids[name]
+
+    def applied(self, created, updated):
+        self.changed = True
+
+    def finish(self):
+        if self.changed:
+            # A weight change touches every student with the attribute.
+            strengths.rebuild()
+
+
+class EventImporter(Importer):
+    kind = "events"
+    model = Event
+
+    def records(self, row):
+        row = _normalize(row)
+        return [((_required(row, "name"), _date(_required(row, "date"))), {})]
+
+    def existing(self, keys):
+        names = {name for name, _ in keys}
+        dates = {day for _, day in keys}
+        found = {}
+        for event in Event.objects.filter(name__in=names, date__in=dates).order_by("-pk"):
+            found[(event.name, event.date)] = event
+        return found
+
+    def build(self, key, values):
+        name, day = key
+        return Event(name=name, date=day)
+
+
+class EventAttributeImporter(Importer):
+    kind = "event_attributes"
+    model = Event.attributes.through
+
+    def load_references(self):
+        self.events = _first_ids(
+            ((name, day), pk) for name, day, pk in Event.objects.values_list("name", "date", "pk")
+        )
+        self.attributes = _first_ids(GraduateAttribute.objects.values_list("name", "pk"))
+        self.event_ids = set()
+
+    def records(self, row):
+        row = _normalize(row)
+        event = (_required(row, "event"), _date(_required(row, "date")))
+        attribute = _required(row, "attribute")
+        if event not in self.events:
+            raise RowError(f"unknown event {event[0]!r} on {event[1]}")
+        if attribute not in self.attributes:
+            raise RowError(f"unknown attribute {attribute!r}")
+        return [((self.events[event], self.attributes[attribute]), {})]
+
+    def existing(self, keys):
+        links = self.model.objects.filter(
+            event_id__in={event for event, _ in keys},
+            graduateattribute_id__in={attribute for _, attribute in keys},
+        )
+        return {(link.event_id, link.graduateattribute_id): link for link in links}
+
+    def build(self, key, values):
+        event_id, attribute_id = key
+        return self.model(event_id=event_id, graduateattribute_id=attribute_id)
+
+    def applied(self, created, updated):
+        self.event_ids.update(link.event_id for link in created)
+
+    def finish(self):
+        for chunk in _chunked(self.event_ids, self.chunk_size):
+            strengths.refresh_students(
+                set(
+                    Participation.objects.filter(event_id__in=chunk).values_list(
+                        "student_id", flat=True
+                    )
+                )
+            )
+
+
+class StudentImporter(Importer):
+    """Students by roll number; a missing or blank school, course or year is left as is."""
+
+    kind = "students"
+    model = Student
+
+    def load_references(self):
+        self.schools = dict(School.objects.values_list("name", "pk"))
+        self.courses = {
+            (school, name): (pk, school_id)
+            for name, school, school_id, pk in Course.objects.values_list(
+                "name", "school__name", "school_id", "pk"
+            )
+        }
+        self.years = dict(AcademicYear.objects.values_list("year", "pk"))
+        self.cohorts = set()
+        self.changed = False
+
+    def records(self, row):
+        row = _normalize(row)
+        roll_no = _required(row, "roll_no")
+        if len(roll_no) > Student._meta.get_field("roll_no").max_length:
+            raise RowError(f"roll number {roll_no!r} is too long")
+        school = row.get("school", "")
+        course = row.get("course", "")
+        year = row.get("academic_year", "")
+        # Only columns with a value are written, so a file of names alone
+        # never clears the placement of the students it matches.
+        values = {"name": _required(row, "name")}
+        if school:
+            if school not in self.schools:
+                raise RowError(f"unknown school {school!r}")
+            values["school_id"] = self.schools[school]
+        if course:
+            if (school, course) not in self.courses:
+                raise RowError(f"unknown course {course!r} in school {school!r}")
+            values["course_id"] = self.courses[(school, course)][0]
+        if year:
+            if year not in self.years:
+                raise RowError(f"unknown academic year {year!r}")
+            values["academic_year_id"] = self.years[year]
+        return [(roll_no, values)]
+
+    def existing(self, keys):
+        return {student.roll_no: student for student in Student.objects.filter(roll_no__in=keys)}
+
+    def build(self, key, values):
+        return Student(roll_no=key, **values)
+
+    def applied(self, created, updated):
+        self.changed = True
+        for student, previous in updated:
+            if "academic_year_id" in previous or "course_id" in previous:
+                self.cohorts.add((student.academic_year_id, student.course_id))
+                self.cohorts.add(
+                    (
+                        previous.get("academic_year_id", student.academic_year_id),
+                        previous.get("course_id", student.course_id),
+                    )
+                )
+
+    def finish(self):
+        if self.cohorts:
+            strengths.refresh_benchmarks(self.cohorts)
+        if self.changed:
+            directory.bump_version_on_commit()
+
+
+class ParticipationImporter(Importer):
+    """One participation per student and event; a new role replaces the old one."""
+
+    kind = "participations"
+    model = Participation
+
+    def load_references(self):
+        self.students = dict(Student.objects.values_list("roll_no", "pk"))
+        self.events = _first_ids(
+            ((name, day), pk) for name, day, pk in Event.objects.values_list("name", "date", "pk")
+        )
+        self.roles = dict(Role.objects.values_list("name", "pk"))
+
+    def records(self, row):
+        row = _normalize(row)
+        roll_no = _required(row, "roll_no")
+        event = (_required(row, "event"), _date(_required(row, "date")))
+        role = _required(row, "role")
+        if roll_no not in self.students:
+            raise RowError(f"unknown roll number {roll_no!r}")
+        if event not in self.events:
+            raise RowError(f"unknown event {event[0]!r} on {event[1]}")
+        if role not in self.roles:
+            raise RowError(f"unknown role {role!r}")
+        return [((self.students[roll_no], self.events[event]), {"role_id": self.roles[role]})]
+
+    def existing(self, keys):
+        found = {}
+        for participation in Participation.objects.filter(
+            student_id__in={student for student, _ in keys},
+            event_id__in={event for _, event in keys},
+        ).order_by("-pk"):
+            found[(participation.student_id, participation.event_id)] = participation
+        return found
+
+    def build(self, key, values):
+        student_id, event_id = key
+        return Participation(student_id=student_id, event_id=event_id, **values)
+
+    def applied(self, created, updated):
+        # Collected by strengths.deferred() and recomputed once per run.
+        strengths.refresh_students(
+            {p.student_id for p in created} | {p.student_id for p, _ in updated}
+        )
+
+
+def _first_ids(pairs):
+    """``{name: pk}`` keeping the lowest pk when names repeat."""
+    ids = {}
+    for name, pk in pairs:
+        if name not in ids or pk < ids[name]:
+            ids[name] = pk
+    return ids
+
+
+IMPORTERS = {
+    importer.kind: importer
+    for importer in (
+        MappingImporter,
+        EventImporter,
+        EventAttributeImporter,
+        StudentImporter,
+        ParticipationImporter,
+    )
+}
+
+
+def run_import(kind, source, fmt=None, sheet=None, dry_run=False, chunk_size=CHUNK_SIZE):
+    """Import ``source`` as ``kind`` and return an :class:`ImportReport`."""
+    try:
+        importer_class = IMPORTERS[kind]
+    except KeyError:
+        raise ImportFailed(
+            f"Unknown import {kind!r}; choose from {', '.join(IMPORTERS)}."
+        ) from None
+    if isinstance(source, bytes):
+        source = io.StringIO(source.decode("utf-8-sig"))
+    importer = importer_class(dry_run=dry_run, chunk_size=chunk_size)
+    report = importer.run(read_rows(source, fmt, sheet))
+    logger.debug("%s", report.summary())
+    return report
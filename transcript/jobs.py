@@ -0,0 +1,447 @@
+"""Background course transcript jobs.
+
+A :class:`~transcript.models.TranscriptBatchJob` renders every transcript of a
+course outside the request cycle.  Each web process runs at most one daemon
+thread that claims jobs from the database and renders them through
+:mod:`transcript.bulk`, so no broker is needed.  ``manage.py
+run_transcript_jobs`` does the same in the foreground.
+
+* Every finished PDF is written to the job's parts directory under
+  ``MEDIA_ROOT`` and its ``TranscriptBatchItem`` is marked done or failed;
+  a failed student never aborts the batch.
+* The owning worker refreshes ``heartbeat_at`` as results arrive and, from a
+  separate thread, every ``HEARTBEAT_INTERVAL`` seconds, so a slow pool start
+  or render keeps the job claimed.  A running job whose heartbeat is older
+  than ``STALE_AFTER`` seconds (its process died or restarted) is claimed
+  again and continues with the pending students.
+* When no student is pending the parts are assembled into the job's
+  ``artifact`` (ZIP, with ``errors.txt`` listing failures, or one combined
+  PDF) and the parts directory is removed.
+* A finished artifact is handed to anyone asking for the same course and
+  format for ``RETENTION_HOURS``, as long as no student failed and the
+  course's :func:`data_stamp` still matches the one taken when the job was
+  queued; after that :func:`purge_expired` (run before each batch of jobs
+  and by ``manage.py purge_transcript_jobs``) deletes the job with its
+  artifact and any leftover parts.
+
+Configured through ``settings.TRANSCRIPT_JOBS``; see :data:`DEFAULTS`.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import bulk, render_cache, strengths
+from .models import (
+    AttributeStrengthMap,
+    CharacterStrength,
+    Participation,
+    Student,
+    StudentStrengthScore,
+    TranscriptBatchItem,
+    TranscriptBatchJob,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Start the worker thread when a job is queued or polled.
+    "AUTOSTART": True,
+    # Seconds without a heartbeat before a running job is claimed again.
+    "STALE_AFTER": 120,
+    # Seconds between heartbeats while a job runs; keep well below STALE_AFTER.
+    "HEARTBEAT_INTERVAL": 30,
+    # Seconds an idle worker thread waits for new jobs before exiting.
+    "IDLE_TIMEOUT": 60,
+    # Hours a finished job's artifact is reused and kept before it is purged.
+    "RETENTION_HOURS": 24,
+}
+
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_thread = None
+_pid = None
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "TRANSCRIPT_JOBS", {}) or {})
+    return config
+
+
+def parts_dir(job):
+    return Path(settings.MEDIA_ROOT) / "transcripts" / "batches" / "parts" / str(job.pk)
+
+
+def _retention_cutoff(retention_hours=None):
+    if retention_hours is None:
+        retention_hours = get_config()["RETENTION_HOURS"]
+    return timezone.now() - timedelta(hours=retention_hours)
+
+
+def data_stamp(academic_year, course):
+    """Digest of every database row the course's transcripts are built from.
+
+    Covers the students, their participations with event and role, their
+    materialized strength scores, the benchmarks, the attribute mappings and
+    the PDF template, so any change to them gives a different stamp.
+    """
+    students = Student.objects.filter(academic_year=academic_year, course=course)
+    digest = hashlib.sha256(render_cache.template_version().encode())
+    sources = (
+        students.order_by("pk").values_list(
+            "pk", "roll_no", "name", "photo", "school_id"
+        ),
+        Participation.objects.filter(student__in=students)
+        .order_by("pk")
+        .values_list(
+            "pk", "student_id", "event_id", "event__name", "event__date", "role_id",
+            "role__name", "role__factor",
+        ),
+        StudentStrengthScore.objects.filter(student__in=students)
+        .order_by("student_id", "strength_id")
+        .values_list("student_id", "strength_id", "score"),
+        CharacterStrength.objects.order_by("pk").values_list("pk", "name"),
+        AttributeStrengthMap.objects.order_by("pk").values_list(
+            "pk", "graduate_attribute_id", "character_strength_id", "weight"
+        ),
+    )
+    for rows in sources:
+        for row in rows.iterator(chunk_size=2000):
+            digest.update(repr(row).encode())
+        digest.update(b"\0")
+    digest.update(repr(sorted(strengths.benchmarks().items())).encode())
+    return digest.hexdigest()
+
+
+def start_job(academic_year, course, output, base_url, user=None, force=False):
+    """Queue a job for the course, or return the active or a reusable finished one.
+
+    Returns ``(job, created)``.  Only one job per year, course and output
+    format may be queued or running at a time.  A finished artifact is reused
+    until it is ``RETENTION_HOURS`` old, unless a student failed, the
+    course's :func:`data_stamp` changed since the job was queued, or
+    ``force`` asks for a fresh render.  ``user`` is recorded as a requester
+    of whichever job is returned.
+    """
+    if user is not None and not user.is_authenticated:
+        user = None
+    matching = TranscriptBatchJob.objects.filter(
+        academic_year=academic_year, course=course, output=output
+    )
+    active = matching.filter(status__in=TranscriptBatchJob.ACTIVE_STATUSES)
+    job = active.first()
+    if job is None:
+        stamp = data_stamp(academic_year, course)
+        if not force:
+            job = (
+                matching.filter(
+                    status=TranscriptBatchJob.DONE,
+                    failed=0,
+                    data_stamp=stamp,
+                    finished_at__gte=_retention_cutoff(),
+                )
+                .exclude(artifact="")
+                .order_by("-finished_at")
+                .first()
+            )
+    if job is not None:
+        _add_requester(job, user)
+        return job, False
+    try:
+        with transaction.atomic():
+            job = TranscriptBatchJob.objects.create(
+                academic_year=academic_year,
+                course=course,
+                output=output,
+                base_url=base_url,
+                created_by=user,
+                data_stamp=stamp,
+            )
+            _add_requester(job, user)
+            student_ids = list(
+                Student.objects.filter(academic_year=academic_year, course=course)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            TranscriptBatchItem.objects.bulk_create(
+                [TranscriptBatchItem(job=job, student_id=pk) for pk in student_ids],
+                batch_size=500,
+            )
+            job.total = len(student_ids)
+            job.save(update_fields=["total"])
+    except IntegrityError:
+        # Lost a race with another request for the same course.
+        job = active.get()
+        _add_requester(job, user)
+        return job, False
+    transaction.on_commit(kick)
+    return job, True
+
+
+def _add_requester(job, user):
+    if user is not None:
+        job.requested_by.add(user)
+
+
+def purge_expired(retention_hours=None):
+    """Delete jobs finished ``retention_hours`` ago with their files.
+
+    Returns how many jobs were removed.
+    """
+    expired = TranscriptBatchJob.objects.filter(
+        status__in=(TranscriptBatchJob.DONE, TranscriptBatchJob.FAILED),
+        finished_at__lt=_retention_cutoff(retention_hours),
+    )
+    count = 0
+    for job in expired.iterator():
+        if job.artifact:
+            job.artifact.delete(save=False)
+        shutil.rmtree(parts_dir(job), ignore_errors=True)
+        job.delete()
+        count += 1
+    return count
+
+
+# ─────────────────────────────────────────────────────────────
+# Processing
+# ─────────────────────────────────────────────────────────────
+def claim_next():
+    """Claim the oldest queued job, or a running job whose worker died."""
+    stale = timezone.now() - timedelta(seconds=get_config()["STALE_AFTER"])
+    candidates = (
+        TranscriptBatchJob.objects.filter(
+            Q(status=TranscriptBatchJob.QUEUED)
+            | Q(status=TranscriptBatchJob.RUNNING, heartbeat_at__lt=stale)
+            | Q(status=TranscriptBatchJob.RUNNING, heartbeat_at__isnull=True)
+        )
+        .order_by("created_at")
+        .values_list("pk", "heartbeat_at")
+    )
+    for pk, heartbeat_at in candidates:
+        now = timezone.now()
+        # Compare-and-swap on the heartbeat so two workers never share a job.
+        claimed = TranscriptBatchJob.objects.filter(
+            pk=pk,
+            status__in=TranscriptBatchJob.ACTIVE_STATUSES,
+            heartbeat_at=heartbeat_at,
+        ).update(
+            status=TranscriptBatchJob.RUNNING,
+            heartbeat_at=now,
+            started_at=Coalesce("started_at", now),
+        )
+        if claimed:
+            return TranscriptBatchJob.objects.get(pk=pk)
+    return None
+
+
+def run_pending():
+    """Process jobs until none can be claimed; return how many ran."""
+    purge_expired()
+    count = 0
+    while True:
+        job = claim_next()
+        if job is None:
+            return count
+        run_job(job)
+        count += 1
+
+
+def run_job(job):
+    """Render the job's pending students and assemble its artifact."""
+    heartbeat = _Heartbeat(job.pk, get_config()["HEARTBEAT_INTERVAL"])
+    heartbeat.start()
+    try:
+        _render_pending(job)
+        _assemble(job)
+    except Exception as exc:
+        logger.exception("Transcript batch job %s failed", job.pk)
+        TranscriptBatchJob.objects.filter(pk=job.pk).update(
+            status=TranscriptBatchJob.FAILED, error=str(exc), finished_at=timezone.now()
+        )
+    finally:
+        heartbeat.stop()
+
+
+class _Heartbeat(threading.Thread):
+    """Refreshes a running job's ``heartbeat_at`` until :meth:`stop`."""
+
+    def __init__(self, job_id, interval):
+        super().__init__(name=f"transcript-job-{job_id}-heartbeat", daemon=True)
+        self.job_id = job_id
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def beat(self):
+        TranscriptBatchJob.objects.filter(
+            pk=self.job_id, status=TranscriptBatchJob.RUNNING
+        ).update(heartbeat_at=timezone.now())
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    self.beat()
+                except Exception:
+                    logger.exception("Failed to refresh transcript batch job %s", self.job_id)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def _render_pending(job):
+    from .views import _bulk_transcripts
+
+    parts = parts_dir(job)
+    parts.mkdir(parents=True, exist_ok=True)
+    items = TranscriptBatchItem.objects.filter(job=job)
+
+    # Parts lost with the previous worker's disk are rendered again.
+    missing = [
+        student_id
+        for student_id in items.filter(status=TranscriptBatchItem.DONE).values_list(
+            "student_id", flat=True
+        )
+        if not (parts / f"{student_id}.pdf").exists()
+    ]
+    if missing:
+        items.filter(student_id__in=missing).update(status=TranscriptBatchItem.PENDING)
+        TranscriptBatchJob.objects.filter(pk=job.pk).update(
+            completed=F("completed") - len(missing)
+        )
+
+    students = Student.objects.filter(
+        pk__in=items.filter(status=TranscriptBatchItem.PENDING).values("student_id")
+    ).order_by("name")
+    results = render_cache.render_transcripts(
+        (student.pk, context)
+        for _, student, context in _bulk_transcripts(
+            lambda path: urljoin(job.base_url, path), students
+        )
+    )
+    for student_id, pdf, error in results:
+        now = timezone.now()
+        if error is None:
+            target = parts / f"{student_id}.pdf"
+            partial = target.with_suffix(".part")
+            partial.write_bytes(pdf)
+            os.replace(partial, target)
+            items.filter(student_id=student_id).update(
+                status=TranscriptBatchItem.DONE, error="", finished_at=now
+            )
+            counter = {"completed": F("completed") + 1}
+        else:
+            logger.error(
+                "Transcript batch job %s: student %s failed: %s", job.pk, student_id, error
+            )
+            items.filter(student_id=student_id).update(
+                status=TranscriptBatchItem.FAILED, error=str(error), finished_at=now
+            )
+            counter = {"failed": F("failed") + 1}
+        TranscriptBatchJob.objects.filter(pk=job.pk).update(heartbeat_at=now, **counter)
+
+
+def _assemble(job):
+    parts = parts_dir(job)
+    done = list(
+        TranscriptBatchItem.objects.filter(job=job, status=TranscriptBatchItem.DONE)
+        .select_related("student")
+        .order_by("student__name")
+    )
+    if not done:
+        TranscriptBatchJob.objects.filter(pk=job.pk).update(
+            status=TranscriptBatchJob.FAILED,
+            error="No transcript could be generated.",
+            finished_at=timezone.now(),
+        )
+        return
+
+    name = slugify(f"{job.course.name} {job.academic_year.year}") or "transcripts"
+    with tempfile.TemporaryFile() as output:
+        if job.output == "pdf":
+            bulk.merge_pdf_files(
+                [parts / f"{item.student_id}.pdf" for item in done], output
+            )
+            filename = f"{name}-{job.pk}.pdf"
+        else:
+            bulk.write_zip(output, _zip_entries(job, done))
+            filename = f"{name}-{job.pk}.zip"
+        output.seek(0)
+        job.artifact.save(filename, File(output), save=False)
+
+    TranscriptBatchJob.objects.filter(pk=job.pk).update(
+        artifact=job.artifact.name,
+        status=TranscriptBatchJob.DONE,
+        finished_at=timezone.now(),
+        heartbeat_at=timezone.now(),
+    )
+    shutil.rmtree(parts, ignore_errors=True)
+
+
+def _zip_entries(job, done):
+    parts = parts_dir(job)
+    for item in done:
+        student = item.student
+        yield (
+            f"{student.roll_no}_{student.name}.pdf",
+            (parts / f"{student.pk}.pdf").read_bytes(),
+        )
+    failures = TranscriptBatchItem.objects.filter(
+        job=job, status=TranscriptBatchItem.FAILED
+    ).select_related("student")
+    lines = [
+        f"{item.student.roll_no}_{item.student.name}.pdf: {item.error}\n"
+        for item in failures
+    ]
+    if lines:
+        yield "errors.txt", "".join(lines).encode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────
+# In-process worker thread
+# ─────────────────────────────────────────────────────────────
+def kick():
+    """Wake this process's worker thread, starting it if necessary."""
+    global _thread, _pid
+    if not get_config()["AUTOSTART"]:
+        return
+    with _lock:
+        if _pid != os.getpid():
+            # Forked (e.g. gunicorn --preload): the thread was not inherited.
+            _pid, _thread = os.getpid(), None
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name="transcript-jobs", daemon=True)
+            _thread.start()
+    _wakeup.set()
+
+
+def _run():
+    idle_timeout = get_config()["IDLE_TIMEOUT"]
+    while True:
+        _wakeup.clear()
+        try:
+            run_pending()
+        except Exception:
+            logger.exception("Transcript job worker crashed")
+        finally:
+            connection.close()
+        if not _wakeup.wait(idle_timeout):
+            # Exits when idle; the next job or status poll restarts it.
+            return
@@ -0,0 +1,162 @@
+"""Compare the NumPy strength engine with the Python loop implementations.
+
+Three ways of scoring the same students are timed:
+
+* ``engine``   – :func:`transcript.scoring.score_students` (one pass);
+* ``loops``    – the former nested-loop/``defaultdict`` algorithm, run once
+  over every participation of the selected students;
+* ``legacy``   – the former per-student ``calculate_strength_data``, which
+  rescanned all participations for each student.  It is timed on a sample
+  and extrapolated to the full set.
+
+The engine and loop results are checked for agreement.  Seed data with e.g.
+``manage.py seed_synthetic_data --students 10000`` first.
+"""
+
+import json
+import statistics
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from transcript import scoring
+from transcript.models import AttributeStrengthMap, Participation, Student
+
+
+def loop_scores(students):
+    """The pre-engine algorithm: ``{student_id: {strength_id: score}}``."""
+    attr_map = defaultdict(list)
+    for asm in AttributeStrengthMap.objects.all():
+        attr_map[asm.graduate_attribute_id].append((asm.character_strength_id, asm.weight))
+
+    totals = defaultdict(lambda: defaultdict(float))
+    participations = (
+        Participation.objects.filter(student__in=students.values("pk"))
+        .select_related("role")
+        .prefetch_related("event__attributes")
+    )
+    for part in participations:
+        role_factor = part.role.factor if part.role else 1.0
+        for attr in part.event.attributes.all():
+            for strength_id, weight in attr_map[attr.id]:
+                totals[part.student_id][strength_id] += weight * role_factor
+    return totals
+
+
+def legacy_student(student):
+    """One call of the former per-student ``calculate_strength_data`` work."""
+    attr_map = defaultdict(list)
+    for asm in AttributeStrengthMap.objects.select_related("character_strength"):
+        attr_map[asm.graduate_attribute_id].append((asm.character_strength.name, asm.weight))
+    own = defaultdict(float)
+    for part in Participation.objects.select_related("role", "event").prefetch_related(
+        "event__attributes"
+    ).filter(student=student):
+        for attr in part.event.attributes.all():
+            for name, weight in attr_map[attr.id]:
+                own[name] += weight * (part.role.factor if part.role else 1.0)
+    everyone = defaultdict(lambda: defaultdict(float))
+    for part in Participation.objects.select_related("student", "role", "event").prefetch_related(
+        "event__attributes"
+    ):
+        for attr in part.event.attributes.all():
+            for name, weight in attr_map[attr.id]:
+                everyone[part.student.roll_no][name] += weight * (
+                    part.role.factor if part.role else 1.0
+                )
+    return own, everyone
+
+
+def _time(func, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+class Command(BaseCommand):
+    help = "Benchmark the vectorized strength engine against the loop implementations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=10000, help="Students to score")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs (median is reported)")
+        parser.add_argument(
+            "--legacy-sample",
+            type=int,
+            default=1,
+            help="Students to time with the per-student legacy algorithm (0 skips it)",
+        )
+        parser.add_argument("--json", dest="json_path", help="Write the results to this file")
+
+    def handle(self, *args, **options):
+        student_ids = list(
+            Student.objects.filter(participation__isnull=False)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .distinct()[: options["students"]]
+        )
+        if not student_ids:
+            raise CommandError(
+                "No students with participations; run `manage.py seed_synthetic_data` first."
+            )
+        if len(student_ids) < options["students"]:
+            self.stderr.write(
+                self.style.WARNING(f"Only {len(student_ids)} students with participations found.")
+            )
+        repeat = max(1, options["repeat"])
+        # The first N students with participations, as a subquery.
+        students = Student.objects.filter(
+            participation__isnull=False, pk__lte=student_ids[-1]
+        ).distinct()
+
+        engine_s, engine = _time(lambda: scoring.score_students(students), repeat)
+        loops_s, loops = _time(lambda: loop_scores(students), repeat)
+
+        column = {pk: i for i, (pk, _) in enumerate(engine.strengths)}
+        row = {pk: i for i, pk in enumerate(engine.student_ids)}
+        max_diff = 0.0
+        for student_id, totals in loops.items():
+            for strength_id, score in totals.items():
+                if strength_id in column:
+                    max_diff = max(
+                        max_diff, abs(engine.scores[row[student_id], column[strength_id]] - score)
+                    )
+        if max_diff > 1e-6:
+            raise CommandError(f"Engine and loop scores disagree (max difference {max_diff}).")
+
+        results = {
+            "students": len(student_ids),
+            "participations": Participation.objects.filter(
+                student__in=students.values("pk")
+            ).count(),
+            "engine_s": round(engine_s, 4),
+            "loops_s": round(loops_s, 4),
+            "speedup": round(loops_s / engine_s, 1) if engine_s else None,
+            "max_difference": max_diff,
+        }
+
+        sample = student_ids[: options["legacy_sample"]]
+        if sample:
+            students = list(Student.objects.filter(pk__in=sample))
+            per_student_s, _ = _time(lambda: [legacy_student(s) for s in students], 1)
+            per_student_s /= len(students)
+            results["legacy_per_student_s"] = round(per_student_s, 4)
+            results["legacy_extrapolated_s"] = round(per_student_s * len(student_ids), 1)
+
+        self.stdout.write(
+            f"{results['students']} students, {results['participations']} participations"
+        )
+        self.stdout.write(f"  engine  {engine_s * 1000:10.1f} ms")
+        self.stdout.write(f"  loops   {loops_s * 1000:10.1f} ms  ({results['speedup']}x slower)")
+        if sample:
+            self.stdout.write(
+                f"  legacy  {results['legacy_per_student_s'] * 1000:10.1f} ms per student, "
+                f"~{results['legacy_extrapolated_s']} s for all students (extrapolated)"
+            )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 
+from transcript import strengths
 from transcript.models import AcademicYear
 
 
@@ -15,7 +16,8 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         year = options["year"]
-        deleted, _ = AcademicYear.objects.filter(year=year).delete()
+        with strengths.deferred():
+            deleted, _ = AcademicYear.objects.filter(year=year).delete()
         if deleted:
             self.stdout.write(
                 self.style.SUCCESS(
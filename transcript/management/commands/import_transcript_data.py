@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from transcript import importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import mappings, events, event attributes, students or "
+        "participations from a CSV or XLSX file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(importer.IMPORTERS))
+        parser.add_argument("path", help="CSV or XLSX file to import")
+        parser.add_argument(
+            "--format", choices=("csv", "xlsx"), help="Override the file extension"
+        )
+        parser.add_argument("--sheet", help="XLSX worksheet (default: the first)")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report the changes without writing"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=importer.CHUNK_SIZE,
+            help="Rows compared and written per transaction",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            report = importer.run_import(
+                options["kind"],
+                options["path"],
+                fmt=options["format"],
+                sheet=options["sheet"],
+                dry_run=options["dry_run"],
+                chunk_size=max(1, options["chunk_size"]),
+            )
+        except importer.ImportFailed as exc:
+            raise CommandError(str(exc)) from exc
+        write_report(self, report)
+
+
+def write_report(command, report):
+    for line, message in report.errors:
+        command.stderr.write(command.style.WARNING(f"Line {line}: {message}"))
+    if report.error_count > len(report.errors):
+        command.stderr.write(
+            command.style.WARNING(f"... {report.error_count - len(report.errors)} more errors")
+        )
+    style = command.style.SUCCESS if not report.error_count else command.style.WARNING
+    command.stdout.write(style(report.summary()))
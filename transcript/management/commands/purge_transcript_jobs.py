@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from transcript import jobs
+
+
+class Command(BaseCommand):
+    help = "Delete finished background transcript jobs, their artifacts and leftover parts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-hours",
+            type=int,
+            default=jobs.get_config()["RETENTION_HOURS"],
+            help="Delete jobs finished more than this many hours ago.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = jobs.purge_expired(options["retention_hours"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired transcript job(s)."))
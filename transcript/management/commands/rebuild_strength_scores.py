@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from transcript import strengths
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized student strength scores and cohort benchmarks"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        scores, benchmarks = strengths.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {scores} strength scores and {benchmarks} cohort benchmarks "
+                f"in {time.perf_counter() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from transcript import jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued (and resume interrupted) background transcript jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once no job is waiting"
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5.0, help="Seconds between polls"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = jobs.run_pending()
+            if count:
+                self.stdout.write(f"Processed {count} transcript job(s).")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transcript', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StrengthBenchmark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_score', models.FloatField()),
+                ('p50', models.FloatField()),
+                ('p90', models.FloatField()),
+                ('student_count', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('academic_year', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='transcript.academicyear')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='transcript.course')),
+                ('strength', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='transcript.characterstrength')),
+            ],
+            options={
+                'unique_together': {('academic_year', 'course', 'strength')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentStrengthScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('strength', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='transcript.characterstrength')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='strength_scores', to='transcript.student')),
+            ],
+            options={
+                'unique_together': {('student', 'strength')},
+            },
+        ),
+    ]
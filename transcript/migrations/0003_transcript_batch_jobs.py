@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transcript', '0002_strength_scores'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptBatchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('output', models.CharField(choices=[('zip', 'ZIP of PDFs'), ('pdf', 'Combined PDF')], default='zip', max_length=3)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('base_url', models.CharField(max_length=200)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('artifact', models.FileField(blank=True, upload_to='transcripts/batches/')),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='transcript.academicyear')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='transcript.course')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TranscriptBatchItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='transcript.student')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='transcript.transcriptbatchjob')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='transcriptbatchjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('academic_year', 'course', 'output'), name='unique_active_transcript_batch_job'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='transcriptbatchitem',
+            unique_together={('job', 'student')},
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-17 16:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_created_by(apps, schema_editor):
+    TranscriptBatchJob = apps.get_model("transcript", "TranscriptBatchJob")
+    Through = TranscriptBatchJob.requested_by.through
+    Through.objects.bulk_create(
+        [
+            Through(transcriptbatchjob_id=job_id, user_id=user_id)
+            for job_id, user_id in TranscriptBatchJob.objects.filter(
+                created_by__isnull=False
+            ).values_list("id", "created_by_id")
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transcript', '0003_transcript_batch_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcriptbatchjob',
+            name='requested_by',
+            field=models.ManyToManyField(blank=True, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(copy_created_by, migrations.RunPython.noop),
+    ]
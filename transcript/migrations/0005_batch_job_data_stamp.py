@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transcript', '0004_batch_job_requested_by'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcriptbatchjob',
+            name='data_stamp',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
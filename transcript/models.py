@@ -1,5 +1,7 @@
 from zoneinfo import ZoneInfo
 
+from django.conf import settings
+from django.core.cache import caches
 from django.db import models
 from django.utils import timezone
 
@@ -49,14 +51,43 @@ class AcademicYear(models.Model):
 IST = ZoneInfo("Asia/Kolkata")
 
 
+ACTIVE_YEAR_CACHE_KEY = "transcript:active_academic_year"
+ACTIVE_YEAR_CACHE_TIMEOUT = 3600
+
+
+def _active_year_cache():
+    return caches[getattr(settings, "ACADEMIC_YEAR_CACHE_ALIAS", "default")]
+
+
+def invalidate_active_academic_year():
+    """Forget the cached active year in every worker.
+
+    Called by the ``AcademicYear`` signals and by views that change the
+    active flag with ``QuerySet.update()`` (which sends no signals).
+    """
+    _active_year_cache().delete(ACTIVE_YEAR_CACHE_KEY)
+
+
 def get_active_academic_year():
     """Return the active academic year without mutating admin choices.
 
     Admins manage the active flag from the Academic Year Settings screen. The
     helper simply returns the flagged year, creating a sensible default only
-    when no records exist yet (fresh install).
+    when no records exist yet (fresh install).  The result (including "no
+    active year") is cached in the shared cache until an ``AcademicYear``
+    changes.
     """
 
+    cache = _active_year_cache()
+    cached = cache.get(ACTIVE_YEAR_CACHE_KEY)
+    if cached is not None:
+        return cached["year"]
+    year = _load_active_academic_year()
+    cache.set(ACTIVE_YEAR_CACHE_KEY, {"year": year}, ACTIVE_YEAR_CACHE_TIMEOUT)
+    return year
+
+
+def _load_active_academic_year():
     active = (
         AcademicYear.objects.filter(is_active=True)
         .order_by("-start_date", "-id")
@@ -163,3 +194,149 @@ class Participation(models.Model):
 
     def __str__(self):
         return f"{self.student} → {self.event} ({self.role})"
+
+
+# ─────────────────────────────────────────────────────────────
+# Materialized strength scores (maintained by transcript.strengths)
+# ─────────────────────────────────────────────────────────────
+class StudentStrengthScore(models.Model):
+    """A student's total for one character strength.
+
+    Sum over the student's participations of attribute weight × role factor.
+    Only non-zero totals are stored.
+    """
+
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="strength_scores"
+    )
+    strength = models.ForeignKey(CharacterStrength, on_delete=models.CASCADE)
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ("student", "strength")
+
+    def __str__(self):
+        return f"{self.student_id} {self.strength_id} = {self.score}"
+
+
+class StrengthBenchmark(models.Model):
+    """Distribution of one strength's scores within a cohort.
+
+    A cohort is the students sharing an academic year and course (either may
+    be empty).  Percentiles are over students with a non-zero score.
+    """
+
+    academic_year = models.ForeignKey(
+        AcademicYear, on_delete=models.CASCADE, null=True, blank=True
+    )
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True)
+    strength = models.ForeignKey(CharacterStrength, on_delete=models.CASCADE)
+    max_score = models.FloatField()
+    p50 = models.FloatField()
+    p90 = models.FloatField()
+    student_count = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("academic_year", "course", "strength")
+
+    def __str__(self):
+        return f"{self.academic_year_id}/{self.course_id} {self.strength_id} max={self.max_score}"
+
+
+# ─────────────────────────────────────────────────────────────
+# Background bulk transcript jobs (processed by transcript.jobs)
+# ─────────────────────────────────────────────────────────────
+class TranscriptBatchJob(models.Model):
+    """Render every transcript of a course into one downloadable artifact.
+
+    At most one queued or running job exists per academic year, course and
+    output format.  Progress lives on :class:`TranscriptBatchItem` rows, so a
+    job interrupted by a restart resumes with the students still pending.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+    OUTPUT_CHOICES = [("zip", "ZIP of PDFs"), ("pdf", "Combined PDF")]
+
+    academic_year = models.ForeignKey(AcademicYear, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    output = models.CharField(max_length=3, choices=OUTPUT_CHOICES, default="zip")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    # Used for the all-events QR links, which normally come from the request.
+    base_url = models.CharField(max_length=200)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    # Everyone who asked for this job, including those handed an existing
+    # one; only they (and staff) may see its status and artifact.
+    requested_by = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, related_name="+", blank=True
+    )
+    total = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    artifact = models.FileField(upload_to="transcripts/batches/", blank=True)
+    error = models.TextField(blank=True)
+    # transcript.jobs.data_stamp() of the course when the job was queued; a
+    # finished job is only reused while the stamp is unchanged.
+    data_stamp = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed while a worker owns the job; a stale heartbeat means the
+    # worker died and the job may be claimed again.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["academic_year", "course", "output"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_active_transcript_batch_job",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.course} {self.academic_year} ({self.output}, {self.status})"
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+    def visible_to(self, user):
+        if user.is_staff or user.is_superuser:
+            return True
+        return self.requested_by.filter(pk=user.pk).exists()
+
+
+class TranscriptBatchItem(models.Model):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (DONE, "Done"), (FAILED, "Failed")]
+
+    job = models.ForeignKey(
+        TranscriptBatchJob, on_delete=models.CASCADE, related_name="items"
+    )
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    error = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("job", "student")
+
+    def __str__(self):
+        return f"{self.job_id}/{self.student_id} {self.status}"
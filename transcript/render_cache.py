@@ -0,0 +1,301 @@
+"""Content-addressed disk cache for rendered transcripts.
+
+QR code PNGs, transcript HTML and final PDF bytes are stored under
+``MEDIA_ROOT`` keyed by a SHA-256 of everything that goes into them: the
+student's fields, strength rows, top events, the ``all_events`` URL, the
+date printed on the transcript and the template version (the configured
+``TEMPLATE_VERSION`` plus a hash of the template and its stylesheets).
+Anything that changes the output therefore changes the key; stale entries
+simply stop being read and age out.
+
+Each kind of entry has its own size limit.  Reads refresh a file's mtime,
+and once a store grows past its limit the least recently used files are
+removed until it is back under 90% of it.  HTML and PDF entries live in one
+directory per student, which ``transcript.signals`` removes when the
+student's participations change.
+
+Configured through ``settings.TRANSCRIPT_RENDER_CACHE``; see
+:data:`DEFAULTS`.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template, render_to_string
+
+from core import pdf_renderer
+
+from . import bulk
+
+logger = logging.getLogger(__name__)
+
+PDF_TEMPLATE = "transcript_app/pdf.html"
+
+DEFAULTS = {
+    "ENABLED": True,
+    # Relative to MEDIA_ROOT.
+    "DIR": "cache/transcripts",
+    # Size limit per kind of entry, in bytes.
+    "MAX_BYTES": {"qr": 16 * 1024**2, "html": 64 * 1024**2, "pdf": 512 * 1024**2},
+    # Bump to discard every cached transcript after a rendering change that
+    # the template source does not reflect (e.g. a PDF engine upgrade).
+    "TEMPLATE_VERSION": "1",
+}
+
+SUFFIXES = {"qr": ".png", "html": ".html", "pdf": ".pdf"}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "TRANSCRIPT_RENDER_CACHE", {}) or {})
+    return config
+
+
+def enabled():
+    return bool(get_config()["ENABLED"])
+
+
+class DiskLRU:
+    """Files under ``root`` evicted least-recently-used beyond ``max_bytes``."""
+
+    def __init__(self, root, max_bytes, suffix=""):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._size = None
+        self._lock = threading.Lock()
+
+    def path(self, key, group=None):
+        return self.root / (str(group) if group is not None else key[:2]) / (key + self.suffix)
+
+    def get(self, key, group=None):
+        """Return the path of a cached entry (marking it used), or ``None``."""
+        path = self.path(key, group)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def read(self, key, group=None):
+        path = self.get(key, group)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:  # evicted by another process in between
+            return None
+
+    def put(self, key, data, group=None):
+        path = self.path(key, group)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            partial.write_bytes(data)
+            os.replace(partial, path)
+        except OSError:
+            logger.warning("Could not write render cache entry %s", path, exc_info=True)
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[0]
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self.prune()
+
+    def _scan(self):
+        files = []
+        for path in self.root.rglob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return sum(size for _, size, _ in files), files
+
+    def prune(self):
+        """Remove the least recently used entries down to 90% of the limit."""
+        total, files = self._scan()
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def delete_group(self, group):
+        shutil.rmtree(self.root / str(group), ignore_errors=True)
+        self._size = None
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def store(kind):
+    """Return the :class:`DiskLRU` for ``kind`` (``qr``, ``html`` or ``pdf``)."""
+    config = get_config()
+    root = Path(settings.MEDIA_ROOT) / config["DIR"] / kind
+    max_bytes = config["MAX_BYTES"][kind]
+    with _stores_lock:
+        lru = _stores.get(kind)
+        if lru is None or lru.root != root or lru.max_bytes != max_bytes:
+            lru = _stores[kind] = DiskLRU(root, max_bytes, SUFFIXES[kind])
+    return lru
+
+
+def _digest(payload):
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _template_digest(name):
+    from .views import PDF_STYLESHEETS
+
+    template = get_template(name)
+    source = getattr(getattr(template, "template", template), "source", "")
+    source += "".join(pdf_renderer.stylesheet_text(css) for css in PDF_STYLESHEETS)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def template_version(name=PDF_TEMPLATE):
+    """Configured version plus a hash of the template and its stylesheets."""
+    return f"{get_config()['TEMPLATE_VERSION']}:{_template_digest(name)}"
+
+
+def qr_png(data, make):
+    """Return the QR PNG for ``data``, calling ``make(data)`` on a miss."""
+    if not enabled():
+        return make(data)
+    lru = store("qr")
+    key = _digest(["qr", data])
+    png = lru.read(key)
+    if png is None:
+        png = make(data)
+        lru.put(key, png)
+    return png
+
+
+def transcript_key(context):
+    """Hash of every input of ``transcript_app/pdf.html`` for ``context``."""
+    student = context["student"]
+    return _digest(
+        {
+            "template": template_version(),
+            "student": [
+                student.pk,
+                student.roll_no,
+                student.name,
+                student.photo.name if student.photo else "",
+                student.school_id,
+                student.course_id,
+                student.academic_year_id,
+            ],
+            "strength_data": context["strength_data"],
+            "top_events": context["top_events"],
+            "all_events_url": context.get("all_events_url"),
+            "today": context["today"],
+        }
+    )
+
+
+def transcript_html(context, key=None):
+    """Render ``pdf.html`` for ``context``, from the cache when possible."""
+    if not enabled():
+        return render_to_string(PDF_TEMPLATE, context)
+    lru = store("html")
+    key = key or transcript_key(context)
+    group = context["student"].pk
+    html = lru.read(key, group)
+    if html is not None:
+        return html.decode("utf-8")
+    html = render_to_string(PDF_TEMPLATE, context)
+    lru.put(key, html.encode("utf-8"), group)
+    return html
+
+
+def transcript_pdf(context, render):
+    """Return PDF bytes for ``context``, calling ``render(html)`` on a miss."""
+    if not enabled():
+        return render(render_to_string(PDF_TEMPLATE, context))
+    lru = store("pdf")
+    key = transcript_key(context)
+    group = context["student"].pk
+    pdf = lru.read(key, group)
+    if pdf is None:
+        pdf = render(transcript_html(context, key))
+        lru.put(key, pdf, group)
+    return pdf
+
+
+def render_transcripts(items):
+    """Render ``(key, context)`` pairs like :func:`transcript.bulk.render_all`.
+
+    Cached PDFs are yielded without touching the pool; only their paths are
+    queued, so a fully cached cohort does not accumulate PDF bytes.
+    """
+    if not enabled():
+        yield from bulk.render_all(
+            (key, render_to_string(PDF_TEMPLATE, context)) for key, context in items
+        )
+        return
+
+    pdfs = store("pdf")
+    hits = deque()
+
+    def misses():
+        for key, context in items:
+            cache_key = transcript_key(context)
+            group = context["student"].pk
+            path = pdfs.get(cache_key, group)
+            if path is not None:
+                hits.append((key, path))
+                continue
+            yield (key, cache_key, group), transcript_html(context, cache_key)
+
+    def drain():
+        while hits:
+            key, path = hits.popleft()
+            try:
+                yield key, path.read_bytes(), None
+            except OSError as exc:
+                yield key, None, exc
+
+    for (key, cache_key, group), pdf, error in bulk.render_all(misses()):
+        yield from drain()
+        if error is None:
+            pdfs.put(cache_key, pdf, group)
+        yield key, pdf, error
+    yield from drain()
+
+
+def invalidate_students(student_ids):
+    """Drop the cached HTML and PDFs of ``student_ids``."""
+    if not enabled():
+        return
+    for kind in ("html", "pdf"):
+        lru = store(kind)
+        for student_id in student_ids:
+            if student_id:
+                lru.delete_group(student_id)
+
+
+def clear():
+    """Remove every cached QR code, HTML page and PDF."""
+    with _stores_lock:
+        _stores.clear()
+    shutil.rmtree(Path(settings.MEDIA_ROOT) / get_config()["DIR"], ignore_errors=True)
@@ -0,0 +1,205 @@
+"""Vectorized strength scoring with NumPy.
+
+Scores for a set of students are a matrix product::
+
+    scores (students × strengths) = P (students × attributes) @ W (attributes × strengths)
+
+``W`` holds the ``AttributeStrengthMap`` weights.  ``P[s, a]`` is the sum of
+``Role.factor`` over student ``s``'s participations in events carrying
+attribute ``a``; it is accumulated from (student, attribute, factor)
+triplets with ``np.bincount`` rather than Python loops.  Graduate attributes
+are few, so ``P`` is held densely even though the triplets are sparse.
+
+:func:`score_students` / :func:`score_cohort` compute scores straight from
+the participation tables; ``transcript.strengths`` uses them to maintain the
+materialized scores and :class:`StrengthScores` to turn stored scores into
+the ESTD/DEV/EMER rows the transcript templates render.
+"""
+
+import numpy as np
+
+from .models import AttributeStrengthMap, CharacterStrength, Event, Participation, Student
+
+CHUNK_SIZE = 2000
+
+# (minimum percentage of the benchmark, category), highest first.
+CATEGORY_THRESHOLDS = ((90, "ESTD"), (80, "DEV"), (60, "EMER"))
+
+
+def load_strengths():
+    """Return ``[(pk, name), ...]`` in transcript display order."""
+    return sorted(
+        CharacterStrength.objects.values_list("pk", "name"), key=lambda s: (s[1], s[0])
+    )
+
+
+class WeightMatrix:
+    """``AttributeStrengthMap`` as a dense attributes × strengths array."""
+
+    def __init__(self, strengths=None):
+        self.strengths = load_strengths() if strengths is None else strengths
+        strength_index = {pk: i for i, (pk, _) in enumerate(self.strengths)}
+        rows = [
+            (attribute_id, strength_index[strength_id], weight)
+            for attribute_id, strength_id, weight in AttributeStrengthMap.objects.values_list(
+                "graduate_attribute_id", "character_strength_id", "weight"
+            )
+            if strength_id in strength_index
+        ]
+        self.attribute_index = {
+            attribute_id: i for i, attribute_id in enumerate(sorted({r[0] for r in rows}))
+        }
+        self.matrix = np.zeros((len(self.attribute_index), len(self.strengths)))
+        if rows:
+            np.add.at(
+                self.matrix,
+                (
+                    np.fromiter((self.attribute_index[r[0]] for r in rows), dtype=np.intp),
+                    np.fromiter((r[1] for r in rows), dtype=np.intp),
+                ),
+                np.fromiter((r[2] for r in rows), dtype=float),
+            )
+
+
+def _participation_filters(students):
+    """Yield ``Participation`` filter kwargs covering ``students``.
+
+    Querysets are pushed down as a subquery; id lists are chunked to stay
+    under the database's parameter limit.
+    """
+    if hasattr(students, "values"):
+        yield {"student_id__in": students.values("pk")}
+        return
+    for start in range(0, len(students), CHUNK_SIZE):
+        yield {"student_id__in": students[start:start + CHUNK_SIZE]}
+
+
+def participation_matrix(student_ids, students, weights):
+    """Return the students × attributes matrix of summed role factors."""
+    n_students, n_attributes = len(student_ids), len(weights.attribute_index)
+    if not n_students or not n_attributes:
+        return np.zeros((n_students, n_attributes))
+    student_index = {pk: i for i, pk in enumerate(student_ids)}
+
+    part_student, part_event, part_factor = [], [], []
+    event_ids = set()
+    for filters in _participation_filters(students):
+        for student_id, event_id, factor in Participation.objects.filter(**filters).values_list(
+            "student_id", "event_id", "role__factor"
+        ):
+            part_student.append(student_index[student_id])
+            part_event.append(event_id)
+            part_factor.append(1.0 if factor is None else factor)
+            event_ids.add(event_id)
+    if not part_event:
+        return np.zeros((n_students, n_attributes))
+
+    # Event → attribute columns, as CSR-style offsets into ``link_attr``.
+    event_list = sorted(event_ids)
+    event_pos = {event_id: i for i, event_id in enumerate(event_list)}
+    link_event, link_attr = [], []
+    for start in range(0, len(event_list), CHUNK_SIZE):
+        for event_id, attribute_id in Event.attributes.through.objects.filter(
+            event_id__in=event_list[start:start + CHUNK_SIZE],
+            graduateattribute_id__in=list(weights.attribute_index),
+        ).values_list("event_id", "graduateattribute_id"):
+            link_event.append(event_pos[event_id])
+            link_attr.append(weights.attribute_index[attribute_id])
+    link_event = np.asarray(link_event, dtype=np.intp)
+    link_attr = np.asarray(link_attr, dtype=np.intp)
+    order = np.argsort(link_event, kind="stable")
+    link_attr = link_attr[order]
+    per_event = np.bincount(link_event, minlength=len(event_list))
+    offsets = np.concatenate(([0], np.cumsum(per_event)[:-1]))
+
+    # Expand every participation into one (student, attribute, factor)
+    # triplet per attribute of its event.
+    part_event = np.fromiter((event_pos[e] for e in part_event), dtype=np.intp)
+    repeats = per_event[part_event]
+    total = int(repeats.sum())
+    if not total:
+        return np.zeros((n_students, n_attributes))
+    rows = np.repeat(np.asarray(part_student, dtype=np.intp), repeats)
+    factors = np.repeat(np.asarray(part_factor, dtype=float), repeats)
+    within = np.arange(total) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    cols = link_attr[np.repeat(offsets[part_event], repeats) + within]
+
+    flat = np.bincount(
+        rows * n_attributes + cols, weights=factors, minlength=n_students * n_attributes
+    )
+    return flat.reshape(n_students, n_attributes)
+
+
+def categorize(scores, benchmarks):
+    """Return an object array of ESTD/DEV/EMER/None for ``scores``."""
+    benchmarks = np.asarray(benchmarks, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = np.where(benchmarks > 0, scores / benchmarks * 100, 0.0)
+    return np.select(
+        [percentages >= threshold for threshold, _ in CATEGORY_THRESHOLDS],
+        [category for _, category in CATEGORY_THRESHOLDS],
+        default=None,
+    )
+
+
+class StrengthScores:
+    """Scores for ``student_ids`` (rows) × ``strengths`` (columns)."""
+
+    def __init__(self, student_ids, strengths, scores):
+        self.student_ids = list(student_ids)
+        self.strengths = strengths
+        self.scores = scores
+
+    def benchmarks(self):
+        """Highest score per strength within this set of students."""
+        if not self.student_ids:
+            return np.zeros(len(self.strengths))
+        return self.scores.max(axis=0)
+
+    def categories(self, benchmarks=None):
+        return categorize(self.scores, self.benchmarks() if benchmarks is None else benchmarks)
+
+    def as_dict(self):
+        """Return ``{student_id: {strength_id: score}}`` for non-zero scores."""
+        result = {}
+        strength_ids = [pk for pk, _ in self.strengths]
+        for row, col in zip(*np.nonzero(self.scores)):
+            result.setdefault(self.student_ids[row], {})[strength_ids[col]] = float(
+                self.scores[row, col]
+            )
+        return result
+
+    def rows(self, benchmarks=None):
+        """Return ``{student_id: [{"name", "average", "category"}, ...]}``."""
+        categories = self.categories(benchmarks)
+        rounded = np.round(self.scores, 2)
+        names = [name for _, name in self.strengths]
+        return {
+            student_id: [
+                {"name": name, "average": float(score), "category": category}
+                for name, score, category in zip(names, rounded[i], categories[i])
+            ]
+            for i, student_id in enumerate(self.student_ids)
+        }
+
+
+def score_students(students, weights=None):
+    """Score a queryset or list of student ids from the participation tables."""
+    weights = WeightMatrix() if weights is None else weights
+    if hasattr(students, "values_list"):
+        student_ids = list(students.order_by("pk").values_list("pk", flat=True))
+    else:
+        student_ids = list(dict.fromkeys(students))
+        students = student_ids
+    matrix = participation_matrix(student_ids, students, weights)
+    return StrengthScores(student_ids, weights.strengths, matrix @ weights.matrix)
+
+
+def score_cohort(academic_year=None, course=None, weights=None):
+    """Score every student of an academic year and/or course in one pass."""
+    students = Student.objects.all()
+    if academic_year is not None:
+        students = students.filter(academic_year=academic_year)
+    if course is not None:
+        students = students.filter(course=course)
+    return score_students(students, weights)
@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import directory, render_cache, strengths
+from .models import (
+    AcademicYear,
+    AttributeStrengthMap,
+    Course,
+    Event,
+    GraduateAttribute,
+    Participation,
+    Role,
+    School,
+    Student,
+    invalidate_active_academic_year,
+)
+
+
+@receiver(post_save, sender=AcademicYear)
+@receiver(post_delete, sender=AcademicYear)
+def academic_year_changed(sender, **kwargs):
+    """Drop the cached active year now and once the change is committed."""
+    invalidate_active_academic_year()
+    transaction.on_commit(invalidate_active_academic_year)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=School)
+@receiver(post_save, sender=AcademicYear)
+@receiver(post_delete, sender=AcademicYear)
+def directory_changed(sender, **kwargs):
+    """Expire the cached home page directory (see transcript/directory.py)."""
+    directory.bump_version_on_commit()
+
+
+# ─────────────────────────────────────────────────────────────
+# Strength score maintenance (see transcript/strengths.py)
+# ─────────────────────────────────────────────────────────────
+def _students_in_events(event_ids):
+    return Participation.objects.filter(event_id__in=event_ids).values_list(
+        "student_id", flat=True
+    )
+
+
+def _students_with_attribute(attribute_id):
+    return Participation.objects.filter(event__attributes=attribute_id).values_list(
+        "student_id", flat=True
+    )
+
+
+@receiver(pre_save, sender=Participation)
+def remember_participation_student(sender, instance, **kwargs):
+    instance._previous_student_id = None
+    if instance.pk:
+        instance._previous_student_id = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("student_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def participation_changed(sender, instance, **kwargs):
+    strengths.refresh_students(
+        {instance.student_id, getattr(instance, "_previous_student_id", None)}
+    )
+
+
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def participation_render_cache(sender, instance, **kwargs):
+    """Drop the student's cached transcripts now and once committed."""
+    student_ids = {instance.student_id, getattr(instance, "_previous_student_id", None)}
+    render_cache.invalidate_students(student_ids)
+    transaction.on_commit(lambda: render_cache.invalidate_students(student_ids))
+
+
+@receiver(m2m_changed, sender=Event.attributes.through)
+def event_attributes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            strengths.refresh_students(set(_students_in_events([instance.pk])))
+        return
+    # ``attribute.event_set`` was changed: ``pk_set`` holds event ids.
+    if action == "pre_clear":
+        instance._cleared_event_ids = list(instance.event_set.values_list("pk", flat=True))
+    elif action == "post_clear":
+        event_ids = getattr(instance, "_cleared_event_ids", [])
+        strengths.refresh_students(set(_students_in_events(event_ids)))
+    elif action in ("post_add", "post_remove"):
+        strengths.refresh_students(set(_students_in_events(pk_set or [])))
+
+
+@receiver(post_save, sender=Role)
+def role_changed(sender, instance, created, **kwargs):
+    if not created:
+        strengths.refresh_students(
+            set(
+                Participation.objects.filter(role=instance).values_list(
+                    "student_id", flat=True
+                )
+            )
+        )
+
+
+@receiver(post_save, sender=AttributeStrengthMap)
+@receiver(post_delete, sender=AttributeStrengthMap)
+def attribute_strength_map_changed(sender, instance, **kwargs):
+    strengths.refresh_students(
+        set(_students_with_attribute(instance.graduate_attribute_id))
+    )
+
+
+@receiver(pre_delete, sender=GraduateAttribute)
+def remember_attribute_students(sender, instance, **kwargs):
+    # Deleting an attribute drops its event links without m2m_changed.
+    instance._affected_student_ids = set(_students_with_attribute(instance.pk))
+
+
+@receiver(post_delete, sender=GraduateAttribute)
+def attribute_deleted(sender, instance, **kwargs):
+    strengths.refresh_students(getattr(instance, "_affected_student_ids", set()))
+
+
+@receiver(pre_save, sender=Student)
+def remember_student_cohort(sender, instance, **kwargs):
+    instance._previous_cohort = None
+    if instance.pk:
+        instance._previous_cohort = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("academic_year_id", "course_id")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_cohort", None)
+    current = (instance.academic_year_id, instance.course_id)
+    if previous and previous != current:
+        strengths.refresh_benchmarks({previous, current})
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    strengths.refresh_benchmarks({(instance.academic_year_id, instance.course_id)})
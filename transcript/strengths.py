@@ -0,0 +1,222 @@
+"""Materialized strength scores and cohort benchmarks.
+
+A student's score for a character strength is the sum, over their
+participations, of ``AttributeStrengthMap.weight × Role.factor`` for every
+graduate attribute of the event (computed by :mod:`transcript.scoring`).
+Scores are stored in
+``StudentStrengthScore`` and summarised per cohort (academic year + course)
+in ``StrengthBenchmark``; the transcript benchmark for a strength is the
+highest cohort maximum.
+
+``transcript.signals`` keeps both tables current when participations, event
+attributes, role factors or the attribute→strength map change.  Bulk loaders
+should wrap their writes in :func:`deferred` so each affected student is
+recomputed once, and ``manage.py rebuild_strength_scores`` rebuilds
+everything from scratch.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Max
+
+from . import scoring
+from .models import Participation, StrengthBenchmark, Student, StudentStrengthScore
+
+CHUNK_SIZE = 2000
+
+_state = threading.local()
+_checked_built = False
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def compute_scores(student_ids, weights=None):
+    """Return ``{student_id: {strength_id: score}}`` from the raw tables."""
+    return scoring.score_students(list(student_ids), weights).as_dict()
+
+
+@contextmanager
+def deferred():
+    """Collect refreshes requested inside the block and apply them once."""
+    if getattr(_state, "pending", None) is not None:
+        yield
+        return
+    _state.pending = pending = {"students": set(), "cohorts": set()}
+    try:
+        yield
+    finally:
+        _state.pending = None
+    refresh_students(pending["students"], pending["cohorts"])
+
+
+def refresh_students(student_ids, cohorts=()):
+    """Recompute the scores of ``student_ids`` and their cohorts' benchmarks.
+
+    ``cohorts`` adds ``(academic_year_id, course_id)`` pairs whose benchmarks
+    should be recomputed even if none of the students belong to them (e.g. a
+    student moved out of the cohort).
+    """
+    student_ids = {pk for pk in student_ids if pk}
+    pending = getattr(_state, "pending", None)
+    if pending is not None:
+        pending["students"].update(student_ids)
+        pending["cohorts"].update(cohorts)
+        return
+    if not student_ids and not cohorts:
+        return
+
+    with transaction.atomic():
+        scores = compute_scores(student_ids)
+        for chunk in _chunks(student_ids):
+            StudentStrengthScore.objects.filter(student_id__in=chunk).delete()
+        StudentStrengthScore.objects.bulk_create(
+            [
+                StudentStrengthScore(student_id=student_id, strength_id=strength_id, score=score)
+                for student_id, totals in scores.items()
+                for strength_id, score in totals.items()
+                if score
+            ],
+            batch_size=CHUNK_SIZE,
+        )
+        affected = set(cohorts)
+        for chunk in _chunks(student_ids):
+            affected.update(
+                Student.objects.filter(pk__in=chunk).values_list("academic_year_id", "course_id")
+            )
+        refresh_benchmarks(affected)
+
+
+def refresh_benchmarks(cohorts):
+    """Recompute ``StrengthBenchmark`` rows for ``(year_id, course_id)`` pairs."""
+    pending = getattr(_state, "pending", None)
+    if pending is not None:
+        pending["cohorts"].update(cohorts)
+        return
+    for year_id, course_id in cohorts:
+        by_strength = defaultdict(list)
+        for strength_id, score in StudentStrengthScore.objects.filter(
+            student__academic_year_id=year_id, student__course_id=course_id
+        ).values_list("strength_id", "score"):
+            by_strength[strength_id].append(score)
+
+        rows = []
+        for strength_id, values in by_strength.items():
+            values.sort()
+            rows.append(
+                StrengthBenchmark(
+                    academic_year_id=year_id,
+                    course_id=course_id,
+                    strength_id=strength_id,
+                    max_score=values[-1],
+                    p50=_percentile(values, 50),
+                    p90=_percentile(values, 90),
+                    student_count=len(values),
+                )
+            )
+        with transaction.atomic():
+            StrengthBenchmark.objects.filter(
+                academic_year_id=year_id, course_id=course_id
+            ).delete()
+            StrengthBenchmark.objects.bulk_create(rows)
+
+
+def rebuild():
+    """Rebuild both tables from scratch and return ``(scores, benchmarks)``."""
+    with transaction.atomic():
+        StudentStrengthScore.objects.all().delete()
+        StrengthBenchmark.objects.all().delete()
+        weights = scoring.WeightMatrix()
+        student_ids = list(
+            Participation.objects.order_by().values_list("student_id", flat=True).distinct()
+        )
+        for chunk in _chunks(student_ids):
+            scores = compute_scores(chunk, weights)
+            StudentStrengthScore.objects.bulk_create(
+                [
+                    StudentStrengthScore(student_id=student_id, strength_id=strength_id, score=score)
+                    for student_id, totals in scores.items()
+                    for strength_id, score in totals.items()
+                    if score
+                ],
+                batch_size=CHUNK_SIZE,
+            )
+        refresh_benchmarks(
+            set(Student.objects.order_by().values_list("academic_year_id", "course_id").distinct())
+        )
+    return StudentStrengthScore.objects.count(), StrengthBenchmark.objects.count()
+
+
+def ensure_built():
+    """Build the tables once per process if they were never populated.
+
+    Covers databases that predate the tables; afterwards the signals keep
+    them current.
+    """
+    global _checked_built
+    if _checked_built:
+        return
+    if not StrengthBenchmark.objects.exists() and Participation.objects.exists():
+        rebuild()
+    _checked_built = True
+
+
+def benchmarks():
+    """Return ``{strength_id: highest cohort maximum}``."""
+    return dict(
+        StrengthBenchmark.objects.values("strength_id")
+        .annotate(best=Max("max_score"))
+        .values_list("strength_id", "best")
+    )
+
+
+def cohort_benchmarks(academic_year_id, course_id):
+    """Return ``{strength_id: StrengthBenchmark}`` for one cohort."""
+    return {
+        row.strength_id: row
+        for row in StrengthBenchmark.objects.filter(
+            academic_year_id=academic_year_id, course_id=course_id
+        )
+    }
+
+
+def strength_data_for_students(student_ids):
+    """Return ``{student_id: strength_data}`` for the transcript templates.
+
+    Each entry lists every character strength by name with the student's
+    score (``average``) and ESTD/DEV/EMER category relative to the
+    benchmark.
+    """
+    ensure_built()
+    strengths = scoring.load_strengths()
+    column = {pk: i for i, (pk, _) in enumerate(strengths)}
+    row = {pk: i for i, pk in enumerate(student_ids)}
+    matrix = np.zeros((len(student_ids), len(strengths)))
+    for chunk in _chunks(student_ids):
+        for student_id, strength_id, score in StudentStrengthScore.objects.filter(
+            student_id__in=chunk
+        ).values_list("student_id", "strength_id", "score"):
+            matrix[row[student_id], column[strength_id]] = score
+    best = benchmarks()
+    return scoring.StrengthScores(student_ids, strengths, matrix).rows(
+        [best.get(pk, 0) for pk, _ in strengths]
+    )
+
+
+def strength_data(student):
+    return strength_data_for_students([student.pk])[student.pk]
@@ -1,11 +1,28 @@
-from datetime import date
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import zipfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
 
+from . import bulk, directory, importer, jobs, render_cache, scoring, strengths
 from .models import (AcademicYear, AttributeStrengthMap, CharacterStrength,
                      Course, Event, GraduateAttribute, Participation, Role,
-                     School, Student)
-from .views import calculate_strength_data
+                     School, Student, StrengthBenchmark, StudentStrengthScore,
+                     TranscriptBatchItem, TranscriptBatchJob,
+                     get_active_academic_year, invalidate_active_academic_year)
+from .views import PDFGenerationError, calculate_strength_data
 
 
 class StrengthCalculationTests(TestCase):
@@ -39,3 +56,795 @@ class StrengthCalculationTests(TestCase):
 
         self.assertEqual(participations.count(), 1)
         self.assertTrue(any(s["average"] > 0 for s in strength_data))
+
+
+class StrengthScoreMaintenanceTests(TestCase):
+    def setUp(self):
+        self.ga = GraduateAttribute.objects.create(name="GA1")
+        self.cs = CharacterStrength.objects.create(name="CS1")
+        self.mapping = AttributeStrengthMap.objects.create(
+            graduate_attribute=self.ga, character_strength=self.cs, weight=2.0
+        )
+        school = School.objects.create(name="School")
+        self.course = Course.objects.create(name="Course", school=school)
+        self.year = AcademicYear.objects.create(year="2024")
+        self.alice = Student.objects.create(
+            roll_no="1", name="Alice", course=self.course, academic_year=self.year
+        )
+        self.bob = Student.objects.create(
+            roll_no="2", name="Bob", course=self.course, academic_year=self.year
+        )
+        self.lead = Role.objects.create(name="First Level", factor=3.0)
+        self.attendee = Role.objects.create(name="Attendee", factor=1.0)
+        self.event = Event.objects.create(name="Event", date=date.today())
+        self.event.attributes.add(self.ga)
+        Participation.objects.create(student=self.alice, event=self.event, role=self.lead)
+        self.bob_part = Participation.objects.create(
+            student=self.bob, event=self.event, role=self.attendee
+        )
+
+    def _score(self, student):
+        row = StudentStrengthScore.objects.filter(student=student, strength=self.cs).first()
+        return row.score if row else 0
+
+    def _benchmark(self):
+        return StrengthBenchmark.objects.get(
+            academic_year=self.year, course=self.course, strength=self.cs
+        )
+
+    def test_scores_and_cohort_benchmark_follow_changes(self):
+        self.assertEqual(self._score(self.alice), 6.0)
+        self.assertEqual(self._score(self.bob), 2.0)
+        bench = self._benchmark()
+        self.assertEqual((bench.max_score, bench.p50, bench.student_count), (6.0, 2.0, 2))
+
+        self.attendee.factor = 4.0
+        self.attendee.save()
+        self.assertEqual(self._score(self.bob), 8.0)
+        self.assertEqual(self._benchmark().max_score, 8.0)
+
+        self.mapping.weight = 1.0
+        self.mapping.save()
+        self.assertEqual(self._score(self.alice), 3.0)
+
+        self.event.attributes.remove(self.ga)
+        self.assertEqual(self._score(self.alice), 0)
+        self.assertFalse(StrengthBenchmark.objects.exists())
+
+        self.ga.event_set.add(self.event)
+        self.assertEqual(self._score(self.alice), 3.0)
+
+        self.bob_part.delete()
+        self.assertEqual(self._score(self.bob), 0)
+        self.assertEqual(self._benchmark().student_count, 1)
+
+    def test_cohort_move_refreshes_both_cohorts(self):
+        other = Course.objects.create(name="Other", school=self.course.school)
+        self.bob.course = other
+        self.bob.save()
+        self.assertEqual(self._benchmark().student_count, 1)
+        self.assertEqual(
+            StrengthBenchmark.objects.get(course=other, strength=self.cs).max_score, 2.0
+        )
+
+    def test_transcript_reads_materialized_rows(self):
+        data = {row["name"]: row for row in strengths.strength_data(self.alice)}
+        self.assertEqual(data["CS1"], {"name": "CS1", "average": 6.0, "category": "ESTD"})
+        self.assertIsNone(strengths.strength_data(self.bob)[0]["category"])
+        with self.assertNumQueries(3):
+            strengths.strength_data_for_students([self.alice.pk, self.bob.pk])
+
+    def test_deferred_batches_and_rebuild_matches(self):
+        student = Student.objects.create(roll_no="3", name="Carol")
+        with strengths.deferred():
+            Participation.objects.create(student=student, event=self.event, role=self.lead)
+            self.assertEqual(self._score(student), 0)
+        self.assertEqual(self._score(student), 6.0)
+
+        before = sorted(StudentStrengthScore.objects.values_list("student_id", "score"))
+        StudentStrengthScore.objects.all().delete()
+        call_command("rebuild_strength_scores", stdout=StringIO())
+        after = sorted(StudentStrengthScore.objects.values_list("student_id", "score"))
+        self.assertEqual(before, after)
+
+
+class ScoringEngineTests(TestCase):
+    def setUp(self):
+        self.ga1 = GraduateAttribute.objects.create(name="GA1")
+        self.ga2 = GraduateAttribute.objects.create(name="GA2")
+        self.curiosity = CharacterStrength.objects.create(name="Curiosity")
+        self.bravery = CharacterStrength.objects.create(name="Bravery")
+        AttributeStrengthMap.objects.create(
+            graduate_attribute=self.ga1, character_strength=self.curiosity, weight=1.0
+        )
+        AttributeStrengthMap.objects.create(
+            graduate_attribute=self.ga2, character_strength=self.curiosity, weight=0.5
+        )
+        AttributeStrengthMap.objects.create(
+            graduate_attribute=self.ga2, character_strength=self.bravery, weight=2.0
+        )
+        lead = Role.objects.create(name="First Level", factor=3.0)
+        attendee = Role.objects.create(name="Attendee", factor=1.0)
+        both = Event.objects.create(name="Both", date=date.today())
+        both.attributes.add(self.ga1, self.ga2)
+        one = Event.objects.create(name="One", date=date.today())
+        one.attributes.add(self.ga1)
+        self.year = AcademicYear.objects.create(year="2024")
+        self.a = Student.objects.create(roll_no="A", name="A", academic_year=self.year)
+        self.b = Student.objects.create(roll_no="B", name="B", academic_year=self.year)
+        self.c = Student.objects.create(roll_no="C", name="C")
+        Participation.objects.create(student=self.a, event=both, role=lead)
+        Participation.objects.create(student=self.a, event=one, role=attendee)
+        Participation.objects.create(student=self.b, event=both, role=attendee)
+
+    def test_matrix_scores_match_hand_computed_totals(self):
+        result = scoring.score_cohort(academic_year=self.year)
+        self.assertEqual(result.student_ids, [self.a.pk, self.b.pk])
+        self.assertEqual([name for _, name in result.strengths], ["Bravery", "Curiosity"])
+        # A: both×3 → curiosity 4.5, bravery 6; one×1 → curiosity 1.
+        self.assertEqual(result.scores.tolist(), [[6.0, 5.5], [2.0, 1.5]])
+        self.assertEqual(result.benchmarks().tolist(), [6.0, 5.5])
+        self.assertEqual(result.categories().tolist(), [["ESTD", "ESTD"], [None, None]])
+
+        rows = scoring.score_students([self.c.pk, self.b.pk]).rows([4.0, 1.8])
+        self.assertEqual(
+            rows[self.b.pk],
+            [
+                {"name": "Bravery", "average": 2.0, "category": None},
+                {"name": "Curiosity", "average": 1.5, "category": "DEV"},
+            ],
+        )
+        self.assertEqual([r["average"] for r in rows[self.c.pk]], [0.0, 0.0])
+
+    def test_materialized_scores_agree_with_engine(self):
+        engine = scoring.score_students([self.a.pk, self.b.pk]).as_dict()
+        stored = {}
+        for student_id, strength_id, score in StudentStrengthScore.objects.values_list(
+            "student_id", "strength_id", "score"
+        ):
+            stored.setdefault(student_id, {})[strength_id] = score
+        self.assertEqual(engine, stored)
+
+    def test_benchmark_command_reports_agreement(self):
+        out = StringIO()
+        call_command(
+            "benchmark_strength_engine", "--students", "10", "--repeat", "1",
+            stdout=out, stderr=StringIO(),
+        )
+        self.assertIn("2 students, 3 participations", out.getvalue())
+        self.assertIn("legacy", out.getvalue())
+
+
+class ActiveAcademicYearCacheTests(TestCase):
+    def setUp(self):
+        invalidate_active_academic_year()
+        self.year = AcademicYear.objects.create(
+            year="2024-2025", start_date=date(2024, 6, 1), is_active=True
+        )
+
+    def tearDown(self):
+        invalidate_active_academic_year()
+
+    def test_cached_after_first_lookup(self):
+        self.assertEqual(get_active_academic_year(), self.year)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_academic_year(), self.year)
+
+    def test_none_is_cached_too(self):
+        self.year.is_active = False
+        self.year.save()
+        self.assertIsNone(get_active_academic_year())
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_active_academic_year())
+
+    def test_save_and_delete_invalidate(self):
+        get_active_academic_year()
+        newer = AcademicYear.objects.create(
+            year="2025-2026", start_date=date(2025, 6, 1), is_active=True
+        )
+        self.assertEqual(get_active_academic_year(), newer)
+        newer.delete()
+        self.assertEqual(get_active_academic_year(), self.year)
+
+    def test_restore_view_switches_cached_year(self):
+        admin = User.objects.create_superuser("admin", "a@example.com", "pw")
+        self.client.force_login(admin)
+        older = AcademicYear.objects.create(year="2023-2024", start_date=date(2023, 6, 1))
+        self.assertEqual(get_active_academic_year(), self.year)
+        self.client.post(reverse("academic_year_restore", args=[older.pk]))
+        self.assertEqual(get_active_academic_year(), older)
+
+
+class StudentDirectoryTests(TestCase):
+    def setUp(self):
+        directory.bump_version()
+        school = School.objects.create(name="School")
+        self.course = Course.objects.create(name="Course", school=school)
+        Course.objects.create(name="Empty", school=school)
+        self.year = AcademicYear.objects.create(year="2024")
+        for roll_no, name in (("3", "Carol"), ("1", "Alice"), ("2", "Bob")):
+            Student.objects.create(
+                roll_no=roll_no, name=name, school=school, course=self.course,
+                academic_year=self.year,
+            )
+        self.params = {"year": "2024", "school": "School", "course": "Course"}
+
+    def get(self, level, params=None, **headers):
+        return self.client.get(reverse(f"transcript:directory_{level}"), params or {}, **headers)
+
+    def test_home_ships_only_years(self):
+        response = self.client.get(reverse("transcript:home"))
+        self.assertContains(response, "2024")
+        self.assertNotContains(response, "Alice")
+
+    def test_levels(self):
+        self.assertEqual(self.get("years").json()["results"], ["2024"])
+        self.assertEqual(self.get("schools", {"year": "2024"}).json()["results"], ["School"])
+        self.assertEqual(
+            self.get("courses", {"year": "2024", "school": "School"}).json()["results"],
+            ["Course"],
+        )
+        self.assertEqual(self.get("schools").status_code, 400)
+
+    def test_students_are_paginated_and_searched(self):
+        data = self.get("students", {**self.params, "page_size": 2}).json()
+        self.assertEqual([s["roll_no"] for s in data["results"]], ["1", "2"])
+        self.assertEqual((data["count"], data["pages"]), (3, 2))
+        data = self.get("students", {**self.params, "page_size": 2, "page": 2}).json()
+        self.assertEqual(data["results"], [{"name": "Carol", "roll_no": "3"}])
+        data = self.get("students", {**self.params, "q": "bo"}).json()
+        self.assertEqual(data["results"], [{"name": "Bob", "roll_no": "2"}])
+        data = self.get("students", {**self.params, "q": "3"}).json()
+        self.assertEqual(data["results"], [{"name": "Carol", "roll_no": "3"}])
+
+    def test_cached_until_a_student_changes(self):
+        response = self.get("students", self.params)
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.get("students", self.params, HTTP_IF_NONE_MATCH=etag).status_code, 304
+            )
+            self.assertEqual(self.get("students", self.params).json()["count"], 3)
+
+        Student.objects.filter(roll_no="2").get().delete()
+        response = self.get("students", self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["count"], 2)
+
+
+class BulkImporterTests(TestCase):
+    def setUp(self):
+        school = School.objects.create(name="School")
+        self.course = Course.objects.create(name="Course", school=school)
+        self.year = AcademicYear.objects.create(year="2024")
+        self.role = Role.objects.create(name="Attendee", factor=1.0)
+        self.ga = GraduateAttribute.objects.create(name="GA1")
+        self.cs = CharacterStrength.objects.create(name="Curiosity")
+        AttributeStrengthMap.objects.create(
+            graduate_attribute=self.ga, character_strength=self.cs, weight=2.0
+        )
+
+    def run_import(self, kind, text, **kwargs):
+        return importer.run_import(kind, io.StringIO(text), **kwargs)
+
+    def test_students_are_diffed_against_existing_rows(self):
+        Student.objects.create(roll_no="1", name="Old", course=self.course)
+        text = (
+            "Roll No,Name,School,Course,Academic Year\n"
+            "1,Alice,School,Course,2024\n"
+            "2,Bob,School,Course,2024\n"
+            "3,Carol,Nowhere,Course,2024\n"
+        )
+        report = self.run_import("students", text)
+        self.assertEqual((report.rows, report.created, report.updated), (3, 1, 1))
+        self.assertEqual(report.errors, [(4, "unknown school 'Nowhere'")])
+        alice = Student.objects.get(roll_no="1")
+        self.assertEqual((alice.name, alice.academic_year), ("Alice", self.year))
+
+        report = self.run_import("students", text)
+        self.assertEqual((report.created, report.updated, report.unchanged), (0, 0, 2))
+
+    def test_missing_or_blank_columns_leave_fields_alone(self):
+        Student.objects.create(
+            roll_no="1",
+            name="Old",
+            school=self.course.school,
+            course=self.course,
+            academic_year=self.year,
+        )
+        report = self.run_import("students", "roll_no,name\n1,Alice\n")
+        self.assertEqual(report.updated, 1)
+        self.run_import("students", "roll_no,name,school,course,academic_year\n1,Alice,,,\n")
+        alice = Student.objects.get(roll_no="1")
+        self.assertEqual(
+            (alice.name, alice.school, alice.course, alice.academic_year),
+            ("Alice", self.course.school, self.course, self.year),
+        )
+
+    def test_dry_run_writes_nothing(self):
+        text = "roll_no,name\n1,Alice\n1,Alice Again\n"
+        report = self.run_import("students", text, dry_run=True, chunk_size=1)
+        self.assertEqual((report.created, report.updated), (1, 1))
+        self.assertIn("[dry run]", report.summary())
+        self.assertFalse(Student.objects.exists())
+
+    def test_participations_refresh_strength_scores(self):
+        Student.objects.create(
+            roll_no="1", name="Alice", course=self.course, academic_year=self.year
+        )
+        self.run_import("events", "name,date\nTalk,2024-07-01\n")
+        self.run_import("event_attributes", "event,date,attribute\nTalk,01-07-2024,GA1\n")
+        self.assertEqual(list(Event.objects.get().attributes.all()), [self.ga])
+
+        text = "roll_no,event,date,role\n1,Talk,2024-07-01,Attendee\n2,Talk,2024-07-01,Attendee\n"
+        report = self.run_import("participations", text)
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors, [(3, "unknown roll number '2'")])
+        score = StudentStrengthScore.objects.get()
+        self.assertEqual((score.strength, score.score), (self.cs, 2.0))
+
+        report = self.run_import("participations", text)
+        self.assertEqual((report.created, report.unchanged), (0, 1))
+
+    def test_load_mappings_command(self):
+        path = os.path.join(tempfile.mkdtemp(), "mapping.csv")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, "w") as fh:
+            fh.write("Column 1,Curiosity,Zest\nGA1,3,0\nGA2,,1\n")
+        out = StringIO()
+        call_command("load_mappings", "--file", path, stdout=out, stderr=StringIO())
+        self.assertIn("2 rows read, 1 created, 1 updated", out.getvalue())
+        self.assertEqual(
+            AttributeStrengthMap.objects.get(graduate_attribute=self.ga).weight, 3.0
+        )
+        self.assertTrue(
+            AttributeStrengthMap.objects.filter(
+                graduate_attribute__name="GA2", character_strength__name="Zest", weight=1.0
+            ).exists()
+        )
+
+
+class StudentEventsTests(TestCase):
+    def setUp(self):
+        school = School.objects.create(name="School")
+        course = Course.objects.create(name="Course", school=school)
+        year = AcademicYear.objects.create(year="2024")
+        self.student = Student.objects.create(
+            roll_no="1", name="Alice", school=school, course=course, academic_year=year
+        )
+        self.ga = GraduateAttribute.objects.create(name="GA1")
+        role = Role.objects.create(name="Attendee", factor=1.0)
+        start = date(2024, 1, 1)
+        for i in range(30):
+            event = Event.objects.create(name=f"Event {i}", date=start + timedelta(days=i))
+            if i % 3 == 0:
+                event.attributes.add(self.ga)
+            Participation.objects.create(student=self.student, event=event, role=role)
+        self.url = reverse("transcript:all_events_api", args=["1"])
+
+    def test_api_pages_newest_first_in_one_query(self):
+        with self.assertNumQueries(2):  # student + one page of events
+            data = self.client.get(self.url).json()
+        self.assertEqual(len(data["results"]), 25)
+        self.assertEqual(data["results"][0]["name"], "Event 29")
+        self.assertTrue(data["has_next"])
+
+        data = self.client.get(self.url, {"page": 2}).json()
+        self.assertEqual([e["name"] for e in data["results"]][-1], "Event 0")
+        self.assertFalse(data["has_next"])
+
+    def test_api_filters_by_date_and_attribute(self):
+        data = self.client.get(
+            self.url, {"from": "2024-01-10", "to": "2024-01-20", "attribute": self.ga.pk}
+        ).json()
+        self.assertEqual(
+            [e["date"] for e in data["results"]],
+            ["2024-01-19", "2024-01-16", "2024-01-13", "2024-01-10"],
+        )
+        self.assertEqual(self.client.get(self.url, {"from": "soon"}).status_code, 400)
+
+    def test_page_renders_first_page_and_load_more_link(self):
+        response = self.client.get(reverse("transcript:all_events", args=["1"]))
+        self.assertContains(response, "Event 29")
+        self.assertNotContains(response, "Event 4<")
+        self.assertContains(response, "page=2")
+
+
+def _fake_pdf(html):
+    if "Broken" in html:
+        raise PDFGenerationError("boom")
+    return b"%PDF-" + html.encode("utf-8")[:20]
+
+
+def _blank_pdf(html):
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+@override_settings(TRANSCRIPT_BULK={"WORKERS": 0})
+class BulkTranscriptTests(TestCase):
+    def setUp(self):
+        school = School.objects.create(name="School")
+        course = Course.objects.create(name="Course", school=school)
+        year = AcademicYear.objects.create(year="2024")
+        for roll_no, name in (("1", "Alice"), ("2", "Broken"), ("3", "Carol")):
+            Student.objects.create(
+                roll_no=roll_no, name=name, school=school, course=course, academic_year=year
+            )
+        self.url = reverse("transcript:bulk_download")
+        self.params = {"year": "2024", "school": "School", "course": "Course"}
+
+    def test_zip_is_streamed_and_lists_failures(self):
+        with mock.patch.object(bulk, "render_pdf", side_effect=_fake_pdf):
+            response = self.client.get(self.url, {**self.params, "type": "zip"})
+            self.assertTrue(response.streaming)
+            body = b"".join(response.streaming_content)
+        archive = zipfile.ZipFile(io.BytesIO(body))
+        self.assertEqual(
+            sorted(archive.namelist()), ["1_Alice.pdf", "3_Carol.pdf", "errors.txt"]
+        )
+        self.assertTrue(archive.read("1_Alice.pdf").startswith(b"%PDF-"))
+        self.assertIn(b"2_Broken.pdf: boom", archive.read("errors.txt"))
+
+    def test_backend_failure_returns_error_page(self):
+        with mock.patch.object(bulk, "render_pdf", side_effect=PDFGenerationError("no backend")):
+            response = self.client.get(self.url, {**self.params, "type": "zip"})
+        self.assertEqual(response.status_code, 500)
+
+    def test_other_render_failures_return_error_page(self):
+        for download_type in ("pdf", "zip"):
+            with mock.patch.object(bulk, "render_pdf", side_effect=RuntimeError("worker died")):
+                with self.assertLogs("transcript.views", "ERROR") as logs:
+                    response = self.client.get(self.url, {**self.params, "type": download_type})
+            self.assertEqual(response.status_code, 500)
+            self.assertIn(b"Unable to generate transcript files", response.content)
+            self.assertIn("course=", logs.output[0])
+
+    @unittest.skipUnless(importlib.util.find_spec("pypdf"), "pypdf not installed")
+    def test_unreadable_pdf_fails_the_merge_cleanly(self):
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as broken:
+            broken.write(b"not a pdf")
+            broken.flush()
+            with self.assertRaises(PDFGenerationError):
+                bulk.merge_pdf_files([broken.name], io.BytesIO())
+
+    def test_unknown_course_is_404(self):
+        response = self.client.get(self.url, {**self.params, "course": "Nope"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_stream_zip_holds_one_entry_at_a_time(self):
+        chunks = list(bulk.stream_zip((f"{i}.pdf", b"x" * 1000) for i in range(5)))
+        self.assertGreaterEqual(len(chunks), 5)
+        self.assertLess(max(len(c) for c in chunks[:5]), 1200)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        self.assertEqual(len(archive.namelist()), 5)
+        self.assertIsNone(archive.testzip())
+
+    def test_render_all_bounds_items_in_flight(self):
+        consumed = []
+
+        def items():
+            for i in range(6):
+                consumed.append(i)
+                yield i, "<p>x</p>"
+
+        with mock.patch.object(bulk, "render_pdf", return_value=b"%PDF-"):
+            results = bulk.render_all(items(), workers=0)
+            self.assertEqual(next(results), (0, b"%PDF-", None))
+            self.assertEqual(consumed, [0])
+            self.assertEqual(len(list(results)), 5)
+
+    def test_render_all_in_process_pool(self):
+        results = list(
+            bulk.render_all(((i, "<p>x</p>") for i in range(3)), workers=2, max_in_flight=2)
+        )
+        self.assertEqual(sorted(key for key, _, _ in results), [0, 1, 2])
+        for _, pdf, error in results:
+            # Without a PDF backend installed the workers report the error.
+            self.assertTrue(pdf is not None or isinstance(error, PDFGenerationError))
+
+        pool = bulk._pool
+        list(bulk.render_all([(0, "<p>x</p>")], workers=2))
+        self.assertIs(bulk._pool, pool)
+
+    @unittest.skipUnless(importlib.util.find_spec("pypdf"), "pypdf not installed")
+    def test_merge_pdf_files_keeps_pages_and_order(self):
+        from pypdf import PdfReader, PdfWriter
+
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir)
+        paths = []
+        for index, size in enumerate((100, 200, 300)):
+            writer = PdfWriter()
+            writer.add_blank_page(width=size, height=size)
+            writer.add_blank_page(width=size + 1, height=size + 1)
+            paths.append(os.path.join(workdir, f"{index}.pdf"))
+            writer.write(paths[-1])
+
+        output = io.BytesIO()
+        bulk.merge_pdf_files(paths, output)
+        reader = PdfReader(io.BytesIO(output.getvalue()), strict=True)
+        self.assertEqual(
+            [int(page.mediabox.width) for page in reader.pages],
+            [100, 101, 200, 201, 300, 301],
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("pypdf"), "pypdf not installed")
+    def test_combined_pdf_merges_in_name_order(self):
+        from pypdf import PdfReader
+
+        Student.objects.filter(name="Broken").update(name="Bob")
+        with mock.patch.object(bulk, "render_pdf", side_effect=_blank_pdf):
+            response = self.client.get(self.url, {**self.params, "type": "pdf"})
+            body = b"".join(response.streaming_content)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(len(PdfReader(io.BytesIO(body)).pages), 3)
+
+
+class TranscriptBatchJobTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media,
+            TRANSCRIPT_BULK={"WORKERS": 0},
+            TRANSCRIPT_JOBS={"AUTOSTART": False},
+        )
+        self.settings_override.enable()
+        school = School.objects.create(name="School")
+        course = Course.objects.create(name="Course", school=school)
+        year = AcademicYear.objects.create(year="2024")
+        for roll_no, name in (("1", "Alice"), ("2", "Broken"), ("3", "Carol")):
+            Student.objects.create(
+                roll_no=roll_no, name=name, school=school, course=course, academic_year=year
+            )
+        self.params = {"year": "2024", "school": "School", "course": "Course", "type": "zip"}
+        self.user = User.objects.create_user("coordinator", password="pw")
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media, ignore_errors=True)
+
+    def start(self, **params):
+        return self.client.post(reverse("transcript:batch_job_start"), {**self.params, **params})
+
+    def test_jobs_are_deduplicated_per_course(self):
+        first = self.start()
+        self.assertEqual(first.status_code, 201)
+        second = self.start()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.json()["id"], second.json()["id"])
+        self.assertEqual(first.json()["total"], 3)
+        self.assertEqual(self.start(type="pdf").status_code, 201)
+        self.assertEqual(self.start(course="Nope").status_code, 404)
+
+    def test_failures_are_recorded_and_artifact_downloadable(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", side_effect=_fake_pdf):
+            self.assertEqual(jobs.run_pending(), 1)
+
+        status = self.client.get(reverse("transcript:batch_job_status", args=[job_id])).json()
+        self.assertEqual(status["status"], "done")
+        self.assertEqual((status["completed"], status["failed"]), (2, 1))
+        failed = [s for s in status["students"] if s["status"] == "failed"]
+        self.assertEqual([s["roll_no"] for s in failed], ["2"])
+
+        response = self.client.get(status["download_url"])
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(
+            sorted(archive.namelist()), ["1_Alice.pdf", "3_Carol.pdf", "errors.txt"]
+        )
+        self.assertFalse(jobs.parts_dir(TranscriptBatchJob.objects.get(pk=job_id)).exists())
+
+    def test_interrupted_job_resumes_pending_students(self):
+        job = TranscriptBatchJob.objects.get(pk=self.start().json()["id"])
+        alice = job.items.get(student__name="Alice")
+        jobs.parts_dir(job).mkdir(parents=True)
+        (jobs.parts_dir(job) / f"{alice.student_id}.pdf").write_bytes(b"%PDF-alice")
+        job.items.filter(pk=alice.pk).update(status=TranscriptBatchItem.DONE)
+        TranscriptBatchJob.objects.filter(pk=job.pk).update(
+            status=TranscriptBatchJob.RUNNING,
+            completed=1,
+            heartbeat_at=timezone.now() - timedelta(seconds=30),
+        )
+
+        # Another worker still owns it while the heartbeat is fresh.
+        self.assertIsNone(jobs.claim_next())
+
+        TranscriptBatchJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        with mock.patch.object(bulk, "render_pdf", side_effect=_fake_pdf) as render:
+            jobs.run_pending()
+        self.assertEqual(render.call_count, 2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.completed, job.failed), ("done", 2, 1))
+        with job.artifact.open("rb") as fh:
+            archive = zipfile.ZipFile(fh)
+            self.assertEqual(archive.read("1_Alice.pdf"), b"%PDF-alice")
+
+    def test_jobs_are_only_visible_to_their_requesters(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", return_value=b"%PDF-"):
+            jobs.run_pending()
+        status_url = reverse("transcript:batch_job_status", args=[job_id])
+        download_url = reverse("transcript:batch_job_download", args=[job_id])
+
+        self.client.logout()
+        self.assertEqual(self.start().status_code, 302)
+        self.assertEqual(self.client.get(status_url).status_code, 302)
+        self.assertEqual(self.client.get(download_url).status_code, 302)
+
+        self.client.force_login(User.objects.create_user("other"))
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+        self.assertEqual(self.client.get(download_url).status_code, 404)
+        # Asking for the same course hands over the finished job instead.
+        response = self.start()
+        self.assertEqual((response.status_code, response.json()["id"]), (200, job_id))
+        self.assertEqual(self.client.get(download_url).status_code, 200)
+
+        self.client.force_login(User.objects.create_user("staff", is_staff=True))
+        self.assertEqual(self.client.get(status_url).status_code, 200)
+
+    def test_finished_job_is_rerun_after_a_participation_changes(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", return_value=b"%PDF-"):
+            jobs.run_pending()
+        self.assertEqual(self.start().json()["id"], job_id)
+
+        Participation.objects.create(
+            student=Student.objects.get(name="Alice"),
+            event=Event.objects.create(name="Event", date=date.today()),
+            role=Role.objects.create(name="Attendee", factor=0.5),
+        )
+        response = self.start()
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(response.json()["id"], job_id)
+
+    def test_job_with_failures_is_not_reused(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", side_effect=_fake_pdf):
+            jobs.run_pending()
+        self.assertEqual(TranscriptBatchJob.objects.get(pk=job_id).failed, 1)
+
+        response = self.start()
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(response.json()["id"], job_id)
+
+    def test_force_renders_again(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", return_value=b"%PDF-"):
+            jobs.run_pending()
+        self.assertEqual(self.start().json()["id"], job_id)
+        self.assertEqual(self.start(force="1").status_code, 201)
+
+    def test_expired_jobs_are_purged_with_their_files(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", side_effect=_fake_pdf):
+            jobs.run_pending()
+        job = TranscriptBatchJob.objects.get(pk=job_id)
+        artifact = job.artifact.path
+        jobs.parts_dir(job).mkdir(parents=True)
+        self.assertTrue(os.path.exists(artifact))
+
+        call_command("purge_transcript_jobs", stdout=StringIO())
+        self.assertTrue(TranscriptBatchJob.objects.filter(pk=job_id).exists())
+
+        TranscriptBatchJob.objects.filter(pk=job_id).update(
+            finished_at=timezone.now() - timedelta(days=2)
+        )
+        self.assertEqual(self.start().status_code, 201)
+        out = StringIO()
+        call_command("purge_transcript_jobs", stdout=out)
+        self.assertIn("Deleted 1 expired", out.getvalue())
+        self.assertFalse(TranscriptBatchJob.objects.filter(pk=job_id).exists())
+        self.assertFalse(os.path.exists(artifact))
+        self.assertFalse(jobs.parts_dir(job).exists())
+
+    def test_heartbeat_is_refreshed_while_a_render_is_slow(self):
+        job_id = self.start().json()["id"]
+
+        def slow_pdf(html):
+            time.sleep(0.1)
+            return b"%PDF-"
+
+        with override_settings(
+            TRANSCRIPT_JOBS={"AUTOSTART": False, "HEARTBEAT_INTERVAL": 0.01}
+        ), mock.patch.object(jobs._Heartbeat, "beat") as beat, mock.patch.object(
+            bulk, "render_pdf", side_effect=slow_pdf
+        ):
+            jobs.run_pending()
+        self.assertGreater(beat.call_count, 3)
+
+        TranscriptBatchJob.objects.filter(pk=job_id).update(
+            status=TranscriptBatchJob.RUNNING, heartbeat_at=None
+        )
+        jobs._Heartbeat(job_id, 30).beat()
+        self.assertIsNotNone(TranscriptBatchJob.objects.get(pk=job_id).heartbeat_at)
+
+    def test_job_fails_when_nothing_renders(self):
+        job_id = self.start().json()["id"]
+        with mock.patch.object(bulk, "render_pdf", side_effect=PDFGenerationError("no backend")):
+            jobs.run_pending()
+        job = TranscriptBatchJob.objects.get(pk=job_id)
+        self.assertEqual((job.status, job.failed), ("failed", 3))
+        self.assertEqual(
+            self.client.get(reverse("transcript:batch_job_download", args=[job_id])).status_code,
+            404,
+        )
+
+
+class RenderCacheTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media,
+            TRANSCRIPT_BULK={"WORKERS": 0},
+        )
+        self.settings_override.enable()
+        ga = GraduateAttribute.objects.create(name="GA1")
+        cs = CharacterStrength.objects.create(name="CS1")
+        AttributeStrengthMap.objects.create(graduate_attribute=ga, character_strength=cs, weight=1)
+        school = School.objects.create(name="School")
+        course = Course.objects.create(name="Course", school=school)
+        year = AcademicYear.objects.create(year="2024")
+        self.students = [
+            Student.objects.create(
+                roll_no=str(i), name=f"S{i}", school=school, course=course, academic_year=year
+            )
+            for i in range(3)
+        ]
+        self.role = Role.objects.create(name="Attendee", factor=1.0)
+        self.event = Event.objects.create(name="Event", date=date.today())
+        self.event.attributes.add(ga)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media, ignore_errors=True)
+
+    def test_single_pdf_is_reused_until_participations_change(self):
+        url = reverse("transcript:transcript_pdf", args=["0"])
+        with mock.patch("transcript.views.render_pdf_from_html", side_effect=_fake_pdf) as render:
+            first = self.client.get(url)
+            second = self.client.get(url)
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(first.content, second.content)
+
+            Participation.objects.create(student=self.students[0], event=self.event, role=self.role)
+            self.client.get(url)
+            self.assertEqual(render.call_count, 2)
+
+    def test_bulk_rerun_is_served_from_cache(self):
+        params = {"year": "2024", "school": "School", "course": "Course", "type": "zip"}
+        url = reverse("transcript:bulk_download")
+        with mock.patch.object(bulk, "render_pdf", side_effect=_fake_pdf) as render:
+            first = b"".join(self.client.get(url, params).streaming_content)
+            second = b"".join(self.client.get(url, params).streaming_content)
+        self.assertEqual(render.call_count, 3)
+        self.assertEqual(
+            sorted(zipfile.ZipFile(io.BytesIO(first)).namelist()),
+            sorted(zipfile.ZipFile(io.BytesIO(second)).namelist()),
+        )
+
+    def test_qr_codes_are_cached(self):
+        make = mock.Mock(return_value=b"png")
+        self.assertEqual(render_cache.qr_png("http://x/1/events/", make), b"png")
+        self.assertEqual(render_cache.qr_png("http://x/1/events/", make), b"png")
+        make.assert_called_once()
+
+    def test_lru_evicts_least_recently_used(self):
+        lru = render_cache.DiskLRU(os.path.join(self.media, "lru"), max_bytes=100, suffix=".bin")
+        for i, key in enumerate(["aa1", "bb2", "cc3"]):
+            lru.put(key, b"x" * 30)
+            os.utime(lru.path(key), (1000 + i, 1000 + i))
+        os.utime(lru.path("aa1"), (2000, 2000))  # most recently read
+        lru.put("dd4", b"x" * 30)
+        self.assertIsNotNone(lru.read("aa1"))
+        self.assertIsNone(lru.read("bb2"))
+        self.assertIsNotNone(lru.read("dd4"))
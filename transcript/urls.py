@@ -9,6 +9,15 @@ urlpatterns = [
     path(
         "validate-roll/", views.validate_roll_no, name="validate_roll"
     ),  # AJAX validation
+    path("jobs/", views.start_batch_job, name="batch_job_start"),  # Background bulk job
+    path("jobs/<int:pk>/", views.batch_job_status, name="batch_job_status"),
+    path(
+        "jobs/<int:pk>/download/", views.batch_job_download, name="batch_job_download"
+    ),
+    path("directory/years/", views.directory_years, name="directory_years"),
+    path("directory/schools/", views.directory_schools, name="directory_schools"),
+    path("directory/courses/", views.directory_courses, name="directory_courses"),
+    path("directory/students/", views.directory_students, name="directory_students"),
     path("<str:roll_no>/", views.transcript_view, name="transcript"),  # View transcript
     path(
         "<str:roll_no>/pdf/", views.transcript_pdf, name="transcript_pdf"
@@ -16,6 +25,9 @@ urlpatterns = [
     path(
         "<str:roll_no>/events/", views.all_events_view, name="all_events"
     ),  # Events per student
+    path(
+        "<str:roll_no>/events/api/", views.all_events_api, name="all_events_api"
+    ),  # Paginated JSON of the same
     path(
         "download/", views.bulk_download_handler, name="bulk_download"
     ),  # Bulk via POST
@@ -1,60 +1,63 @@
 import base64
-import importlib.util
 import io
-import json
+import itertools
 import logging
-import zipfile
-from collections import defaultdict
+import os
+import tempfile
 from datetime import date
 from urllib.parse import unquote
 
-import qrcode
-from django.http import Http404, HttpResponse, JsonResponse
+from django.contrib.auth.decorators import login_required
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, render
-from django.template.loader import get_template, render_to_string
 from django.urls import reverse
-if importlib.util.find_spec("xhtml2pdf") is not None:
-    from xhtml2pdf import pisa  # type: ignore
-else:  # pragma: no cover - optional dependency
-    pisa = None
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET, require_POST
 
-logger = logging.getLogger(__name__)
-
-try:  # pragma: no cover - optional dependency
-    from weasyprint import HTML
-except (ImportError, OSError) as exc:  # pragma: no cover - optional dependency
-    HTML = None
-    logger.warning(
-        "WeasyPrint import failed, falling back to xhtml2pdf for PDF generation. %s",
-        exc,
-    )
+from core import pdf_renderer
+from core.pdf_renderer import PDFGenerationError  # noqa: F401 - re-exported
 
+logger = logging.getLogger(__name__)
 
-class PDFGenerationError(Exception):
-    """Raised when PDF generation fails."""
+# Stylesheets applied to transcript_app/pdf.html (static paths).
+PDF_STYLESHEETS = ("transcript/css/pdf.css",)
 
 
 def render_pdf_from_html(html: str) -> bytes:
-    """Render an HTML string into PDF bytes using the available backend."""
+    """Render transcript HTML into PDF bytes with the shared renderer."""
+    return pdf_renderer.render(html, PDF_STYLESHEETS)
 
-    if HTML is not None:
-        return HTML(string=html).write_pdf()
 
-    if pisa is None:
-        raise PDFGenerationError(
-            "xhtml2pdf is not installed; install it or enable WeasyPrint for PDF output."
-        )
+# qrcode is imported on first use; only transcript pages need it.
+def _qr_png(data: str) -> bytes:
+    import qrcode
+
+    buf = io.BytesIO()
+    qrcode.make(data).save(buf, format="PNG")
+    return buf.getvalue()
 
-    pdf_buffer = io.BytesIO()
-    pisa_status = pisa.CreatePDF(html, dest=pdf_buffer)
-    if pisa_status.err:
-        raise PDFGenerationError("Failed to generate PDF using xhtml2pdf.")
 
-    pdf_buffer.seek(0)
-    return pdf_buffer.getvalue()
+def qr_png_base64(data: str) -> str:
+    """Return ``data`` encoded as a QR code PNG, base64 encoded."""
+    return base64.b64encode(render_cache.qr_png(data, _qr_png)).decode("utf-8")
 
-from .models import (AcademicYear, AttributeStrengthMap, CharacterStrength,
-                     Participation, Student)
+from . import bulk, directory, jobs, render_cache, strengths
+from .models import (
+    AcademicYear,
+    Course,
+    GraduateAttribute,
+    Participation,
+    Student,
+    TranscriptBatchItem,
+    TranscriptBatchJob,
+)
 
 
 # ─────────────────────────────────────────────
@@ -63,42 +66,80 @@ from .models import (AcademicYear, AttributeStrengthMap, CharacterStrength,
 def home(request):
     years = AcademicYear.objects.all().order_by("year")
 
-    # DEBUG: Print what we're sending to template
-    print("=== DEBUG: Years being sent to template ===")
-    for year in years:
-        print(f"Year: {year.year}")
-    print("=== END DEBUG ===")
+    if TranscriptBatchJob.objects.filter(
+        status__in=TranscriptBatchJob.ACTIVE_STATUSES
+    ).exists():
+        jobs.kick()  # resume jobs interrupted by a restart
 
-    students = (
-        Student.objects.select_related("academic_year", "course__school")
-        .all()
-        .order_by("name")
-    )
+    return render(request, "transcript_app/home.html", {"years": years})
 
-    student_data = {}
-    for student in students:
-        # Add safety checks to prevent errors
-        if student.academic_year and student.course and student.course.school:
-            year = str(student.academic_year.year)
-            school = student.course.school.name
-            course = student.course.name
-
-            student_data.setdefault(year, {}).setdefault(school, {}).setdefault(
-                course, []
-            ).append({"name": student.name, "roll_no": student.roll_no})
-
-    # DEBUG: Print student data structure
-    print("=== DEBUG: Student data keys ===")
-    print(f"Years in student_data: {list(student_data.keys())}")
-    for year_key, schools in student_data.items():
-        print(f"  {year_key}: {list(schools.keys())}")
-    print("=== END DEBUG ===")
 
-    return render(
-        request,
-        "transcript_app/home.html",
-        {"years": years, "student_data": json.dumps(student_data)},
+# ─────────────────────────────────────────────
+# STUDENT DIRECTORY (JSON, one level at a time)
+# ─────────────────────────────────────────────
+def _positive_int(value, default):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+def _directory_response(request, level, params):
+    """Serve a directory level with an ETag, answering 304 when it is unchanged."""
+    version = directory.current_version()
+    tag = directory.etag(version, level, params)
+    if tag is not None:
+        not_modified = get_conditional_response(request, etag=tag)
+        if not_modified is not None:
+            patch_cache_control(not_modified, private=True, no_cache=True)
+            return not_modified
+    response = JsonResponse(directory.lookup(version, level, params))
+    if tag is not None:
+        response["ETag"] = tag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _directory_params(request, *names):
+    params = {name: request.GET.get(name, "").strip() for name in names}
+    missing = [name for name, value in params.items() if not value]
+    if missing:
+        return params, JsonResponse(
+            {"success": False, "error": f"{', '.join(missing)} required"}, status=400
+        )
+    return params, None
+
+
+@require_GET
+def directory_years(request):
+    return _directory_response(request, "years", {})
+
+
+@require_GET
+def directory_schools(request):
+    params, error = _directory_params(request, "year")
+    return error or _directory_response(request, "schools", params)
+
+
+@require_GET
+def directory_courses(request):
+    params, error = _directory_params(request, "year", "school")
+    return error or _directory_response(request, "courses", params)
+
+
+@require_GET
+def directory_students(request):
+    params, error = _directory_params(request, "year", "school", "course")
+    if error:
+        return error
+    params["q"] = request.GET.get("q", "").strip()
+    params["page"] = _positive_int(request.GET.get("page"), 1)
+    params["page_size"] = min(
+        _positive_int(request.GET.get("page_size"), directory.PAGE_SIZE),
+        directory.MAX_PAGE_SIZE,
     )
+    return _directory_response(request, "students", params)
 
 
 # ─────────────────────────────────────────────
@@ -113,72 +154,21 @@ def validate_roll_no(request):
 # ─────────────────────────────────────────────
 # STRENGTH CALCULATION
 # ─────────────────────────────────────────────
-def calculate_strength_data(student):
-    participations = (
+def _participations_for(student):
+    return (
         Participation.objects.select_related("role", "event")
         .prefetch_related("event__attributes")
         .filter(student=student)
     )
 
-    strength_scores = defaultdict(float)
-    student_strength_totals = defaultdict(lambda: defaultdict(float))
 
-    attribute_strength_map = AttributeStrengthMap.objects.select_related(
-        "graduate_attribute", "character_strength"
-    )
-    attr_map = defaultdict(list)
-    for asm in attribute_strength_map:
-        attr_map[asm.graduate_attribute_id].append(
-            (asm.character_strength.name, asm.weight)
-        )
-
-    all_participations = Participation.objects.select_related(
-        "student", "role", "event"
-    ).prefetch_related("event__attributes")
-
-    for part in participations:
-        role_factor = part.role.factor if part.role else 1.0
-        for attr in part.event.attributes.all():
-            for strength_name, weight in attr_map[attr.id]:
-                strength_scores[strength_name] += weight * role_factor
-
-    for part in all_participations:
-        role_factor = part.role.factor if part.role else 1.0
-        for attr in part.event.attributes.all():
-            for strength_name, weight in attr_map[attr.id]:
-                student_strength_totals[part.student.roll_no][strength_name] += (
-                    weight * role_factor
-                )
-
-    all_strengths = CharacterStrength.objects.order_by("name")
-    strength_data = []
-    for strength_obj in all_strengths:
-        name = strength_obj.name
-        score = strength_scores.get(name, 0)
-        benchmark = max(
-            [
-                student_strength_totals[roll].get(name, 0)
-                for roll in student_strength_totals
-            ],
-            default=1,
-        )
-        percentage = (score / benchmark) * 100 if benchmark > 0 else 0
-
-        if percentage >= 90:
-            category = "ESTD"
-        elif percentage >= 80:
-            category = "DEV"
-        elif percentage >= 60:
-            category = "EMER"
-        else:
-            category = None
-
-        strength_data.append(
-            {"name": name, "average": round(score, 2), "category": category}
-        )
+def calculate_strength_data(student):
+    """Return the student's strength rows and their participations.
 
-    strength_data.sort(key=lambda x: x["name"])
-    return strength_data, participations
+    Scores and benchmarks come from the materialized tables maintained by
+    :mod:`transcript.strengths`.
+    """
+    return strengths.strength_data(student), _participations_for(student)
 
 
 # ─────────────────────────────────────────────
@@ -227,10 +217,7 @@ def transcript_view(request, roll_no):
         all_events_url = request.build_absolute_uri(
             reverse("transcript:all_events", kwargs={"roll_no": student.roll_no})
         )
-        qr = qrcode.make(all_events_url)
-        buf = io.BytesIO()
-        qr.save(buf, format="PNG")
-        qr_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
+        qr_b64 = qr_png_base64(all_events_url)
 
     return render(
         request,
@@ -250,10 +237,12 @@ def transcript_view(request, roll_no):
 # ─────────────────────────────────────────────
 # PDF DOWNLOAD VIEW (Single Transcript)
 # ─────────────────────────────────────────────
-def transcript_pdf(request, roll_no):
-    student = get_object_or_404(Student, roll_no=roll_no)
-    strength_data, participations = calculate_strength_data(student)
+def _pdf_context(build_absolute_uri, student, strength_data, participations):
+    """Template context for ``transcript_app/pdf.html``.
 
+    ``build_absolute_uri`` turns a path into the URL encoded in the QR code
+    (``request.build_absolute_uri`` for requests).
+    """
     sorted_events = sorted(
         participations, key=lambda p: len(p.event.attributes.all()), reverse=True
     )
@@ -262,29 +251,33 @@ def transcript_pdf(request, roll_no):
         for p in sorted_events[:5]
     ]
 
-    qr_b64 = None
+    all_events_url = qr_b64 = None
     if participations.count() > 5:
-        all_events_url = request.build_absolute_uri(
+        all_events_url = build_absolute_uri(
             reverse("transcript:all_events", kwargs={"roll_no": student.roll_no})
         )
-        qr = qrcode.make(all_events_url)
-        buf = io.BytesIO()
-        qr.save(buf, format="PNG")
-        qr_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
+        qr_b64 = qr_png_base64(all_events_url)
 
-    template = get_template("transcript_app/pdf.html")
-    html = template.render(
-        {
-            "student": student,
-            "strength_data": strength_data,
-            "today": date.today(),
-            "top_events": top_events,
-            "qr_code": qr_b64,
-        }
+    return {
+        "student": student,
+        "strength_data": strength_data,
+        "today": date.today(),
+        "top_events": top_events,
+        "all_events_url": all_events_url,
+        "qr_code": qr_b64,
+    }
+
+
+def transcript_pdf(request, roll_no):
+    student = get_object_or_404(Student, roll_no=roll_no)
+    strength_data, participations = calculate_strength_data(student)
+
+    context = _pdf_context(
+        request.build_absolute_uri, student, strength_data, participations
     )
 
     try:
-        pdf_file = render_pdf_from_html(html)
+        pdf_file = render_cache.transcript_pdf(context, render_pdf_from_html)
     except PDFGenerationError:
         logger.exception(
             "Failed to generate transcript PDF for student %s", student.roll_no
@@ -304,25 +297,73 @@ def transcript_pdf(request, roll_no):
 # ─────────────────────────────────────────────
 # ALL EVENTS VIEW
 # ─────────────────────────────────────────────
-def all_events_view(request, roll_no):
-    student = get_object_or_404(Student, roll_no=roll_no)
-    participations = Participation.objects.filter(student=student)
-
-    # Create a clean list of events with role and date.
-    all_event_data = []
-    for p in participations:
-        all_event_data.append(
+EVENTS_PAGE_SIZE = 25
+
+
+def _event_filters(params):
+    """Parse ``from``/``to`` (ISO dates) and ``attribute`` ids; raise ValueError."""
+    filters = {}
+    for name in ("from", "to"):
+        value = params.get(name, "").strip()
+        if value:
+            parsed = parse_date(value)
+            if parsed is None:
+                raise ValueError(f"Invalid {name} date: {value}")
+            filters[name] = parsed
+    attributes = [value for value in params.getlist("attribute") if value]
+    if attributes:
+        if not all(value.isdigit() for value in attributes):
+            raise ValueError("Invalid attribute")
+        filters["attribute"] = sorted({int(value) for value in attributes})
+    return filters
+
+
+def _events_page(student, filters, page):
+    """Return one page of the student's events, newest first, in one query.
+
+    One row past the page is fetched to tell whether another page follows.
+    """
+    rows = Participation.objects.filter(student=student)
+    if "from" in filters:
+        rows = rows.filter(event__date__gte=filters["from"])
+    if "to" in filters:
+        rows = rows.filter(event__date__lte=filters["to"])
+    if "attribute" in filters:
+        rows = rows.filter(event__attributes__in=filters["attribute"]).distinct()
+    offset = (page - 1) * EVENTS_PAGE_SIZE
+    window = list(
+        rows.order_by("-event__date", "-pk").values(
+            "pk", "event__name", "event__date", "role__name"
+        )[offset:offset + EVENTS_PAGE_SIZE + 1]
+    )
+    return {
+        "results": [
             {
-                "name": p.event.name,
-                "date": p.event.date.strftime(
-                    "%d %b %Y"
-                ),  # Optional: format date like "15 Jul 2025"
-                "role": p.role.name if p.role else "Participant",
+                "name": row["event__name"],
+                "date": row["event__date"].isoformat(),
+                "date_display": row["event__date"].strftime("%d %b %Y"),
+                "role": row["role__name"] or "Participant",
             }
-        )
+            for row in window[:EVENTS_PAGE_SIZE]
+        ],
+        "page": page,
+        "page_size": EVENTS_PAGE_SIZE,
+        "has_next": len(window) > EVENTS_PAGE_SIZE,
+    }
+
+
+def all_events_view(request, roll_no):
+    student = get_object_or_404(
+        Student.objects.select_related("course__school"), roll_no=roll_no
+    )
+    try:
+        filters = _event_filters(request.GET)
+    except ValueError:
+        filters = {}
+    page = _positive_int(request.GET.get("page"), 1)
 
-    # Strength calculations (same as transcript).
-    strength_data, _ = calculate_strength_data(student)
+    # Sidebar from the materialized scores (see transcript/strengths.py).
+    strength_data = strengths.strength_data(student)
 
     # Top five strengths for sidebar.
     top_5_strengths = [
@@ -338,21 +379,72 @@ def all_events_view(request, roll_no):
     for s in top_5_strengths:
         s["score"] = round((s["score"] / max_score) * 100, 2) if max_score > 0 else 0
 
+    query = request.GET.copy()
+    query.pop("page", None)
     return render(
         request,
         "transcript_app/student_events.html",
         {
             "student": student,
-            "all_events": all_event_data,  # Updated
+            "events_page": _events_page(student, filters, page),
+            "filters": filters,
+            "filter_query": query.urlencode(),
+            "attributes": GraduateAttribute.objects.order_by("name"),
             "strength_data": strength_data,
             "top_5_strengths": top_5_strengths,
         },
     )
 
 
+@require_GET
+def all_events_api(request, roll_no):
+    student = get_object_or_404(Student, roll_no=roll_no)
+    try:
+        filters = _event_filters(request.GET)
+    except ValueError as exc:
+        return JsonResponse({"success": False, "error": str(exc)}, status=400)
+    page = _positive_int(request.GET.get("page"), 1)
+    return JsonResponse(_events_page(student, filters, page))
+
+
 # ─────────────────────────────────────────────
 # BULK DOWNLOAD HANDLER (PDF or ZIP via ?type=pdf|zip)
 # ─────────────────────────────────────────────
+BULK_CHUNK_SIZE = 200
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_transcripts(build_absolute_uri, students):
+    """Yield ``(position, student, pdf.html context)`` for every student, lazily.
+
+    Students and their strength rows are loaded a chunk at a time so the
+    bulk renderers never hold the whole cohort in memory.
+    """
+    position = 0
+    rows = students.iterator(chunk_size=BULK_CHUNK_SIZE)
+    for chunk in _chunked(rows, BULK_CHUNK_SIZE):
+        strength_map = strengths.strength_data_for_students([s.pk for s in chunk])
+        for student in chunk:
+            context = _pdf_context(
+                build_absolute_uri,
+                student,
+                strength_map[student.pk],
+                _participations_for(student),
+            )
+            yield position, student, context
+            position += 1
+
+
 def bulk_download_handler(request):
     year = request.GET.get("year")
     school = unquote(request.GET.get("school", ""))
@@ -368,110 +460,47 @@ def bulk_download_handler(request):
 
     try:
         if download_type == "zip":
-            buffer = io.BytesIO()
-            with zipfile.ZipFile(buffer, "w") as zip_file:
-                for student in students:
-                    strength_data, participations = calculate_strength_data(student)
-                    sorted_events = sorted(
-                        participations,
-                        key=lambda p: len(p.event.attributes.all()),
-                        reverse=True,
-                    )
-                    top_events = [
-                        (p.event.name, p.role.name if p.role else "Participant")
-                        for p in sorted_events[:5]
-                    ]
-
-                    qr_b64 = None
-                    if participations.count() > 5:
-                        all_events_url = request.build_absolute_uri(
-                            reverse(
-                                "transcript:all_events",
-                                kwargs={"roll_no": student.roll_no},
-                            )
-                        )
-                        qr = qrcode.make(all_events_url)
-                        buf = io.BytesIO()
-                        qr.save(buf, format="PNG")
-                        qr_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-
-                    html = render_to_string(
-                        "transcript_app/pdf.html",
-                        {
-                            "student": student,
-                            "strength_data": strength_data,
-                            "today": date.today(),
-                            "top_events": top_events,
-                            "qr_code": qr_b64,
-                        },
-                    )
-
-                    try:
-                        pdf_bytes = render_pdf_from_html(html)
-                    except PDFGenerationError:
-                        logger.exception(
-                            "Failed to generate transcript PDF for student %s",
-                            student.roll_no,
-                        )
-                        raise
-
-                    zip_file.writestr(
-                        f"{student.roll_no}_{student.name}.pdf", pdf_bytes
-                    )
-
-            buffer.seek(0)
-            response = HttpResponse(buffer.read(), content_type="application/zip")
+            pages = _bulk_transcripts(request.build_absolute_uri, students)
+            results = render_cache.render_transcripts(
+                (f"{student.roll_no}_{student.name}.pdf", context)
+                for _, student, context in pages
+            )
+            # Surface a broken PDF backend as an error page rather than an
+            # archive of failures; later failures are listed in errors.txt.
+            first = next(results)
+            if first[2] is not None:
+                results.close()
+                raise bulk.as_generation_error(first[0], first[2])
+
+            response = StreamingHttpResponse(
+                bulk.stream_zip(bulk.zip_entries(itertools.chain([first], results), [])),
+                content_type="application/zip",
+            )
             response["Content-Disposition"] = (
                 'attachment; filename="All_Student_PDFs.zip"'
             )
 
             return response
 
-        combined_html = ""
-        for student in students:
-            strength_data, participations = calculate_strength_data(student)
-            sorted_events = sorted(
-                participations,
-                key=lambda p: len(p.event.attributes.all()),
-                reverse=True,
+        output = tempfile.TemporaryFile()
+        try:
+            pages = _bulk_transcripts(request.build_absolute_uri, students)
+            bulk.merge_pdfs(
+                render_cache.render_transcripts(
+                    (position, context) for position, _, context in pages
+                ),
+                output,
             )
-            top_events = [
-                (p.event.name, p.role.name if p.role else "Participant")
-                for p in sorted_events[:5]
-            ]
-
-            qr_b64 = None
-            if participations.count() > 5:
-                all_events_url = request.build_absolute_uri(
-                    reverse(
-                        "transcript:all_events", kwargs={"roll_no": student.roll_no}
-                    )
-                )
-                qr = qrcode.make(all_events_url)
-                buf = io.BytesIO()
-                qr.save(buf, format="PNG")
-                qr_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-
-            html = render_to_string(
-                "transcript_app/pdf.html",
-                {
-                    "student": student,
-                    "strength_data": strength_data,
-                    "today": date.today(),
-                    "top_events": top_events,
-                    "qr_code": qr_b64,
-                },
-            )
-
-            combined_html += f'<div style="page-break-after: always;">{html}</div>'
-
-        pdf_bytes = render_pdf_from_html(combined_html)
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
-        response["Content-Disposition"] = (
-            'attachment; filename="Course_Transcripts.pdf"'
+        except BaseException:
+            output.close()
+            raise
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename="Course_Transcripts.pdf",
+            content_type="application/pdf",
         )
-
-        return response
     except PDFGenerationError:
         logger.exception(
             "Failed to generate bulk transcripts for year=%s, school=%s, course=%s",
@@ -483,3 +512,96 @@ def bulk_download_handler(request):
             "Unable to generate transcript files at this time. Please try again later.",
             status=500,
         )
+
+
+# ─────────────────────────────────────────────
+# BACKGROUND BATCH JOBS (see transcript/jobs.py)
+# ─────────────────────────────────────────────
+def _job_payload(job):
+    items = (
+        TranscriptBatchItem.objects.filter(job=job)
+        .select_related("student")
+        .order_by("student__name")
+    )
+    payload = {
+        "id": job.pk,
+        "status": job.status,
+        "output": job.output,
+        "total": job.total,
+        "completed": job.completed,
+        "failed": job.failed,
+        "error": job.error,
+        "status_url": reverse("transcript:batch_job_status", args=[job.pk]),
+        "download_url": None,
+        "students": [
+            {
+                "roll_no": item.student.roll_no,
+                "name": item.student.name,
+                "status": item.status,
+                "error": item.error,
+            }
+            for item in items
+        ],
+    }
+    if job.status == TranscriptBatchJob.DONE and job.artifact:
+        payload["download_url"] = reverse("transcript:batch_job_download", args=[job.pk])
+    return payload
+
+
+def _visible_job(request, pk, **filters):
+    job = get_object_or_404(TranscriptBatchJob, pk=pk, **filters)
+    if not job.visible_to(request.user):
+        raise Http404("No such job")
+    return job
+
+
+@login_required
+@require_POST
+def start_batch_job(request):
+    year = request.POST.get("year")
+    school = request.POST.get("school", "")
+    course_name = request.POST.get("course", "")
+    output = "pdf" if request.POST.get("type") == "pdf" else "zip"
+
+    academic_year = AcademicYear.objects.filter(year=year).first()
+    course = Course.objects.filter(name=course_name, school__name=school).first()
+    if (
+        academic_year is None
+        or course is None
+        or not Student.objects.filter(academic_year=academic_year, course=course).exists()
+    ):
+        raise Http404("No students found")
+
+    job, created = jobs.start_job(
+        academic_year,
+        course,
+        output,
+        base_url=request.build_absolute_uri("/"),
+        user=request.user,
+        # Skips reusing a finished artifact, e.g. to retry failed students.
+        force=request.POST.get("force") == "1",
+    )
+    if not created:
+        jobs.kick()
+    return JsonResponse(_job_payload(job), status=201 if created else 200)
+
+
+@login_required
+def batch_job_status(request, pk):
+    job = _visible_job(request, pk)
+    if job.is_active:
+        # Resumes jobs orphaned by a restart once someone is waiting on them.
+        jobs.kick()
+    return JsonResponse(_job_payload(job))
+
+
+@login_required
+def batch_job_download(request, pk):
+    job = _visible_job(request, pk, status=TranscriptBatchJob.DONE)
+    if not job.artifact:
+        raise Http404("No artifact for this job")
+    return FileResponse(
+        job.artifact.open("rb"),
+        as_attachment=True,
+        filename=os.path.basename(job.artifact.name),
+    )